@@ -0,0 +1,10 @@
+"""
+Benchmarks for the Task Manager API.
+
+Each module can be run on its own from the backend directory, for example::
+
+    python -m benchmarks.patch_throughput
+
+Benchmarks run against a throwaway test database created from the
+configured ``default`` database, so they never touch real data.
+"""
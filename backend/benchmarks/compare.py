@@ -0,0 +1,80 @@
+"""
+Compares two load test results and flags regressions.
+
+A scenario regresses when its throughput drops or its p95 latency grows by
+more than the tolerance, when it runs more queries per request, or when it
+has more failed requests. The exit status is 1 if any scenario regressed,
+so the script can gate CI jobs.
+
+Usage::
+
+    python -m benchmarks.compare benchmarks/results/<base>-http.json benchmarks/results/<head>-http.json
+                                 [--tolerance 0.1]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def compare(base: dict, head: dict, tolerance: float) -> list[str]:
+    """
+    Prints a comparison of two results and lists the regressions.
+
+    Args:
+        base (dict): Reference result, as written by ``benchmarks.load``.
+        head (dict): Result to check.
+        tolerance (float): Accepted relative change of throughput and latency.
+
+    Returns:
+        list[str]: Descriptions of the regressions, empty if there are none.
+    """
+    regressions: list[str] = []
+    print(f"{'scenario':<10} {'req/s':>21} {'p95 ms':>21} {'queries':>15} {'errors':>11}")
+    for name, current in head["results"].items():
+        previous: dict | None = base["results"].get(name)
+        if previous is None:
+            print(f"{name:<10} (new)")
+            continue
+        print(
+            f"{name:<10} {previous['per_second']:>9.1f} -> {current['per_second']:>8.1f} "
+            f"{previous['p95_ms']:>9.2f} -> {current['p95_ms']:>8.2f} "
+            f"{previous['queries_per_request'] or 0:>6.1f} -> {current['queries_per_request'] or 0:>5.1f} "
+            f"{previous['errors']:>4} -> {current['errors']:>3}"
+        )
+        if current["per_second"] < previous["per_second"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {previous['per_second']} -> {current['per_second']} req/s")
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']} -> {current['p95_ms']} ms")
+        if (current["queries_per_request"] or 0) > (previous["queries_per_request"] or 0):
+            regressions.append(
+                f"{name}: queries per request {previous['queries_per_request']} -> {current['queries_per_request']}"
+            )
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}: errors {previous['errors']} -> {current['errors']}")
+    return regressions
+
+
+def main() -> None:
+    """Parses the command line and compares the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base", type=Path, help="reference result")
+    parser.add_argument("head", type=Path, help="result to check")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="accepted relative change (default 0.1)")
+    args = parser.parse_args()
+
+    base: dict = json.loads(args.base.read_text())
+    head: dict = json.loads(args.head.read_text())
+    if base["meta"]["driver"] != head["meta"]["driver"]:
+        parser.error("results were produced by different drivers")
+
+    print(f"{base['meta']['commit']} -> {head['meta']['commit']} ({head['meta']['driver']})")
+    regressions: list[str] = compare(base, head, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compression and JSON backend benchmark for the task list.
+
+Reports the bytes on the wire and the server CPU time per request of
+GET /api/tasks/ for each content coding, and compares the standard
+library and orjson backends for rendering and parsing.
+
+Usage::
+
+    python -m benchmarks.compression [--tasks 500] [--requests 100]
+"""
+
+import argparse
+import io
+import json
+
+from benchmarks.seed import seed_user_tasks
+from benchmarks.utils import BenchmarkResult, benchmark_database, measure, setup_django
+
+
+def run_encodings(requests: int) -> None:
+    """
+    Times the task list for each content coding the server can produce.
+
+    Args:
+        requests (int): Timed requests per coding.
+    """
+    from django.contrib.auth.models import User
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from task_manager.middleware import brotli
+
+    client: APIClient = APIClient()
+    client.force_authenticate(user=User.objects.get(username="bench"))
+    url: str = reverse("task-list")
+
+    encodings: list[str] = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+    for encoding in encodings:
+        size: int = len(client.get(url, HTTP_ACCEPT_ENCODING=encoding).content)
+        result: BenchmarkResult = measure(
+            f"GET /api/tasks/ ({encoding})",
+            lambda _: client.get(url, HTTP_ACCEPT_ENCODING=encoding),
+            requests,
+        )
+        print(f"{result.report()}  bytes {size:>9}")
+
+
+def run_json_backends(requests: int) -> None:
+    """
+    Times rendering and parsing of the task list with each JSON backend.
+
+    Args:
+        requests (int): Timed runs per backend.
+    """
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from tasks.models import Task
+    from tasks.parsers import FastJSONParser
+    from tasks.renderers import FastJSONRenderer, orjson
+    from tasks.serializers import FastTaskSerializer
+
+    if orjson is None:
+        print("orjson is not installed: FastJSONRenderer and FastJSONParser fall back to the standard library")
+
+    data: list[dict] = FastTaskSerializer().serialize(Task.objects.all())
+    body: bytes = json.dumps(data).encode()
+    for renderer in (JSONRenderer(), FastJSONRenderer()):
+        print(measure(f"render with {type(renderer).__name__}", lambda _: renderer.render(data), requests).report())
+    for parser in (JSONParser(), FastJSONParser()):
+        print(
+            measure(
+                f"parse with {type(parser).__name__}",
+                lambda _: parser.parse(io.BytesIO(body), "application/json", {}),
+                requests,
+            ).report()
+        )
+
+
+def main() -> None:
+    """Parses the command line and runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=500, help="tasks in the list")
+    parser.add_argument("--requests", type=int, default=100, help="timed requests per scenario")
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database():
+        seed_user_tasks(args.tasks)
+        run_encodings(args.requests)
+        run_json_backends(args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+"""
+Load test of the main API endpoints.
+
+Seeds users and tasks, then drives list, search, create (with the overlap
+validation), login and users either in-process through the test client,
+over HTTP against a local threaded server, or over HTTP against gunicorn
+started with a configuration file. Reports requests per second, latency
+percentiles and queries per request (not available for gunicorn, whose
+workers are other processes), and saves the results as JSON under
+``benchmarks/results/`` for ``benchmarks.compare``.
+
+Usage::
+
+    python -m benchmarks.load [--users 50] [--tasks-per-user 200] [--requests 500]
+                              [--driver inprocess|http|both|gunicorn] [--concurrency 8]
+                              [--gunicorn-config gunicorn.conf.py]
+                              [--scenarios list search create login users]
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import quote
+
+from benchmarks.seed import PASSWORD, seed_tasks, seed_users
+from benchmarks.utils import BenchmarkResult, QueryCounter, benchmark_database, measure, setup_django
+
+RESULTS_DIR: Path = Path(__file__).resolve().parent / "results"
+
+# Seconds to wait for gunicorn to accept connections
+GUNICORN_START_TIMEOUT: float = 30.0
+
+# Request numbers are unique across drivers and warm-up runs, so create requests never reuse dates
+REQUEST_NUMBERS: itertools.count = itertools.count()
+
+
+@dataclass(frozen=True)
+class Account:
+    """
+    Seeded user as seen by the load generator.
+
+    Attributes:
+        id (int): Id of the user.
+        email (str): Email used to log in.
+        token (str): JWT access token.
+    """
+
+    id: int
+    email: str
+    token: str
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    A request repeated by the load generator.
+
+    Attributes:
+        name (str): Name of the scenario.
+        method (str): HTTP method.
+        build (Callable): Returns the path and JSON body of the n-th request for an account.
+        expected (tuple[int, ...]): Status codes counted as successful.
+        authenticated (bool): Whether the request carries the account's access token.
+    """
+
+    name: str
+    method: str
+    build: Callable[[Account, int], tuple[str, dict | None]]
+    expected: tuple[int, ...] = (200,)
+    authenticated: bool = True
+
+
+def create_body(account: Account, index: int) -> tuple[str, dict]:
+    """
+    Builds a task creation request.
+
+    Requests come in pairs on the same dates: the first one is created, the
+    second one is rejected by the overlap validation. Dates lie beyond the
+    seeded tasks so that the pairs never collide with them.
+    """
+    start: date = date.today() + timedelta(days=100000 + index // 2 * 2)
+    body: dict = {
+        "title": f"Load task {index}",
+        "start_date": start.isoformat(),
+        "due_date": start.isoformat(),
+        "user": account.id,
+    }
+    return "/api/tasks/", body
+
+
+def search_path(account: Account, index: int) -> tuple[str, None]:
+    """Builds a 30-day search request moving along the seeded range."""
+    start: date = date.today() + timedelta(days=index % 365)
+    return f"/api/tasks/search/?start={start.isoformat()}&end={(start + timedelta(days=30)).isoformat()}", None
+
+
+SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("list", "GET", lambda account, index: ("/api/tasks/", None)),
+        Scenario("search", "GET", search_path),
+        Scenario("create", "POST", create_body, expected=(201, 400)),
+        Scenario(
+            "login",
+            "POST",
+            lambda account, index: ("/api/auth/login/", {"email": account.email, "password": PASSWORD}),
+            authenticated=False,
+        ),
+        Scenario("users", "GET", lambda account, index: ("/api/auth/users/", None)),
+    )
+}
+
+
+def prepare(users: int, tasks_per_user: int) -> list[Account]:
+    """
+    Seeds the database and issues an access token for every user.
+
+    Args:
+        users (int): Number of users.
+        tasks_per_user (int): Number of tasks of each user.
+
+    Returns:
+        list[Account]: The seeded accounts.
+    """
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    seeded: list = seed_users(users)
+    seed_tasks(seeded, tasks_per_user)
+    return [Account(user.id, user.email, str(RefreshToken.for_user(user).access_token)) for user in seeded]
+
+
+def run_inprocess(scenario: Scenario, accounts: list[Account], requests: int) -> BenchmarkResult:
+    """
+    Sends the requests of a scenario sequentially through the test client.
+
+    Args:
+        scenario (Scenario): Scenario to run.
+        accounts (list[Account]): Accounts the requests are spread over.
+        requests (int): Number of timed requests.
+
+    Returns:
+        BenchmarkResult: Timings and queries per request.
+    """
+    from rest_framework.test import APIClient
+
+    client: APIClient = APIClient()
+    errors: list[int] = []
+
+    def send(index: int) -> None:
+        number: int = next(REQUEST_NUMBERS)
+        account: Account = accounts[number // 2 % len(accounts)]
+        path, body = scenario.build(account, number)
+        headers: dict = {"HTTP_AUTHORIZATION": f"Bearer {account.token}"} if scenario.authenticated else {}
+        response = client.generic(
+            scenario.method,
+            path,
+            json.dumps(body) if body is not None else "",
+            content_type="application/json",
+            **headers,
+        )
+        if response.status_code not in scenario.expected:
+            errors.append(response.status_code)
+
+    for index in range(10):
+        send(index)
+    errors.clear()
+    result: BenchmarkResult = measure(scenario.name, send, requests, warmup=0)
+    result.errors = len(errors)
+    return result
+
+
+class CountingApplication:
+    """
+    WSGI wrapper counting the SQL queries run by the requests it serves.
+
+    Every server thread has its own connection, so each request installs
+    its own counter and adds the result to a shared total.
+    """
+
+    def __init__(self, application) -> None:
+        self.application = application
+        self.queries: int = 0
+        self.lock: threading.Lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        counter: QueryCounter = QueryCounter()
+        with counter.watch():
+            # Consume the body inside the block, in case the response is streamed
+            body: list[bytes] = list(self.application(environ, start_response))
+        with self.lock:
+            self.queries += counter.count
+        return body
+
+    def reset(self) -> int:
+        """
+        Resets the query total.
+
+        Returns:
+            int: The total before the reset.
+        """
+        with self.lock:
+            total, self.queries = self.queries, 0
+        return total
+
+
+def start_server() -> tuple:
+    """
+    Starts a threaded WSGI server on a free local port.
+
+    Returns:
+        tuple: The server and the counting application it serves.
+    """
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, format, *args) -> None:
+            pass
+
+    application: CountingApplication = CountingApplication(get_internal_wsgi_application())
+    server = ThreadedWSGIServer(("127.0.0.1", 0), QuietHandler, allow_reuse_address=False)
+    server.daemon_threads = True
+    server.set_app(application)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, application
+
+
+def database_url() -> str:
+    """
+    Builds the URL of the benchmark database, for servers running in other processes.
+
+    Returns:
+        str: URL in the format of the ``DATABASE_URL`` setting.
+    """
+    from django.db import connection
+
+    settings: dict = connection.settings_dict
+    if connection.vendor == "sqlite":
+        return f"sqlite:///{settings['NAME']}"
+    credentials: str = f"{quote(settings['USER'])}:{quote(settings['PASSWORD'])}@" if settings["USER"] else ""
+    address: str = f"{settings['HOST']}:{settings['PORT']}" if settings["PORT"] else settings["HOST"]
+    return f"{connection.vendor}://{credentials}{address}/{settings['NAME']}"
+
+
+def start_gunicorn(config: str) -> tuple[subprocess.Popen, tuple[str, int]]:
+    """
+    Starts gunicorn on a free local port, serving the benchmark database.
+
+    Args:
+        config (str): Gunicorn configuration file.
+
+    Returns:
+        tuple[subprocess.Popen, tuple[str, int]]: The gunicorn master and the address it listens on.
+    """
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        address: tuple[str, int] = probe.getsockname()
+    environment: dict = {**os.environ, "DATABASE_URL": database_url()}
+    process: subprocess.Popen = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", config, "--bind", "%s:%d" % address, "task_manager.wsgi:application"],
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline: float = time.monotonic() + GUNICORN_START_TIMEOUT
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            socket.create_connection(address, timeout=1).close()
+            return process, address
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"gunicorn did not start with {config}")
+
+
+def stop_gunicorn(process: subprocess.Popen) -> None:
+    """Stops gunicorn gracefully, so its workers log their timings."""
+    process.terminate()
+    process.wait(timeout=60)
+
+
+def run_http(
+    scenario: Scenario,
+    accounts: list[Account],
+    requests: int,
+    concurrency: int,
+    address: tuple[str, int],
+    application: CountingApplication | None = None,
+) -> BenchmarkResult:
+    """
+    Sends the requests of a scenario concurrently over HTTP.
+
+    Args:
+        scenario (Scenario): Scenario to run.
+        accounts (list[Account]): Accounts the requests are spread over.
+        requests (int): Number of timed requests.
+        concurrency (int): Number of concurrent clients.
+        address (tuple[str, int]): Host and port of the server.
+        application (CountingApplication | None): Application served by a local server, whose
+            queries are counted; None for servers running in other processes.
+
+    Returns:
+        BenchmarkResult: Timings and queries per request. The CPU time is the one of this process,
+        which only includes the server's for a local server.
+    """
+    host, port = address
+    local = threading.local()
+
+    def send(index: int) -> tuple[float, bool]:
+        number: int = next(REQUEST_NUMBERS)
+        account: Account = accounts[number // 2 % len(accounts)]
+        path, body = scenario.build(account, number)
+        headers: dict = {"Content-Type": "application/json", "Connection": "close"}
+        if scenario.authenticated:
+            headers["Authorization"] = f"Bearer {account.token}"
+        started: float = time.perf_counter()
+        try:
+            # The development server closes connections after each response
+            local.connection = http.client.HTTPConnection(host, port, timeout=60)
+            local.connection.request(
+                scenario.method, path, json.dumps(body) if body is not None else None, headers=headers
+            )
+            response = local.connection.getresponse()
+            response.read()
+            succeeded: bool = response.status in scenario.expected
+        except (OSError, http.client.HTTPException):
+            succeeded = False
+        finally:
+            local.connection.close()
+        return time.perf_counter() - started, succeeded
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, range(concurrency * 2)))
+        if application is not None:
+            application.reset()
+        started: float = time.perf_counter()
+        cpu_started: float = time.process_time()
+        outcomes: list[tuple[float, bool]] = list(executor.map(send, range(requests)))
+        total: float = time.perf_counter() - started
+        cpu: float = time.process_time() - cpu_started
+
+    return BenchmarkResult(
+        f"{scenario.name} (x{concurrency})",
+        requests,
+        total,
+        [timing for timing, _ in outcomes],
+        application.reset() / requests if application is not None else None,
+        cpu,
+        errors=sum(1 for _, succeeded in outcomes if not succeeded),
+    )
+
+
+def git_commit() -> str:
+    """Returns the short hash of the checked out commit, or ``unknown``."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save(driver: str, results: dict[str, BenchmarkResult], parameters: dict, directory: Path) -> Path:
+    """
+    Writes the results of a run as JSON.
+
+    Args:
+        driver (str): ``inprocess``, ``http`` or ``gunicorn``.
+        results (dict[str, BenchmarkResult]): Results by scenario name.
+        parameters (dict): Command line parameters of the run.
+        directory (Path): Output directory.
+
+    Returns:
+        Path: The written file, named after the commit and driver.
+    """
+    import django
+    from django.db import connection
+
+    commit: str = git_commit()
+    report: dict = {
+        "meta": {
+            "commit": commit,
+            "driver": driver,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "parameters": parameters,
+        },
+        "results": {name: result.to_dict() for name, result in results.items()},
+    }
+    directory.mkdir(parents=True, exist_ok=True)
+    path: Path = directory / f"{commit}-{driver}.json"
+    path.write_text(json.dumps(report, indent=2) + "\n")
+    return path
+
+
+def main() -> None:
+    """Parses the command line and runs the load test."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50, help="number of seeded users")
+    parser.add_argument("--tasks-per-user", type=int, default=200, help="number of seeded tasks per user")
+    parser.add_argument("--requests", type=int, default=500, help="timed requests per scenario")
+    parser.add_argument("--driver", choices=["inprocess", "http", "both", "gunicorn"], default="both")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent clients of the HTTP drivers")
+    parser.add_argument(
+        "--gunicorn-config", default="gunicorn.conf.py", help="configuration file of the gunicorn driver"
+    )
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR, help="directory of the JSON results")
+    parser.add_argument("--no-save", action="store_true", help="only print the results")
+    args = parser.parse_args()
+    parameters: dict = {key: value for key, value in vars(args).items() if key not in ("output", "no_save")}
+
+    setup_django()
+    drivers: list[str] = ["inprocess", "http"] if args.driver == "both" else [args.driver]
+    with benchmark_database(threaded=drivers != ["inprocess"]):
+        accounts: list[Account] = prepare(args.users, args.tasks_per_user)
+        print(f"Seeded {args.users} users with {args.tasks_per_user} tasks each (pid {os.getpid()})")
+        for driver in drivers:
+            results: dict[str, BenchmarkResult] = {}
+            if driver == "http":
+                server, application = start_server()
+                address: tuple[str, int] = server.server_address[:2]
+            elif driver == "gunicorn":
+                process, address = start_gunicorn(args.gunicorn_config)
+                application = None
+            print(f"\n{driver}")
+            for name in args.scenarios:
+                scenario: Scenario = SCENARIOS[name]
+                if driver == "inprocess":
+                    result = run_inprocess(scenario, accounts, args.requests)
+                else:
+                    result = run_http(scenario, accounts, args.requests, args.concurrency, address, application)
+                results[name] = result
+                print(result.report())
+            if driver == "http":
+                server.shutdown()
+                server.server_close()
+            elif driver == "gunicorn":
+                stop_gunicorn(process)
+            if not args.no_save:
+                print(f"Saved {save(driver, results, parameters, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+PATCH throughput benchmark for the task detail endpoint.
+
+Compares a title-only PATCH, which skips the overlap validation and writes
+a single column, with a PATCH that moves the task dates.
+
+Usage::
+
+    python -m benchmarks.patch_throughput [--requests 500] [--tasks 1000]
+"""
+
+import argparse
+from datetime import date, timedelta
+
+from benchmarks.utils import benchmark_database, measure, setup_django
+
+
+def run(requests: int, tasks: int) -> None:
+    """
+    Seeds a user with tasks and times PATCH requests against one of them.
+
+    Args:
+        requests (int): Number of timed requests per scenario.
+        tasks (int): Number of tasks of the benchmark user.
+    """
+    from django.contrib.auth.models import User
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from tasks.models import Task
+
+    user: User = User.objects.create_user(username="bench", email="bench@example.com", password="bench")
+    start: date = date(2030, 1, 1)
+    # Two-day tasks with a one-day gap, so no task overlaps another one
+    Task.objects.bulk_create(
+        Task(
+            title=f"Task {index}",
+            start_date=start + timedelta(days=index * 3),
+            due_date=start + timedelta(days=index * 3 + 1),
+            user=user,
+            created_by=user,
+        )
+        for index in range(tasks)
+    )
+    task: Task = Task.objects.filter(user=user).first()
+    client: APIClient = APIClient()
+    client.force_authenticate(user=user)
+    url: str = reverse("task-detail", kwargs={"pk": task.id})
+    body: dict = {"start_date": str(task.start_date), "due_date": str(task.due_date), "user": user.id}
+
+    results = [
+        measure(
+            "PATCH title only",
+            lambda index: client.patch(url, {"title": f"Renamed {index}"}, format="json"),
+            requests,
+        ),
+        measure(
+            "PATCH title, unchanged dates and user",
+            lambda index: client.patch(url, {**body, "title": f"Renamed {index}"}, format="json"),
+            requests,
+        ),
+        measure(
+            "PATCH dates (overlap validation)",
+            lambda index: client.patch(
+                url,
+                # Alternates between two due dates that both differ from the current one
+                {**body, "due_date": str(task.start_date + timedelta(days=2 * (index % 2)))},
+                format="json",
+            ),
+            requests,
+        ),
+    ]
+    for result in results:
+        print(result.report())
+
+
+def main() -> None:
+    """Parses the command line and runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="timed requests per scenario")
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks of the benchmark user")
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database():
+        run(args.requests, args.tasks)
+
+
+if __name__ == "__main__":
+    main()
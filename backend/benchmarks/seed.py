@@ -0,0 +1,133 @@
+"""
+Bulk data seeding for the benchmarks.
+
+Users and tasks are written with ``bulk_create`` so that large volumes can
+be seeded in seconds, bypassing the per-object validation of the API.
+"""
+
+import random
+from datetime import date, timedelta
+
+# Password of every seeded user
+PASSWORD: str = "bench-password"
+
+
+def seed_users(count: int, prefix: str = "bench") -> list:
+    """
+    Creates users named ``<prefix>_<n>`` with bulk inserts.
+
+    The password is hashed once and shared, since hashing dominates the
+    seeding time otherwise.
+
+    Args:
+        count (int): Number of users to create.
+        prefix (str): Username and email prefix.
+
+    Returns:
+        list[User]: The created users, with their ids.
+    """
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+
+    password: str = make_password(PASSWORD)
+    User.objects.bulk_create(
+        (
+            User(username=f"{prefix}_{index}", email=f"{prefix}_{index}@example.com", password=password)
+            for index in range(count)
+        ),
+        batch_size=1000,
+    )
+    # bulk_create only returns primary keys on some backends, so read them back
+    return list(User.objects.filter(username__startswith=f"{prefix}_").order_by("id"))
+
+
+def seed_tasks(
+    users: list,
+    tasks_per_user: int,
+    completed_ratio: float = 0.3,
+    open_ended_ratio: float = 0.05,
+    shared_ratio: float = 0.1,
+    random_seed: int = 0,
+) -> int:
+    """
+    Creates tasks for every user with bulk inserts.
+
+    The data follows the shape the API produces: pending tasks of a user
+    never overlap, completed tasks may overlap anything, a few tasks have no
+    due date and some tasks were created by another user. Durations and gaps
+    vary so that date range filters hit a realistic number of rows.
+
+    Args:
+        users (list[User]): Owners of the tasks.
+        tasks_per_user (int): Number of tasks of each user.
+        completed_ratio (float): Share of completed tasks.
+        open_ended_ratio (float): Share of tasks without a due date.
+        shared_ratio (float): Share of tasks created by another user.
+        random_seed (int): Seed, so that runs are reproducible.
+
+    Returns:
+        int: Number of tasks created.
+    """
+    from tasks.models import Task
+
+    generator: random.Random = random.Random(random_seed)
+    first_day: date = date.today() + timedelta(days=1)
+
+    def build():
+        for user in users:
+            day: date = first_day
+            for index in range(tasks_per_user):
+                duration: int = generator.randint(0, 6)
+                completed: bool = generator.random() < completed_ratio
+                if completed:
+                    # Completed tasks are ignored by the overlap validation, so they can sit anywhere
+                    start: date = first_day + timedelta(days=generator.randint(0, tasks_per_user * 5))
+                else:
+                    start = day
+                    day += timedelta(days=duration + generator.randint(1, 3))
+                creator = generator.choice(users) if len(users) > 1 and generator.random() < shared_ratio else user
+                yield Task(
+                    title=f"Task {index} of {user.username}",
+                    description="Benchmark task description",
+                    start_date=start,
+                    due_date=None if generator.random() < open_ended_ratio else start + timedelta(days=duration),
+                    completed=completed,
+                    user=user,
+                    created_by=creator,
+                )
+
+    Task.objects.bulk_create(build(), batch_size=5000)
+    return len(users) * tasks_per_user
+
+
+def seed_user_tasks(rows: int, username: str = "bench") -> None:
+    """
+    Inserts consecutive, non-overlapping tasks for a single user.
+
+    Idempotent: only the missing tasks are added, so a benchmark can grow
+    the list between sizes.
+
+    Args:
+        rows (int): Total number of tasks the user must have.
+        username (str): Username of the owner, created if needed.
+    """
+    from django.contrib.auth.models import User
+    from tasks.models import Task
+
+    user, _ = User.objects.get_or_create(username=username, defaults={"email": f"{username}@example.com"})
+    existing: int = Task.objects.filter(user=user).count()
+    start: date = date(2030, 1, 1)
+    Task.objects.bulk_create(
+        (
+            Task(
+                title=f"Task {index}",
+                description="Benchmark task description",
+                start_date=start + timedelta(days=index),
+                due_date=start + timedelta(days=index) if index % 3 else None,
+                user=user,
+                created_by=user,
+            )
+            for index in range(existing, rows)
+        ),
+        batch_size=5000,
+    )
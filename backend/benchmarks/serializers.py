@@ -0,0 +1,69 @@
+"""
+Serialization benchmark for task lists.
+
+Compares TaskSerializer with DRF's JSONRenderer against FastTaskSerializer
+with FastJSONRenderer, from QuerySet to response bytes.
+
+Usage::
+
+    python -m benchmarks.serializers [--rows 1000 10000 100000] [--iterations 3]
+"""
+
+import argparse
+
+from benchmarks.seed import seed_user_tasks
+from benchmarks.utils import BenchmarkResult, benchmark_database, measure, setup_django
+
+
+def run(rows: int, iterations: int) -> list[BenchmarkResult]:
+    """
+    Times both serialization paths on the tasks of the benchmark user.
+
+    Args:
+        rows (int): Number of tasks to serialize.
+        iterations (int): Timed runs per path.
+
+    Returns:
+        list[BenchmarkResult]: Results of the DRF and fast paths.
+    """
+    from rest_framework.renderers import JSONRenderer
+    from tasks.models import Task
+    from tasks.renderers import FastJSONRenderer
+    from tasks.serializers import FastTaskSerializer, TaskSerializer
+
+    seed_user_tasks(rows)
+    queryset = Task.objects.filter(user__username="bench")
+
+    drf: BenchmarkResult = measure(
+        f"TaskSerializer + JSONRenderer ({rows} rows)",
+        lambda _: JSONRenderer().render(TaskSerializer(queryset.select_related("user"), many=True).data),
+        iterations,
+        warmup=1,
+    )
+    fast: BenchmarkResult = measure(
+        f"FastTaskSerializer + FastJSONRenderer ({rows} rows)",
+        lambda _: FastJSONRenderer().render(FastTaskSerializer().serialize(queryset)),
+        iterations,
+        warmup=1,
+    )
+    return [drf, fast]
+
+
+def main() -> None:
+    """Parses the command line and runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000], help="list sizes")
+    parser.add_argument("--iterations", type=int, default=3, help="timed runs per path and size")
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database():
+        for rows in sorted(args.rows):
+            drf, fast = run(rows, args.iterations)
+            print(drf.report())
+            print(fast.report())
+            print(f"{'speedup':<52} {drf.total / fast.total:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
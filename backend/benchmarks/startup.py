@@ -0,0 +1,134 @@
+"""
+Worker startup and per-request middleware benchmark.
+
+Reports the time a fresh process takes to import the WSGI application and
+resolve its first API URL, as a worker does before serving its first
+request, with the packages weighing most in ``python -X importtime``. Then
+times GET /api/health/ through the project's middleware and through the
+same stack with Django's own session, CSRF, authentication, messages and
+clickjacking middleware, which also run on API requests.
+
+Usage::
+
+    python -m benchmarks.startup [--runs 5] [--requests 2000] [--top 10]
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from benchmarks.utils import BenchmarkResult, benchmark_database, measure, setup_django
+
+BASE_DIR: Path = Path(__file__).resolve().parent.parent
+
+# Imports of a worker up to its first request, printing the elapsed milliseconds
+WORKER_STARTUP: str = (
+    "import time; started = time.perf_counter(); import task_manager.wsgi; "
+    "from django.urls import resolve; resolve('/api/tasks/'); print((time.perf_counter() - started) * 1000)"
+)
+
+IMPORT_TIME_LINE: re.Pattern = re.compile(r"import time:\s+(\d+) \|\s+\d+ \|\s*(\S+)")
+
+
+def package_of(module: str) -> str:
+    """Groups a module under its top-level package, or its Django contrib app."""
+    parts: list[str] = module.split(".")
+    return ".".join(parts[:3]) if parts[:2] == ["django", "contrib"] else parts[0]
+
+
+def run_startup(runs: int, top: int) -> None:
+    """
+    Times the startup of fresh worker processes.
+
+    Args:
+        runs (int): Number of processes started; the fastest one is reported.
+        top (int): Number of packages listed.
+    """
+    timings: list[tuple[float, str]] = []
+    for _ in range(runs):
+        process: subprocess.CompletedProcess = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", WORKER_STARTUP],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        timings.append((float(process.stdout.strip().splitlines()[-1]), process.stderr))
+
+    elapsed, report = min(timings)
+    packages: defaultdict[str, int] = defaultdict(int)
+    modules: int = 0
+    for match in IMPORT_TIME_LINE.finditer(report):
+        packages[package_of(match.group(2))] += int(match.group(1))
+        modules += 1
+    print(
+        f"Worker startup: {elapsed:.0f}ms (fastest of {runs}), "
+        f"of which {modules} module imports {sum(packages.values()) / 1000:.0f}ms"
+    )
+    for package, microseconds in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {package:<40} {microseconds / 1000:>7.1f}ms")
+
+
+def stock_middleware() -> list[str]:
+    """
+    Returns ``MIDDLEWARE`` with Django's classes in place of their API-skipping subclasses.
+
+    Returns:
+        list[str]: Dotted paths of the middleware.
+    """
+    from django.conf import settings
+    from django.utils.module_loading import import_string
+
+    from task_manager.middleware import BrowserOnlyMixin
+
+    stack: list[str] = []
+    for path in settings.MIDDLEWARE:
+        middleware: type = import_string(path)
+        if issubclass(middleware, BrowserOnlyMixin):
+            base: type = next(base for base in middleware.__bases__ if base is not BrowserOnlyMixin)
+            path = f"{base.__module__}.{base.__qualname__}"
+        stack.append(path)
+    return stack
+
+
+def run_middleware(requests: int) -> None:
+    """
+    Times an API request through the project's and through the stock middleware.
+
+    Args:
+        requests (int): Timed requests per stack.
+    """
+    from django.conf import settings
+    from django.test import Client, override_settings
+
+    results: dict[str, BenchmarkResult] = {}
+    for name, stack in (("stock", stock_middleware()), ("api-only", settings.MIDDLEWARE)):
+        with override_settings(MIDDLEWARE=stack):
+            client: Client = Client()
+            results[name] = measure(
+                f"GET /api/health/ ({name} middleware)", lambda _: client.get("/api/health/"), requests
+            )
+            print(results[name].report())
+    saved: float = results["stock"].total / requests - results["api-only"].total / requests
+    print(f"Saved per API request: {saved * 1_000_000:.0f}us")
+
+
+def main() -> None:
+    """Parses the command line and runs the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="worker processes started")
+    parser.add_argument("--requests", type=int, default=2000, help="timed requests per middleware stack")
+    parser.add_argument("--top", type=int, default=10, help="packages listed by import time")
+    args = parser.parse_args()
+
+    setup_django()
+    run_startup(args.runs, args.top)
+    with benchmark_database():
+        run_middleware(args.requests)
+
+
+if __name__ == "__main__":
+    main()
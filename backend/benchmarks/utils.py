@@ -0,0 +1,185 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+
+import logging
+import os
+import statistics
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import django
+
+
+def setup_django() -> None:
+    """
+    Configures Django so benchmark scripts can import models and views.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "task_manager.settings")
+    django.setup()
+    # Request logging would dominate the timings, and load tests provoke expected 4xx warnings
+    logging.disable(logging.WARNING)
+
+
+@contextmanager
+def benchmark_database(threaded: bool = False) -> Iterator[None]:
+    """
+    Creates a throwaway test database for the duration of the benchmark.
+
+    Args:
+        threaded (bool): Whether other threads (e.g. a local HTTP server) will use the
+            database. SQLite then uses a temporary file instead of an in-memory database.
+
+    Yields:
+        None: The test database is active inside the block.
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    if threaded and connection.vendor == "sqlite":
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(tempfile.mkdtemp(), "benchmark.sqlite3")
+    old_name: str = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+class QueryCounter:
+    """
+    Counts the SQL queries run on the current thread's database connection.
+    """
+
+    def __init__(self) -> None:
+        self.count: int = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def watch(self) -> Iterator["QueryCounter"]:
+        """
+        Counts the queries run inside the block.
+
+        Yields:
+            QueryCounter: This counter.
+        """
+        from django.db import connection
+
+        with connection.execute_wrapper(self):
+            yield self
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Timings of a benchmarked operation.
+
+    Attributes:
+        name (str): Name of the operation.
+        iterations (int): Number of timed runs.
+        total (float): Total wall time in seconds.
+        timings (list[float]): Wall time of each run in seconds.
+        queries (float | None): Average number of SQL queries per run, None if unknown.
+        cpu (float): Total CPU time of the process in seconds.
+        errors (int): Number of failed runs.
+    """
+
+    name: str
+    iterations: int
+    total: float
+    timings: list[float]
+    queries: float | None = 0.0
+    cpu: float = 0.0
+    errors: int = 0
+
+    @property
+    def per_second(self) -> float:
+        """Runs per second."""
+        return self.iterations / self.total if self.total else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns a percentile of the run timings in milliseconds.
+
+        Args:
+            percent (float): Percentile between 0 and 100.
+
+        Returns:
+            float: Timing in milliseconds.
+        """
+        ordered: list[float] = sorted(self.timings)
+        index: int = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+        return ordered[index] * 1000
+
+    @property
+    def cpu_per_run(self) -> float:
+        """CPU time per run in milliseconds."""
+        return self.cpu / self.iterations * 1000 if self.iterations else 0.0
+
+    def report(self) -> str:
+        """Formats the result as a single line."""
+        return (
+            f"{self.name:<52} {self.per_second:>10.1f}/s  "
+            f"p50 {self.percentile(50):>7.2f}ms  p95 {self.percentile(95):>7.2f}ms  "
+            f"p99 {self.percentile(99):>7.2f}ms  mean {statistics.mean(self.timings) * 1000:>7.2f}ms  "
+            f"cpu {self.cpu_per_run:>7.2f}ms  "
+            f"queries {self.queries if self.queries is not None else float('nan'):>5.1f}"
+            + (f"  errors {self.errors}" if self.errors else "")
+        )
+
+    def to_dict(self) -> dict:
+        """
+        Summarizes the result for JSON reports.
+
+        Returns:
+            dict: Throughput, latency percentiles in milliseconds, queries and errors.
+        """
+        return {
+            "requests": self.iterations,
+            "errors": self.errors,
+            "per_second": round(self.per_second, 2),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "mean_ms": round(statistics.mean(self.timings) * 1000, 3),
+            "cpu_ms": round(self.cpu_per_run, 3),
+            "queries_per_request": round(self.queries, 2) if self.queries is not None else None,
+        }
+
+
+def measure(name: str, operation: Callable[[int], object], iterations: int, warmup: int = 10) -> BenchmarkResult:
+    """
+    Times an operation and counts the SQL queries it runs.
+
+    Args:
+        name (str): Name of the operation.
+        operation (Callable[[int], object]): Operation to time; receives the run index.
+        iterations (int): Number of timed runs.
+        warmup (int): Number of untimed runs made first.
+
+    Returns:
+        BenchmarkResult: The collected timings.
+    """
+    for index in range(warmup):
+        operation(index)
+
+    counter: QueryCounter = QueryCounter()
+    timings: list[float] = []
+    with counter.watch():
+        started: float = time.perf_counter()
+        cpu_started: float = time.process_time()
+        for index in range(iterations):
+            run_started: float = time.perf_counter()
+            operation(index)
+            timings.append(time.perf_counter() - run_started)
+        total: float = time.perf_counter() - started
+        cpu: float = time.process_time() - cpu_started
+
+    return BenchmarkResult(name, iterations, total, timings, counter.count / iterations, cpu)
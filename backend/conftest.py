@@ -2,27 +2,164 @@
 Conftest for Django tests
 """
 import pytest
-from django.conf import settings
+from collections.abc import Iterator
+from contextlib import contextmanager
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from model_bakery import baker
 from datetime import date, timedelta
 
+# Data seeded once per test database; every test starts from it without re-inserting it
+SEED_USERNAME_PREFIX: str = "seed_user"
+SEED_USERS: int = 20
+SEED_TASKS_PER_USER: int = 50
+
+# Maximum number of SQL queries per endpoint, for a client authenticated with force_authenticate.
+# Raising a budget must be a deliberate decision, reviewed together with the change that needs it.
+QUERY_BUDGETS: dict[str, int] = {
+    "task-list": 1,
+    "task-detail:get": 1,
+    "task-search": 1,
+    "task-calendar": 1,
+    # User lookup, overlap check, insert, memberships, events, history
+    "task-create": 6,
+    # The above, plus the key lookup, insert and response update, each of the last two in a savepoint
+    "task-create:idempotent": 13,
+    # Key lookup
+    "task-create:replay": 1,
+    # Task, update, members, assigned user of the response, events, history
+    "task-update": 6,
+    # Update, members of the tasks for cache invalidation, events, history
+    "task-complete": 4,
+    "task-bulk-complete": 4,
+    # Task, members, cascade to its memberships and reminders, delete, events, history
+    "task-delete": 7,
+    # Task, page of changes
+    "task-history": 2,
+    "users": 1,
+    # User by email, user by username in authenticate()
+    "login": 2,
+}
+
+
+def bulk_create_users(count: int, prefix: str = "user", password: str | None = None, **kwargs) -> list:
+    """
+    Creates users named ``<prefix>_<n>`` with a single bulk insert.
+
+    Args:
+        count (int): Number of users.
+        prefix (str): Username and email prefix.
+        password (str | None): Password of every user, unusable if None.
+        **kwargs: Extra field values shared by all users.
+
+    Returns:
+        list[User]: The created users.
+    """
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+
+    hashed: str = make_password(password)
+    return User.objects.bulk_create(
+        User(username=f"{prefix}_{index}", email=f"{prefix}_{index}@example.com", password=hashed, **kwargs)
+        for index in range(count)
+    )
+
+
+def bulk_create_tasks(user, count: int, start: date | None = None, length: int = 1, gap: int = 1, **kwargs) -> list:
+    """
+    Creates consecutive, non-overlapping tasks for a user with a single bulk insert.
+
+    Task ``n`` starts ``n * (length + gap)`` days after ``start`` and lasts
+    ``length`` days, so the intervals pass the overlap validation.
+
+    Args:
+        user (User): Owner and, unless given in kwargs, creator of the tasks.
+        count (int): Number of tasks.
+        start (date | None): Start date of the first task, today if None.
+        length (int): Days between the start and due date of each task.
+        gap (int): Free days between two tasks, at least 1.
+        **kwargs: Extra field values shared by all tasks.
+
+    Returns:
+        list[Task]: The created tasks.
+    """
+    from tasks.models import Task
+
+    first: date = start or date.today()
+    kwargs.setdefault("created_by", user)
+    tasks: list[Task] = []
+    for index in range(count):
+        task_start: date = first + timedelta(days=index * (length + gap))
+        tasks.append(
+            Task(
+                title=f"Task {index}",
+                start_date=task_start,
+                due_date=task_start + timedelta(days=length),
+                user=user,
+                **kwargs,
+            )
+        )
+    return Task.objects.bulk_create(tasks)
+
 
 @pytest.fixture(scope="session")
-def django_db_setup():
+def django_db_setup(django_db_setup, django_db_blocker):
+    """
+    Creates the test database once per worker and seeds the shared data.
+
+    Each test runs in a transaction that is rolled back afterwards, so the
+    seeded rows are a snapshot every test starts from. pytest-django runs
+    transactional tests last, as flushing the database removes the seed.
+    """
+    with django_db_blocker.unblock():
+        for user in bulk_create_users(SEED_USERS, prefix=SEED_USERNAME_PREFIX):
+            bulk_create_tasks(user, SEED_TASKS_PER_USER)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Clears the cache before each test so cached responses never leak between tests.
+    """
+    from django.core.cache import cache
+
+    cache.clear()
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Asserts that a block stays within the query budget of an endpoint.
+
+    Usage::
+
+        with query_budget("task-list"):
+            client.get(url)
+    """
+
+    @contextmanager
+    def _check(endpoint: str) -> Iterator[CaptureQueriesContext]:
+        budget: int = QUERY_BUDGETS[endpoint]
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        executed: int = len(context.captured_queries)
+        if executed > budget:
+            queries: str = "\n".join(
+                f"{index}. {query['sql']}" for index, query in enumerate(context.captured_queries, start=1)
+            )
+            pytest.fail(f"{endpoint} ran {executed} queries, its budget is {budget}:\n{queries}")
+
+    return _check
+
+
+@pytest.fixture
+def seeded_users(db) -> list:
     """
-    Configures an in-memory database for testing.
-    This configuration overrides the database configuration in settings.py
-    only during the execution of the tests.
+    Returns the users seeded in the test database, each with ``SEED_TASKS_PER_USER`` pending tasks.
     """
-    settings.DATABASES = {
-        "default": {
-            "ENGINE": "django.db.backends.sqlite3",
-            "NAME": ":memory:",
-            "TEST": {
-                "NAME": ":memory:",
-            },
-        },
-    }
+    from django.contrib.auth.models import User
+
+    return list(User.objects.filter(username__startswith=f"{SEED_USERNAME_PREFIX}_").order_by("id"))
 
 
 @pytest.fixture
@@ -69,6 +206,22 @@ def task_factory():
     return _create_task
 
 
+@pytest.fixture
+def bulk_user_factory(db):
+    """
+    Factory to create many test users with a single insert.
+    """
+    return bulk_create_users
+
+
+@pytest.fixture
+def bulk_task_factory(db):
+    """
+    Factory to create many non-overlapping test tasks with a single insert.
+    """
+    return bulk_create_tasks
+
+
 @pytest.fixture
 def authenticated_client(api_client, user_factory):
     """
@@ -19,6 +19,9 @@ PASSWORD_STR: Final[str] = "password"
 PASSWORD_CONFIRM_STR: Final[str] = "password_confirm"
 ID_STR: Final[str] = "id"
 
+# Requests under this path are API requests, authenticated with access tokens
+API_PATH_PREFIX: Final[str] = "/api/"
+
 # Error messages
 ERROR_MESSAGES = {
     "invalid_date_format": f"Invalid date format. Use {DATE_FORMAT_DISPLAY}.",
@@ -26,6 +29,22 @@ ERROR_MESSAGES = {
     "task_overlap": "This task overlaps with an existing task.",
     "empty_title": "The title cannot be empty.",
     "past_start_date": "The start date cannot be in the past.",
+    "calendar_range_required": "Both 'from' and 'to' dates are required.",
+    "calendar_range_inverted": "The 'to' date must be later or equal to the 'from' date.",
+    "calendar_range_too_large": "The calendar range cannot exceed {max_days} days.",
+    "invalid_bucket": "Invalid bucket. Use one of: {buckets}.",
+    "unknown_fields": "Unknown fields: {fields}.",
+    "version_conflict": "The task was modified by someone else. Reload it and try again.",
+    "unknown_users": "Unknown users: {users}.",
+    "invalid_credentials": "Authentication credentials were not provided or are invalid.",
+    "method_not_allowed": 'Method "{method}" not allowed.',
+    "not_tracing": "Allocations are not being traced in this worker process. Start tracing first.",
+    "invalid_comparison": "Invalid comparison. Use one of: {choices}.",
+    "invalid_limit": "The limit must be a positive integer.",
+    "invalid_frames": "The number of frames must be between 1 and {max_frames}.",
+    "idempotency_key_invalid": "The Idempotency-Key header must be 1 to {max_length} printable characters.",
+    "idempotency_key_reused": "This Idempotency-Key was already used with a different request.",
+    "idempotency_key_in_progress": "A request with this Idempotency-Key is still being processed. Retry later.",
 }
 
 # Field requirements
@@ -39,18 +58,167 @@ API_RESPONSES = {
     "task_created": "Task created successfully.",
     "task_updated": "Task updated successfully.",
     "task_deleted": "Task deleted successfully.",
+    "task_completed": "Task marked as completed.",
+    "task_already_completed": "Task was already completed.",
 }
 
 # Query parameters
 QUERY_PARAMS = {
     "start_date": "start",
     "end_date": "end",
+    "from_date": "from",
+    "to_date": "to",
+    "bucket": "bucket",
+    "fields": "fields",
+    "expand": "expand",
+    "include_archived": "include_archived",
+    "compare": "compare",
+    "package": "package",
+    "limit": "limit",
+    "page_size": "page_size",
+}
+
+# Calendar settings
+CALENDAR = {
+    "bucket_day": "day",
+    "bucket_week": "week",
+    "max_range_days": 366,
+    "cache_timeout": 300,
+}
+
+# Bulk operations
+BULK_OPERATIONS = {
+    "max_ids": 1000,
+}
+
+# Background jobs
+JOBS = {
+    "max_attempts": 5,
+    "backoff_base_seconds": 10,
+    "backoff_max_seconds": 3600,
+    "batch_size": 20,
+    "poll_interval_seconds": 1.0,
+    "lock_timeout_seconds": 600,
+    "max_error_length": 4000,
+}
+
+# Due date reminders: each kind fires for tasks whose due date is ``offset_days`` before the sweep day
+REMINDERS = {
+    "kinds": {
+        "upcoming": -1,
+        "overdue": 1,
+    },
+    "batch_size": 1000,
+    "lock_timeout_seconds": 300,
+    "max_catch_up_days": 7,
+}
+
+# Archival of completed tasks (tasks.archive); the age is the TASK_ARCHIVE_AFTER_DAYS setting
+ARCHIVE = {
+    "batch_size": 1000,
+    "pause_seconds": 0.1,
+}
+
+# Account deletion (users.deletion)
+ACCOUNT_DELETION = {
+    "batch_size": 1000,
+    "pause_seconds": 0.1,
+    "lock_timeout_seconds": 300,
+}
+
+# Task sharding (tasks.sharding); the shards are the TASK_SHARD_URLS setting
+SHARDING = {
+    "task_id_sequence": "tasks.task",
+    "id_block_size": 100,
+    "reshard_batch_size": 500,
+}
+
+# On-demand request profiling (diagnostics.profiling); the store size is the PROFILING_STORE_SIZE setting
+PROFILING = {
+    "header": "HTTP_X_PROFILE",
+    "query_param": "profile",
+    "salt": "diagnostics.profiling",
+    "sample_interval_seconds": 0.001,
+    "retention_seconds": 24 * 60 * 60,
+    "top_functions": 30,
+}
+
+# Idempotent retries of writes (idempotency.keys)
+IDEMPOTENCY = {
+    "header": "Idempotency-Key",
+    "replayed_header": "Idempotent-Replayed",
+    "max_key_length": 255,
+    # Retries with the same key replay the stored response during this time
+    "retention_hours": 24,
+    # A request still running after this long is assumed dead, and its key can be used again
+    "lock_timeout_seconds": 60,
+    # Response headers replayed besides those the view adds itself (e.g. the task ETag)
+    "replayed_headers": ("Location",),
+}
+
+# Memory diagnostics of worker processes (diagnostics.memory)
+MEMORY = {
+    # Frames kept per allocation, so allocations in libraries are traced back to the project module calling them
+    "traceback_frames": 25,
+    "max_traceback_frames": 100,
+    # Packages allocations are attributed to, whenever one of their modules is in the traceback
+    "packages": ("tasks", "users", "events", "jobs", "diagnostics", "task_manager"),
+    "report_limit": 20,
+    # RSS is sampled at most this often, and the samples of the last hour are kept
+    "rss_sample_interval_seconds": 10,
+    "rss_samples": 360,
+}
+
+# Django admin of the task tables (tasks.admin)
+ADMIN = {
+    "list_per_page": 100,
+    # Below this estimate, lists are counted exactly
+    "estimated_count_threshold": 100_000,
+}
+
+# Change events streamed to clients (events.sse)
+EVENTS = {
+    "path": "/api/events/",
+    "task_created": "task.created",
+    "task_updated": "task.updated",
+    "task_deleted": "task.deleted",
+    "task_completed": "task.completed",
+    "task_shared": "task.shared",
+    "task_unshared": "task.unshared",
+    "reset": "reset",
+    "heartbeat_seconds": 15,
+    "retry_milliseconds": 3000,
+    "queue_size": 100,
+    "max_replay": 500,
+    "poll_batch_size": 1000,
+    "gap_timeout_seconds": 10,
+    "retention_hours": 24,
 }
 
 # Model verbosity names
 MODEL_VERBOSE_NAMES = {
     "task": "Task",
     "tasks": "Tasks",
+    "job": "Job",
+    "jobs": "Jobs",
+    "archived_task": "Archived task",
+    "archived_tasks": "Archived tasks",
+    "task_membership": "Task membership",
+    "task_memberships": "Task memberships",
+    "task_reminder": "Task reminder",
+    "task_reminders": "Task reminders",
+    "reminder_sweep": "Reminder sweep",
+    "reminder_sweeps": "Reminder sweeps",
+    "task_change": "Task change",
+    "task_changes": "Task changes",
+    "account_deletion": "Account deletion",
+    "account_deletions": "Account deletions",
+    "event": "Event",
+    "events": "Events",
+    "id_sequence": "Id sequence",
+    "id_sequences": "Id sequences",
+    "idempotency_key": "Idempotency key",
+    "idempotency_keys": "Idempotency keys",
 }
 
 # Pagination settings
@@ -0,0 +1,110 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.handlers.wsgi import WSGIHandler
+from django.test import RequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from constants import MEMORY
+from diagnostics.memory import tracker
+
+# Read-only requests replayed by default
+DEFAULT_PATHS: tuple[str, ...] = ("/api/tasks/", "/api/tasks/search/", "/api/auth/users/")
+
+
+def megabytes(size: int | None) -> str:
+    """Formats a number of bytes in megabytes."""
+    return "n/a" if size is None else f"{size / 1024 / 1024:.2f} MB"
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay read-only API requests as a user in this process and report the memory that keeps growing, "
+        "by module and allocation site"
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("username", help="user the requests are authenticated as")
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help=f"path requested with GET, repeatable (default: {', '.join(DEFAULT_PATHS)})",
+        )
+        parser.add_argument("--requests", type=int, default=100, help="requests per path and round")
+        parser.add_argument("--rounds", type=int, default=5, help="rounds of requests, each followed by a snapshot")
+        parser.add_argument("--frames", type=int, default=MEMORY["traceback_frames"], help="frames kept per allocation")
+        parser.add_argument(
+            "--package",
+            action="append",
+            dest="packages",
+            help="package allocations are attributed to, repeatable (default: the project's apps)",
+        )
+        parser.add_argument("--limit", type=int, default=MEMORY["report_limit"], help="modules and sites listed")
+
+    def handle(self, *args, **options) -> None:
+        try:
+            user: User = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"Unknown user: {options['username']}")
+        if tracker.tracing:
+            raise CommandError("Allocations are already traced in this process")
+
+        host: str = next((host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"), "localhost")
+        # The test client is not used, as it leaves signal receivers behind on every request
+        factory: RequestFactory = RequestFactory(
+            HTTP_HOST=host, HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+        paths: list[str] = options["paths"] or list(DEFAULT_PATHS)
+        packages: list[str] = options["packages"] or []
+
+        # A first round fills the caches and imports filled on first use, which are not leaks
+        self.replay(factory, paths, options["requests"])
+        tracker.start(options["frames"])
+        try:
+            tracker.snapshot()
+            for number in range(1, options["rounds"] + 1):
+                self.replay(factory, paths, options["requests"])
+                report: dict = tracker.snapshot("previous", packages, options["limit"])
+                growth: int = sum(module["size_diff_bytes"] for module in report["modules"])
+                self.stdout.write(
+                    f"Round {number}: traced {megabytes(report['traced_bytes'])} ({growth:+,} bytes in the top "
+                    f"{options['limit']} modules), RSS {megabytes(report['rss']['current_bytes'])}"
+                )
+            report = tracker.snapshot("baseline", packages, options["limit"])
+        finally:
+            tracker.stop()
+
+        self.stdout.write(f"\nGrowth by module over {options['rounds']} rounds:")
+        for module in report["modules"]:
+            self.stdout.write(
+                f"  {module['size_diff_bytes']:>+12,} B {module['count_diff']:>+8,} blocks  {module['module']}"
+            )
+        self.stdout.write("\nGrowth by allocation site:")
+        for site in report["sites"]:
+            self.stdout.write(f"  {site['size_diff_bytes']:>+12,} B {site['count_diff']:>+8,} blocks  {site['site']}")
+        rss: dict = report["rss"]
+        self.stdout.write(
+            f"\nRSS: {megabytes(rss.get('first_bytes'))} -> {megabytes(rss['current_bytes'])}, "
+            f"peak {megabytes(rss.get('peak_bytes'))}"
+        )
+
+    def replay(self, factory: RequestFactory, paths: list[str], requests: int) -> None:
+        """
+        Sends GET requests to every path through the WSGI handler, as a worker would.
+
+        Args:
+            factory (RequestFactory): Factory of authenticated requests.
+            paths (list[str]): Requested paths.
+            requests (int): Requests per path.
+
+        Raises:
+            CommandError: If a request fails.
+        """
+        handler: WSGIHandler = WSGIHandler()
+        for path in paths:
+            for _ in range(requests):
+                response = handler(factory.get(path).environ, lambda status, headers: None)
+                response.close()
+                if response.status_code != 200:
+                    raise CommandError(f"GET {path} answered {response.status_code}")
@@ -0,0 +1,308 @@
+"""
+Memory diagnostics of worker processes.
+
+``tracemalloc`` snapshots of a process are diffed to find what keeps
+growing. Allocations are reported by module and by line: an allocation is
+attributed to the innermost frame of its traceback that belongs to one of
+``MEMORY["packages"]``, so the dictionaries built by DRF for
+``tasks.serializers`` are reported under ``tasks.serializers`` rather than
+``rest_framework.fields``. Allocations with no project frame are reported
+under the module that made them.
+
+The resident set size (RSS) of the process is sampled as well, to tell
+memory held by Python objects from memory the allocator does not give back.
+
+Django is not imported here, so the gunicorn configuration can use the
+module in the master before the application is loaded.
+"""
+
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable
+
+from constants import MEMORY
+
+# Allocations of the import machinery and of tracemalloc are not reported, nor those made
+# anywhere below this module, such as the snapshots it keeps
+IGNORED: tuple[tracemalloc.Filter, ...] = (
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__, all_frames=True),
+)
+
+
+def rss_bytes() -> int | None:
+    """
+    Reads the resident set size of the process.
+
+    Returns:
+        int | None: RSS in bytes, None where ``/proc`` is not available.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def module_names() -> dict[str, str]:
+    """
+    Maps the source files of the imported modules to the modules' names.
+
+    Returns:
+        dict[str, str]: Module name by file path, as found in tracebacks.
+    """
+    return {
+        module.__file__: name
+        for name, module in list(sys.modules.items())
+        if isinstance(getattr(module, "__file__", None), str)
+    }
+
+
+@dataclass
+class Allocations:
+    """
+    Memory allocated at a site or by a module, and its change between two snapshots.
+
+    Attributes:
+        size (int): Bytes allocated in the new snapshot.
+        size_diff (int): Change in bytes since the old snapshot.
+        count (int): Number of memory blocks in the new snapshot.
+        count_diff (int): Change in blocks since the old snapshot.
+    """
+
+    size: int = 0
+    size_diff: int = 0
+    count: int = 0
+    count_diff: int = 0
+
+    def add(self, statistic: tracemalloc.StatisticDiff) -> None:
+        """Adds the allocations of a traceback."""
+        self.size += statistic.size
+        self.size_diff += statistic.size_diff
+        self.count += statistic.count
+        self.count_diff += statistic.count_diff
+
+    def to_dict(self) -> dict:
+        """Returns the allocations with explicit units."""
+        return {
+            "size_bytes": self.size,
+            "size_diff_bytes": self.size_diff,
+            "count": self.count,
+            "count_diff": self.count_diff,
+        }
+
+
+def attribute(
+    traceback: tracemalloc.Traceback, modules: dict[str, str], packages: tuple[str, ...]
+) -> tuple[str, tracemalloc.Frame]:
+    """
+    Finds the module and line an allocation is reported under.
+
+    Args:
+        traceback (tracemalloc.Traceback): Traceback of the allocation, oldest frame first.
+        modules (dict[str, str]): Module name by file path.
+        packages (tuple[str, ...]): Packages preferred over the module that made the allocation.
+
+    Returns:
+        tuple[str, tracemalloc.Frame]: Module name and frame.
+    """
+    for frame in reversed(traceback):
+        module: str = modules.get(frame.filename, frame.filename)
+        if module.split(".", 1)[0] in packages:
+            return module, frame
+    innermost: tracemalloc.Frame = traceback[-1]
+    return modules.get(innermost.filename, innermost.filename), innermost
+
+
+def compare(
+    new: tracemalloc.Snapshot, old: tracemalloc.Snapshot, packages: tuple[str, ...], limit: int
+) -> dict[str, list[dict]]:
+    """
+    Diffs two snapshots by module and by allocation site.
+
+    Args:
+        new (tracemalloc.Snapshot): Latest snapshot.
+        old (tracemalloc.Snapshot): Snapshot compared to.
+        packages (tuple[str, ...]): Packages allocations are attributed to.
+        limit (int): Number of modules and sites listed.
+
+    Returns:
+        dict[str, list[dict]]: Modules and sites, those that grew the most first.
+    """
+    modules: dict[str, str] = module_names()
+    by_module: dict[str, Allocations] = {}
+    by_site: dict[tuple[str, str, int], Allocations] = {}
+    for statistic in new.compare_to(old, "traceback"):
+        module, frame = attribute(statistic.traceback, modules, packages)
+        by_module.setdefault(module, Allocations()).add(statistic)
+        by_site.setdefault((module, frame.filename, frame.lineno), Allocations()).add(statistic)
+
+    def largest(allocations: dict) -> list:
+        return sorted(allocations.items(), key=lambda item: (-item[1].size_diff, -item[1].size))[:limit]
+
+    return {
+        "modules": [{"module": module, **allocations.to_dict()} for module, allocations in largest(by_module)],
+        "sites": [
+            {"module": module, "site": f"{filename}:{lineno}", **allocations.to_dict()}
+            for (module, filename, lineno), allocations in largest(by_site)
+        ],
+    }
+
+
+class MemoryTracker:
+    """
+    Snapshots and RSS samples of the current process.
+
+    The first snapshot taken after tracing starts is the baseline that later
+    ones are compared to, along with the snapshot preceding them. Like the
+    slow query buffer, the state lives in process memory, so every worker
+    process keeps its own.
+    """
+
+    def __init__(self, rss_samples: int, rss_interval: float) -> None:
+        self.rss_interval: float = rss_interval
+        self.rss: deque[tuple[float, datetime, int]] = deque(maxlen=rss_samples)
+        self.baseline: tracemalloc.Snapshot | None = None
+        self.previous: tracemalloc.Snapshot | None = None
+        self.snapshots: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        """Whether allocations are being traced."""
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = MEMORY["traceback_frames"]) -> None:
+        """
+        Starts tracing allocations, unless they already are.
+
+        Only allocations made from then on are traced.
+
+        Args:
+            frames (int): Frames kept per allocation.
+        """
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+                self.baseline = self.previous = None
+                self.snapshots = 0
+
+    def stop(self) -> None:
+        """Stops tracing and frees the traces and snapshots."""
+        with self._lock:
+            tracemalloc.stop()
+            self.baseline = self.previous = None
+            self.snapshots = 0
+
+    def snapshot(
+        self, against: str = "baseline", packages: Iterable[str] = (), limit: int = MEMORY["report_limit"]
+    ) -> dict:
+        """
+        Takes a snapshot and compares it to the baseline or to the previous snapshot.
+
+        Args:
+            against (str): ``baseline`` or ``previous``.
+            packages (Iterable[str]): Packages allocations are attributed to, ``MEMORY["packages"]`` if empty.
+            limit (int): Number of modules and sites listed.
+
+        Returns:
+            dict: Traced memory, modules and sites that grew the most, and the RSS trend.
+
+        Raises:
+            RuntimeError: If allocations are not being traced.
+        """
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                raise RuntimeError("Allocations are not being traced")
+            # Unreachable cycles would otherwise show up as growth until the collector runs
+            gc.collect()
+            snapshot: tracemalloc.Snapshot = tracemalloc.take_snapshot().filter_traces(IGNORED)
+            if self.baseline is None:
+                self.baseline = self.previous = snapshot
+            old: tracemalloc.Snapshot = self.baseline if against == "baseline" else self.previous
+            self.previous = snapshot
+            self.snapshots += 1
+            current, peak = tracemalloc.get_traced_memory()
+            self.sample_rss(force=True)
+            return {
+                "snapshot": self.snapshots,
+                "compared_to": against,
+                "traced_bytes": current,
+                "traced_peak_bytes": peak,
+                **compare(snapshot, old, tuple(packages) or MEMORY["packages"], limit),
+                "rss": self.rss_trend(),
+            }
+
+    def sample_rss(self, force: bool = False) -> int | None:
+        """
+        Samples the RSS unless the last sample is more recent than the sampling interval.
+
+        Cheap enough to be called after every request.
+
+        Args:
+            force (bool): Sample regardless of the interval.
+
+        Returns:
+            int | None: The sampled RSS in bytes, None if no sample was taken.
+        """
+        now: float = time.monotonic()
+        if not force and self.rss and now - self.rss[-1][0] < self.rss_interval:
+            return None
+        rss: int | None = rss_bytes()
+        if rss is not None:
+            self.rss.append((now, datetime.now(timezone.utc), rss))
+        return rss
+
+    def rss_trend(self) -> dict:
+        """
+        Summarizes the RSS samples.
+
+        Returns:
+            dict: Current, first and peak RSS, growth per hour and the samples, oldest first.
+        """
+        samples: list[tuple[float, datetime, int]] = list(self.rss)
+        if not samples:
+            return {"current_bytes": rss_bytes(), "samples": []}
+        (first_at, _, first), (last_at, _, last) = samples[0], samples[-1]
+        elapsed: float = last_at - first_at
+        return {
+            "current_bytes": last,
+            "first_bytes": first,
+            "peak_bytes": max(rss for _, _, rss in samples),
+            "growth_bytes": last - first,
+            "growth_per_hour_bytes": round((last - first) / elapsed * 3600) if elapsed else 0,
+            "samples": [{"at": at.isoformat(), "rss_bytes": rss} for _, at, rss in samples],
+        }
+
+    def status(self) -> dict:
+        """
+        Reports whether allocations are traced, the traced memory and the RSS trend.
+
+        Returns:
+            dict: Tracing state and memory figures of the process.
+        """
+        self.sample_rss()
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "pid": os.getpid(),
+            "tracing": self.tracing,
+            "traceback_frames": tracemalloc.get_traceback_limit() if self.tracing else None,
+            "snapshots": self.snapshots,
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "rss": self.rss_trend(),
+        }
+
+
+# Process-wide tracker, also fed with RSS samples by the gunicorn workers (gunicorn.conf.py)
+tracker: MemoryTracker = MemoryTracker(MEMORY["rss_samples"], MEMORY["rss_sample_interval_seconds"])
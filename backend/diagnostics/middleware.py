@@ -0,0 +1,136 @@
+import logging
+import time
+from contextlib import ExitStack
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+from constants import PROFILING
+from diagnostics.profiling import Profile, RequestProfiler, read_token, save_profile
+from diagnostics.recorder import recorder
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+class SlowQueryMiddleware:
+    """
+    Records the SQL statements of a request that exceed ``SLOW_QUERY_THRESHOLD_MS``.
+
+    Every database connection gets an execution wrapper for the duration of
+    the request, so the statement, its duration and the view that ran it are
+    captured into the process-wide ring buffer and logged as warnings.
+    A negative threshold disables the middleware.
+    """
+
+    def __init__(self, get_response) -> None:
+        if settings.SLOW_QUERY_THRESHOLD_MS < 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold: float = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(partial(self.time_query, request, alias)))
+            return self.get_response(request)
+
+    def time_query(self, request: HttpRequest, alias: str, execute, sql, params, many, context):
+        """
+        Runs a statement and records it if it was slow.
+
+        Args:
+            request (HttpRequest): Request running the statement.
+            alias (str): Alias of the database connection.
+            execute: Next callable of the execution wrapper chain.
+            sql: Statement.
+            params: Statement parameters.
+            many (bool): Whether this is an ``executemany()`` call.
+            context (dict): Execution context passed by Django.
+
+        Returns:
+            Any: Result of the statement.
+        """
+        started: float = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration: float = time.perf_counter() - started
+            if duration >= self.threshold:
+                match = request.resolver_match
+                entry = recorder.record(
+                    sql=sql,
+                    duration_ms=duration * 1000,
+                    view=match.view_name if match else None,
+                    method=request.method,
+                    path=request.path,
+                    database=alias,
+                )
+                logger.warning(f"Slow query ({entry.duration_ms}ms) in {entry.view or entry.path}: {entry.sql[:200]}")
+
+
+class ProfilingMiddleware:
+    """
+    Profiles the requests sent with a profiling token of a staff user.
+
+    The token is read from the ``X-Profile`` header or the ``profile`` query
+    parameter (see ``diagnostics.profiling``). The profile id is returned in
+    the ``X-Profile-Id`` response header. Other requests go straight through.
+    A ``PROFILING_STORE_SIZE`` of 0 disables the middleware.
+    """
+
+    def __init__(self, get_response) -> None:
+        if settings.PROFILING_STORE_SIZE <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        token: str | None = request.META.get(PROFILING["header"])
+        if token is None and PROFILING["query_param"] + "=" in request.META.get("QUERY_STRING", ""):
+            token = request.GET.get(PROFILING["query_param"])
+        if token is None:
+            return self.get_response(request)
+
+        user_id: int | None = read_token(token)
+        if user_id is None or not User.objects.filter(pk=user_id, is_staff=True, is_active=True).exists():
+            logger.warning(f"Invalid profiling token for {request.method} {request.path}")
+            return self.get_response(request)
+        return self.profile(request, user_id)
+
+    def profile(self, request: HttpRequest, user_id: int) -> HttpResponse:
+        """
+        Serves a request under the profiler and stores its profile.
+
+        Args:
+            request (HttpRequest): Request to profile.
+            user_id (int): Id of the staff user the token was issued to.
+
+        Returns:
+            HttpResponse: The response, with the id of the profile.
+        """
+        profiler: RequestProfiler = RequestProfiler()
+        response: HttpResponse | None = None
+        try:
+            with ExitStack() as stack:
+                stack.enter_context(profiler)
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(partial(profiler.time_query, alias)))
+                response = self.get_response(request)
+        finally:
+            # Kept even if the request raised, as the profile shows where
+            match = request.resolver_match
+            profile: Profile = profiler.build(
+                method=request.method,
+                path=request.path,
+                view=match.view_name if match else None,
+                status=response.status_code if response is not None else None,
+                user_id=user_id,
+            )
+            save_profile(profile)
+            logger.info(f"Profiled {profile.method} {profile.path} in {profile.duration_ms}ms as {profile.id}")
+        response["X-Profile-Id"] = profile.id
+        return response
@@ -0,0 +1,299 @@
+"""
+On-demand profiling of single requests.
+
+A staff user asks for a signed profiling token, then sends it with the
+requests to profile, in the ``X-Profile`` header or the ``profile`` query
+parameter. ``diagnostics.middleware.ProfilingMiddleware`` runs such a
+request under cProfile and a stack sampler, records the timeline of its SQL
+statements, and keeps the result in the cache, so that every worker sharing
+it can serve the download. Only the last ``PROFILING_STORE_SIZE`` profiles
+are kept. Requests without a token only pay for a header lookup.
+"""
+
+import cProfile
+import marshal
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from types import FrameType
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.utils import timezone
+
+from constants import PROFILING
+from diagnostics.recorder import MAX_SQL_LENGTH
+
+# Cache keys of the profile ids, oldest first, and of each profile
+INDEX_KEY: str = "diagnostics:profiles"
+PROFILE_KEY: str = "diagnostics:profile:{profile_id}"
+
+
+def issue_token(user_id: int) -> str:
+    """
+    Signs a profiling token for a staff user.
+
+    Args:
+        user_id (int): Id of the staff user.
+
+    Returns:
+        str: Token valid for ``PROFILING_TOKEN_MAX_AGE`` seconds.
+    """
+    return signing.TimestampSigner(salt=PROFILING["salt"]).sign(str(user_id))
+
+
+def read_token(token: str) -> int | None:
+    """
+    Checks a profiling token.
+
+    Args:
+        token (str): Token sent with a request.
+
+    Returns:
+        int | None: Id of the user the token was issued to, None if it is invalid or expired.
+    """
+    try:
+        return int(
+            signing.TimestampSigner(salt=PROFILING["salt"]).unsign(token, max_age=settings.PROFILING_TOKEN_MAX_AGE)
+        )
+    except (signing.BadSignature, ValueError):
+        return None
+
+
+def frame_name(frame: FrameType) -> str:
+    """Names a stack frame after its module and function, e.g. ``tasks.views:TaskViewSet.search``."""
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+
+
+class StackSampler(threading.Thread):
+    """
+    Samples the stack of a thread at a fixed interval.
+
+    cProfile records calls but not the stacks they ran in; the samples give
+    the collapsed stacks flame graphs are drawn from.
+    """
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        super().__init__(daemon=True, name="profile-sampler")
+        self.thread_id: int = thread_id
+        self.interval: float = interval
+        self.samples: Counter[str] = Counter()
+        self.stopped: threading.Event = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            frame: FrameType | None = sys._current_frames().get(self.thread_id)
+            stack: list[str] = []
+            while frame is not None:
+                stack.append(frame_name(frame))
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        """Stops sampling and waits for the last sample."""
+        self.stopped.set()
+        self.join()
+
+
+@dataclass
+class Profile:
+    """
+    Profile of a single request.
+
+    Attributes:
+        id (str): Identifier of the profile.
+        method (str): HTTP method of the request.
+        path (str): Path of the request.
+        view (str | None): Name of the view that served it.
+        status (int | None): Status code of the response, None if the view raised.
+        duration_ms (float): Wall time of the request in milliseconds.
+        user_id (int): Id of the staff user the token was issued to.
+        recorded_at (datetime): When the request finished.
+        queries (list[dict]): SQL statements in execution order, with their start offset and duration.
+        stats (bytes): cProfile statistics in the marshal format of ``pstats``.
+        collapsed (str): Sampled stacks in the collapsed format of flame graph tools.
+    """
+
+    id: str
+    method: str
+    path: str
+    view: str | None
+    status: int | None
+    duration_ms: float
+    user_id: int
+    recorded_at: datetime
+    queries: list[dict] = field(default_factory=list)
+    stats: bytes = b""
+    collapsed: str = ""
+
+    def summary(self) -> dict:
+        """
+        Returns the profile without its statistics, as a JSON-serializable dictionary.
+
+        Returns:
+            dict: Request fields, query count and total query time.
+        """
+        data: dict = asdict(self)
+        for name in ("queries", "stats", "collapsed"):
+            del data[name]
+        return {
+            **data,
+            "recorded_at": self.recorded_at.isoformat(),
+            "query_count": len(self.queries),
+            "query_ms": round(sum(query["duration_ms"] for query in self.queries), 3),
+        }
+
+    def top_functions(self, limit: int) -> list[dict]:
+        """
+        Lists the functions that took the most time, callees included.
+
+        Args:
+            limit (int): Number of functions.
+
+        Returns:
+            list[dict]: Function, call count, own and cumulative time in milliseconds.
+        """
+        stats: dict = marshal.loads(self.stats)
+        rows: list[dict] = [
+            {
+                "function": pstats.func_std_string(function),
+                "calls": calls,
+                "own_ms": round(own * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            }
+            for function, (_, calls, own, cumulative, _) in stats.items()
+        ]
+        return sorted(rows, key=lambda row: -row["cumulative_ms"])[:limit]
+
+
+class RequestProfiler:
+    """
+    Collects the profile of one request, on the thread serving it.
+    """
+
+    def __init__(self) -> None:
+        self.profiler: cProfile.Profile = cProfile.Profile()
+        self.sampler: StackSampler = StackSampler(threading.get_ident(), PROFILING["sample_interval_seconds"])
+        self.queries: list[dict] = []
+        self.started: float = 0.0
+        self.duration: float = 0.0
+
+    def __enter__(self) -> "RequestProfiler":
+        self.started = time.perf_counter()
+        self.sampler.start()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.profiler.disable()
+        self.sampler.stop()
+        self.duration = time.perf_counter() - self.started
+
+    def time_query(self, alias: str, execute, sql, params, many, context):
+        """
+        Database execution wrapper adding each statement to the timeline.
+
+        Args:
+            alias (str): Alias of the database connection.
+            execute: Next callable of the execution wrapper chain.
+            sql: Statement.
+            params: Statement parameters, not kept.
+            many (bool): Whether this is an ``executemany()`` call.
+            context (dict): Execution context passed by Django.
+
+        Returns:
+            Any: Result of the statement.
+        """
+        started: float = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                {
+                    "sql": sql[:MAX_SQL_LENGTH],
+                    "database": alias,
+                    "start_ms": round((started - self.started) * 1000, 3),
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                }
+            )
+
+    def build(self, method: str, path: str, view: str | None, status: int | None, user_id: int) -> Profile:
+        """
+        Assembles the collected data once the request finished.
+
+        Returns:
+            Profile: The profile of the request.
+        """
+        self.profiler.create_stats()
+        return Profile(
+            id=uuid.uuid4().hex,
+            method=method,
+            path=path,
+            view=view,
+            status=status,
+            duration_ms=round(self.duration * 1000, 3),
+            user_id=user_id,
+            recorded_at=timezone.now(),
+            queries=self.queries,
+            stats=marshal.dumps(self.profiler.stats),
+            collapsed="".join(f"{stack} {count}\n" for stack, count in self.sampler.samples.most_common()),
+        )
+
+
+def save_profile(profile: Profile) -> None:
+    """
+    Stores a profile, evicting the oldest ones beyond ``PROFILING_STORE_SIZE``.
+
+    The index is updated without a lock: concurrent saves from several
+    workers may drop one of the ids, which is acceptable for diagnostics.
+
+    Args:
+        profile (Profile): Profile to store.
+    """
+    ids: list[str] = [*cache.get(INDEX_KEY, []), profile.id]
+    evicted: list[str] = ids[: -settings.PROFILING_STORE_SIZE]
+    cache.set(PROFILE_KEY.format(profile_id=profile.id), profile, timeout=PROFILING["retention_seconds"])
+    cache.set(INDEX_KEY, ids[-settings.PROFILING_STORE_SIZE :], timeout=PROFILING["retention_seconds"])
+    cache.delete_many([PROFILE_KEY.format(profile_id=profile_id) for profile_id in evicted])
+
+
+def get_profile(profile_id: str) -> Profile | None:
+    """
+    Loads a stored profile.
+
+    Args:
+        profile_id (str): Identifier of the profile.
+
+    Returns:
+        Profile | None: The profile, None if it was evicted or never existed.
+    """
+    return cache.get(PROFILE_KEY.format(profile_id=profile_id))
+
+
+def list_profiles() -> list[Profile]:
+    """
+    Loads the stored profiles.
+
+    Returns:
+        list[Profile]: Profiles, newest first.
+    """
+    ids: list[str] = cache.get(INDEX_KEY, [])
+    found: dict = cache.get_many([PROFILE_KEY.format(profile_id=profile_id) for profile_id in ids])
+    return [
+        found[PROFILE_KEY.format(profile_id=profile_id)]
+        for profile_id in reversed(ids)
+        if PROFILE_KEY.format(profile_id=profile_id) in found
+    ]
+
+
+def clear_profiles() -> None:
+    """Deletes every stored profile."""
+    ids: list[str] = cache.get(INDEX_KEY, [])
+    cache.delete_many([INDEX_KEY, *(PROFILE_KEY.format(profile_id=profile_id) for profile_id in ids)])
@@ -0,0 +1,105 @@
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from threading import Lock
+
+from django.conf import settings
+from django.utils import timezone
+
+# Longer statements are truncated so that a single query cannot bloat the buffer
+MAX_SQL_LENGTH: int = 4000
+
+
+@dataclass(frozen=True)
+class SlowQuery:
+    """
+    A statement that ran longer than the slow query threshold.
+
+    Query parameters are deliberately not kept, as they may contain personal data.
+
+    Attributes:
+        sql (str): Statement with its placeholders.
+        duration_ms (float): Execution time in milliseconds.
+        view (str | None): Name of the view that ran the statement, None before URL resolution.
+        method (str): HTTP method of the request.
+        path (str): Path of the request.
+        database (str): Alias of the database connection.
+        recorded_at (datetime): When the statement finished.
+    """
+
+    sql: str
+    duration_ms: float
+    view: str | None
+    method: str
+    path: str
+    database: str
+    recorded_at: datetime
+
+    def to_dict(self) -> dict:
+        """
+        Returns the entry as a JSON-serializable dictionary.
+
+        Returns:
+            dict: Entry fields, with the timestamp in ISO 8601 format.
+        """
+        return {**asdict(self), "recorded_at": self.recorded_at.isoformat()}
+
+
+class SlowQueryRecorder:
+    """
+    Thread-safe ring buffer of the most recent slow queries.
+
+    The buffer lives in process memory, so every worker process keeps its own.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity: int = capacity
+        self._entries: deque[SlowQuery] = deque(maxlen=capacity)
+        self._lock: Lock = Lock()
+
+    def record(
+        self,
+        sql: str,
+        duration_ms: float,
+        view: str | None,
+        method: str,
+        path: str,
+        database: str,
+    ) -> SlowQuery:
+        """
+        Adds a slow query, evicting the oldest one when the buffer is full.
+
+        Returns:
+            SlowQuery: The recorded entry.
+        """
+        entry: SlowQuery = SlowQuery(
+            sql=sql[:MAX_SQL_LENGTH],
+            duration_ms=round(duration_ms, 3),
+            view=view,
+            method=method,
+            path=path,
+            database=database,
+            recorded_at=timezone.now(),
+        )
+        with self._lock:
+            self._entries.append(entry)
+        return entry
+
+    def entries(self) -> list[SlowQuery]:
+        """
+        Returns the recorded queries, newest first.
+
+        Returns:
+            list[SlowQuery]: Snapshot of the buffer.
+        """
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        """Empties the buffer."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Process-wide recorder fed by diagnostics.middleware.SlowQueryMiddleware
+recorder: SlowQueryRecorder = SlowQueryRecorder(settings.SLOW_QUERY_BUFFER_SIZE)
@@ -0,0 +1,129 @@
+"""
+OpenAPI documentation of the diagnostics endpoints, loaded with the schema (see ``task_manager.schema``).
+"""
+
+from drf_spectacular.extensions import OpenApiViewExtension
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+
+from constants import QUERY_PARAMS
+
+
+class SlowQueryViewSchema(OpenApiViewExtension):
+    target_class = "diagnostics.views.SlowQueryView"
+
+    def view_replacement(self) -> type:
+        @extend_schema_view(
+            get=extend_schema(description="List the most recent slow queries of this worker process, newest first"),
+            delete=extend_schema(description="Clear the slow queries recorded by this worker process"),
+        )
+        class SlowQueryView(self.target_class):
+            pass
+
+        return SlowQueryView
+
+
+class ProfileTokenViewSchema(OpenApiViewExtension):
+    target_class = "diagnostics.views.ProfileTokenView"
+
+    def view_replacement(self) -> type:
+        @extend_schema_view(
+            post=extend_schema(request=None, description="Issue a token profiling the requests sent with it"),
+        )
+        class ProfileTokenView(self.target_class):
+            pass
+
+        return ProfileTokenView
+
+
+class ProfileListViewSchema(OpenApiViewExtension):
+    target_class = "diagnostics.views.ProfileListView"
+
+    def view_replacement(self) -> type:
+        @extend_schema_view(
+            get=extend_schema(description="List the stored request profiles, newest first"),
+            delete=extend_schema(description="Delete the stored request profiles"),
+        )
+        class ProfileListView(self.target_class):
+            pass
+
+        return ProfileListView
+
+
+class ProfileDetailViewSchema(OpenApiViewExtension):
+    target_class = "diagnostics.views.ProfileDetailView"
+
+    def view_replacement(self) -> type:
+        @extend_schema_view(
+            get=extend_schema(
+                responses={200: OpenApiTypes.OBJECT},
+                description="Show a request profile, or download it as pstats or collapsed stacks",
+            ),
+        )
+        class ProfileDetailView(self.target_class):
+            pass
+
+        return ProfileDetailView
+
+
+class MemoryViewSchema(OpenApiViewExtension):
+    target_class = "diagnostics.views.MemoryView"
+
+    def view_replacement(self) -> type:
+        @extend_schema_view(
+            get=extend_schema(
+                responses={200: OpenApiTypes.OBJECT},
+                description="Show whether this worker process traces allocations, its traced memory and RSS trend",
+            ),
+            post=extend_schema(
+                request=OpenApiTypes.OBJECT,
+                responses={200: OpenApiTypes.OBJECT},
+                description="Start tracing the allocations of this worker process",
+            ),
+            delete=extend_schema(
+                description="Stop tracing the allocations of this worker process and drop its snapshots"
+            ),
+        )
+        class MemoryView(self.target_class):
+            pass
+
+        return MemoryView
+
+
+class MemorySnapshotViewSchema(OpenApiViewExtension):
+    target_class = "diagnostics.views.MemorySnapshotView"
+
+    def view_replacement(self) -> type:
+        @extend_schema_view(
+            post=extend_schema(
+                request=None,
+                parameters=[
+                    OpenApiParameter(
+                        name=QUERY_PARAMS["compare"],
+                        description="Snapshot compared to: the first one, or the one before",
+                        required=False,
+                        type=OpenApiTypes.STR,
+                        enum=[*self.target_class.COMPARISONS],
+                    ),
+                    OpenApiParameter(
+                        name=QUERY_PARAMS["package"],
+                        description="Package allocations are attributed to, repeatable (default: the project's apps)",
+                        required=False,
+                        type=OpenApiTypes.STR,
+                        many=True,
+                    ),
+                    OpenApiParameter(
+                        name=QUERY_PARAMS["limit"],
+                        description="Number of modules and allocation sites listed",
+                        required=False,
+                        type=OpenApiTypes.INT,
+                    ),
+                ],
+                responses={200: OpenApiTypes.OBJECT},
+                description="Take a memory snapshot and list the modules and allocation sites that grew the most",
+            ),
+        )
+        class MemorySnapshotView(self.target_class):
+            pass
+
+        return MemorySnapshotView
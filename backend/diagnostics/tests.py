@@ -0,0 +1,229 @@
+import pstats
+import pytest
+from datetime import date, timedelta
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from typing import Callable
+from diagnostics.memory import tracker
+from diagnostics.profiling import issue_token
+from diagnostics.recorder import SlowQueryRecorder, recorder
+
+
+@pytest.mark.django_db
+class TestSlowQueryRecorder:
+    @pytest.fixture(autouse=True)
+    def setup(self, user_factory: Callable, task_factory: Callable, settings) -> None:
+        """Record every statement and start from an empty buffer."""
+        settings.SLOW_QUERY_THRESHOLD_MS = 0
+        recorder.clear()
+        self.user: User = user_factory(username="owner")
+        self.admin: User = user_factory(username="admin", is_staff=True)
+        task_factory(user=self.user, created_by=self.user)
+        self.slow_queries_url: str = reverse("slow-queries")
+
+    def client_for(self, user: User) -> APIClient:
+        """Returns a client authenticated as the given user."""
+        client: APIClient = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def test_queries_are_recorded_with_their_view(self) -> None:
+        """Test that statements above the threshold are recorded with the calling view."""
+        self.client_for(self.user).get(reverse("task-list"))
+
+        entries = recorder.entries()
+        assert len(entries) == 1
+        assert entries[0].view == "task-list"
+        assert entries[0].method == "GET"
+        assert entries[0].path == reverse("task-list")
+        assert entries[0].sql.startswith("SELECT")
+        assert entries[0].duration_ms >= 0
+
+    def test_admin_can_list_and_clear_slow_queries(self) -> None:
+        """Test that admins can read and clear the buffer."""
+        self.client_for(self.user).get(reverse("task-list"))
+        client: APIClient = self.client_for(self.admin)
+
+        response: Response = client.get(self.slow_queries_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["threshold_ms"] == 0
+        assert response.data["queries"][-1]["view"] == "task-list"
+
+        response = client.delete(self.slow_queries_url)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert recorder.entries() == []
+
+    def test_non_admin_cannot_read_slow_queries(self) -> None:
+        """Test that regular users are denied access to the buffer."""
+        response: Response = self.client_for(self.user).get(self.slow_queries_url)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_negative_threshold_disables_recording(self, settings) -> None:
+        """Test that a negative threshold turns the recorder off."""
+        settings.SLOW_QUERY_THRESHOLD_MS = -1
+
+        self.client_for(self.user).get(reverse("task-list"))
+
+        assert recorder.entries() == []
+
+    def test_buffer_keeps_only_the_latest_entries(self) -> None:
+        """Test that the ring buffer evicts the oldest entries when full."""
+        buffer: SlowQueryRecorder = SlowQueryRecorder(capacity=2)
+        for index in range(3):
+            buffer.record(f"SELECT {index}", 1.0, None, "GET", "/", "default")
+
+        assert [entry.sql for entry in buffer.entries()] == ["SELECT 2", "SELECT 1"]
+
+
+@pytest.mark.django_db
+class TestRequestProfiling:
+    @pytest.fixture(autouse=True)
+    def setup(self, user_factory: Callable, task_factory: Callable) -> None:
+        """Creates a staff user with a profiling token and a user with a task."""
+        self.admin: User = user_factory(username="admin", is_staff=True)
+        self.user: User = user_factory(username="owner")
+        task_factory(user=self.user, created_by=self.user, start_date=date.today())
+        self.admin_client: APIClient = APIClient()
+        self.admin_client.force_authenticate(user=self.admin)
+        self.token: str = self.admin_client.post(reverse("profile-token")).data["token"]
+        self.search_url: str = reverse("task-search")
+
+    def search(self, **extra) -> Response:
+        """Searches the user's tasks, with the given headers or query parameters."""
+        client: APIClient = APIClient()
+        client.force_authenticate(user=self.user)
+        query: dict = {"start": date.today().isoformat(), **extra.pop("query", {})}
+        return client.get(self.search_url, query, **extra)
+
+    def test_profiles_a_request_with_its_sql_timeline(self, tmp_path) -> None:
+        """Test that a request sent with a token is profiled and its profile downloadable."""
+        response: Response = self.search(HTTP_X_PROFILE=self.token)
+
+        assert response.status_code == status.HTTP_200_OK
+        profile_id: str = response["X-Profile-Id"]
+        listed: dict = self.admin_client.get(reverse("profiles")).data
+        assert [profile["id"] for profile in listed["profiles"]] == [profile_id]
+        detail: dict = self.admin_client.get(reverse("profile-detail", kwargs={"profile_id": profile_id})).data
+        assert detail["view"] == "task-search"
+        assert detail["status"] == status.HTTP_200_OK
+        assert detail["user_id"] == self.admin.id
+        assert detail["query_count"] == len(detail["queries"]) > 0
+        assert all(query["start_ms"] >= 0 and query["duration_ms"] >= 0 for query in detail["queries"])
+        assert any("search" in function["function"] for function in detail["functions"])
+
+        download = self.admin_client.get(
+            reverse("profile-download", kwargs={"profile_id": profile_id, "download": "pstats"})
+        )
+        (tmp_path / "search.prof").write_bytes(download.content)
+        stats: pstats.Stats = pstats.Stats(str(tmp_path / "search.prof"))
+        assert any(name == "search" for _, _, name in stats.stats)
+        collapsed = self.admin_client.get(
+            reverse("profile-download", kwargs={"profile_id": profile_id, "download": "collapsed"})
+        )
+        assert collapsed["Content-Type"].startswith("text/plain")
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed.content.decode().splitlines())
+
+    def test_only_valid_tokens_of_staff_users_trigger_profiling(self) -> None:
+        """Test that missing, tampered and non-staff tokens leave requests unprofiled."""
+        assert "X-Profile-Id" not in self.search()
+        assert "X-Profile-Id" not in self.search(HTTP_X_PROFILE=self.token + "x")
+        assert "X-Profile-Id" not in self.search(HTTP_X_PROFILE=issue_token(self.user.id))
+        assert "X-Profile-Id" in self.search(query={"profile": self.token})
+        assert self.admin_client.get(reverse("profiles")).data["count"] == 1
+
+    def test_store_keeps_only_the_latest_profiles(self, settings) -> None:
+        """Test that the oldest profiles are evicted beyond the store size."""
+        settings.PROFILING_STORE_SIZE = 2
+        ids: list[str] = [self.search(HTTP_X_PROFILE=self.token)["X-Profile-Id"] for _ in range(3)]
+
+        listed: dict = self.admin_client.get(reverse("profiles")).data
+        assert [profile["id"] for profile in listed["profiles"]] == [ids[2], ids[1]]
+        response: Response = self.admin_client.get(reverse("profile-detail", kwargs={"profile_id": ids[0]}))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_non_admin_cannot_use_profiling(self) -> None:
+        """Test that tokens and profiles are restricted to admin users."""
+        client: APIClient = APIClient()
+        client.force_authenticate(user=self.user)
+
+        assert client.post(reverse("profile-token")).status_code == status.HTTP_403_FORBIDDEN
+        assert client.get(reverse("profiles")).status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestMemoryDiagnostics:
+    @pytest.fixture(autouse=True)
+    def setup(self, user_factory: Callable, task_factory: Callable) -> None:
+        """Creates a staff user and a user with a task, and stops tracing after each test."""
+        self.admin: User = user_factory(username="admin", is_staff=True)
+        self.user: User = user_factory(username="owner")
+        task_factory(user=self.user, created_by=self.user, start_date=date.today())
+        self.admin_client: APIClient = APIClient()
+        self.admin_client.force_authenticate(user=self.admin)
+        yield
+        tracker.stop()
+
+    def test_snapshots_report_growth_by_project_module(self) -> None:
+        """Test that memory retained below a view is reported under the project module holding it."""
+        response: Response = self.admin_client.post(reverse("memory"), {"frames": 10}, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["tracing"] is True
+        assert response.data["traceback_frames"] == 10
+        self.admin_client.post(reverse("memory-snapshots"))
+
+        # Every calendar range is cached, so the responses stay in memory
+        client: APIClient = APIClient()
+        client.force_authenticate(user=self.user)
+        for offset in range(5):
+            start: date = date.today() + timedelta(days=offset)
+            client.get(reverse("task-calendar"), {"from": start.isoformat(), "to": start.isoformat()})
+        response = self.admin_client.post(reverse("memory-snapshots") + "?compare=previous&limit=50")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["snapshot"] == 2
+        assert response.data["compared_to"] == "previous"
+        grown: list[str] = [module["module"] for module in response.data["modules"] if module["size_diff_bytes"] > 0]
+        assert any(module.startswith("tasks.") for module in grown)
+        assert "diagnostics.memory" not in grown
+        assert response.data["rss"]["current_bytes"] > 0
+
+    def test_snapshots_need_tracing_and_valid_parameters(self) -> None:
+        """Test that snapshots are refused while not tracing and with invalid parameters."""
+        url: str = reverse("memory-snapshots")
+
+        assert self.admin_client.post(url).status_code == status.HTTP_409_CONFLICT
+        assert self.admin_client.post(url + "?compare=yesterday").status_code == status.HTTP_400_BAD_REQUEST
+        assert self.admin_client.post(url + "?limit=0").status_code == status.HTTP_400_BAD_REQUEST
+        assert self.admin_client.post(reverse("memory"), {"frames": 0}, format="json").status_code == 400
+        assert self.admin_client.delete(reverse("memory")).status_code == status.HTTP_204_NO_CONTENT
+        assert self.admin_client.get(reverse("memory")).data["tracing"] is False
+
+    def test_non_admin_cannot_trace_memory(self) -> None:
+        """Test that memory diagnostics are restricted to admin users."""
+        client: APIClient = APIClient()
+        client.force_authenticate(user=self.user)
+
+        assert client.get(reverse("memory")).status_code == status.HTTP_403_FORBIDDEN
+        assert client.post(reverse("memory")).status_code == status.HTTP_403_FORBIDDEN
+        assert client.post(reverse("memory-snapshots")).status_code == status.HTTP_403_FORBIDDEN
+        assert tracker.tracing is False
+
+    def test_trace_memory_command_replays_requests(self) -> None:
+        """Test that the command replays requests, reports growth and stops tracing."""
+        out: StringIO = StringIO()
+        call_command(
+            "trace_memory", "owner", "--path", reverse("task-list"), "--requests", "2", "--rounds", "2", stdout=out
+        )
+
+        output: str = out.getvalue()
+        assert "Round 2:" in output
+        assert "Growth by module over 2 rounds:" in output
+        assert tracker.tracing is False
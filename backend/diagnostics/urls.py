@@ -0,0 +1,23 @@
+from django.urls import path, re_path
+from .views import (
+    MemorySnapshotView,
+    MemoryView,
+    ProfileDetailView,
+    ProfileListView,
+    ProfileTokenView,
+    SlowQueryView,
+)
+
+urlpatterns = [
+    path("slow-queries/", SlowQueryView.as_view(), name="slow-queries"),
+    path("memory/", MemoryView.as_view(), name="memory"),
+    path("memory/snapshots/", MemorySnapshotView.as_view(), name="memory-snapshots"),
+    path("profiles/", ProfileListView.as_view(), name="profiles"),
+    path("profiles/token/", ProfileTokenView.as_view(), name="profile-token"),
+    re_path(r"^profiles/(?P<profile_id>[0-9a-f]{32})/$", ProfileDetailView.as_view(), name="profile-detail"),
+    re_path(
+        r"^profiles/(?P<profile_id>[0-9a-f]{32})/(?P<download>pstats|collapsed)/$",
+        ProfileDetailView.as_view(),
+        name="profile-download",
+    ),
+]
@@ -0,0 +1,238 @@
+import logging
+import os
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework import permissions, status
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from constants import ERROR_MESSAGES, MEMORY, PROFILING, QUERY_PARAMS
+from diagnostics.memory import tracker
+from diagnostics.profiling import Profile, clear_profiles, get_profile, issue_token, list_profiles
+from diagnostics.recorder import recorder
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+class SlowQueryView(APIView):
+    """
+    API endpoint exposing the slow queries recorded by this worker process.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request: Request) -> Response:
+        """
+        Returns the recorded slow queries.
+
+        Returns:
+            Response: Threshold, buffer capacity, process id and queries.
+        """
+        entries = recorder.entries()
+        return Response(
+            {
+                "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+                "capacity": recorder.capacity,
+                "pid": os.getpid(),
+                "count": len(entries),
+                "queries": [entry.to_dict() for entry in entries],
+            }
+        )
+
+    def delete(self, request: Request) -> Response:
+        """
+        Empties the slow query buffer.
+
+        Returns:
+            Response: Empty response.
+        """
+        recorder.clear()
+        logger.info(f"Slow query buffer cleared by {request.user}")
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfileTokenView(APIView):
+    """
+    API endpoint issuing profiling tokens to staff users.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request: Request) -> Response:
+        """
+        Signs a profiling token for the authenticated staff user.
+
+        Returns:
+            Response: The token, how to send it and its lifetime in seconds.
+        """
+        logger.info(f"Profiling token issued to {request.user}")
+        return Response(
+            {
+                "token": issue_token(request.user.pk),
+                "header": "X-Profile",
+                "query_param": PROFILING["query_param"],
+                "expires_in": settings.PROFILING_TOKEN_MAX_AGE,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class ProfileListView(APIView):
+    """
+    API endpoint listing the stored request profiles.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request: Request) -> Response:
+        """
+        Returns the summaries of the stored profiles.
+
+        Returns:
+            Response: Store capacity and profiles.
+        """
+        profiles: list[Profile] = list_profiles()
+        return Response(
+            {
+                "capacity": settings.PROFILING_STORE_SIZE,
+                "count": len(profiles),
+                "profiles": [profile.summary() for profile in profiles],
+            }
+        )
+
+    def delete(self, request: Request) -> Response:
+        """
+        Empties the profile store.
+
+        Returns:
+            Response: Empty response.
+        """
+        clear_profiles()
+        logger.info(f"Request profiles cleared by {request.user}")
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfileDetailView(APIView):
+    """
+    API endpoint exposing a request profile and downloading its statistics.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    # Downloadable formats: content type and file extension
+    FORMATS: dict[str, tuple[str, str]] = {
+        "pstats": ("application/octet-stream", "prof"),
+        "collapsed": ("text/plain; charset=utf-8", "collapsed.txt"),
+    }
+
+    def get(self, request: Request, profile_id: str, download: str | None = None) -> Response | HttpResponse:
+        """
+        Returns a profile with its SQL timeline and slowest functions, or one of its files.
+
+        Args:
+            profile_id (str): Identifier of the profile.
+            download (str | None): ``pstats`` for cProfile statistics readable by ``pstats`` and
+                snakeviz, ``collapsed`` for sampled stacks readable by flamegraph.pl and speedscope.
+
+        Returns:
+            Response | HttpResponse: The profile, or the file as an attachment.
+        """
+        profile: Profile | None = get_profile(profile_id)
+        if profile is None:
+            raise NotFound()
+        if download is None:
+            return Response(
+                {
+                    **profile.summary(),
+                    "queries": profile.queries,
+                    "functions": profile.top_functions(PROFILING["top_functions"]),
+                }
+            )
+        content_type, extension = self.FORMATS[download]
+        response: HttpResponse = HttpResponse(
+            profile.stats if download == "pstats" else profile.collapsed, content_type=content_type
+        )
+        response["Content-Disposition"] = f'attachment; filename="profile-{profile.id}.{extension}"'
+        return response
+
+
+class MemoryView(APIView):
+    """
+    API endpoint starting, stopping and reporting the memory tracing of this worker process.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request: Request) -> Response:
+        """
+        Returns the memory status of the worker process.
+
+        Returns:
+            Response: Tracing state, traced memory and RSS samples.
+        """
+        return Response(tracker.status())
+
+    def post(self, request: Request) -> Response:
+        """
+        Starts tracing allocations with ``frames`` frames per allocation.
+
+        Returns:
+            Response: Memory status of the worker process.
+        """
+        frames = request.data.get("frames", MEMORY["traceback_frames"])
+        if not isinstance(frames, int) or isinstance(frames, bool) or not 1 <= frames <= MEMORY["max_traceback_frames"]:
+            return Response(
+                {"error": ERROR_MESSAGES["invalid_frames"].format(max_frames=MEMORY["max_traceback_frames"])},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        tracker.start(frames)
+        logger.info(f"Memory tracing started by {request.user} in worker {os.getpid()} with {frames} frames")
+        return Response(tracker.status())
+
+    def delete(self, request: Request) -> Response:
+        """
+        Stops tracing allocations.
+
+        Returns:
+            Response: Empty response.
+        """
+        tracker.stop()
+        logger.info(f"Memory tracing stopped by {request.user} in worker {os.getpid()}")
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class MemorySnapshotView(APIView):
+    """
+    API endpoint taking a memory snapshot of this worker process and diffing it.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    # Snapshots a new one can be compared to
+    COMPARISONS: tuple[str, ...] = ("baseline", "previous")
+
+    def post(self, request: Request) -> Response:
+        """
+        Takes a snapshot and compares it to the baseline or the previous snapshot.
+
+        Returns:
+            Response: Traced memory, growth by module and by allocation site, and the RSS trend.
+        """
+        against: str = request.query_params.get(QUERY_PARAMS["compare"], self.COMPARISONS[0])
+        if against not in self.COMPARISONS:
+            return Response(
+                {"error": ERROR_MESSAGES["invalid_comparison"].format(choices=", ".join(self.COMPARISONS))},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit: str = request.query_params.get(QUERY_PARAMS["limit"], str(MEMORY["report_limit"]))
+        if not limit.isdigit() or int(limit) < 1:
+            return Response({"error": ERROR_MESSAGES["invalid_limit"]}, status=status.HTTP_400_BAD_REQUEST)
+        if not tracker.tracing:
+            return Response({"error": ERROR_MESSAGES["not_tracing"]}, status=status.HTTP_409_CONFLICT)
+
+        report: dict = tracker.snapshot(against, request.query_params.getlist(QUERY_PARAMS["package"]), int(limit))
+        return Response({"pid": os.getpid(), **report})
@@ -0,0 +1,149 @@
+"""
+Backends carrying events from the process that writes them to the processes streaming them.
+
+The backend is chosen with the ``EVENTS_BACKEND`` setting. A backend gets the
+events a process published once their transaction committed, and feeds the
+process-wide broker with the events of every process. Another transport
+(e.g. Redis pub/sub or PostgreSQL ``LISTEN``/``NOTIFY``) can be plugged in by
+subclassing ``EventBackend``.
+"""
+
+import asyncio
+import logging
+import time
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Max, Q
+from django.utils.module_loading import import_string
+
+from constants import EVENTS
+from events.broker import Broker
+from events.models import Event
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+class EventBackend:
+    """
+    Interface of the events backends.
+    """
+
+    def publish(self, events: list[Event]) -> None:
+        """
+        Hands committed events over to the streaming processes.
+
+        Called from the thread that wrote the events.
+
+        Args:
+            events (list[Event]): Saved events, in id order.
+        """
+        raise NotImplementedError
+
+    async def start(self) -> None:
+        """
+        Starts feeding the broker of this process, if not done yet.
+
+        Called by every new stream, from the event loop serving it.
+        """
+
+
+class LocalBackend(EventBackend):
+    """
+    Dispatches events to the streams of the writing process only.
+
+    Fits a single process serving both the API and the streams.
+    """
+
+    def __init__(self, broker: Broker) -> None:
+        self.broker: Broker = broker
+
+    def publish(self, events: list[Event]) -> None:
+        self.broker.dispatch(events)
+
+
+class DatabaseBackend(EventBackend):
+    """
+    Streams the events written by any process by polling the events table.
+
+    Each streaming process runs a single poller, whatever its number of
+    streams: one indexed ``id > last`` query per interval. Ids are assigned
+    before the transaction commits, so an event may become visible after a
+    higher id was read; the missing ids are polled again for a few seconds
+    instead of being skipped.
+    """
+
+    def __init__(self, broker: Broker) -> None:
+        self.broker: Broker = broker
+        self.interval: float = settings.EVENTS_POLL_INTERVAL
+        self.last_id: int | None = None
+        self.gaps: dict[int, float] = {}
+        self._task: asyncio.Task | None = None
+
+    def publish(self, events: list[Event]) -> None:
+        # The rows themselves are the message: every poller will read them
+        pass
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def run(self) -> None:
+        """
+        Polls the events table until the event loop stops.
+        """
+        logger.info(f"Polling events every {self.interval}s")
+        while True:
+            try:
+                events: list[Event] = await sync_to_async(self.poll)()
+                self.broker.dispatch(events)
+            except Exception:
+                logger.exception("Event poll failed")
+            await asyncio.sleep(self.interval)
+
+    def poll(self) -> list[Event]:
+        """
+        Reads the events committed since the previous poll.
+
+        Returns:
+            list[Event]: New events, in id order.
+        """
+        if self.last_id is None:
+            # Streams replay older events themselves
+            self.last_id = Event.objects.aggregate(last=Max("id"))["last"] or 0
+            return []
+
+        now: float = time.monotonic()
+        self.gaps = {
+            event_id: seen for event_id, seen in self.gaps.items() if now - seen < EVENTS["gap_timeout_seconds"]
+        }
+        events: list[Event] = list(
+            Event.objects.filter(Q(id__gt=self.last_id) | Q(id__in=list(self.gaps))).order_by("id")[
+                : EVENTS["poll_batch_size"]
+            ]
+        )
+        expected: int = self.last_id + 1
+        for event in events:
+            self.gaps.pop(event.pk, None)
+            if event.pk > self.last_id:
+                # Large jumps come from rolled back bulk inserts, not from transactions in flight
+                if event.pk - expected <= EVENTS["poll_batch_size"]:
+                    self.gaps.update((event_id, now) for event_id in range(expected, event.pk))
+                expected = event.pk + 1
+                self.last_id = event.pk
+        return events
+
+
+@lru_cache(maxsize=None)
+def get_backend() -> EventBackend:
+    """
+    Returns the events backend of this process, configured by ``EVENTS_BACKEND``.
+
+    Returns:
+        EventBackend: The backend, bound to the process-wide broker.
+    """
+    from events.broker import broker
+
+    return import_string(settings.EVENTS_BACKEND)(broker)
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+from threading import Lock
+
+from constants import EVENTS
+from events.models import Event
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    Queue of the events waiting to be sent on one stream.
+
+    The queue is bounded: a client that does not keep up is disconnected
+    instead of letting its backlog grow, and replays the events it missed
+    from the database when it reconnects.
+
+    Attributes:
+        user_id (int): Recipient of the events.
+        loop (asyncio.AbstractEventLoop): Event loop serving the stream.
+        queue (asyncio.Queue): Pending events, then None once the subscription is closed.
+        closed (bool): Whether the stream must end.
+    """
+
+    __slots__ = ("user_id", "loop", "queue", "closed")
+
+    def __init__(self, user_id: int, loop: asyncio.AbstractEventLoop, size: int) -> None:
+        self.user_id: int = user_id
+        self.loop: asyncio.AbstractEventLoop = loop
+        self.queue: asyncio.Queue[Event | None] = asyncio.Queue(size)
+        self.closed: bool = False
+
+    def deliver(self, event: Event) -> None:
+        """
+        Queues an event. Must run in the subscription's event loop.
+
+        Args:
+            event (Event): Event to send.
+        """
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning(f"Event stream of user {self.user_id} is too slow, closing it")
+            self.close()
+
+    def close(self) -> None:
+        """
+        Ends the stream, dropping the events not sent yet. Must run in the subscription's event loop.
+        """
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class Broker:
+    """
+    In-process fan-out of events to the streams of their recipients.
+
+    Streams subscribe from their event loop; events are dispatched from any
+    thread, e.g. a request thread after its transaction committed, and are
+    handed over to each stream's loop without blocking the caller. A stream
+    costs a queue and a coroutine, so a process holds thousands of idle ones.
+    """
+
+    def __init__(self) -> None:
+        self._subscriptions: defaultdict[int, set[Subscription]] = defaultdict(set)
+        self._lock: Lock = Lock()
+
+    def subscribe(self, user_id: int, size: int = EVENTS["queue_size"]) -> Subscription:
+        """
+        Registers a stream of a user. Must be called from the stream's event loop.
+
+        Args:
+            user_id (int): Id of the user.
+            size (int): Maximum number of pending events.
+
+        Returns:
+            Subscription: The subscription to read events from.
+        """
+        subscription: Subscription = Subscription(user_id, asyncio.get_running_loop(), size)
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Removes a stream.
+
+        Args:
+            subscription (Subscription): Subscription returned by ``subscribe``.
+        """
+        with self._lock:
+            subscriptions: set[Subscription] | None = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def dispatch(self, events: Iterable[Event]) -> None:
+        """
+        Sends events to the streams of their recipients connected to this process.
+
+        Args:
+            events (Iterable[Event]): Saved events, in id order.
+        """
+        for event in events:
+            with self._lock:
+                subscriptions: list[Subscription] = list(self._subscriptions.get(event.user_id, ()))
+            for subscription in subscriptions:
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+                except RuntimeError:
+                    # The loop of the stream was closed
+                    self.unsubscribe(subscription)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of open streams.
+        """
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+
+# Process-wide broker fed by the events backend
+broker: Broker = Broker()
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from constants import EVENTS
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = "Delete the events older than the replay window"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--hours", type=int, default=EVENTS["retention_hours"], help="age in hours of the events to delete"
+        )
+
+    def handle(self, *args, **options) -> None:
+        deleted, _ = Event.objects.filter(created_at__lt=timezone.now() - timedelta(hours=options["hours"])).delete()
+        self.stdout.write(f"Deleted {deleted} events")
@@ -0,0 +1,56 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+from constants import MODEL_VERBOSE_NAMES
+
+
+class Event(models.Model):
+    """
+    A change notification addressed to one user.
+
+    Events are stored so that clients reconnecting with the id of the last
+    event they received can replay the ones they missed, and so that every
+    process serving streams can pick up events written by the others. Ids
+    only grow, which makes them usable as SSE event ids.
+
+    Attributes:
+        user (User): Recipient of the event.
+        type (str): Event type, e.g. ``task.updated``.
+        data (dict): JSON payload of the event.
+        created_at (datetime): When the event was published.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="events", verbose_name="User")
+    type = models.CharField(max_length=50, verbose_name="Type")
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder, verbose_name="Data")
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True, verbose_name="Creation timestamp")
+
+    def __str__(self) -> str:
+        """
+        String representation of the Event object.
+
+        Returns:
+            str: The id, type and recipient of the event.
+        """
+        return f"#{self.pk} {self.type} for user {self.user_id}"
+
+    def encode(self) -> bytes:
+        """
+        Formats the event as a server-sent events message.
+
+        Returns:
+            bytes: ``id``, ``event`` and ``data`` fields followed by a blank line.
+        """
+        data: str = json.dumps(self.data, cls=DjangoJSONEncoder, separators=(",", ":"))
+        return f"id: {self.pk}\nevent: {self.type}\ndata: {data}\n\n".encode()
+
+    class Meta:
+        verbose_name = MODEL_VERBOSE_NAMES["event"]
+        verbose_name_plural = MODEL_VERBOSE_NAMES["events"]
+        indexes = [
+            # Replay: the events of a user after a given id
+            models.Index(fields=["user", "id"]),
+        ]
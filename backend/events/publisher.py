@@ -0,0 +1,36 @@
+import logging
+from collections.abc import Iterable
+
+from django.db import transaction
+
+from events.backends import get_backend
+from events.models import Event
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+def publish(event_type: str, messages: Iterable[tuple[Iterable[int | None], dict]]) -> list[Event]:
+    """
+    Records events and streams them once the current transaction commits.
+
+    All events are inserted with a single query. Each message is addressed to
+    a set of users, every one of them getting their own event.
+
+    Args:
+        event_type (str): Type of the events.
+        messages (Iterable[tuple[Iterable[int | None], dict]]): Pairs of recipient ids and
+            payload. ``None`` ids and duplicates are ignored.
+
+    Returns:
+        list[Event]: The recorded events.
+    """
+    events: list[Event] = Event.objects.bulk_create(
+        Event(user_id=user_id, type=event_type, data=data)
+        for user_ids, data in messages
+        for user_id in sorted({user_id for user_id in user_ids if user_id is not None})
+    )
+    if events:
+        transaction.on_commit(lambda: get_backend().publish(events))
+        logger.debug(f"{len(events)} {event_type} events published")
+    return events
@@ -0,0 +1,232 @@
+"""
+Server-sent events stream of the changes to the authenticated user's data.
+
+The stream is a bare ASGI application mounted in front of Django by
+``task_manager.asgi``: an idle stream is a coroutine waiting on its queue,
+with no thread, database connection or middleware stack attached, so one
+worker holds thousands of them.
+
+Clients authenticate with their access token, in the ``Authorization``
+header or, as browsers' ``EventSource`` cannot set headers, in the
+``token`` query parameter. A client reconnecting with ``Last-Event-ID`` (or
+``?last_event_id=``) first receives the events it missed; if too many were
+missed, or they were pruned, it receives a ``reset`` event and should
+reload its data.
+"""
+
+import asyncio
+import json
+import logging
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Max, Min
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from constants import ERROR_MESSAGES, EVENTS
+from events.backends import get_backend
+from events.broker import Subscription, broker
+from events.models import Event
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+def get_token(scope: dict) -> str | None:
+    """
+    Extracts the access token of a connection.
+
+    Args:
+        scope (dict): ASGI connection scope.
+
+    Returns:
+        str | None: Raw token from the ``Authorization`` header or the ``token`` query parameter.
+    """
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            parts: list[str] = value.decode("latin-1").split()
+            if len(parts) == 2 and parts[0] in jwt_settings.AUTH_HEADER_TYPES:
+                return parts[1]
+    return parse_qs(scope["query_string"].decode("latin-1")).get("token", [None])[0]
+
+
+def get_last_event_id(scope: dict) -> int | None:
+    """
+    Reads the id of the last event received by a reconnecting client.
+
+    Args:
+        scope (dict): ASGI connection scope.
+
+    Returns:
+        int | None: The id, or None for a new client or an invalid id.
+    """
+    value: str | None = next(
+        (value.decode("latin-1") for name, value in scope["headers"] if name == b"last-event-id"), None
+    )
+    if value is None:
+        value = parse_qs(scope["query_string"].decode("latin-1")).get("last_event_id", [None])[0]
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def replay(user_id: int, last_event_id: int) -> tuple[list[Event], int | None]:
+    """
+    Loads the events a reconnecting client missed.
+
+    Args:
+        user_id (int): Id of the user.
+        last_event_id (int): Id of the last event the client received.
+
+    Returns:
+        tuple[list[Event], int | None]: The missed events in id order, or no events and the id
+        to resume from if the client must reload its data instead.
+    """
+    events: list[Event] = list(
+        Event.objects.filter(user_id=user_id, id__gt=last_event_id).order_by("id")[: EVENTS["max_replay"] + 1]
+    )
+    bounds: dict = Event.objects.aggregate(first=Min("id"), last=Max("id"))
+    pruned: bool = bounds["first"] is not None and bounds["first"] > last_event_id + 1
+    if len(events) > EVENTS["max_replay"] or pruned:
+        return [], bounds["last"] or last_event_id
+    return events, None
+
+
+class EventStreamApplication:
+    """
+    ASGI application streaming the events of the authenticated user.
+    """
+
+    async def __call__(self, scope: dict, receive, send) -> None:
+        if scope["method"] != "GET":
+            await self.respond(send, 405, ERROR_MESSAGES["method_not_allowed"].format(method=scope["method"]))
+            return
+
+        user_id: int | None = await self.authenticate(scope)
+        if user_id is None:
+            await self.respond(send, 401, ERROR_MESSAGES["invalid_credentials"])
+            return
+
+        await get_backend().start()
+        subscription: Subscription = broker.subscribe(user_id)
+        logger.debug(f"Event stream opened for user {user_id} ({len(broker)} open)")
+        try:
+            await self.stream(scope, subscription, receive, send)
+        finally:
+            broker.unsubscribe(subscription)
+            logger.debug(f"Event stream closed for user {user_id}")
+
+    async def authenticate(self, scope: dict) -> int | None:
+        """
+        Validates the access token of a connection.
+
+        Args:
+            scope (dict): ASGI connection scope.
+
+        Returns:
+            int | None: Id of the authenticated active user, None if authentication failed.
+        """
+        token: str | None = get_token(scope)
+        if not token:
+            return None
+        try:
+            user_id = AccessToken(token)[jwt_settings.USER_ID_CLAIM]
+        except (TokenError, KeyError):
+            return None
+        if not await User.objects.filter(pk=user_id, is_active=True).aexists():
+            return None
+        return user_id
+
+    async def stream(self, scope: dict, subscription: Subscription, receive, send) -> None:
+        """
+        Sends the missed events, then the new ones until the client disconnects.
+
+        A comment is sent when no event was sent for a while, so that proxies
+        keep the connection open and dead clients are detected.
+
+        Args:
+            scope (dict): ASGI connection scope.
+            subscription (Subscription): Subscription of the stream.
+            receive: ASGI receive callable.
+            send: ASGI send callable.
+        """
+        headers: list[tuple[bytes, bytes]] = [
+            (b"content-type", b"text/event-stream"),
+            (b"cache-control", b"no-cache"),
+            # Disables response buffering in nginx
+            (b"x-accel-buffering", b"no"),
+        ]
+        if settings.CORS_ALLOW_ALL_ORIGINS:
+            headers.append((b"access-control-allow-origin", b"*"))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await self.write(send, f"retry: {EVENTS['retry_milliseconds']}\n\n".encode())
+
+        # Subscribing before the replay means an event can be both replayed and queued
+        replayed: set[int] = set()
+        last_event_id: int | None = get_last_event_id(scope)
+        if last_event_id is not None:
+            events, reset_id = await sync_to_async(replay)(subscription.user_id, last_event_id)
+            if reset_id is not None:
+                await self.write(send, f"id: {reset_id}\nevent: {EVENTS['reset']}\ndata: {{}}\n\n".encode())
+            for event in events:
+                await self.write(send, event.encode())
+                replayed.add(event.pk)
+
+        watcher: asyncio.Task = asyncio.ensure_future(self.watch_disconnect(receive, subscription))
+        try:
+            while True:
+                try:
+                    event: Event | None = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=EVENTS["heartbeat_seconds"]
+                    )
+                except asyncio.TimeoutError:
+                    await self.write(send, b": keepalive\n\n")
+                    continue
+                if event is None:
+                    break
+                if event.pk not in replayed:
+                    await self.write(send, event.encode())
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            watcher.cancel()
+
+    async def watch_disconnect(self, receive, subscription: Subscription) -> None:
+        """
+        Closes the subscription when the client disconnects.
+
+        Args:
+            receive: ASGI receive callable.
+            subscription (Subscription): Subscription of the stream.
+        """
+        while (await receive())["type"] != "http.disconnect":
+            pass
+        subscription.close()
+
+    async def write(self, send, body: bytes) -> None:
+        """
+        Sends a chunk of the stream.
+
+        Args:
+            send: ASGI send callable.
+            body (bytes): Chunk to send.
+        """
+        await send({"type": "http.response.body", "body": body, "more_body": True})
+
+    async def respond(self, send, status: int, detail: str) -> None:
+        """
+        Sends an error response in the format of the API.
+
+        Args:
+            send: ASGI send callable.
+            status (int): HTTP status code.
+            detail (str): Error message.
+        """
+        await send(
+            {"type": "http.response.start", "status": status, "headers": [(b"content-type", b"application/json")]}
+        )
+        await send({"type": "http.response.body", "body": json.dumps({"detail": detail}).encode()})
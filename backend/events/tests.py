@@ -0,0 +1,241 @@
+import asyncio
+import io
+import json
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import date, timedelta
+from typing import Callable, Tuple
+from unittest.mock import patch
+from events.backends import DatabaseBackend, LocalBackend
+from events.broker import Broker, Subscription, broker
+from events.models import Event
+from events.sse import EventStreamApplication
+from tasks.models import Task
+from constants import EVENTS
+
+
+def parse(messages: list[dict]) -> list[dict]:
+    """Returns the events sent on a stream as dictionaries of their fields."""
+    body: str = b"".join(message.get("body", b"") for message in messages[1:]).decode()
+    events: list[dict] = []
+    for block in body.split("\n\n"):
+        fields: dict = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if "event" in fields:
+            events.append({**fields, "data": json.loads(fields["data"])})
+    return events
+
+
+async def open_stream(query_string: str = "", headers: list | None = None, method: str = "GET") -> tuple:
+    """Starts a stream and waits for it to subscribe, or to be rejected."""
+    disconnected: asyncio.Event = asyncio.Event()
+    messages: list[dict] = []
+
+    async def receive() -> dict:
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    scope: dict = {
+        "type": "http",
+        "method": method,
+        "path": EVENTS["path"],
+        "query_string": query_string.encode(),
+        "headers": headers or [],
+    }
+    subscribed: int = len(broker)
+    task: asyncio.Task = asyncio.ensure_future(EventStreamApplication()(scope, receive, send))
+    for _ in range(200):
+        if task.done() or (len(broker) > subscribed and len(messages) > 1):
+            break
+        await asyncio.sleep(0.005)
+    return task, disconnected, messages
+
+
+async def close_stream(task: asyncio.Task, disconnected: asyncio.Event) -> None:
+    """Disconnects the client and waits for the stream to end."""
+    disconnected.set()
+    await asyncio.wait_for(task, timeout=5)
+
+
+@pytest.mark.django_db
+class TestEventPublishing:
+    @pytest.fixture(autouse=True)
+    def setup(self, authenticated_client: Tuple[APIClient, User], user_factory: Callable) -> None:
+        """Creates a task assigned to another user by the authenticated user."""
+        self.client, self.user = authenticated_client
+        self.assignee: User = user_factory(username="assignee")
+        self.task: Task = Task.objects.create(
+            title="Shared task", start_date=date.today(), user=self.assignee, created_by=self.user
+        )
+
+    def test_writes_publish_events_to_owner_and_creator(self, django_capture_on_commit_callbacks) -> None:
+        """Test that every task write records one event per involved user and streams it after commit."""
+        with patch.object(LocalBackend, "publish") as published:
+            with django_capture_on_commit_callbacks(execute=True):
+                self.client.patch(reverse("task-detail", kwargs={"pk": self.task.id}), {"title": "Renamed"})
+                self.client.post(reverse("task-complete", kwargs={"pk": self.task.id}))
+                self.client.delete(reverse("task-detail", kwargs={"pk": self.task.id}))
+
+        events: list[Event] = list(Event.objects.order_by("id"))
+        assert [(event.type, event.user_id) for event in events] == [
+            (EVENTS["task_updated"], self.user.id),
+            (EVENTS["task_updated"], self.assignee.id),
+            (EVENTS["task_completed"], self.user.id),
+            (EVENTS["task_completed"], self.assignee.id),
+            (EVENTS["task_deleted"], self.user.id),
+            (EVENTS["task_deleted"], self.assignee.id),
+        ]
+        assert events[0].data["title"] == "Renamed"
+        assert events[2].data == {"id": self.task.id, "completed": True, "version": 3}
+        assert events[4].data == {"id": self.task.id}
+        assert published.call_count == 3
+
+    def test_failed_writes_publish_nothing(self) -> None:
+        """Test that rejected writes do not record events."""
+        self.client.post(reverse("task-list"), {"title": "", "start_date": date.today().isoformat()})
+
+        assert not Event.objects.exists()
+
+
+@pytest.mark.django_db
+class TestEventStream:
+    @pytest.fixture(autouse=True)
+    def setup(self, user_factory: Callable) -> None:
+        """Creates a user with an access token."""
+        self.user: User = user_factory(username="streamer")
+        self.token: str = str(AccessToken.for_user(self.user))
+
+    def test_rejects_missing_or_invalid_tokens(self) -> None:
+        """Test that streams require a valid access token of an active user."""
+
+        async def scenario() -> list[int]:
+            statuses: list[int] = []
+            for query_string in ("", "token=invalid"):
+                _, _, messages = await open_stream(query_string)
+                statuses.append(messages[0]["status"])
+            await sync_to_async(User.objects.filter(pk=self.user.pk).update)(is_active=False)
+            _, _, messages = await open_stream(f"token={self.token}")
+            statuses.append(messages[0]["status"])
+            _, _, messages = await open_stream(method="POST")
+            statuses.append(messages[0]["status"])
+            return statuses
+
+        assert async_to_sync(scenario)() == [401, 401, 401, 405]
+
+    def test_streams_events_of_the_user_only(self, user_factory: Callable) -> None:
+        """Test that published events reach the streams of their recipient."""
+        other: User = user_factory(username="other")
+
+        async def scenario() -> list[dict]:
+            task, disconnected, messages = await open_stream(
+                headers=[(b"authorization", f"Bearer {self.token}".encode())]
+            )
+            assert messages[0]["status"] == 200
+            assert (b"content-type", b"text/event-stream") in messages[0]["headers"]
+            events: list[Event] = [
+                await sync_to_async(Event.objects.create)(user=user, type=EVENTS["task_updated"], data={"id": 1})
+                for user in (other, self.user)
+            ]
+            LocalBackend(broker).publish(events)
+            await asyncio.sleep(0.05)
+            await close_stream(task, disconnected)
+            return parse(messages)
+
+        events: list[dict] = async_to_sync(scenario)()
+
+        assert [(event["event"], event["data"]) for event in events] == [(EVENTS["task_updated"], {"id": 1})]
+        assert len(broker) == 0
+
+    def test_replays_missed_events_after_last_event_id(self) -> None:
+        """Test that a reconnecting client first receives the events it missed."""
+        events: list[Event] = [
+            Event.objects.create(user=self.user, type=EVENTS["task_created"], data={"id": index}) for index in range(3)
+        ]
+
+        async def scenario() -> list[dict]:
+            task, disconnected, messages = await open_stream(
+                f"token={self.token}", headers=[(b"last-event-id", str(events[0].pk).encode())]
+            )
+            await close_stream(task, disconnected)
+            return parse(messages)
+
+        replayed: list[dict] = async_to_sync(scenario)()
+
+        assert [event["id"] for event in replayed] == [str(events[1].pk), str(events[2].pk)]
+
+    def test_sends_reset_when_too_many_events_were_missed(self, monkeypatch) -> None:
+        """Test that clients too far behind are told to reload instead of replaying."""
+        monkeypatch.setitem(EVENTS, "max_replay", 1)
+        events: list[Event] = [
+            Event.objects.create(user=self.user, type=EVENTS["task_created"], data={"id": index}) for index in range(3)
+        ]
+
+        async def scenario() -> list[dict]:
+            task, disconnected, messages = await open_stream(f"token={self.token}&last_event_id={events[0].pk - 1}")
+            await close_stream(task, disconnected)
+            return parse(messages)
+
+        replayed: list[dict] = async_to_sync(scenario)()
+
+        assert [(event["event"], event["id"]) for event in replayed] == [(EVENTS["reset"], str(events[-1].pk))]
+
+
+class TestBroker:
+    def test_slow_subscribers_are_closed(self) -> None:
+        """Test that a full queue ends the stream instead of growing."""
+
+        async def scenario() -> Subscription:
+            local: Broker = Broker()
+            subscription: Subscription = local.subscribe(1, size=2)
+            local.dispatch(Event(pk=index, user_id=1, type="test") for index in range(3))
+            await asyncio.sleep(0)
+            return subscription
+
+        subscription: Subscription = asyncio.run(scenario())
+
+        assert subscription.closed is True
+        assert subscription.queue.get_nowait() is None
+
+
+@pytest.mark.django_db
+class TestDatabaseBackend:
+    def test_poll_returns_new_events_and_late_commits(self, user_factory: Callable) -> None:
+        """Test that polling reads new events and the ids committed after a higher one."""
+        user: User = user_factory()
+        backend: DatabaseBackend = DatabaseBackend(Broker())
+        assert backend.poll() == []
+
+        first, second, third = (Event.objects.create(user=user, type="test") for _ in range(3))
+        # The second event is still in flight when the third one is read
+        missing: int = second.pk
+        second.delete()
+        assert [event.pk for event in backend.poll()] == [first.pk, third.pk]
+        assert set(backend.gaps) == {missing}
+
+        Event.objects.create(pk=missing, user=user, type="test")
+        assert [event.pk for event in backend.poll()] == [missing]
+        assert backend.gaps == {}
+        assert backend.poll() == []
+
+    def test_prune_events_command(self, user_factory: Callable) -> None:
+        """Test that events older than the retention window are deleted."""
+        user: User = user_factory()
+        old: Event = Event.objects.create(user=user, type="test")
+        Event.objects.filter(pk=old.pk).update(
+            created_at=timezone.now() - timedelta(hours=EVENTS["retention_hours"] + 1)
+        )
+        Event.objects.create(user=user, type="test")
+        output: io.StringIO = io.StringIO()
+
+        call_command("prune_events", stdout=output)
+
+        assert "Deleted 1 events" in output.getvalue()
+        assert Event.objects.count() == 1
@@ -0,0 +1,162 @@
+"""
+Gunicorn configuration of the API server.
+
+Usage::
+
+    gunicorn -c gunicorn.conf.py task_manager.wsgi:application
+
+Workers and threads are sized from the CPUs available to the process and
+can be overridden with environment variables:
+
+    WEB_CONCURRENCY                 number of worker processes (CPUs + 1 with a shared cache, else 1)
+    GUNICORN_THREADS                threads per worker (4)
+    GUNICORN_PRELOAD                load the application in the master before forking (true)
+    GUNICORN_MAX_REQUESTS           requests after which a worker is replaced, 0 to disable (1000)
+    GUNICORN_MAX_REQUESTS_JITTER    random extra requests, so workers are not all replaced at once (100)
+    GUNICORN_TIMEOUT                seconds a worker may stay silent before it is killed (30)
+    GUNICORN_SLOW_REQUEST_MS        requests slower than this are logged with their worker (1000)
+    GUNICORN_MAX_RSS_MB             resident memory above which a worker is replaced, 0 to disable (0)
+
+Requests mostly wait on the database, so each worker serves several of
+them with threads, which cost far less memory than processes. The
+application is loaded once in the master and its memory is shared
+copy-on-write by the workers, which are recycled after a bounded number of
+requests to cap slow memory growth, or as soon as their resident memory
+exceeds GUNICORN_MAX_RSS_MB. The server-sent events stream is not
+served here, but by the ASGI application (see the README).
+
+Task list versions, recent writes and stored profiles live in the cache,
+so several workers are only started by default when CACHE_BACKEND names a
+cache shared between processes; with the per-process default, each worker
+would serve stale ETags and forget the writes made through the others.
+"""
+
+import gc
+import os
+import threading
+import time
+
+from gunicorn.arbiter import Arbiter
+from gunicorn.http.message import Request
+from gunicorn.workers.base import Worker
+
+from diagnostics.memory import tracker
+
+
+def env_bool(name: str, default: bool) -> bool:
+    """Reads a boolean environment variable."""
+    return os.environ.get(name, str(default)).lower() in ("1", "true", "yes", "on")
+
+
+def available_cpus() -> int:
+    """Returns the number of CPUs the process may run on, e.g. those of its container."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def shared_cache() -> bool:
+    """Returns whether the configured cache backend is shared between processes."""
+    backend: str = os.environ.get("CACHE_BACKEND", "")
+    return bool(backend) and backend.rsplit(".", 1)[-1] not in ("LocMemCache", "DummyCache")
+
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", available_cpus() + 1 if shared_cache() else 1))
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+worker_class = "gthread" if threads > 1 else "sync"
+preload_app = env_bool("GUNICORN_PRELOAD", True)
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = timeout
+keepalive = 5
+# Heartbeat files on a tmpfs, as a slow disk would make busy workers look stuck
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+errorlog = "-"
+
+SLOW_REQUEST_MS: float = float(os.environ.get("GUNICORN_SLOW_REQUEST_MS", "1000"))
+MAX_RSS_BYTES: int = int(os.environ.get("GUNICORN_MAX_RSS_MB", "0")) * 1024 * 1024
+
+
+class WorkerStats:
+    """
+    Request timings of a worker process, shared by its threads.
+
+    Attributes:
+        started (float): Monotonic time the worker started at.
+        requests (int): Number of requests served.
+        busy (float): Total time spent serving requests, in seconds.
+        slowest (float): Longest request, in seconds.
+    """
+
+    def __init__(self) -> None:
+        self.started: float = time.monotonic()
+        self.requests: int = 0
+        self.busy: float = 0.0
+        self.slowest: float = 0.0
+        self.lock: threading.Lock = threading.Lock()
+
+    def add(self, elapsed: float) -> None:
+        """Records a served request."""
+        with self.lock:
+            self.requests += 1
+            self.busy += elapsed
+            self.slowest = max(self.slowest, elapsed)
+
+    def summary(self) -> str:
+        """Formats the timings for the logs."""
+        uptime: float = time.monotonic() - self.started
+        mean: float = self.busy / self.requests * 1000 if self.requests else 0.0
+        return (
+            f"{self.requests} requests in {uptime:.0f}s, mean {mean:.1f}ms, slowest {self.slowest * 1000:.1f}ms, "
+            f"busy {self.busy / (uptime * threads) * 100 if uptime else 0:.1f}% of {threads} threads"
+        )
+
+
+def when_ready(server: Arbiter) -> None:
+    # Objects loaded by the preloaded application are never collected, so the collector
+    # does not write to their pages and they stay shared with the workers
+    gc.freeze()
+
+
+def pre_fork(server: Arbiter, worker: Worker) -> None:
+    if not preload_app:
+        # Django is not even set up in the master
+        return
+    from django.db import connections
+
+    # A connection opened while loading the application would be inherited by every worker,
+    # which would then talk over the same socket; closing it in the master leaves workers none
+    connections.close_all()
+
+
+def post_fork(server: Arbiter, worker: Worker) -> None:
+    worker.stats = WorkerStats()
+
+
+def pre_request(worker: Worker, req: Request) -> None:
+    req.started = time.perf_counter()
+
+
+def post_request(worker: Worker, req: Request, environ: dict, resp) -> None:
+    elapsed: float = time.perf_counter() - req.started
+    worker.stats.add(elapsed)
+    if elapsed * 1000 >= SLOW_REQUEST_MS:
+        worker.log.warning(f"Slow request in worker {worker.pid}: {req.method} {req.path} took {elapsed * 1000:.0f}ms")
+    # The RSS trend of the diagnostics endpoint, sampled at most every few seconds
+    rss: int | None = tracker.sample_rss()
+    if MAX_RSS_BYTES and rss is not None and rss > MAX_RSS_BYTES and worker.alive:
+        # Like max_requests: the worker finishes its requests in progress, then the master replaces it
+        worker.log.warning(
+            f"Worker {worker.pid} uses {rss / 1024 / 1024:.0f} MB, above GUNICORN_MAX_RSS_MB: "
+            f"replacing it after {worker.stats.requests} requests"
+        )
+        worker.alive = False
+
+
+def worker_exit(server: Arbiter, worker: Worker) -> None:
+    stats: WorkerStats | None = getattr(worker, "stats", None)
+    if stats is not None:
+        server.log.info(f"Worker {worker.pid} exiting after {stats.summary()}")
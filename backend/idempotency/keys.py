@@ -0,0 +1,217 @@
+"""
+Idempotent retries of writes.
+
+A client retrying a write after a timeout cannot tell whether the first
+attempt went through. Sending the same ``Idempotency-Key`` header with every
+attempt makes the retries safe: the first attempt claims the key and stores
+its response, and the retries get that response back, marked with an
+``Idempotent-Replayed`` header, without running validation or writes again.
+
+A retry arriving while the first attempt still runs is answered with 409,
+and a key reused for a different request with 422. Failed attempts release
+the key, so the client can retry them as well.
+"""
+
+import hashlib
+import logging
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from functools import wraps
+
+from django.db import IntegrityError, router, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from constants import ERROR_MESSAGES, IDEMPOTENCY
+from idempotency.models import IdempotencyKey
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(request: Request) -> str:
+    """
+    Hashes what identifies a request, so a key cannot be reused for another one.
+
+    Args:
+        request (Request): Request sent with the key.
+
+    Returns:
+        str: SHA-256 hex digest of the method, path, content type and body.
+    """
+    digest = hashlib.sha256()
+    for part in (request.method, request.get_full_path(), request.content_type):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def scope_of(request: Request, request_fingerprint: str) -> str:
+    """
+    Returns the owner of the keys sent with a request.
+
+    Anonymous clients cannot be told apart, so their keys are scoped by the
+    request as well: two clients sending the same key with different
+    requests never get each other's response or a 422.
+
+    Args:
+        request (Request): Request sent with a key.
+        request_fingerprint (str): Fingerprint of the request.
+
+    Returns:
+        str: ``user:<id>`` for authenticated requests, ``anonymous:<fingerprint prefix>`` otherwise.
+    """
+    if request.user.is_authenticated:
+        return f"user:{request.user.pk}"
+    return f"anonymous:{request_fingerprint[:32]}"
+
+
+def claim(scope: str, key: str, request_fingerprint: str) -> tuple[IdempotencyKey, bool]:
+    """
+    Claims a key for a request, unless another request holds it.
+
+    Retries are the common case when the key exists, so it is looked up
+    before being inserted: a replay costs a single query. An expired key, or
+    one held by a request that has not finished within
+    ``IDEMPOTENCY["lock_timeout_seconds"]``, is taken over.
+
+    Args:
+        scope (str): Owner of the key.
+        key (str): Value of the header.
+        request_fingerprint (str): Fingerprint of the request.
+
+    Returns:
+        tuple[IdempotencyKey, bool]: The key, and whether the request claimed it.
+    """
+    now: datetime = timezone.now()
+    claimed: dict = {
+        "fingerprint": request_fingerprint,
+        "status_code": None,
+        "response_body": None,
+        "response_headers": {},
+        "created_at": now,
+        "expires_at": now + timedelta(hours=IDEMPOTENCY["retention_hours"]),
+    }
+    keys = IdempotencyKey.objects.filter(scope=scope, key=key)
+    record: IdempotencyKey | None = keys.first()
+    if record is None:
+        try:
+            with transaction.atomic(using=router.db_for_write(IdempotencyKey)):
+                return IdempotencyKey.objects.create(scope=scope, key=key, **claimed), True
+        except IntegrityError:
+            # Claimed by a concurrent attempt
+            return claim(scope, key, request_fingerprint)
+
+    stale: datetime = now - timedelta(seconds=IDEMPOTENCY["lock_timeout_seconds"])
+    if record.expires_at > now and (record.status_code is not None or record.created_at > stale):
+        return record, False
+    # Compare-and-set, as concurrent attempts may try to take the key over as well
+    if not keys.filter(pk=record.pk, created_at=record.created_at).update(**claimed):
+        return claim(scope, key, request_fingerprint)
+    for field, value in claimed.items():
+        setattr(record, field, value)
+    return record, True
+
+
+def replay(record: IdempotencyKey) -> Response:
+    """
+    Rebuilds the stored response of a key.
+
+    Args:
+        record (IdempotencyKey): Key of a completed request.
+
+    Returns:
+        Response: The stored response, marked as replayed.
+    """
+    response: Response = Response(record.response_body, status=record.status_code, headers=record.response_headers)
+    response[IDEMPOTENCY["replayed_header"]] = "true"
+    return response
+
+
+def idempotent(view_method: Callable) -> Callable:
+    """
+    Makes a write view method replay its response to retries with the same ``Idempotency-Key``.
+
+    Requests without the header run as usual. The view runs in a transaction
+    that also stores its response, so a key is never left completed for a
+    write that was rolled back; writes to other databases, such as task
+    shards, are not covered by it. Side effects the view defers with
+    ``transaction.on_commit``, such as cache invalidation and events, run
+    once it commits. Only successful responses are stored.
+
+    Usage::
+
+        @idempotent
+        def create(self, request, *args, **kwargs):
+            ...
+
+    Args:
+        view_method (Callable): View method receiving the request.
+
+    Returns:
+        Callable: The wrapped method.
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request: Request, *args, **kwargs) -> Response:
+        key: str | None = request.headers.get(IDEMPOTENCY["header"])
+        if key is None:
+            return view_method(self, request, *args, **kwargs)
+        if not 0 < len(key) <= IDEMPOTENCY["max_key_length"] or not (key.isascii() and key.isprintable()):
+            return Response(
+                {"error": ERROR_MESSAGES["idempotency_key_invalid"].format(max_length=IDEMPOTENCY["max_key_length"])},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        request_fingerprint: str = fingerprint(request)
+        record, claimed = claim(scope_of(request, request_fingerprint), key, request_fingerprint)
+        if not claimed:
+            if record.fingerprint != request_fingerprint:
+                logger.warning(f"Idempotency key {record} reused for {request.method} {request.path}")
+                return Response(
+                    {"error": ERROR_MESSAGES["idempotency_key_reused"]}, status=status.HTTP_422_UNPROCESSABLE_ENTITY
+                )
+            if record.status_code is None:
+                return Response(
+                    {"error": ERROR_MESSAGES["idempotency_key_in_progress"]},
+                    status=status.HTTP_409_CONFLICT,
+                    headers={"Retry-After": "1"},
+                )
+            logger.info(f"Replaying the response of idempotency key {record}")
+            return replay(record)
+
+        try:
+            with transaction.atomic(using=router.db_for_write(IdempotencyKey)):
+                response: Response = view_method(self, request, *args, **kwargs)
+                if status.is_success(response.status_code):
+                    record.status_code = response.status_code
+                    record.response_body = response.data
+                    record.response_headers = {
+                        name: response[name] for name in IDEMPOTENCY["replayed_headers"] if response.has_header(name)
+                    }
+                    record.save(update_fields=["status_code", "response_body", "response_headers"])
+                    return response
+        except Exception:
+            record.delete()
+            raise
+        record.delete()
+        return response
+
+    return wrapper
+
+
+def prune_expired(now: datetime | None = None) -> int:
+    """
+    Deletes the expired keys.
+
+    Args:
+        now (datetime | None): Current time, ``timezone.now()`` by default.
+
+    Returns:
+        int: Number of deleted keys.
+    """
+    deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=now or timezone.now()).delete()
+    return deleted
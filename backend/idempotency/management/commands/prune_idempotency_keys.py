@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from idempotency.keys import prune_expired
+
+
+class Command(BaseCommand):
+    help = "Delete the idempotency keys whose retention period is over"
+
+    def handle(self, *args, **options) -> None:
+        deleted: int = prune_expired()
+        self.stdout.write(f"Deleted {deleted} idempotency keys")
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.1 on 2026-10-19 05:50
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="IdempotencyKey",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("scope", models.CharField(max_length=50, verbose_name="Scope")),
+                ("key", models.CharField(max_length=255, verbose_name="Key")),
+                ("fingerprint", models.CharField(max_length=64, verbose_name="Request fingerprint")),
+                (
+                    "status_code",
+                    models.PositiveSmallIntegerField(blank=True, null=True, verbose_name="Response status"),
+                ),
+                (
+                    "response_body",
+                    models.JSONField(
+                        blank=True,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        null=True,
+                        verbose_name="Response body",
+                    ),
+                ),
+                ("response_headers", models.JSONField(blank=True, default=dict, verbose_name="Response headers")),
+                (
+                    "created_at",
+                    models.DateTimeField(default=django.utils.timezone.now, verbose_name="Creation timestamp"),
+                ),
+                ("expires_at", models.DateTimeField(db_index=True, verbose_name="Expiration timestamp")),
+            ],
+            options={
+                "verbose_name": "Idempotency key",
+                "verbose_name_plural": "Idempotency keys",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="idempotencykey",
+            constraint=models.UniqueConstraint(fields=("scope", "key"), name="idempotency_key_unique_per_scope"),
+        ),
+    ]
@@ -0,0 +1,51 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+from constants import MODEL_VERBOSE_NAMES
+
+
+class IdempotencyKey(models.Model):
+    """
+    A write sent with an ``Idempotency-Key`` header, and its response once it succeeded.
+
+    Retries carrying the same key in the same scope get the stored response
+    back instead of running the write again. Rows are deleted by
+    ``prune_idempotency_keys`` once they expire.
+
+    Attributes:
+        scope (str): Owner of the key, ``user:<id>``, or ``anonymous:<fingerprint prefix>``.
+        key (str): Value of the header, chosen by the client.
+        fingerprint (str): SHA-256 of the method, path and body of the request.
+        status_code (int | None): Status of the response, None while the request runs.
+        response_body (Any): Data of the response.
+        response_headers (dict): Replayed headers of the response.
+        created_at (datetime): When the request started.
+        expires_at (datetime): When the key can be used for another request.
+    """
+
+    scope = models.CharField(max_length=50, verbose_name="Scope")
+    key = models.CharField(max_length=255, verbose_name="Key")
+    fingerprint = models.CharField(max_length=64, verbose_name="Request fingerprint")
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True, verbose_name="Response status")
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder, verbose_name="Response body")
+    response_headers = models.JSONField(default=dict, blank=True, verbose_name="Response headers")
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="Creation timestamp")
+    expires_at = models.DateTimeField(db_index=True, verbose_name="Expiration timestamp")
+
+    def __str__(self) -> str:
+        """
+        String representation of the IdempotencyKey object.
+
+        Returns:
+            str: The scope and value of the key.
+        """
+        return f"{self.scope} {self.key}"
+
+    class Meta:
+        verbose_name = MODEL_VERBOSE_NAMES["idempotency_key"]
+        verbose_name_plural = MODEL_VERBOSE_NAMES["idempotency_keys"]
+        constraints = [
+            # Also the index of the lookups by key
+            models.UniqueConstraint(fields=["scope", "key"], name="idempotency_key_unique_per_scope"),
+        ]
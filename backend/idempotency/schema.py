@@ -0,0 +1,20 @@
+"""
+OpenAPI documentation of idempotent writes, loaded with the schema (see ``task_manager.schema``).
+"""
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+
+from constants import IDEMPOTENCY
+
+# Documents the header on the views decorated with idempotent()
+IDEMPOTENCY_KEY_PARAMETER: OpenApiParameter = OpenApiParameter(
+    name=IDEMPOTENCY["header"],
+    location=OpenApiParameter.HEADER,
+    description=(
+        f"Unique value sent with every attempt of the same write; retries replay the response of the first "
+        f"successful attempt for {IDEMPOTENCY['retention_hours']} hours"
+    ),
+    required=False,
+    type=OpenApiTypes.STR,
+)
@@ -0,0 +1,159 @@
+import io
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from datetime import date, timedelta
+from typing import Callable, Tuple
+from idempotency.models import IdempotencyKey
+from tasks.cache import get_user_tasks_version
+from tasks.models import Task
+from constants import IDEMPOTENCY
+
+HEADER: str = "HTTP_IDEMPOTENCY_KEY"
+
+
+@pytest.mark.django_db
+class TestIdempotentTaskCreation:
+    @pytest.fixture(autouse=True)
+    def setup(self, authenticated_client: Tuple[APIClient, User]) -> None:
+        """Initial setup for all tests"""
+        self.client, self.user = authenticated_client
+        self.url: str = reverse("task-list")
+        start: date = date.today() + timedelta(days=3)
+        self.task_data: dict = {
+            "title": "Retried task",
+            "start_date": start.isoformat(),
+            "due_date": start.isoformat(),
+            "user": self.user.id,
+        }
+
+    def create(self, key: str | None = "key-1", client: APIClient | None = None, **changes) -> Response:
+        """Posts the task, with an Idempotency-Key header unless the key is None."""
+        headers: dict = {HEADER: key} if key is not None else {}
+        return (client or self.client).post(self.url, {**self.task_data, **changes}, format="json", **headers)
+
+    def test_retry_replays_the_created_task(self, query_budget: Callable) -> None:
+        """Test that a retry gets the first response back without creating or validating again."""
+        first: Response = self.create()
+        with query_budget("task-create:replay"):
+            retry: Response = self.create()
+
+        assert first.status_code == retry.status_code == status.HTTP_201_CREATED
+        assert retry.data == first.data
+        assert retry[IDEMPOTENCY["replayed_header"]] == "true"
+        assert retry["ETag"] == first["ETag"]
+        assert IDEMPOTENCY["replayed_header"] not in first
+        # Without the key, the same task would be refused as overlapping the first one
+        assert Task.objects.filter(user=self.user, title="Retried task").count() == 1
+        assert self.create(key=None).status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_first_attempt_stays_within_its_query_budget(self, query_budget: Callable) -> None:
+        """Test that claiming the key and storing the response add a bounded number of queries."""
+        with query_budget("task-create:idempotent"):
+            response: Response = self.create()
+
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_key_reused_for_another_request_is_rejected(self, user_factory: Callable) -> None:
+        """Test that a key cannot be reused with another body, while other users have their own keys."""
+        self.create()
+        other: APIClient = APIClient()
+        other_user: User = user_factory(username="other")
+        other.force_authenticate(user=other_user)
+
+        assert self.create(title="Another task").status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert self.create(client=other, user=other_user.id).status_code == status.HTTP_201_CREATED
+
+    def test_failed_attempt_releases_the_key(self) -> None:
+        """Test that a rejected request stores nothing, so it can be corrected and retried."""
+        assert self.create(title="").status_code == status.HTTP_400_BAD_REQUEST
+        assert not IdempotencyKey.objects.exists()
+
+        assert self.create().status_code == status.HTTP_201_CREATED
+        assert IdempotencyKey.objects.get().status_code == status.HTTP_201_CREATED
+
+    def test_key_of_a_running_request_is_locked_until_it_times_out(self) -> None:
+        """Test that a concurrent retry gets 409, and that the key of a request that died is taken over."""
+        self.create()
+        # The first attempt died before committing its task
+        Task.objects.filter(user=self.user).delete()
+        IdempotencyKey.objects.update(status_code=None, response_body=None)
+
+        response: Response = self.create()
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response["Retry-After"] == "1"
+
+        IdempotencyKey.objects.update(
+            created_at=timezone.now() - timedelta(seconds=IDEMPOTENCY["lock_timeout_seconds"] + 1)
+        )
+        assert self.create().status_code == status.HTTP_201_CREATED
+        assert Task.objects.filter(user=self.user).count() == 1
+
+    def test_cache_is_invalidated_after_commit(self, django_capture_on_commit_callbacks: Callable) -> None:
+        """Test that the task version is bumped once the write committed, so no reader caches it before."""
+        version: int = get_user_tasks_version(self.user.id)
+        with django_capture_on_commit_callbacks() as callbacks:
+            assert self.create().status_code == status.HTTP_201_CREATED
+            assert get_user_tasks_version(self.user.id) == version
+
+        for callback in callbacks:
+            callback()
+        assert get_user_tasks_version(self.user.id) > version
+
+    def test_invalid_keys_are_rejected(self) -> None:
+        """Test that empty, overlong and non-printable keys are refused."""
+        for key in ("", "k" * (IDEMPOTENCY["max_key_length"] + 1), "tab\tkey"):
+            assert self.create(key=key).status_code == status.HTTP_400_BAD_REQUEST
+        assert not Task.objects.filter(title="Retried task").exists()
+
+
+@pytest.mark.django_db
+class TestIdempotentRegistration:
+    def test_retry_registers_the_user_once(self) -> None:
+        """Test that a retried registration returns the registered user instead of a duplicate error."""
+        api_client: APIClient = APIClient()
+        data: dict = {
+            "username": "retrying",
+            "email": "retrying@example.com",
+            "password": "StrongP@ssw0rd",
+            "password_confirm": "StrongP@ssw0rd",
+        }
+        first: Response = api_client.post(reverse("register"), data, format="json", **{HEADER: "signup-1"})
+        retry: Response = api_client.post(reverse("register"), data, format="json", **{HEADER: "signup-1"})
+
+        assert first.status_code == retry.status_code == status.HTTP_201_CREATED
+        assert retry.data == first.data
+        assert User.objects.filter(username="retrying").count() == 1
+
+    def test_anonymous_clients_do_not_share_keys(self) -> None:
+        """Test that two clients registering with the same key each get their own user."""
+        for username in ("first", "second"):
+            data: dict = {
+                "username": username,
+                "email": f"{username}@example.com",
+                "password": "StrongP@ssw0rd",
+                "password_confirm": "StrongP@ssw0rd",
+            }
+            response: Response = APIClient().post(reverse("register"), data, format="json", **{HEADER: "signup-1"})
+            assert response.status_code == status.HTTP_201_CREATED
+            assert response.data["username"] == username
+
+
+@pytest.mark.django_db
+class TestPruneIdempotencyKeys:
+    def test_deletes_only_expired_keys(self) -> None:
+        """Test that the command deletes the keys past their retention period."""
+        now = timezone.now()
+        IdempotencyKey.objects.create(scope="anonymous", key="old", fingerprint="", expires_at=now - timedelta(hours=1))
+        IdempotencyKey.objects.create(scope="anonymous", key="new", fingerprint="", expires_at=now + timedelta(hours=1))
+        out: io.StringIO = io.StringIO()
+
+        call_command("prune_idempotency_keys", stdout=out)
+
+        assert "Deleted 1 idempotency keys" in out.getvalue()
+        assert list(IdempotencyKey.objects.values_list("key", flat=True)) == ["new"]
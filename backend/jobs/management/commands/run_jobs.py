@@ -0,0 +1,41 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from constants import JOBS
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = "Process background jobs from the database queue"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--concurrency", type=int, default=1, help="number of worker threads")
+        parser.add_argument(
+            "--batch-size", type=int, default=JOBS["batch_size"], help="maximum jobs claimed at once per thread"
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=JOBS["poll_interval_seconds"],
+            help="seconds to wait when the queue is empty",
+        )
+        parser.add_argument(
+            "--lock-timeout",
+            type=int,
+            default=JOBS["lock_timeout_seconds"],
+            help="seconds after which jobs locked by a dead worker are retried",
+        )
+        parser.add_argument("--once", action="store_true", help="process the due jobs and exit")
+
+    def handle(self, *args, **options) -> None:
+        worker: Worker = Worker(
+            concurrency=options["concurrency"],
+            batch_size=options["batch_size"],
+            poll_interval=options["poll_interval"],
+            lock_timeout=options["lock_timeout"],
+        )
+        # Finish the current batch on shutdown instead of leaving jobs locked
+        signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+        signal.signal(signal.SIGINT, lambda *_: worker.stop())
+        worker.run(once=options["once"])
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.1 on 2026-10-19 04:57
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Job",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=100, verbose_name="Handler name")),
+                ("payload", models.JSONField(blank=True, default=dict, verbose_name="Payload")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("pending", "Pending"), ("running", "Running"), ("failed", "Failed")],
+                        default="pending",
+                        max_length=10,
+                        verbose_name="Status",
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0, verbose_name="Attempts")),
+                ("max_attempts", models.PositiveIntegerField(default=5, verbose_name="Max attempts")),
+                ("run_at", models.DateTimeField(default=django.utils.timezone.now, verbose_name="Run at")),
+                ("locked_by", models.CharField(blank=True, max_length=100, verbose_name="Locked by")),
+                ("locked_at", models.DateTimeField(blank=True, null=True, verbose_name="Locked at")),
+                ("last_error", models.TextField(blank=True, verbose_name="Last error")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Created at")),
+            ],
+            options={
+                "verbose_name": "Job",
+                "verbose_name_plural": "Jobs",
+                "indexes": [
+                    models.Index(fields=["status", "run_at"], name="jobs_job_status_f5c023_idx"),
+                    models.Index(fields=["locked_by"], name="jobs_job_locked__520837_idx"),
+                ],
+            },
+        ),
+    ]
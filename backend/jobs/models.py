@@ -0,0 +1,46 @@
+from django.db import models
+from django.utils import timezone
+from constants import JOBS, MODEL_VERBOSE_NAMES
+
+
+class Job(models.Model):
+    """
+    Unit of background work waiting in the database-backed queue.
+
+    Jobs are claimed by ``run_jobs`` workers, deleted once their handler
+    succeeds and kept with the ``failed`` status once they run out of attempts.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        FAILED = "failed", "Failed"
+
+    name = models.CharField(max_length=100, verbose_name="Handler name")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="Payload")
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING, verbose_name="Status")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Attempts")
+    max_attempts = models.PositiveIntegerField(default=JOBS["max_attempts"], verbose_name="Max attempts")
+    run_at = models.DateTimeField(default=timezone.now, verbose_name="Run at")
+    locked_by = models.CharField(max_length=100, blank=True, verbose_name="Locked by")
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name="Locked at")
+    last_error = models.TextField(blank=True, verbose_name="Last error")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created at")
+
+    def __str__(self) -> str:
+        """
+        String representation of the Job object.
+
+        Returns:
+            str: The handler name and id of the job.
+        """
+        return f"{self.name} #{self.pk}"
+
+    class Meta:
+        verbose_name = MODEL_VERBOSE_NAMES["job"]
+        verbose_name_plural = MODEL_VERBOSE_NAMES["jobs"]
+        indexes = [
+            # Claim query: pending jobs that are due, oldest first
+            models.Index(fields=["status", "run_at"]),
+            models.Index(fields=["locked_by"]),
+        ]
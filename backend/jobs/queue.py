@@ -0,0 +1,203 @@
+import logging
+import random
+import traceback
+import uuid
+from datetime import datetime, timedelta
+from itertools import groupby
+
+from django.db import connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from constants import JOBS
+from jobs.models import Job
+from jobs.registry import JobHandler, get_handler
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+def enqueue(
+    name: str, payload: dict | None = None, delay: timedelta | None = None, max_attempts: int | None = None
+) -> Job:
+    """
+    Adds a job to the queue.
+
+    The job is a row in the same database as the request data, so enqueueing
+    inside a transaction makes the job visible only if the transaction commits.
+
+    Args:
+        name (str): Name of a registered handler.
+        payload (dict | None): JSON-serializable arguments of the handler.
+        delay (timedelta | None): Run the job no earlier than this from now.
+        max_attempts (int | None): Attempts before the job fails permanently.
+
+    Returns:
+        Job: The queued job.
+    """
+    job: Job = Job.objects.create(
+        name=name,
+        payload=payload or {},
+        run_at=timezone.now() + (delay or timedelta()),
+        max_attempts=max_attempts or JOBS["max_attempts"],
+    )
+    logger.debug(f"Job {job} enqueued")
+    return job
+
+
+def backoff(attempts: int) -> timedelta:
+    """
+    Returns the delay before retrying a job that failed ``attempts`` times.
+
+    The delay doubles with every attempt up to a maximum, with a 10% jitter so
+    that jobs failing together do not retry together.
+
+    Args:
+        attempts (int): Number of attempts made so far.
+
+    Returns:
+        timedelta: Delay before the next attempt.
+    """
+    seconds: float = min(JOBS["backoff_base_seconds"] * 2 ** max(attempts - 1, 0), JOBS["backoff_max_seconds"])
+    return timedelta(seconds=seconds * random.uniform(0.9, 1.1))
+
+
+def claim(worker: str, limit: int) -> list[Job]:
+    """
+    Locks up to ``limit`` due jobs for a worker.
+
+    On PostgreSQL the candidate rows are selected with ``FOR UPDATE SKIP LOCKED``,
+    so concurrent workers never wait on each other. Other backends (SQLite)
+    claim with a single ``UPDATE ... WHERE id IN (SELECT ... LIMIT n)``
+    statement, which takes the write lock at once instead of upgrading a read
+    lock, and whose ``status = 'pending'`` condition skips jobs claimed meanwhile.
+
+    Args:
+        worker (str): Name of the claiming worker.
+        limit (int): Maximum number of jobs to claim.
+
+    Returns:
+        list[Job]: The claimed jobs, with their attempt counted, oldest first.
+    """
+    alias: str = router.db_for_write(Job)
+    now: datetime = timezone.now()
+    token: str = f"{worker}:{uuid.uuid4().hex[:12]}"
+    jobs = Job.objects.using(alias)
+    candidates = jobs.filter(status=Job.Status.PENDING, run_at__lte=now).order_by("run_at", "id")
+    changes: dict = {
+        "status": Job.Status.RUNNING,
+        "locked_by": token,
+        "locked_at": now,
+        "attempts": F("attempts") + 1,
+    }
+
+    if connections[alias].features.has_select_for_update_skip_locked:
+        with transaction.atomic(using=alias):
+            ids: list[int] = list(candidates.select_for_update(skip_locked=True).values_list("id", flat=True)[:limit])
+            if not ids:
+                return []
+            jobs.filter(id__in=ids).update(**changes)
+    elif not jobs.filter(id__in=candidates.values("id")[:limit], status=Job.Status.PENDING).update(**changes):
+        return []
+
+    return list(jobs.filter(locked_by=token).order_by("run_at", "id"))
+
+
+def release_stale(timeout: timedelta | None = None) -> int:
+    """
+    Returns jobs locked by a worker that died to the queue.
+
+    Args:
+        timeout (timedelta | None): Age of a lock after which it is considered stale.
+
+    Returns:
+        int: Number of released jobs.
+    """
+    timeout = timeout or timedelta(seconds=JOBS["lock_timeout_seconds"])
+    released: int = Job.objects.filter(status=Job.Status.RUNNING, locked_at__lt=timezone.now() - timeout).update(
+        status=Job.Status.PENDING, locked_by="", locked_at=None
+    )
+    if released:
+        logger.warning(f"Released {released} stale jobs")
+    return released
+
+
+def succeed(jobs: list[Job]) -> None:
+    """
+    Removes processed jobs from the queue.
+
+    Args:
+        jobs (list[Job]): Jobs whose handler succeeded.
+    """
+    Job.objects.filter(id__in=[job.id for job in jobs]).delete()
+
+
+def fail(jobs: list[Job], error: str) -> None:
+    """
+    Schedules a retry of failed jobs, or marks them as failed for good.
+
+    Args:
+        jobs (list[Job]): Jobs whose handler raised.
+        error (str): Error to store on the jobs.
+    """
+    now: datetime = timezone.now()
+    for job in jobs:
+        job.last_error = error[: JOBS["max_error_length"]]
+        job.locked_by = ""
+        job.locked_at = None
+        if job.attempts >= job.max_attempts:
+            job.status = Job.Status.FAILED
+            logger.error(f"Job {job} failed after {job.attempts} attempts: {error.splitlines()[-1]}")
+        else:
+            job.status = Job.Status.PENDING
+            job.run_at = now + backoff(job.attempts)
+            logger.warning(f"Job {job} failed (attempt {job.attempts}), retrying at {job.run_at.isoformat()}")
+    Job.objects.bulk_update(jobs, ["status", "run_at", "locked_by", "locked_at", "last_error"])
+
+
+def execute(handler: JobHandler, jobs: list[Job]) -> None:
+    """
+    Runs a handler on jobs of its name inside a transaction.
+
+    Batch handlers get all payloads in one call and succeed or fail together.
+
+    Args:
+        handler (JobHandler): Handler of the jobs.
+        jobs (list[Job]): Claimed jobs of the handler's name.
+    """
+    groups: list[list[Job]] = [jobs] if handler.batch else [[job] for job in jobs]
+    for group in groups:
+        try:
+            with transaction.atomic():
+                if handler.batch:
+                    handler.function([job.payload for job in group])
+                else:
+                    handler.function(group[0].payload)
+        except Exception:
+            fail(group, traceback.format_exc())
+        else:
+            succeed(group)
+
+
+def process(worker: str, batch_size: int = JOBS["batch_size"]) -> int:
+    """
+    Claims a batch of due jobs and runs them.
+
+    Args:
+        worker (str): Name of the worker.
+        batch_size (int): Maximum number of jobs claimed at once.
+
+    Returns:
+        int: Number of jobs claimed.
+    """
+    jobs: list[Job] = claim(worker, batch_size)
+    for name, group in groupby(sorted(jobs, key=lambda job: job.name), key=lambda job: job.name):
+        handler: JobHandler | None = get_handler(name)
+        claimed: list[Job] = list(group)
+        if handler is None:
+            for job in claimed:
+                job.attempts = job.max_attempts
+            fail(claimed, f"No handler registered for job {name}")
+            continue
+        execute(handler, claimed)
+    return len(jobs)
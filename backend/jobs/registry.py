@@ -0,0 +1,62 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class JobHandler:
+    """
+    Function registered to process jobs of a given name.
+
+    Attributes:
+        name (str): Job name, conventionally ``<app>.<action>``.
+        function (Callable): Receives the payload, or the list of payloads for batch handlers.
+        batch (bool): Whether the claimed jobs of this name are processed in a single call.
+    """
+
+    name: str
+    function: Callable[[Any], None]
+    batch: bool = False
+
+
+HANDLERS: dict[str, JobHandler] = {}
+
+
+def job(name: str, batch: bool = False) -> Callable:
+    """
+    Registers a function as the handler of a job name.
+
+    Usage::
+
+        @job("tasks.deliver_reminders")
+        def deliver_reminders_job(payload: dict) -> None:
+            ...
+
+    Args:
+        name (str): Job name.
+        batch (bool): Process all claimed jobs of this name in one call.
+
+    Returns:
+        Callable: Decorator returning the function unchanged.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        if name in HANDLERS and HANDLERS[name].function is not function:
+            raise ValueError(f"A handler is already registered for job {name}")
+        HANDLERS[name] = JobHandler(name, function, batch)
+        return function
+
+    return decorator
+
+
+def get_handler(name: str) -> JobHandler | None:
+    """
+    Returns the handler registered for a job name.
+
+    Args:
+        name (str): Job name.
+
+    Returns:
+        JobHandler | None: The handler, None if the name is unknown.
+    """
+    return HANDLERS.get(name)
@@ -0,0 +1,119 @@
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.utils import timezone
+from jobs.models import Job
+from jobs.queue import backoff, claim, enqueue, process, release_stale
+from jobs.registry import job
+
+calls: list = []
+
+
+@job("tests.echo")
+def echo(payload: dict) -> None:
+    calls.append(payload)
+
+
+@job("tests.echo_batch", batch=True)
+def echo_batch(payloads: list[dict]) -> None:
+    calls.append(payloads)
+
+
+@job("tests.fail")
+def always_fail(payload: dict) -> None:
+    raise RuntimeError("boom")
+
+
+@pytest.mark.django_db
+class TestJobQueue:
+    @pytest.fixture(autouse=True)
+    def setup(self) -> None:
+        """Start every test with no recorded handler calls."""
+        calls.clear()
+
+    def test_processed_job_is_removed(self) -> None:
+        """Test that a successful job runs its handler and leaves the queue."""
+        enqueue("tests.echo", {"value": 1})
+
+        assert process("worker") == 1
+        assert calls == [{"value": 1}]
+        assert not Job.objects.exists()
+
+    def test_batch_handler_receives_all_payloads(self) -> None:
+        """Test that jobs of a batch handler are processed in a single call."""
+        for value in range(3):
+            enqueue("tests.echo_batch", {"value": value})
+
+        process("worker")
+
+        assert calls == [[{"value": 0}, {"value": 1}, {"value": 2}]]
+
+    def test_failed_job_is_retried_with_backoff(self) -> None:
+        """Test that a failing job goes back to the queue with a delay."""
+        queued: Job = enqueue("tests.fail")
+
+        process("worker")
+
+        queued.refresh_from_db()
+        assert queued.status == Job.Status.PENDING
+        assert queued.attempts == 1
+        assert queued.run_at > timezone.now()
+        assert "RuntimeError: boom" in queued.last_error
+        assert process("worker") == 0
+
+    def test_job_fails_permanently_after_max_attempts(self) -> None:
+        """Test that a job is kept as failed once it has no attempts left."""
+        queued: Job = enqueue("tests.fail", max_attempts=1)
+
+        process("worker")
+
+        queued.refresh_from_db()
+        assert queued.status == Job.Status.FAILED
+
+    def test_unknown_job_fails_permanently(self) -> None:
+        """Test that a job without a registered handler is not retried."""
+        queued: Job = enqueue("tests.unknown")
+
+        process("worker")
+
+        queued.refresh_from_db()
+        assert queued.status == Job.Status.FAILED
+        assert "No handler registered" in queued.last_error
+
+    def test_claims_do_not_overlap(self) -> None:
+        """Test that a job is claimed by a single worker and future jobs are not claimed."""
+        for _ in range(3):
+            enqueue("tests.echo")
+        enqueue("tests.echo", delay=timedelta(hours=1))
+
+        first: list[Job] = claim("first", 2)
+        second: list[Job] = claim("second", 10)
+
+        assert len(first) == 2
+        assert len(second) == 1
+        assert {job.id for job in first}.isdisjoint(job.id for job in second)
+        assert all(job.status == Job.Status.RUNNING and job.attempts == 1 for job in first + second)
+
+    def test_stale_locks_are_released(self) -> None:
+        """Test that jobs of a dead worker return to the queue."""
+        enqueue("tests.echo")
+        claimed: list[Job] = claim("dead", 1)
+        Job.objects.filter(id=claimed[0].id).update(locked_at=timezone.now() - timedelta(hours=1))
+
+        assert release_stale(timedelta(minutes=10)) == 1
+        assert Job.objects.get().status == Job.Status.PENDING
+
+    def test_backoff_grows_exponentially(self) -> None:
+        """Test that retry delays double with every attempt, with jitter."""
+        assert timedelta(seconds=9) <= backoff(1) <= timedelta(seconds=11)
+        assert timedelta(seconds=36) <= backoff(3) <= timedelta(seconds=44)
+
+    def test_run_jobs_command_processes_due_jobs(self) -> None:
+        """Test that the worker command drains the queue with --once."""
+        enqueue("tests.echo", {"value": 1})
+        enqueue("tests.echo", {"value": 2})
+
+        call_command("run_jobs", "--once", "--batch-size", "1")
+
+        assert calls == [{"value": 1}, {"value": 2}]
+        assert not Job.objects.exists()
@@ -0,0 +1,107 @@
+import logging
+import os
+import socket
+import threading
+from datetime import timedelta
+
+from django.db import close_old_connections, connections
+
+from constants import JOBS
+from jobs.queue import process, release_stale
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """
+    Processes queued jobs with a pool of threads.
+
+    Each thread claims batches of jobs on its own database connection and
+    sleeps for ``poll_interval`` seconds whenever the queue is empty.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 1,
+        batch_size: int = JOBS["batch_size"],
+        poll_interval: float = JOBS["poll_interval_seconds"],
+        lock_timeout: int = JOBS["lock_timeout_seconds"],
+        name: str | None = None,
+    ) -> None:
+        self.concurrency: int = concurrency
+        self.batch_size: int = batch_size
+        self.poll_interval: float = poll_interval
+        self.lock_timeout: timedelta = timedelta(seconds=lock_timeout)
+        self.name: str = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping: threading.Event = threading.Event()
+
+    def stop(self) -> None:
+        """Asks the threads to stop after their current batch."""
+        self.stopping.set()
+
+    def drain(self, thread_name: str) -> int:
+        """
+        Processes jobs until none is due.
+
+        Args:
+            thread_name (str): Name of the worker thread, used in the job locks.
+
+        Returns:
+            int: Number of jobs processed.
+        """
+        total: int = 0
+        while not self.stopping.is_set():
+            processed: int = process(thread_name, self.batch_size)
+            if not processed:
+                break
+            total += processed
+        return total
+
+    def loop(self, index: int, once: bool) -> None:
+        """
+        Body of a worker thread.
+
+        Args:
+            index (int): Number of the thread.
+            once (bool): Stop as soon as the queue is empty.
+        """
+        thread_name: str = f"{self.name}:{index}"
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                try:
+                    release_stale(self.lock_timeout)
+                    self.drain(thread_name)
+                except Exception:
+                    # Database errors (e.g. a locked SQLite file) must not kill the worker
+                    logger.exception(f"Worker {thread_name} failed to process jobs")
+                if once:
+                    break
+                self.stopping.wait(self.poll_interval)
+        finally:
+            connections.close_all()
+
+    def run(self, once: bool = False) -> None:
+        """
+        Starts the threads and waits for them to finish.
+
+        A single-threaded worker runs in the calling thread.
+
+        Args:
+            once (bool): Process the due jobs and return instead of polling forever.
+        """
+        logger.info(f"Worker {self.name} started with {self.concurrency} threads")
+        if self.concurrency == 1:
+            self.loop(0, once)
+            logger.info(f"Worker {self.name} stopped")
+            return
+        threads: list[threading.Thread] = [
+            threading.Thread(target=self.loop, args=(index, once), name=f"jobs-{index}", daemon=True)
+            for index in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logger.info(f"Worker {self.name} stopped")
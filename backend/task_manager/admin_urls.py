@@ -0,0 +1,16 @@
+"""
+URLs of the admin site, imported on the first request to ``/admin/``.
+
+Admin modules pull in forms, widgets and every ``ModelAdmin`` of the
+project, which API workers never need: they are discovered here rather
+than when the application starts (see ``SimpleAdminConfig`` in
+``INSTALLED_APPS``).
+"""
+
+from django.contrib import admin
+
+admin.autodiscover()
+
+app_name = "admin"
+
+urlpatterns = admin.site.get_urls()
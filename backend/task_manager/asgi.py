@@ -3,6 +3,9 @@ ASGI config for task_manager project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The event stream (``EVENTS["path"]``) is served by its own lightweight ASGI
+application; every other request goes through Django.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -13,4 +16,20 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "task_manager.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once Django is set up, as they load models
+from constants import EVENTS  # noqa: E402
+from events.sse import EventStreamApplication  # noqa: E402
+
+events_application = EventStreamApplication()
+
+
+async def application(scope: dict, receive, send) -> None:
+    """
+    Routes the event stream to its application and everything else to Django.
+    """
+    if scope["type"] == "http" and scope["path"] == EVENTS["path"]:
+        await events_application(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
@@ -0,0 +1,259 @@
+"""
+Project-wide middleware.
+"""
+
+import gzip
+import logging
+
+from django.conf import settings
+from django.contrib.auth import middleware as auth_middleware
+from django.contrib.messages import middleware as messages_middleware
+from django.contrib.sessions import middleware as sessions_middleware
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.middleware import clickjacking, csrf
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from constants import API_PATH_PREFIX
+from task_manager.routers import mark_recent_write, use_replica, wrote_recently
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """
+    Parses an ``Accept-Encoding`` header into codings and their quality values.
+
+    Args:
+        header (str): Header value, e.g. ``"br;q=1.0, gzip;q=0.8, *;q=0"``.
+
+    Returns:
+        dict[str, float]: Quality value of each listed coding.
+    """
+    codings: dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        quality: float = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        codings[coding.strip().lower()] = quality
+    return codings
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compresses responses with brotli or gzip, as negotiated with the client.
+
+    Only responses of at least ``COMPRESSION_MIN_SIZE`` bytes are compressed,
+    since small payloads gain nothing but CPU time. Streaming responses
+    (e.g. server-sent events) and already encoded responses are left alone.
+    Brotli requires the optional ``brotli`` package.
+
+    Only API responses are compressed. The admin and other HTML pages carry
+    CSRF tokens next to content reflected from the request, which makes
+    their compressed size leak the token (BREACH); API requests authenticate
+    with bearer tokens and get no CSRF token.
+    """
+
+    def __init__(self, get_response) -> None:
+        super().__init__(get_response)
+        self.min_size: int = settings.COMPRESSION_MIN_SIZE
+        self.gzip_level: int = settings.COMPRESSION_GZIP_LEVEL
+        self.brotli_quality: int = settings.COMPRESSION_BROTLI_QUALITY
+
+    def select_encoding(self, request: HttpRequest) -> str | None:
+        """
+        Picks the best content coding accepted by the client.
+
+        Args:
+            request (HttpRequest): Incoming request.
+
+        Returns:
+            str | None: ``"br"``, ``"gzip"`` or None if neither is acceptable.
+        """
+        accepted: dict[str, float] = parse_accept_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        wildcard: float = accepted.get("*", 0.0)
+        candidates: list[str] = ["br", "gzip"] if brotli is not None else ["gzip"]
+        ranked: list[tuple[float, str]] = [
+            (accepted.get(coding, wildcard), coding) for coding in candidates if accepted.get(coding, wildcard) > 0
+        ]
+        # max() keeps the first candidate (brotli) on equal quality values
+        return max(ranked, key=lambda item: item[0])[1] if ranked else None
+
+    def compress(self, content: bytes, encoding: str) -> bytes:
+        """
+        Compresses a response body.
+
+        Args:
+            content (bytes): Body to compress.
+            encoding (str): ``"br"`` or ``"gzip"``.
+
+        Returns:
+            bytes: Compressed body.
+        """
+        if encoding == "br":
+            return brotli.compress(content, quality=self.brotli_quality)
+        return gzip.compress(content, compresslevel=self.gzip_level, mtime=0)
+
+    def process_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        """
+        Compresses the response if it is large enough and the client accepts it.
+
+        Args:
+            request (HttpRequest): Incoming request.
+            response (HttpResponse): Outgoing response.
+
+        Returns:
+            HttpResponse: The response, compressed or untouched.
+        """
+        if not is_api_request(request) or response.streaming or response.has_header("Content-Encoding"):
+            return response
+        if len(response.content) < self.min_size:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding: str | None = self.select_encoding(request)
+        if encoding is None:
+            return response
+
+        compressed: bytes = self.compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+
+        logger.debug(f"Compressed {request.path} with {encoding}: {len(response.content)} -> {len(compressed)} bytes")
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        response.headers["Content-Encoding"] = encoding
+
+        # The body is no longer byte-identical, so a strong ETag becomes weak (RFC 9110 8.8.1)
+        etag: str | None = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        return response
+
+
+class ReplicaMiddleware:
+    """
+    Serves safe requests from a read replica, with read-your-writes consistency.
+
+    A successful unsafe request marks its user as a recent writer, whose
+    requests keep reading from the primary for ``DATABASE_REPLICA_STICKY_SECONDS``
+    so that they never miss their own changes. The user of a safe request is
+    read from its access token without querying the database. The middleware
+    is disabled when no replica is configured.
+    """
+
+    def __init__(self, get_response) -> None:
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.authentication: JWTAuthentication = JWTAuthentication()
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if request.method not in SAFE_METHODS:
+            response: HttpResponse = self.get_response(request)
+            # DRF sets the user authenticated by the view on the Django request
+            user = getattr(request, "user", None)
+            if response.status_code < 400 and user is not None and user.is_authenticated:
+                mark_recent_write(user.pk)
+            return response
+
+        user_id: int | None = self.get_user_id(request)
+        if user_id is not None and wrote_recently(user_id):
+            return self.get_response(request)
+        with use_replica():
+            return self.get_response(request)
+
+    def get_user_id(self, request: HttpRequest) -> int | None:
+        """
+        Reads the user id of a request's access token.
+
+        The token is only decoded: the view still authenticates the request.
+
+        Args:
+            request (HttpRequest): Incoming request.
+
+        Returns:
+            int | None: Id of the user, None for anonymous requests or invalid tokens.
+        """
+        header: bytes | None = self.authentication.get_header(request)
+        if not header:
+            return None
+        try:
+            raw_token: bytes | None = self.authentication.get_raw_token(header)
+            return AccessToken(raw_token)[jwt_settings.USER_ID_CLAIM] if raw_token else None
+        except (AuthenticationFailed, TokenError, KeyError):
+            return None
+
+
+def is_api_request(request: HttpRequest) -> bool:
+    """
+    Tells whether a request targets the JSON API rather than the admin or other HTML pages.
+
+    Args:
+        request (HttpRequest): Incoming request.
+
+    Returns:
+        bool: True if the path starts with ``API_PATH_PREFIX``.
+    """
+    return request.path_info.startswith(API_PATH_PREFIX)
+
+
+class BrowserOnlyMixin:
+    """
+    Skips a middleware of the browser pages for API requests.
+
+    API requests authenticate with access tokens, so sessions, CSRF tokens,
+    flash messages and frame options only serve the admin: the subclasses
+    below replace Django's middleware in ``MIDDLEWARE`` and pass API
+    requests straight to the next one. Being subclasses, they still satisfy
+    the admin's system checks.
+    """
+
+    def __call__(self, request: HttpRequest):
+        if is_api_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionMiddleware(BrowserOnlyMixin, sessions_middleware.SessionMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(BrowserOnlyMixin, csrf.CsrfViewMiddleware):
+    def process_view(self, request: HttpRequest, callback, callback_args, callback_kwargs) -> HttpResponse | None:
+        if is_api_request(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class AuthenticationMiddleware(BrowserOnlyMixin, auth_middleware.AuthenticationMiddleware):
+    # DRF sets request.user on API requests once the view authenticated them
+    pass
+
+
+class MessageMiddleware(BrowserOnlyMixin, messages_middleware.MessageMiddleware):
+    pass
+
+
+class XFrameOptionsMiddleware(BrowserOnlyMixin, clickjacking.XFrameOptionsMiddleware):
+    pass
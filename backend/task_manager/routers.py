@@ -0,0 +1,93 @@
+"""
+Database routing between the primary database and its read replicas.
+
+Reads go to the primary unless a request opted in with ``use_replica()``,
+which ``task_manager.middleware.ReplicaMiddleware`` does for the safe
+requests of users who did not write recently. Management commands, jobs
+and every write therefore keep reading from the primary, where they see
+their own changes.
+
+Replicas are configured with ``DATABASE_REPLICA_URLS`` and named
+``replica_0``, ``replica_1``, ... in ``DATABASES``.
+"""
+
+import random
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+# Cache key marking a user whose reads must hit the primary
+RECENT_WRITE_KEY: str = "db:recent-write:{user_id}"
+
+# Database serving the reads of the current request, None for the primary
+_read_alias: ContextVar[str | None] = ContextVar("read_alias", default=None)
+
+
+@contextmanager
+def use_replica() -> Iterator[str | None]:
+    """
+    Routes the reads of the enclosed block to a randomly chosen replica.
+
+    All reads of the block use the same replica, so they see a consistent
+    snapshot. Without configured replicas, reads stay on the primary.
+
+    Yields:
+        str | None: Alias of the chosen replica, None if there is none.
+    """
+    alias: str | None = random.choice(settings.DATABASE_REPLICAS) if settings.DATABASE_REPLICAS else None
+    token = _read_alias.set(alias)
+    try:
+        yield alias
+    finally:
+        _read_alias.reset(token)
+
+
+def mark_recent_write(*user_ids: int | None) -> None:
+    """
+    Pins the reads of users to the primary until the replicas caught up with a write.
+
+    Args:
+        *user_ids: Ids of the users whose data changed. ``None`` values are ignored.
+    """
+    if not settings.DATABASE_REPLICAS:
+        return
+    keys: dict[str, bool] = {
+        RECENT_WRITE_KEY.format(user_id=user_id): True for user_id in user_ids if user_id is not None
+    }
+    cache.set_many(keys, timeout=settings.DATABASE_REPLICA_STICKY_SECONDS)
+
+
+def wrote_recently(user_id: int) -> bool:
+    """
+    Checks whether a user's reads must hit the primary.
+
+    Args:
+        user_id (int): Id of the user.
+
+    Returns:
+        bool: True if the user's data changed within ``DATABASE_REPLICA_STICKY_SECONDS``.
+    """
+    return cache.get(RECENT_WRITE_KEY.format(user_id=user_id), False)
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of ``use_replica()`` blocks to a replica, everything else to the primary.
+
+    Related objects are read from the primary too, not from the database of
+    the instance they were reached from, which may be a task shard.
+    """
+
+    def db_for_read(self, model, **hints) -> str:
+        return _read_alias.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints) -> str:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        # Replicas hold the same rows as the primary
+        return True
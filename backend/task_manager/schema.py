@@ -0,0 +1,30 @@
+"""
+Loading of the OpenAPI documentation of the views.
+
+The views carry no ``extend_schema`` decorators, which would import
+drf-spectacular in every worker. Their documentation lives in the
+``schema`` module of their app, as ``OpenApiViewExtension`` classes that
+drf-spectacular applies when it generates the schema. The modules are
+imported by ``load_view_extensions()``, a preprocessing hook, which
+drf-spectacular calls before it inspects the views.
+"""
+
+from importlib import import_module
+
+# Modules documenting the views of each app
+SCHEMA_MODULES: tuple[str, ...] = ("diagnostics.schema", "tasks.schema", "users.schema")
+
+
+def load_view_extensions(endpoints: list[tuple]) -> list[tuple]:
+    """
+    Registers the view documentation of the apps.
+
+    Args:
+        endpoints (list[tuple]): ``(path, path_regex, method, callback)`` of every endpoint.
+
+    Returns:
+        list[tuple]: The endpoints, unchanged.
+    """
+    for module in SCHEMA_MODULES:
+        import_module(module)
+    return endpoints
@@ -15,6 +15,7 @@ from pathlib import Path
 from datetime import timedelta
 import dj_database_url
 from dotenv import load_dotenv
+from corsheaders.defaults import default_headers
 
 # Cargar variables de entorno
 load_dotenv()
@@ -37,11 +38,15 @@ DEBUG = os.environ.get("DEBUG", "True") == "True"
 
 ALLOWED_HOSTS = os.environ.get("ALLOWED_HOSTS", "localhost,127.0.0.1").split(",")
 
+# API-only workers leave the admin and the API documentation (drf-spectacular) out, with their modules
+API_ONLY = os.environ.get("API_ONLY", "False") == "True"
+
 
 # Application definition
 
 INSTALLED_APPS = [
-    "django.contrib.admin",
+    # Admin modules are discovered on the first request to the admin (task_manager.admin_urls)
+    "django.contrib.admin.apps.SimpleAdminConfig",
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
@@ -53,17 +58,33 @@ INSTALLED_APPS = [
     "drf_spectacular",  # Reemplaza a drf-yasg
     "tasks",
     "users",
+    "diagnostics",
+    "jobs",
+    "events",
+    "idempotency",
 ]
 
+if API_ONLY:
+    INSTALLED_APPS = [
+        app for app in INSTALLED_APPS if app not in ("django.contrib.admin.apps.SimpleAdminConfig", "drf_spectacular")
+    ]
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    "diagnostics.middleware.ProfilingMiddleware",
+    "task_manager.middleware.CompressionMiddleware",
+    "diagnostics.middleware.SlowQueryMiddleware",
+    "task_manager.middleware.ReplicaMiddleware",
+    # Inserts the task changes recorded by a request with one statement
+    "tasks.middleware.TaskHistoryMiddleware",
+    # Session, CSRF, authentication, messages and frame options are skipped for API_PATH_PREFIX
+    "task_manager.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "task_manager.middleware.CsrfViewMiddleware",
+    "task_manager.middleware.AuthenticationMiddleware",
+    "task_manager.middleware.MessageMiddleware",
+    "task_manager.middleware.XFrameOptionsMiddleware",
 ]
 
 ROOT_URLCONF = "task_manager.urls"
@@ -101,6 +122,36 @@ else:
         }
     }
 
+# Read replicas: comma-separated database URLs, routed by task_manager.routers.ReplicaRouter
+# Safe requests read from a replica unless their user wrote within DATABASE_REPLICA_STICKY_SECONDS,
+# which should exceed the replication lag; recent writes are tracked in the default cache
+DATABASE_REPLICAS = []
+for index, url in enumerate(url for url in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if url.strip()):
+    DATABASES[f"replica_{index}"] = {**dj_database_url.parse(url.strip()), "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS.append(f"replica_{index}")
+DATABASE_REPLICA_STICKY_SECONDS = int(os.environ.get("DATABASE_REPLICA_STICKY_SECONDS", "5"))
+
+# Task sharding: comma-separated URLs of the databases holding tasks besides the default one
+# Tasks are placed by a hash of their assignee (tasks.sharding); run the reshard_tasks command
+# after changing the list. Task shards have no replicas.
+TASK_SHARDS = ["default"]
+for index, url in enumerate((url for url in os.environ.get("TASK_SHARD_URLS", "").split(",") if url.strip()), 1):
+    DATABASES[f"shard_{index}"] = dj_database_url.parse(url.strip())
+    TASK_SHARDS.append(f"shard_{index}")
+
+DATABASE_ROUTERS = ["tasks.sharding.ShardRouter", "task_manager.routers.ReplicaRouter"]
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Per-process memory by default; point CACHE_BACKEND/CACHE_LOCATION to a shared cache in production
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("CACHE_LOCATION", "task-manager"),
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -144,6 +195,35 @@ STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Response compression (task_manager.middleware.CompressionMiddleware)
+# Brotli is used when the optional brotli package is installed, gzip otherwise
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "4"))
+
+# Slow query recorder (diagnostics.middleware.SlowQueryMiddleware)
+# Statements slower than the threshold are kept in a per-process ring buffer; a negative threshold disables it
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_BUFFER_SIZE = int(os.environ.get("SLOW_QUERY_BUFFER_SIZE", "200"))
+
+# Request profiling (diagnostics.middleware.ProfilingMiddleware), triggered by tokens issued to staff users
+# The last profiles are kept in the default cache, which must be shared for downloads to reach any worker;
+# a store size of 0 disables profiling
+PROFILING_STORE_SIZE = int(os.environ.get("PROFILING_STORE_SIZE", "20"))
+PROFILING_TOKEN_MAX_AGE = int(os.environ.get("PROFILING_TOKEN_MAX_AGE", "3600"))
+
+# Change events (events.sse, served by the ASGI application only)
+# The database backend lets every process stream the events written by any other one;
+# events.backends.LocalBackend only reaches clients connected to the writing process
+EVENTS_BACKEND = os.environ.get("EVENTS_BACKEND", "events.backends.DatabaseBackend")
+EVENTS_POLL_INTERVAL = float(os.environ.get("EVENTS_POLL_INTERVAL", "1.0"))
+
+# Completed tasks older than this are moved to the archive table by the archive_tasks command
+TASK_ARCHIVE_AFTER_DAYS = int(os.environ.get("TASK_ARCHIVE_AFTER_DAYS", "180"))
+
+# JSON backend of the API: "json" (standard library) or "orjson" (optional orjson package)
+API_JSON_BACKEND = os.environ.get("API_JSON_BACKEND", "json")
+
 # Django REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": ("rest_framework_simplejwt.authentication.JWTAuthentication",),
@@ -151,6 +231,21 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+if API_ONLY:
+    # Routers and views read the schema class of the views, which would import drf-spectacular
+    del REST_FRAMEWORK["DEFAULT_SCHEMA_CLASS"]
+
+if API_JSON_BACKEND == "orjson":
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = (
+        "tasks.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] = (
+        "tasks.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    )
+
 # JWT Settings
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
@@ -164,6 +259,8 @@ SIMPLE_JWT = {
 # CORS Settings
 CORS_ALLOW_ALL_ORIGINS = True  # En producción, esto debería configurarse con dominios específicos
 CORS_ALLOW_CREDENTIALS = True
+# Retried writes carry an Idempotency-Key header (idempotency.keys)
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
 
 # DRF Spectacular Settings
 SPECTACULAR_SETTINGS = {
@@ -171,6 +268,8 @@ SPECTACULAR_SETTINGS = {
     "DESCRIPTION": "API for collaborative task management",
     "VERSION": "1.0.0",
     "SERVE_INCLUDE_SCHEMA": False,
+    # Imports the view documentation, kept out of the views (see task_manager.schema)
+    "PREPROCESSING_HOOKS": ["task_manager.schema.load_view_extensions"],
     "COMPONENT_SPLIT_REQUEST": True,
     "SWAGGER_UI_SETTINGS": {
         "persistAuthorization": True,
@@ -0,0 +1,38 @@
+"""
+Django settings for the test suite.
+
+Tests run on an in-memory SQLite database unless ``TEST_DATABASE_URL`` points
+to another database. Every pytest-xdist worker is a separate process, so each
+one gets its own in-memory database; on other backends pytest-django suffixes
+the test database name with the worker id (``test_tasks_gw0``, ...).
+"""
+
+import os
+
+import dj_database_url
+
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    "default": (
+        dj_database_url.parse(os.environ["TEST_DATABASE_URL"])
+        if os.environ.get("TEST_DATABASE_URL")
+        else {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+    ),
+}
+
+# Password hashing is deliberately slow and would dominate the user tests
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+# Tests run in a single process, where events need no polling
+EVENTS_BACKEND = "events.backends.LocalBackend"
+
+# Stands in for a lagging read replica in the routing tests, which enable it with DATABASE_REPLICAS.
+# It is a separate database, so rows written to the primary are missing from it.
+DATABASES["replica"] = {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+DATABASE_REPLICAS = []
+
+# Task shards of the sharding tests, which enable them with TASK_SHARDS
+DATABASES["shard_1"] = {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+DATABASES["shard_2"] = {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+TASK_SHARDS = ["default"]
@@ -0,0 +1,226 @@
+import gzip
+import io
+import os
+import subprocess
+import sys
+import pytest
+from datetime import date
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import router
+from django.test import Client
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from typing import Callable, Tuple
+from task_manager.middleware import parse_accept_encoding
+from task_manager.routers import use_replica
+from tasks.models import Task
+from tasks.parsers import FastJSONParser
+from tasks.serializers import TaskSerializer
+
+
+@pytest.mark.django_db
+class TestCompressionMiddleware:
+    @pytest.fixture(autouse=True)
+    def setup(self, authenticated_client: Tuple[APIClient, User], task_factory: Callable, settings) -> None:
+        """Create enough tasks for the list to exceed the compression threshold."""
+        settings.COMPRESSION_MIN_SIZE = 1024
+        self.client, self.user = authenticated_client
+        for index in range(10):
+            task_factory(title=f"Task {index}", description="Compressible text " * 5, user=self.user)
+        self.task_list_url: str = reverse("task-list")
+
+    def test_large_response_is_gzipped(self) -> None:
+        """Test that a large list is compressed when the client accepts gzip."""
+        response: Response = self.client.get(self.task_list_url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response["Vary"]
+        assert len(gzip.decompress(response.content)) > int(response["Content-Length"])
+
+    def test_response_without_accept_encoding_is_not_compressed(self) -> None:
+        """Test that clients not advertising gzip get the identity encoding."""
+        response: Response = self.client.get(self.task_list_url)
+
+        assert not response.has_header("Content-Encoding")
+        assert len(response.json()) == 10
+
+    def test_small_response_is_not_compressed(self) -> None:
+        """Test that responses below the threshold are sent as is."""
+        response: Response = self.client.get(self.task_list_url, {"fields": "id"}, HTTP_ACCEPT_ENCODING="gzip")
+
+        assert not response.has_header("Content-Encoding")
+
+    def test_html_pages_are_not_compressed(self, client, settings) -> None:
+        """Test that pages carrying a CSRF token are never compressed."""
+        settings.COMPRESSION_MIN_SIZE = 0
+
+        response = client.get(reverse("admin:login"), HTTP_ACCEPT_ENCODING="gzip")
+
+        assert b"csrfmiddlewaretoken" in response.content
+        assert not response.has_header("Content-Encoding")
+
+    def test_refused_encoding_is_not_used(self) -> None:
+        """Test that q=0 disables a coding."""
+        response: Response = self.client.get(self.task_list_url, HTTP_ACCEPT_ENCODING="gzip;q=0, identity")
+
+        assert not response.has_header("Content-Encoding")
+
+
+def test_parse_accept_encoding() -> None:
+    """Test the parsing of Accept-Encoding quality values."""
+    assert parse_accept_encoding("br;q=1.0, gzip;q=0.5, *;q=0") == {"br": 1.0, "gzip": 0.5, "*": 0.0}
+    assert parse_accept_encoding("GZIP") == {"gzip": 1.0}
+    assert parse_accept_encoding("") == {}
+
+
+def test_fast_json_parser() -> None:
+    """Test that the fast parser reads JSON bodies like DRF's JSONParser."""
+    body: bytes = '{"title": "Tâche", "ids": [1, 2], "completed": false}'.encode()
+
+    assert FastJSONParser().parse(io.BytesIO(body), "application/json", {}) == {
+        "title": "Tâche",
+        "ids": [1, 2],
+        "completed": False,
+    }
+
+
+def test_fast_json_parser_invalid_body() -> None:
+    """Test that malformed JSON is reported as a parse error."""
+    with pytest.raises(ParseError):
+        FastJSONParser().parse(io.BytesIO(b'{"title": '), "application/json", {})
+
+
+@pytest.mark.django_db
+class TestBrowserOnlyMiddleware:
+    def test_api_requests_skip_sessions_csrf_and_frame_options(self, client, user_factory: Callable) -> None:
+        """Test that token-authenticated API requests run without the browser middleware."""
+        user: User = user_factory()
+        response: Response = client.post(
+            reverse("task-list"),
+            {"title": "No CSRF token", "start_date": date.today().isoformat(), "user": user.id},
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert not hasattr(response.wsgi_request, "session")
+        assert "X-Frame-Options" not in response
+        assert not response.cookies
+
+    def test_admin_keeps_sessions_csrf_and_frame_options(self, client) -> None:
+        """Test that the admin pages still get sessions, CSRF protection and frame options."""
+        response = client.get(reverse("admin:login"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["X-Frame-Options"] == "DENY"
+        assert "csrftoken" in response.cookies
+        strict: Client = Client(enforce_csrf_checks=True)
+        assert strict.post(reverse("admin:login"), {"username": "x", "password": "y"}).status_code == 403
+
+    def test_schema_view_is_loaded_on_first_request(self, client) -> None:
+        """Test that the lazily imported documentation views are served, with the documentation of the views."""
+        response = client.get(reverse("schema"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert b"Task Manager API" in response.content
+        assert b"Idempotency-Key" in response.content
+        assert b"Register a new user" in response.content
+        assert b"Take a memory snapshot" in response.content
+
+
+class TestApiOnlyProfile:
+    def test_api_workers_import_neither_admin_nor_documentation(self) -> None:
+        """Test that API-only workers resolve API URLs without importing the admin app or drf-spectacular."""
+        script: str = (
+            "import sys, django; django.setup(); from django.urls import resolve, Resolver404; "
+            "resolve('/api/tasks/'); imported = [name for name in sys.modules "
+            "if name.startswith(('drf_spectacular', 'django.contrib.admin.apps', 'tasks.admin'))]; "
+            "assert not imported, imported\n"
+            "for path in ('/admin/', '/api/schema/'):\n"
+            "    try: resolve(path)\n"
+            "    except Resolver404: pass\n"
+            "    else: raise AssertionError(path)"
+        )
+        environment: dict[str, str] = {
+            **os.environ,
+            "API_ONLY": "True",
+            "DJANGO_SETTINGS_MODULE": "task_manager.settings",
+        }
+
+        process = subprocess.run(
+            [sys.executable, "-c", script], cwd=settings.BASE_DIR, env=environment, capture_output=True, text=True
+        )
+
+        assert process.returncode == 0, process.stderr
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+class TestReplicaRouting:
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client: APIClient, user_factory: Callable, settings) -> None:
+        """Enable the replica, which lags behind and only holds a copy of the user."""
+        settings.DATABASE_REPLICAS = ["replica"]
+        self.user: User = user_factory(username="reader")
+        User.objects.using("replica").create(id=self.user.id, username=self.user.username)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+        self.client: APIClient = api_client
+        self.task_list_url: str = reverse("task-list")
+
+    def test_safe_requests_read_from_replica(self) -> None:
+        """Test that reads are served by the replica, not by the primary."""
+        Task.objects.create(title="Primary only", start_date=date.today(), user=self.user, created_by=self.user)
+
+        assert self.client.get(self.task_list_url).json() == []
+        assert self.client.get(reverse("users")).status_code == status.HTTP_200_OK
+
+    def test_writes_pin_user_to_primary(self) -> None:
+        """Test that a user reads their own writes even though the replica did not catch up."""
+        response: Response = self.client.post(
+            self.task_list_url, {"title": "Fresh", "start_date": date.today().isoformat(), "user": self.user.id}
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        assert [task["title"] for task in self.client.get(self.task_list_url).json()] == ["Fresh"]
+
+    def test_registered_user_reads_from_primary(self) -> None:
+        """Test that a user can authenticate right after registering, before the replica has them."""
+        data: dict = {
+            "username": "newcomer",
+            "email": "newcomer@example.com",
+            "password": "StrongP@ssw0rd",
+            "password_confirm": "StrongP@ssw0rd",
+        }
+        assert APIClient().post(reverse("register"), data, format="json").status_code == status.HTTP_201_CREATED
+        login: Response = APIClient().post(
+            reverse("login"), {"email": data["email"], "password": data["password"]}, format="json"
+        )
+        client: APIClient = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['access']}")
+
+        assert client.get(self.task_list_url).status_code == status.HTTP_200_OK
+
+    def test_overlap_validation_reads_primary(self) -> None:
+        """Test that the overlap check sees tasks the replica is missing."""
+        today: str = date.today().isoformat()
+        Task.objects.create(
+            title="Existing", start_date=date.today(), due_date=date.today(), user=self.user, created_by=self.user
+        )
+        serializer: TaskSerializer = TaskSerializer(
+            data={"title": "Overlap", "start_date": today, "due_date": today, "user": self.user.id}
+        )
+
+        with use_replica():
+            assert serializer.is_valid() is False
+        assert "overlapping_task" in serializer.errors
+
+    def test_only_replica_blocks_read_from_replica(self) -> None:
+        """Test that reads outside of a request, and all writes, go to the primary."""
+        assert router.db_for_read(Task) == "default"
+        with use_replica():
+            assert router.db_for_read(Task) == "replica"
+            assert router.db_for_write(Task) == "default"
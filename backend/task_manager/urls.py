@@ -14,42 +14,79 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
-from django.urls import path, include
+from django.apps import apps
+from django.http import HttpRequest, HttpResponse
+from django.urls import URLResolver, path, include
+from django.urls.resolvers import RoutePattern
+from django.utils.module_loading import import_string
 from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-    SpectacularRedocView,
-)
-from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+def lazy_view(view_class: str, **initkwargs):
+    """
+    Returns a view whose class is imported on its first request.
+
+    Keeps rarely used views, like the schema and documentation ones of
+    drf_spectacular, out of the modules imported by every worker.
+
+    Args:
+        view_class (str): Dotted path of a class-based view.
+        **initkwargs: Arguments of ``as_view()``.
+
+    Returns:
+        Callable: The view function.
+    """
+    views: list = []
+
+    def view(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        if not views:
+            views.append(import_string(view_class).as_view(**initkwargs))
+        return views[0](request, *args, **kwargs)
+
+    return view
 
 
 # Vista simple para probar que la API funciona
-@api_view(["GET"])
-@permission_classes([AllowAny])
-def healthcheck(request):
-    return Response({"status": "ok", "message": "API funcionando correctamente"})
-
-
-urlpatterns = [
-    path("admin/", admin.site.urls),
-    # API Documentation
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
-    path(
-        "api/docs/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
-        name="swagger-ui",
-    ),
-    path("api/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
+class HealthCheckView(APIView):
+    # A class rather than @api_view, which reads APIView.schema and so imports the DEFAULT_SCHEMA_CLASS
+    permission_classes = [AllowAny]
+
+    def get(self, request: Request) -> Response:
+        return Response({"status": "ok", "message": "API funcionando correctamente"})
+
+
+urlpatterns = []
+
+# The admin and the documentation are left out of API-only workers (settings.API_ONLY)
+if apps.is_installed("django.contrib.admin"):
+    urlpatterns += [
+        # Unlike include(), a resolver given a module name only imports it when resolving or reversing its URLs
+        URLResolver(RoutePattern("admin/"), "task_manager.admin_urls", app_name="admin", namespace="admin"),
+    ]
+if apps.is_installed("drf_spectacular"):
+    urlpatterns += [
+        # API Documentation
+        path("api/schema/", lazy_view("drf_spectacular.views.SpectacularAPIView"), name="schema"),
+        path(
+            "api/docs/",
+            lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="schema"),
+            name="swagger-ui",
+        ),
+        path("api/redoc/", lazy_view("drf_spectacular.views.SpectacularRedocView", url_name="schema"), name="redoc"),
+    ]
+
+urlpatterns += [
     # Vista de prueba
-    path("api/health/", healthcheck, name="healthcheck"),
+    path("api/health/", HealthCheckView.as_view(), name="healthcheck"),
     # API URLs
     path("api/", include("tasks.urls")),
     path("api/auth/", include("users.urls")),
+    path("api/diagnostics/", include("diagnostics.urls")),
     path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
 ]
@@ -0,0 +1,90 @@
+import logging
+import time
+from datetime import datetime, timedelta
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from constants import ARCHIVE
+from tasks.cache import bump_user_tasks_version
+from tasks.models import ArchivedTask, Task, TaskMembership
+from tasks.sharding import get_shards
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Columns copied from the task table to the archive
+ARCHIVED_COLUMNS: tuple[str, ...] = tuple(field.attname for field in Task._meta.concrete_fields)
+
+
+def archive_batch(cutoff: datetime, batch_size: int = ARCHIVE["batch_size"], using: str = DEFAULT_DB_ALIAS) -> int:
+    """
+    Moves the oldest tasks completed before a cutoff to the archive.
+
+    The batch is read through the ``(completed, completed_at)`` index, copied
+    and deleted in one transaction, so a task is always in exactly one of the
+    two tables. On PostgreSQL the rows are locked with ``SKIP LOCKED``, so
+    several archivers never wait on each other. Deleting a task also deletes
+    its memberships and reminders.
+
+    Args:
+        cutoff (datetime): Tasks completed before this are archived.
+        batch_size (int): Maximum number of tasks moved.
+        using (str): Shard to archive, whose archive table receives the tasks.
+
+    Returns:
+        int: Number of archived tasks.
+    """
+    tasks = Task.objects.using(using).filter(completed=True, completed_at__lt=cutoff).order_by("completed_at", "id")
+    if connections[using].features.has_select_for_update_skip_locked:
+        tasks = tasks.select_for_update(skip_locked=True)
+
+    with transaction.atomic(using=using):
+        rows: list[dict] = list(tasks.values(*ARCHIVED_COLUMNS)[:batch_size])
+        if not rows:
+            return 0
+        ids: list[int] = [row["id"] for row in rows]
+        user_ids: set[int] = set(
+            TaskMembership.objects.using(using).filter(task_id__in=ids).values_list("user_id", flat=True)
+        )
+        ArchivedTask.objects.using(using).bulk_create((ArchivedTask(**row) for row in rows), ignore_conflicts=True)
+        Task.objects.using(using).filter(id__in=ids).delete()
+    bump_user_tasks_version(*user_ids)
+    return len(rows)
+
+
+def archive_tasks(
+    older_than: timedelta,
+    batch_size: int = ARCHIVE["batch_size"],
+    pause: float = ARCHIVE["pause_seconds"],
+    max_batches: int | None = None,
+) -> int:
+    """
+    Archives the tasks completed longer ago than an age, batch after batch, one shard after the other.
+
+    Sleeping between batches throttles the archiver, leaving room for the
+    regular traffic and for replication to catch up.
+
+    Args:
+        older_than (timedelta): Minimum age of the completion.
+        batch_size (int): Tasks per batch.
+        pause (float): Seconds to sleep between two batches.
+        max_batches (int | None): Stop after this many batches, None to archive everything.
+
+    Returns:
+        int: Number of archived tasks.
+    """
+    cutoff: datetime = timezone.now() - older_than
+    archived: int = 0
+    batches: int = 0
+    for alias in get_shards():
+        while max_batches is None or batches < max_batches:
+            moved: int = archive_batch(cutoff, batch_size, alias)
+            archived += moved
+            batches += 1
+            if moved < batch_size:
+                break
+            logger.debug(f"Archived {archived} tasks so far")
+            time.sleep(pause)
+    logger.info(f"Archived {archived} tasks completed before {cutoff.isoformat()}")
+    return archived
@@ -0,0 +1,125 @@
+from django.core.cache import cache
+from django.db import connections, transaction
+from collections.abc import Callable
+from datetime import date
+import logging
+import time
+from task_manager.routers import mark_recent_write
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+TASKS_VERSION_KEY: str = "tasks:version:{user_id}"
+CALENDAR_KEY: str = "tasks:calendar:{user_id}:{version}:{start}:{end}:{bucket}:{fields}"
+
+
+def get_user_tasks_version(user_id: int) -> int:
+    """
+    Returns the current version of a user's task set.
+
+    The version is part of every per-user cache key, so bumping it
+    invalidates all cached responses for that user at once. A missing key,
+    never set or evicted, is seeded with the current time (see ``seed_version()``).
+
+    Args:
+        user_id (int): Id of the user.
+
+    Returns:
+        int: Current version.
+    """
+    key: str = TASKS_VERSION_KEY.format(user_id=user_id)
+    version: int | None = cache.get(key)
+    if version is None:
+        cache.add(key, seed_version(), timeout=None)
+        version = cache.get(key, 0)
+    return version
+
+
+def seed_version() -> int:
+    """
+    Returns the initial value of a version key: the current time in microseconds.
+
+    Versions only grow by one per bump, so a key seeded after an eviction is
+    above any value it held before, and ETags built from those values never
+    match again.
+
+    Returns:
+        int: Microseconds since the epoch.
+    """
+    return time.time_ns() // 1000
+
+
+def bump_user_tasks_version(*user_ids: int | None) -> None:
+    """
+    Invalidates the cached task responses of the given users.
+
+    The users also read from the primary database until the replicas caught
+    up, so that no stale replica read gets cached under the new version.
+
+    Called within a transaction, the bump waits for it to commit, on every
+    database with one open: a concurrent read could otherwise cache data the
+    transaction has not committed, or later rolls back, under the new version.
+    Nothing is bumped if the transaction rolls back.
+
+    Args:
+        *user_ids: Ids of the users whose tasks changed. ``None`` values are ignored.
+    """
+    changed: set[int] = {user_id for user_id in user_ids if user_id is not None}
+    if changed:
+        after_commit(
+            lambda: _bump(changed),
+            [connection.alias for connection in connections.all(initialized_only=True) if connection.in_atomic_block],
+        )
+
+
+def after_commit(func: Callable[[], None], aliases: list[str]) -> None:
+    """
+    Runs a function once the transactions open on the given databases committed.
+
+    Args:
+        func (Callable[[], None]): Function to run, dropped if a transaction rolls back.
+        aliases (list[str]): Databases with a transaction open, right away if empty.
+    """
+    if not aliases:
+        func()
+        return
+    transaction.on_commit(lambda: after_commit(func, aliases[1:]), using=aliases[0])
+
+
+def _bump(user_ids: set[int]) -> None:
+    """Increments the task versions of users and pins their reads to the primary."""
+    for user_id in user_ids:
+        key: str = TASKS_VERSION_KEY.format(user_id=user_id)
+        # add() is a no-op if the key exists; incr() is atomic on shared backends
+        cache.add(key, seed_version(), timeout=None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # The key was evicted between add() and incr()
+            cache.set(key, seed_version(), timeout=None)
+        logger.debug(f"Task cache invalidated for user {user_id}")
+    mark_recent_write(*user_ids)
+
+
+def calendar_cache_key(user_id: int, start: date, end: date, bucket: str, fields: str = "") -> str:
+    """
+    Builds the cache key of a calendar response.
+
+    Args:
+        user_id (int): Id of the user requesting the calendar.
+        start (date): First day of the range.
+        end (date): Last day of the range.
+        bucket (str): Bucket size.
+        fields (str): Sparse fieldset of the response, empty for the full representation.
+
+    Returns:
+        str: Cache key bound to the user's current task version.
+    """
+    return CALENDAR_KEY.format(
+        user_id=user_id,
+        version=get_user_tasks_version(user_id),
+        start=start.isoformat(),
+        end=end.isoformat(),
+        bucket=bucket,
+        fields=fields,
+    )
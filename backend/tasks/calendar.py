@@ -0,0 +1,77 @@
+from collections.abc import Iterable
+from datetime import date, timedelta
+from constants import CALENDAR
+
+BUCKETS: tuple[str, ...] = (CALENDAR["bucket_day"], CALENDAR["bucket_week"])
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    """
+    Returns the first day of the bucket that contains the given day.
+
+    Weeks start on Monday (ISO 8601).
+
+    Args:
+        day (date): Day to place in a bucket.
+        bucket (str): Bucket size, ``day`` or ``week``.
+
+    Returns:
+        date: First day of the bucket.
+    """
+    if bucket == CALENDAR["bucket_week"]:
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def bucket_step(bucket: str) -> timedelta:
+    """
+    Returns the length of a bucket.
+
+    Args:
+        bucket (str): Bucket size, ``day`` or ``week``.
+
+    Returns:
+        timedelta: Distance between two consecutive bucket starts.
+    """
+    return timedelta(days=7) if bucket == CALENDAR["bucket_week"] else timedelta(days=1)
+
+
+def build_calendar(
+    rows: Iterable[tuple[date, date | None, dict]],
+    start: date,
+    end: date,
+    bucket: str,
+) -> list[dict]:
+    """
+    Groups tasks into date buckets in a single pass.
+
+    Every bucket of the range is returned, even when empty, so clients can
+    render the grid directly. Tasks spanning several days are listed in every
+    bucket they touch; tasks without a due date are considered indefinitely
+    extended, as in the overlap validation, and fill the rest of the range.
+
+    Args:
+        rows: ``(start_date, due_date, payload)`` tuples ordered by start date.
+        start (date): First day of the range.
+        end (date): Last day of the range.
+        bucket (str): Bucket size, ``day`` or ``week``.
+
+    Returns:
+        list[dict]: Buckets in chronological order, each with its ``date`` and ``tasks``.
+    """
+    step: timedelta = bucket_step(bucket)
+    first: date = bucket_start(start, bucket)
+    count: int = (bucket_start(end, bucket) - first) // step + 1
+    buckets: list[list[dict]] = [[] for _ in range(count)]
+
+    for task_start, task_due, payload in rows:
+        span_start: date = max(task_start, start)
+        span_end: date = min(task_due or end, end)
+        if span_end < span_start:
+            continue
+        first_index: int = (bucket_start(span_start, bucket) - first) // step
+        last_index: int = (bucket_start(span_end, bucket) - first) // step
+        for index in range(first_index, last_index + 1):
+            buckets[index].append(payload)
+
+    return [{"date": (first + step * index).isoformat(), "tasks": tasks} for index, tasks in enumerate(buckets)]
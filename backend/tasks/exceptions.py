@@ -0,0 +1,27 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from constants import ERROR_MESSAGES
+
+
+class PreconditionFailed(APIException):
+    """
+    Raised when the ``If-Match`` header of a request does not match the current task version.
+    """
+
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = ERROR_MESSAGES["version_conflict"]
+    default_code = "precondition_failed"
+
+    def __init__(self, detail: str | None = None, code: str | None = None, current: dict | None = None) -> None:
+        """
+        Builds the exception, optionally embedding the current task representation.
+
+        Args:
+            detail (str | None): Error message.
+            code (str | None): Error code.
+            current (dict | None): Current representation of the task, returned so
+                clients can merge and retry without refetching their task list.
+        """
+        super().__init__(detail, code)
+        if current is not None:
+            self.detail = {"detail": self.detail, "current": current}
@@ -0,0 +1,121 @@
+"""
+Append-only history of task changes.
+
+The task views record a ``TaskChange`` for every creation, update,
+completion and deletion, and so does the admin. During a request the
+entries are only buffered: ``TaskHistoryMiddleware`` inserts them with a
+single ``bulk_create`` once the response is ready and successful, so the
+history adds at most one statement to a request, however many tasks it
+changed. Failed requests and rolled back transactions leave no entries.
+Entries recorded outside a request, e.g. from a shell, are inserted right
+away.
+
+Entries store the previous and new value of the ``TRACKED_FIELDS`` that
+changed, compared in memory without reading the task again. Creations and
+deletions store every field, with None as the missing side.
+"""
+
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from django.db import router, transaction
+
+from tasks.models import Task, TaskChange
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Fields whose changes are recorded
+TRACKED_FIELDS: tuple[str, ...] = ("title", "description", "start_date", "due_date", "completed", "user")
+
+# Entries waiting for the end of the current request, None outside requests
+_pending: ContextVar[list[TaskChange] | None] = ContextVar("task_changes_pending", default=None)
+
+
+def snapshot(task: Task, loaded: bool = False) -> dict[str, Any]:
+    """
+    Reads the tracked fields of a task, skipping deferred ones.
+
+    Args:
+        task (Task): The task.
+        loaded (bool): Reads the values the task was loaded with instead of its
+            current ones, for callers such as admin forms that only get the task
+            once it was changed in memory.
+
+    Returns:
+        dict[str, Any]: Values by field name. Related users are given by id.
+    """
+    attnames: dict[str, str] = {name: Task._meta.get_field(name).attname for name in TRACKED_FIELDS}
+    if loaded:
+        values: dict[str, Any] = getattr(task, "_loaded_values", {})
+        return {name: values[attname] for name, attname in attnames.items() if attname in values}
+    deferred: set[str] = task.get_deferred_fields()
+    return {name: getattr(task, attname) for name, attname in attnames.items() if attname not in deferred}
+
+
+def diff(before: dict[str, Any], after: dict[str, Any]) -> dict[str, list]:
+    """
+    Compares two snapshots of a task.
+
+    An empty snapshot stands for a task that does not exist, before its
+    creation or after its deletion, so every field is reported.
+
+    Args:
+        before (dict[str, Any]): Snapshot before the change.
+        after (dict[str, Any]): Snapshot after the change.
+
+    Returns:
+        dict[str, list]: ``[old, new]`` values of the changed fields.
+    """
+    return {
+        name: [before.get(name), after.get(name)]
+        for name in TRACKED_FIELDS
+        if (name in before or name in after) and before.get(name) != after.get(name)
+    }
+
+
+def record(*entries: TaskChange) -> None:
+    """
+    Adds entries to the history, at the end of the current request or right away outside requests.
+
+    Args:
+        *entries (TaskChange): Unsaved entries.
+    """
+    pending: list[TaskChange] | None = _pending.get()
+    if pending is not None:
+        pending.extend(entries)
+    elif entries:
+        TaskChange.objects.using(router.db_for_write(TaskChange)).bulk_create(entries)
+
+
+@contextmanager
+def buffered() -> Iterator[list[TaskChange]]:
+    """
+    Buffers the entries recorded within the block and inserts them together once it succeeded.
+
+    The entries are inserted when the block exits, or when the transaction
+    open around it commits. They are discarded if the block raises, if that
+    transaction rolls back, or if the caller empties the yielded list, e.g.
+    for a failed request.
+
+    Yields:
+        list[TaskChange]: The buffered entries.
+    """
+    pending: list[TaskChange] = []
+    token = _pending.set(pending)
+    try:
+        yield pending
+    finally:
+        _pending.reset(token)
+    if pending:
+        alias: str = router.db_for_write(TaskChange)
+        transaction.on_commit(lambda: _insert(alias, pending), using=alias)
+
+
+def _insert(alias: str, entries: list[TaskChange]) -> None:
+    """Inserts buffered entries with a single statement."""
+    TaskChange.objects.using(alias).bulk_create(entries)
+    logger.debug(f"{len(entries)} task changes recorded")
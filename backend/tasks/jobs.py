@@ -0,0 +1,15 @@
+from datetime import date
+
+from jobs.registry import job
+from tasks.reminders import deliver_reminders
+
+
+@job("tasks.deliver_reminders")
+def deliver_reminders_job(payload: dict) -> None:
+    """
+    Delivers a batch of reminders recorded by a sweep.
+
+    Args:
+        payload (dict): ``{"kind": str, "due_date": ISO 8601 date, "task_ids": [int, ...]}``.
+    """
+    deliver_reminders(payload["kind"], date.fromisoformat(payload["due_date"]), payload["task_ids"])
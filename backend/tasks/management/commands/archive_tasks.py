@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from constants import ARCHIVE
+from tasks.archive import archive_tasks
+
+
+class Command(BaseCommand):
+    help = "Move the tasks completed long ago to the archive table"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=settings.TASK_ARCHIVE_AFTER_DAYS,
+            help="archive tasks completed more than this many days ago",
+        )
+        parser.add_argument("--batch-size", type=int, default=ARCHIVE["batch_size"], help="tasks per batch")
+        parser.add_argument(
+            "--pause", type=float, default=ARCHIVE["pause_seconds"], help="seconds to sleep between batches"
+        )
+        parser.add_argument("--max-batches", type=int, help="stop after this many batches")
+
+    def handle(self, *args, **options) -> None:
+        archived: int = archive_tasks(
+            timedelta(days=options["older_than_days"]),
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+            max_batches=options["max_batches"],
+        )
+        self.stdout.write(f"Archived {archived} tasks")
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from constants import SHARDING
+from tasks.resharding import reshard
+
+
+class Command(BaseCommand):
+    help = "Move the tasks that are not in the shard of their assignee, e.g. after adding a shard"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--batch-size", type=int, default=SHARDING["reshard_batch_size"], help="rows read per batch"
+        )
+        parser.add_argument(
+            "--source",
+            action="append",
+            dest="sources",
+            help="database to move tasks out of (repeatable, every shard by default)",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="only count the tasks to move")
+
+    def handle(self, *args, **options) -> None:
+        moved: dict[str, int] = reshard(
+            batch_size=options["batch_size"], sources=options["sources"], dry_run=options["dry_run"]
+        )
+        verb: str = "Would move" if options["dry_run"] else "Moved"
+        self.stdout.write(f"{verb} {moved['tasks']} tasks and {moved['archived_tasks']} archived tasks")
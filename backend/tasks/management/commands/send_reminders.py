@@ -0,0 +1,43 @@
+import os
+import socket
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from constants import REMINDERS
+from tasks.reminders import sweep
+
+
+class Command(BaseCommand):
+    help = "Record due date reminders and queue their delivery"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--date", type=date.fromisoformat, help="day of the sweep (default: today)")
+        parser.add_argument("--kinds", nargs="+", choices=list(REMINDERS["kinds"]), help="reminder kinds to sweep")
+        parser.add_argument("--batch-size", type=int, default=REMINDERS["batch_size"], help="tasks per batch")
+        parser.add_argument(
+            "--max-catch-up-days",
+            type=int,
+            default=REMINDERS["max_catch_up_days"],
+            help="how many missed days to catch up on",
+        )
+        parser.add_argument("--interval", type=float, help="sweep again every INTERVAL seconds instead of exiting")
+
+    def handle(self, *args, **options) -> None:
+        worker: str = f"{socket.gethostname()}:{os.getpid()}"
+        while True:
+            today: date = options["date"] or timezone.localdate()
+            results: dict[str, int] = sweep(
+                today,
+                worker,
+                kinds=options["kinds"],
+                batch_size=options["batch_size"],
+                max_catch_up_days=options["max_catch_up_days"],
+            )
+            for kind, processed in results.items():
+                self.stdout.write(f"{kind}: {processed} tasks")
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
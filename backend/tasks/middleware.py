@@ -0,0 +1,26 @@
+from django.http import HttpRequest, HttpResponse
+from rest_framework.permissions import SAFE_METHODS
+
+from tasks.history import buffered
+
+
+class TaskHistoryMiddleware:
+    """
+    Buffers the task changes recorded by a write request and inserts them at its end.
+
+    See ``tasks.history``. Only successful responses keep their changes: a
+    request that raised or answered with an error inserts none. Safe
+    requests record no change and go straight through.
+    """
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if request.method in SAFE_METHODS:
+            return self.get_response(request)
+        with buffered() as pending:
+            response: HttpResponse = self.get_response(request)
+            if response.status_code >= 400:
+                pending.clear()
+        return response
@@ -0,0 +1,82 @@
+# Generated by Django 4.2.1 on 2026-10-19 04:32
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("tasks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="task",
+            options={"ordering": ["start_date", "due_date"], "verbose_name": "Task", "verbose_name_plural": "Tasks"},
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="completed",
+            field=models.BooleanField(default=False, verbose_name="Completed"),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, verbose_name="Creation timestamp"),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="created_by",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="created_tasks",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Created by",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="description",
+            field=models.TextField(blank=True, verbose_name="Description"),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="due_date",
+            field=models.DateField(blank=True, null=True, verbose_name="Due date"),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="start_date",
+            field=models.DateField(verbose_name="Start date"),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="title",
+            field=models.CharField(max_length=255, verbose_name="Title"),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="Last update timestamp"),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tasks",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="User",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["user", "start_date"], name="tasks_task_user_id_371848_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["user", "completed"], name="tasks_task_user_id_f226ed_idx"),
+        ),
+    ]
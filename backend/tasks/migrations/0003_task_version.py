@@ -0,0 +1,17 @@
+# Generated by Django 4.2.1 on 2026-10-19 04:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0002_task_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="version",
+            field=models.PositiveIntegerField(default=1, verbose_name="Version"),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.1 on 2026-10-19 04:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0003_task_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReminderSweep",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("kind", models.CharField(max_length=20, verbose_name="Kind")),
+                ("window", models.DateField(verbose_name="Window")),
+                ("cursor", models.BigIntegerField(default=0, verbose_name="Cursor")),
+                ("locked_by", models.CharField(blank=True, max_length=100, verbose_name="Locked by")),
+                ("locked_at", models.DateTimeField(blank=True, null=True, verbose_name="Locked at")),
+                ("completed_at", models.DateTimeField(blank=True, null=True, verbose_name="Completed at")),
+            ],
+            options={
+                "verbose_name": "Reminder sweep",
+                "verbose_name_plural": "Reminder sweeps",
+            },
+        ),
+        migrations.CreateModel(
+            name="TaskReminder",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("kind", models.CharField(max_length=20, verbose_name="Kind")),
+                ("due_date", models.DateField(verbose_name="Due date")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Creation timestamp")),
+                ("sent_at", models.DateTimeField(blank=True, null=True, verbose_name="Sent at")),
+            ],
+            options={
+                "verbose_name": "Task reminder",
+                "verbose_name_plural": "Task reminders",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["completed", "due_date", "id"], name="tasks_task_complet_3fcb31_idx"),
+        ),
+        migrations.AddField(
+            model_name="taskreminder",
+            name="task",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="reminders",
+                to="tasks.task",
+                verbose_name="Task",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="remindersweep",
+            constraint=models.UniqueConstraint(fields=("kind", "window"), name="unique_reminder_sweep"),
+        ),
+        migrations.AddConstraint(
+            model_name="taskreminder",
+            constraint=models.UniqueConstraint(fields=("task", "kind", "due_date"), name="unique_task_reminder"),
+        ),
+    ]
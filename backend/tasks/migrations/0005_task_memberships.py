@@ -0,0 +1,82 @@
+# Generated by Django 4.2.1 on 2026-10-19 05:08
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Roles of TaskMembership, frozen for this migration
+ASSIGNEE, CREATOR = 1, 2
+BATCH_SIZE = 5000
+
+
+def backfill_memberships(apps, schema_editor):
+    """Creates the assignee and creator memberships of the existing tasks, in id order batches."""
+    Task = apps.get_model("tasks", "Task")
+    TaskMembership = apps.get_model("tasks", "TaskMembership")
+    alias = schema_editor.connection.alias
+    cursor = 0
+    while True:
+        rows = list(
+            Task.objects.using(alias)
+            .filter(id__gt=cursor)
+            .order_by("id")
+            .values_list("id", "user_id", "created_by_id", "start_date")[:BATCH_SIZE]
+        )
+        if not rows:
+            break
+        memberships = []
+        for task_id, user_id, created_by_id, start_date in rows:
+            roles = {user_id: ASSIGNEE}
+            roles[created_by_id] = roles.get(created_by_id, 0) | CREATOR
+            memberships.extend(
+                TaskMembership(task_id=task_id, user_id=member_id, roles=role, start_date=start_date)
+                for member_id, role in roles.items()
+            )
+        TaskMembership.objects.using(alias).bulk_create(memberships)
+        cursor = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("tasks", "0004_task_reminders"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskMembership",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("roles", models.PositiveSmallIntegerField(verbose_name="Roles")),
+                ("start_date", models.DateField(verbose_name="Start date")),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="memberships",
+                        to="tasks.task",
+                        verbose_name="Task",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="task_memberships",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="User",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Task membership",
+                "verbose_name_plural": "Task memberships",
+                "indexes": [models.Index(fields=["user", "start_date"], name="tasks_taskm_user_id_4c4b3e_idx")],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="taskmembership",
+            constraint=models.UniqueConstraint(fields=("task", "user"), name="unique_task_membership"),
+        ),
+        migrations.RunPython(backfill_memberships, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 4.2.1 on 2026-10-19 05:11
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import F
+
+
+def backfill_completed_at(apps, schema_editor):
+    """Uses the last update of the tasks completed so far as their completion time."""
+    Task = apps.get_model("tasks", "Task")
+    Task.objects.using(schema_editor.connection.alias).filter(completed=True, completed_at__isnull=True).update(
+        completed_at=F("updated_at")
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("tasks", "0005_task_memberships"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedTask",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False, verbose_name="ID")),
+                ("title", models.CharField(max_length=255, verbose_name="Title")),
+                ("description", models.TextField(blank=True, verbose_name="Description")),
+                ("start_date", models.DateField(verbose_name="Start date")),
+                ("due_date", models.DateField(blank=True, null=True, verbose_name="Due date")),
+                ("completed", models.BooleanField(default=True, verbose_name="Completed")),
+                ("created_at", models.DateTimeField(verbose_name="Creation timestamp")),
+                ("updated_at", models.DateTimeField(verbose_name="Last update timestamp")),
+                ("version", models.PositiveIntegerField(default=1, verbose_name="Version")),
+                ("completed_at", models.DateTimeField(blank=True, null=True, verbose_name="Completed at")),
+                ("archived_at", models.DateTimeField(auto_now_add=True, verbose_name="Archived at")),
+            ],
+            options={
+                "verbose_name": "Archived task",
+                "verbose_name_plural": "Archived tasks",
+                "ordering": ["start_date", "due_date"],
+            },
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="completed_at",
+            field=models.DateTimeField(blank=True, null=True, verbose_name="Completed at"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["completed", "completed_at"], name="tasks_task_complet_82a7c9_idx"),
+        ),
+        migrations.AddField(
+            model_name="archivedtask",
+            name="created_by",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="created_archived_tasks",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Created by",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedtask",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_tasks",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="User",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(fields=["user", "start_date"], name="tasks_archi_user_id_36cf85_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(fields=["created_by", "start_date"], name="tasks_archi_created_f2f673_idx"),
+        ),
+        migrations.RunPython(backfill_completed_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 4.2.1 on 2026-10-19 05:22
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("tasks", "0006_task_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IdSequence",
+            fields=[
+                ("name", models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name="Name")),
+                ("next_id", models.BigIntegerField(verbose_name="Next id")),
+            ],
+            options={
+                "verbose_name": "Id sequence",
+                "verbose_name_plural": "Id sequences",
+            },
+        ),
+        migrations.AlterField(
+            model_name="archivedtask",
+            name="created_by",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="created_archived_tasks",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Created by",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="archivedtask",
+            name="user",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_tasks",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="User",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="created_by",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="created_tasks",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Created by",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="user",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tasks",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="User",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="taskmembership",
+            name="user",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="task_memberships",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="User",
+            ),
+        ),
+    ]
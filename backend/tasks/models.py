@@ -1,14 +1,230 @@
-from django.db import models
+from django.db import DEFAULT_DB_ALIAS, models, router, transaction
+from django.db.models import F, Max, Q
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
+from collections import defaultdict
+from datetime import datetime
+from threading import Lock
+from typing import Any, Callable
 import logging
-from constants import ERROR_MESSAGES, MODEL_VERBOSE_NAMES
+from constants import ERROR_MESSAGES, MODEL_VERBOSE_NAMES, SHARDING
+from tasks.sharding import get_shards, is_sharded, shard_for_user
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
 
+class TaskQuerySet(models.QuerySet):
+    """
+    Custom QuerySet for the Task model.
+    """
+
+    def mark_as_completed(self, now: datetime | None = None) -> int:
+        """
+        Marks the pending tasks of the QuerySet as completed.
+
+        Runs a single conditional ``UPDATE ... SET completed = true WHERE completed = false``
+        touching only ``completed``, ``completed_at``, ``updated_at`` and ``version``,
+        so concurrent calls never race.
+
+        Args:
+            now (datetime | None): Completion time, ``timezone.now()`` by default. The tasks
+                completed by this call are the ones whose ``completed_at`` is this value.
+
+        Returns:
+            int: Number of tasks that were actually completed.
+        """
+        now = now or timezone.now()
+        return self.filter(completed=False).update(
+            completed=True, completed_at=now, updated_at=now, version=F("version") + 1
+        )
+
+    def bulk_create(self, objs, *args, **kwargs) -> list["Task"]:
+        """
+        Inserts tasks and the memberships of their assignees and creators.
+
+        When sharded, tasks get ids from ``allocate_task_ids()`` and are
+        inserted into the shard of their assignee, unless the QuerySet was
+        bound to a database with ``using()``.
+
+        Returns:
+            list[Task]: The created tasks.
+        """
+        objs = list(objs)
+        if is_sharded() and self._db is None:
+            new: list[Task] = [task for task in objs if task.pk is None]
+            for task, pk in zip(new, allocate_task_ids(len(new))):
+                task.pk = pk
+            shards: defaultdict[str, list[Task]] = defaultdict(list)
+            for task in objs:
+                shards[shard_for_user(task.user_id)].append(task)
+            for alias, tasks in shards.items():
+                self.using(alias).bulk_create(tasks, *args, **kwargs)
+            return objs
+
+        for task in objs:
+            task.sync_completed_at()
+        with transaction.atomic(using=self.db, savepoint=False):
+            tasks: list[Task] = super().bulk_create(objs, *args, **kwargs)
+            TaskMembership.objects.using(self.db).bulk_create(
+                (membership for task in tasks if task.pk is not None for membership in task.build_memberships()),
+                batch_size=kwargs.get("batch_size"),
+            )
+        return tasks
+
+    def move_to(self, alias: str) -> int:
+        """
+        Moves the tasks of the QuerySet, with their memberships and reminders, to another shard.
+
+        The rows are copied to the target shard, then deleted from the shard of
+        the QuerySet. Copies skip the rows already there, so a move interrupted
+        between the two steps can simply run again.
+
+        Args:
+            alias (str): Target shard.
+
+        Returns:
+            int: Number of moved tasks.
+        """
+        rows: list[dict] = list(self.values(*(field.attname for field in Task._meta.concrete_fields)))
+        if not rows:
+            return 0
+        ids: list[int] = [row["id"] for row in rows]
+        memberships: list[dict] = list(
+            TaskMembership.objects.using(self.db)
+            .filter(task_id__in=ids)
+            .values("task_id", "user_id", "roles", "start_date")
+        )
+        reminders: list[dict] = list(
+            TaskReminder.objects.using(self.db).filter(task_id__in=ids).values("task_id", "kind", "due_date", "sent_at")
+        )
+        target: TaskQuerySet = Task.objects.using(alias)
+        with transaction.atomic(using=alias):
+            # The plain bulk_create() copies the memberships instead of building them
+            super(TaskQuerySet, target).bulk_create((Task(**row) for row in rows), ignore_conflicts=True)
+            # bulk_create() stamps the auto_now columns, so the original timestamps are written back
+            target.bulk_update([Task(**row) for row in rows], ["created_at", "updated_at"])
+            TaskMembership.objects.using(alias).bulk_create(
+                (TaskMembership(**row) for row in memberships), ignore_conflicts=True
+            )
+            TaskReminder.objects.using(alias).bulk_create(
+                (TaskReminder(**row) for row in reminders), ignore_conflicts=True
+            )
+        Task.objects.using(self.db).filter(id__in=ids).delete()
+        logger.debug(f"Moved {len(ids)} tasks from {self.db} to {alias}")
+        return len(ids)
+
+
+class IdSequence(models.Model):
+    """
+    Source of ids unique across databases, stored in ``default``.
+
+    Task shards cannot rely on their own auto-increment, so sharded tasks get
+    their ids from here. Processes reserve blocks of ids with one ``UPDATE``
+    (see ``allocate_task_ids()``) instead of a round trip per insert.
+
+    Attributes:
+        name (str): Name of the sequence.
+        next_id (int): First id not reserved yet.
+    """
+
+    name = models.CharField(max_length=100, primary_key=True, verbose_name="Name")
+    next_id = models.BigIntegerField(verbose_name="Next id")
+
+    @classmethod
+    def reserve(cls, name: str, count: int, start: Callable[[], int]) -> range:
+        """
+        Reserves consecutive ids.
+
+        Args:
+            name (str): Name of the sequence, created on first use.
+            count (int): Number of ids.
+            start (Callable[[], int]): Returns the first id of a new sequence.
+
+        Returns:
+            range: The reserved ids.
+        """
+        sequences: models.QuerySet[IdSequence] = cls.objects.using(DEFAULT_DB_ALIAS).filter(name=name)
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            # The UPDATE locks the row until the new value is read back
+            if not sequences.update(next_id=F("next_id") + count):
+                cls.objects.using(DEFAULT_DB_ALIAS).bulk_create(
+                    [cls(name=name, next_id=start())], ignore_conflicts=True
+                )
+                sequences.update(next_id=F("next_id") + count)
+            next_id: int = sequences.values_list("next_id", flat=True).get()
+        return range(next_id - count, next_id)
+
+    def __str__(self) -> str:
+        """
+        String representation of the IdSequence object.
+
+        Returns:
+            str: The name and next id of the sequence.
+        """
+        return f"{self.name} at {self.next_id}"
+
+    class Meta:
+        verbose_name = MODEL_VERBOSE_NAMES["id_sequence"]
+        verbose_name_plural = MODEL_VERBOSE_NAMES["id_sequences"]
+
+
+# Task ids reserved by this process and not used yet
+_task_ids: list[int] = []
+_task_ids_lock: Lock = Lock()
+
+
+def first_free_task_id() -> int:
+    """
+    Returns the id following the highest task id of every shard, archived tasks included.
+
+    Returns:
+        int: First id of the task sequence.
+    """
+    return 1 + max(
+        model.objects.using(alias).aggregate(last=Max("id"))["last"] or 0
+        for alias in get_shards()
+        for model in (Task, ArchivedTask)
+    )
+
+
+def allocate_task_ids(count: int) -> list[int]:
+    """
+    Hands out ids for new sharded tasks, reserving them by blocks of ``SHARDING["id_block_size"]``.
+
+    Ids are unique but, as every process draws from its own block, not
+    ordered by creation time.
+
+    Args:
+        count (int): Number of ids.
+
+    Returns:
+        list[int]: The ids.
+    """
+    with _task_ids_lock:
+        if len(_task_ids) < count:
+            _task_ids.extend(
+                IdSequence.reserve(
+                    SHARDING["task_id_sequence"],
+                    max(count - len(_task_ids), SHARDING["id_block_size"]),
+                    first_free_task_id,
+                )
+            )
+        ids: list[int] = _task_ids[:count]
+        del _task_ids[:count]
+    return ids
+
+
+class TaskVersionConflict(Exception):
+    """
+    Raised when a conditional save finds the task at a different version.
+    """
+
+
 class Task(models.Model):
     """
     Model to store task information.
@@ -16,6 +232,9 @@ class Task(models.Model):
     Each task belongs to a specific user and contains information
     about its title, description, relevant dates, and completion status.
 
+    Instances loaded from the database remember their original values, so
+    saving an existing task only writes the columns that actually changed.
+
     Attributes:
         title (str): Task title.
         description (str): Detailed description (optional).
@@ -25,6 +244,8 @@ class Task(models.Model):
         user (User): User to whom the task belongs.
         created_at (datetime): Creation timestamp.
         updated_at (datetime): Last update timestamp.
+        version (int): Incremented on every write, used for optimistic concurrency control.
+        completed_at (datetime): When the task was completed, None while pending.
     """
 
     title = models.CharField(max_length=255, verbose_name="Title")
@@ -32,12 +253,73 @@ class Task(models.Model):
     start_date = models.DateField(verbose_name="Start date")
     due_date = models.DateField(null=True, blank=True, verbose_name="Due date")
     completed = models.BooleanField(default=False, verbose_name="Completed")
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="tasks", verbose_name="User")
+    # Shards hold no users, so references to users are not enforced by the database
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, db_constraint=False, related_name="tasks", verbose_name="User"
+    )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Creation timestamp")
     created_by = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="created_tasks", verbose_name="Created by"
+        User,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        # Covered by the (created_by, start_date) index
+        db_index=False,
+        related_name="created_tasks",
+        verbose_name="Created by",
     )
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Last update timestamp")
+    version = models.PositiveIntegerField(default=1, verbose_name="Version")
+    completed_at = models.DateTimeField(null=True, blank=True, verbose_name="Completed at")
+
+    objects = TaskQuerySet.as_manager()
+
+    # Fields whose changes require running clean() again
+    DATE_FIELDS: tuple[str, ...] = ("start_date", "due_date")
+
+    @classmethod
+    def from_db(cls, db: str, field_names: list[str], values: list[Any]) -> "Task":
+        """
+        Creates an instance from a database row and snapshots its loaded values.
+
+        Args:
+            db (str): Alias of the database the row comes from.
+            field_names (list[str]): Attribute names of the loaded columns.
+            values (list[Any]): Loaded values, in the same order.
+
+        Returns:
+            Task: The new instance.
+        """
+        instance: Task = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def _snapshot(self) -> None:
+        """
+        Records the current values as the clean state of the instance.
+        """
+        deferred: set[str] = self.get_deferred_fields()
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname not in deferred
+        }
+
+    def get_dirty_fields(self) -> list[str]:
+        """
+        Returns the names of the fields changed since the instance was loaded or saved.
+
+        Returns:
+            list[str]: Names of the changed fields. Every concrete field if the
+            original values are unknown.
+        """
+        loaded: dict[str, Any] | None = getattr(self, "_loaded_values", None)
+        if loaded is None:
+            return [field.name for field in self._meta.concrete_fields if not field.primary_key]
+        return [
+            field.name
+            for field in self._meta.concrete_fields
+            if field.attname in loaded and getattr(self, field.attname) != loaded[field.attname]
+        ]
 
     def __str__(self) -> str:
         """
@@ -64,25 +346,244 @@ class Task(models.Model):
         if self.due_date and self.start_date and self.due_date < self.start_date:
             raise ValidationError({"due_date": ERROR_MESSAGES["due_date_before_start"]})
 
-    def save(self, *args, **kwargs) -> None:
+    def save(self, *args, expected_version: int | None = None, **kwargs) -> None:
         """
         Saves the Task model instance, applying validations.
 
+        New tasks are inserted with every column. Existing tasks are updated
+        with ``update_fields`` set to the changed columns only, and nothing is
+        written when no field changed. Validations only run when a date changed.
+        Every update increments ``version``: without ``expected_version``, a
+        row changed by another write since it was loaded is updated on top of
+        that write, and the instance gets the version following it.
+
         Args:
             *args: Positional arguments.
+            expected_version (int | None): If given, the update only applies while the
+                stored row is still at this version (``UPDATE ... WHERE version = n``).
             **kwargs: Keyword arguments.
+
+        Raises:
+            TaskVersionConflict: If the stored row is not at ``expected_version``.
+        """
+        is_update: bool = not self._state.adding
+        self.sync_completed_at()
+        dirty_fields: list[str] = self.get_dirty_fields()
+
+        if is_update and not args and kwargs.get("update_fields") is None and not kwargs.get("force_insert"):
+            if not dirty_fields:
+                logger.debug(f"Task {self.pk} unchanged, skipping save")
+                return
+            kwargs["update_fields"] = [*dirty_fields, "updated_at"]
+
+        if not is_update or any(field in dirty_fields for field in self.DATE_FIELDS):
+            self.clean()
+
+        previous_version: int = self.version
+        loaded_version: int | None = None
+        if is_update:
+            loaded_version = getattr(self, "_loaded_values", {}).get("version", self.version)
+            self.version = (expected_version if expected_version is not None else loaded_version) + 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = [*kwargs["update_fields"], "version"]
+
+        alias: str = kwargs.get("using") or router.db_for_write(Task, instance=self)
+        if is_sharded():
+            alias = kwargs["using"] = self.place_in_shard()
+            # The id is set before the insert, which would otherwise start with an UPDATE
+            kwargs["force_insert"] = kwargs.get("force_insert", False) or not is_update
+        self._expected_version = expected_version
+        self._loaded_version = loaded_version
+        try:
+            # With an expected version, a savepoint keeps an enclosing transaction usable after a conflict
+            with transaction.atomic(using=alias, savepoint=expected_version is not None):
+                super().save(*args, **kwargs)
+                self.save_memberships(is_update, dirty_fields)
+        except TaskVersionConflict:
+            self.version = previous_version
+            raise
+        finally:
+            self._expected_version = self._loaded_version = None
+        self._snapshot()
+
+    def place_in_shard(self) -> str:
+        """
+        Prepares the save of the task into the shard of its assignee.
+
+        New tasks get an id unique across shards. A task reassigned to a user
+        of another shard is first moved there, with its memberships and
+        reminders, then updated.
+
+        Returns:
+            str: Alias of the shard to save into.
+        """
+        alias: str = shard_for_user(self.user_id)
+        if self._state.adding:
+            if self.pk is None:
+                self.pk = allocate_task_ids(1)[0]
+        elif self._state.db != alias:
+            Task.objects.using(self._state.db).filter(pk=self.pk).move_to(alias)
+            self._state.db = alias
+        return alias
+
+    def sync_completed_at(self) -> None:
+        """
+        Stamps the completion time of a task being completed, and clears it when reopened.
+        """
+        if "completed_at" in self.get_deferred_fields():
+            return
+        if self.completed and self.completed_at is None:
+            self.completed_at = timezone.now()
+        elif not self.completed and self.completed_at is not None:
+            self.completed_at = None
+
+    def build_memberships(self) -> list["TaskMembership"]:
+        """
+        Builds the memberships given by the task's assignee and creator.
+
+        Returns:
+            list[TaskMembership]: Unsaved memberships, one per user.
+        """
+        roles: dict[int, int] = {self.user_id: TaskMembership.ASSIGNEE}
+        roles[self.created_by_id] = roles.get(self.created_by_id, 0) | TaskMembership.CREATOR
+        return [
+            TaskMembership(task_id=self.pk, user_id=user_id, roles=role, start_date=self.start_date)
+            for user_id, role in roles.items()
+        ]
+
+    def save_memberships(self, is_update: bool, dirty_fields: list[str]) -> None:
+        """
+        Keeps the memberships of the task in line with a save.
+
+        New tasks get their memberships inserted. Changing the assignee or
+        the creator moves their roles, keeping watchers; changing the start
+        date updates its denormalized copy.
+
+        Args:
+            is_update (bool): Whether the save updated an existing task.
+            dirty_fields (list[str]): Fields changed by the save.
+        """
+        memberships: models.QuerySet[TaskMembership] = TaskMembership.objects.using(self._state.db)
+        if not is_update:
+            memberships.bulk_create(self.build_memberships())
+            return
+        if "user" not in dirty_fields and "created_by" not in dirty_fields:
+            if "start_date" in dirty_fields:
+                self.memberships.update(start_date=self.start_date)
+            return
+
+        wanted: dict[int, int] = {membership.user_id: membership.roles for membership in self.build_memberships()}
+        changed: list[TaskMembership] = []
+        removed: list[int] = []
+        for membership in self.memberships.all():
+            roles: int = (membership.roles & TaskMembership.WATCHER) | wanted.pop(membership.user_id, 0)
+            if not roles:
+                removed.append(membership.pk)
+            elif roles != membership.roles or membership.start_date != self.start_date:
+                membership.roles, membership.start_date = roles, self.start_date
+                changed.append(membership)
+        if removed:
+            memberships.filter(pk__in=removed).delete()
+        if changed:
+            memberships.bulk_update(changed, ["roles", "start_date"])
+        memberships.bulk_create(
+            TaskMembership(task_id=self.pk, user_id=user_id, roles=roles, start_date=self.start_date)
+            for user_id, roles in wanted.items()
+        )
+
+    def add_watchers(self, user_ids: list[int]) -> None:
+        """
+        Shares the task with users, who can then read it.
+
+        Args:
+            user_ids (list[int]): Ids of the users.
+        """
+        alias: str = router.db_for_write(TaskMembership, instance=self)
+        with transaction.atomic(using=alias, savepoint=False):
+            TaskMembership.objects.using(alias).bulk_create(
+                (
+                    TaskMembership(task_id=self.pk, user_id=user_id, roles=0, start_date=self.start_date)
+                    for user_id in user_ids
+                ),
+                ignore_conflicts=True,
+            )
+            self.memberships.filter(user_id__in=user_ids).update(roles=F("roles").bitor(TaskMembership.WATCHER))
+
+    def remove_watchers(self, user_ids: list[int]) -> None:
+        """
+        Stops sharing the task with users. Their other roles are kept.
+
+        Args:
+            user_ids (list[int]): Ids of the users.
+        """
+        with transaction.atomic(using=router.db_for_write(TaskMembership, instance=self), savepoint=False):
+            self.memberships.filter(user_id__in=user_ids).update(roles=F("roles").bitand(~TaskMembership.WATCHER))
+            self.memberships.filter(user_id__in=user_ids, roles=0).delete()
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update) -> bool:
+        """
+        Runs the UPDATE of a save, restricted to the expected version if one was given.
+
+        Without an expected version, the row is first updated while still at
+        its loaded version, which writes the version computed by ``save()``.
+        If another write changed the row since, it is updated again with
+        ``version = version + 1`` and the resulting version is read back, so
+        two states of the row never share a version.
+
+        Raises:
+            TaskVersionConflict: If no row matched the expected version.
         """
-        self.clean()
-        super().save(*args, **kwargs)
+        expected_version: int | None = getattr(self, "_expected_version", None)
+        if expected_version is not None:
+            base_qs = base_qs.filter(version=expected_version)
+        loaded_version: int | None = getattr(self, "_loaded_version", None)
+        if expected_version is None and loaded_version is not None:
+            if super()._do_update(
+                base_qs.filter(version=loaded_version), using, pk_val, values, update_fields, forced_update
+            ):
+                return True
+            values = [
+                (field, model, F("version") + 1 if field.attname == "version" else value)
+                for field, model, value in values
+            ]
+        updated: bool = super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        if not updated and expected_version is not None:
+            raise TaskVersionConflict(f"Task {pk_val} is no longer at version {expected_version}")
+        if updated and loaded_version is not None and expected_version is None:
+            self.version = base_qs.filter(pk=pk_val).values_list("version", flat=True).get()
+        return updated
 
-    def mark_as_completed(self) -> None:
+    def mark_as_completed(self, user: User | None = None) -> bool:
         """
-        Marks the task as completed and saves it.
+        Marks the task as completed.
+
+        The row is updated with a single conditional query instead of a
+        read-modify-write of every column, so it is safe under concurrency.
+        Like the complete endpoint, it then invalidates the cached responses
+        of the task's members, notifies them and records the completion.
+
+        Args:
+            user (User | None): User completing the task, None for the system.
+
+        Returns:
+            bool: True if this call completed the task, False if it was already completed.
         """
-        if not self.completed:
-            self.completed = True
-            self.save()
+        # The notifications import this module
+        from tasks.notifications import notify_completed
+
+        now: datetime = timezone.now()
+        tasks: TaskQuerySet = Task.objects.using(router.db_for_write(Task, instance=self)).filter(pk=self.pk)
+        completed: bool = tasks.mark_as_completed(now) > 0
+        self.completed = True
+        if completed:
+            self.version += 1
+            self.completed_at = now
+        if hasattr(self, "_loaded_values"):
+            self._loaded_values.update(completed=True, version=self.version, completed_at=self.completed_at)
+        if completed:
+            notify_completed(tasks, now, user)
             logger.info(f"Task marked as completed: {self.title}")
+        return completed
 
     class Meta:
         ordering = ["start_date", "due_date"]
@@ -90,5 +591,294 @@ class Task(models.Model):
         verbose_name_plural = MODEL_VERBOSE_NAMES["tasks"]
         indexes = [
             models.Index(fields=["user", "start_date"]),
+            # Account deletion: the tasks a user created for others, walked like their own
+            models.Index(fields=["created_by", "start_date"]),
             models.Index(fields=["user", "completed"]),
+            # Reminder sweeps: pending tasks due on a given day, walked in id order
+            models.Index(fields=["completed", "due_date", "id"]),
+            # Archival: the oldest completed tasks first
+            models.Index(fields=["completed", "completed_at"]),
+        ]
+
+
+class ArchivedTask(models.Model):
+    """
+    Completed task moved out of the task table by ``tasks.archive``.
+
+    Rows keep the id and the columns of the original task, so archived
+    tasks share the task representations. They are read-only and visible
+    to their assignee and creator.
+
+    Attributes:
+        archived_at (datetime): When the task was archived.
+        (every other attribute as in Task)
+    """
+
+    id = models.BigIntegerField(primary_key=True, verbose_name="ID")
+    title = models.CharField(max_length=255, verbose_name="Title")
+    description = models.TextField(blank=True, verbose_name="Description")
+    start_date = models.DateField(verbose_name="Start date")
+    due_date = models.DateField(null=True, blank=True, verbose_name="Due date")
+    completed = models.BooleanField(default=True, verbose_name="Completed")
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, db_constraint=False, related_name="archived_tasks", verbose_name="User"
+    )
+    created_at = models.DateTimeField(verbose_name="Creation timestamp")
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name="created_archived_tasks",
+        verbose_name="Created by",
+    )
+    updated_at = models.DateTimeField(verbose_name="Last update timestamp")
+    version = models.PositiveIntegerField(default=1, verbose_name="Version")
+    completed_at = models.DateTimeField(null=True, blank=True, verbose_name="Completed at")
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="Archived at")
+
+    def __str__(self) -> str:
+        """
+        String representation of the ArchivedTask object.
+
+        Returns:
+            str: The task title.
+        """
+        return f"{self.title}"
+
+    class Meta:
+        ordering = ["start_date", "due_date"]
+        verbose_name = MODEL_VERBOSE_NAMES["archived_task"]
+        verbose_name_plural = MODEL_VERBOSE_NAMES["archived_tasks"]
+        indexes = [
+            models.Index(fields=["user", "start_date"]),
+            models.Index(fields=["created_by", "start_date"]),
+        ]
+
+
+class TaskMembership(models.Model):
+    """
+    Materialized visibility of a task: one row per user who can see it.
+
+    ``roles`` is a bitmask of the user's relations to the task. Assignee
+    and creator memberships are maintained by ``Task.save`` and
+    ``TaskQuerySet.bulk_create``; watchers are added by sharing the task.
+    The task's start date is copied here, so a user's task list is a range
+    scan of the ``(user, start_date)`` index joined to the tasks by key.
+
+    Attributes:
+        task (Task): The visible task.
+        user (User): The member.
+        roles (int): Bitmask of ``ASSIGNEE``, ``CREATOR`` and ``WATCHER``.
+        start_date (date): Start date of the task.
+    """
+
+    ASSIGNEE: int = 1
+    CREATOR: int = 2
+    WATCHER: int = 4
+    # Roles allowed to modify the task
+    EDITORS: int = ASSIGNEE | CREATOR
+
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="memberships", verbose_name="Task")
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, db_constraint=False, related_name="task_memberships", verbose_name="User"
+    )
+    roles = models.PositiveSmallIntegerField(verbose_name="Roles")
+    start_date = models.DateField(verbose_name="Start date")
+
+    @classmethod
+    def roles_including(cls, mask: int) -> list[int]:
+        """
+        Lists the role combinations sharing at least one role with a mask.
+
+        Lets queries filter on roles with an ``IN`` list instead of a bitwise expression.
+
+        Args:
+            mask (int): Roles to look for.
+
+        Returns:
+            list[int]: Matching values of ``roles``.
+        """
+        return [roles for roles in range(1, (cls.ASSIGNEE | cls.CREATOR | cls.WATCHER) + 1) if roles & mask]
+
+    def __str__(self) -> str:
+        """
+        String representation of the TaskMembership object.
+
+        Returns:
+            str: The user, task and roles of the membership.
+        """
+        return f"User {self.user_id} on task {self.task_id} (roles {self.roles})"
+
+    class Meta:
+        verbose_name = MODEL_VERBOSE_NAMES["task_membership"]
+        verbose_name_plural = MODEL_VERBOSE_NAMES["task_memberships"]
+        constraints = [
+            models.UniqueConstraint(fields=["task", "user"], name="unique_task_membership"),
         ]
+        indexes = [
+            models.Index(fields=["user", "start_date"]),
+        ]
+
+
+class TaskReminder(models.Model):
+    """
+    Delivery record of a due date reminder.
+
+    A task gets at most one reminder of each kind per due date, enforced by a
+    unique constraint, so sweeps can be retried or overlap without duplicates.
+    Moving the due date makes the task eligible again.
+
+    Attributes:
+        task (Task): Task the reminder is about.
+        kind (str): Reminder kind, a key of ``REMINDERS["kinds"]``.
+        due_date (date): Due date of the task when the reminder was recorded.
+        created_at (datetime): When the sweep recorded the reminder.
+        sent_at (datetime): When the reminder was delivered, None while pending.
+    """
+
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="reminders", verbose_name="Task")
+    kind = models.CharField(max_length=20, verbose_name="Kind")
+    due_date = models.DateField(verbose_name="Due date")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Creation timestamp")
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name="Sent at")
+
+    def __str__(self) -> str:
+        """
+        String representation of the TaskReminder object.
+
+        Returns:
+            str: The kind and task of the reminder.
+        """
+        return f"{self.kind} reminder for task {self.task_id}"
+
+    class Meta:
+        verbose_name = MODEL_VERBOSE_NAMES["task_reminder"]
+        verbose_name_plural = MODEL_VERBOSE_NAMES["task_reminders"]
+        constraints = [
+            models.UniqueConstraint(fields=["task", "kind", "due_date"], name="unique_task_reminder"),
+        ]
+
+
+class ReminderSweep(models.Model):
+    """
+    Progress of the reminder sweep over one window: the tasks of a kind due on one day.
+
+    A node claims the window by locking this row, then walks the tasks in
+    primary key order and stores the last processed id in ``cursor`` after
+    every batch, so an interrupted sweep resumes where it stopped. The window
+    is walked again by every sweep until the day its reminders fire is over.
+
+    Attributes:
+        kind (str): Reminder kind.
+        window (date): Due date covered by the sweep.
+        cursor (int): Id of the last processed task.
+        locked_by (str): Claim token of the node sweeping the window, empty if free.
+        locked_at (datetime): Last heartbeat of that node.
+        completed_at (datetime): When the window was processed for the last time, after its day.
+    """
+
+    kind = models.CharField(max_length=20, verbose_name="Kind")
+    window = models.DateField(verbose_name="Window")
+    cursor = models.BigIntegerField(default=0, verbose_name="Cursor")
+    locked_by = models.CharField(max_length=100, blank=True, verbose_name="Locked by")
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name="Locked at")
+    completed_at = models.DateTimeField(null=True, blank=True, verbose_name="Completed at")
+
+    def __str__(self) -> str:
+        """
+        String representation of the ReminderSweep object.
+
+        Returns:
+            str: The kind and window of the sweep.
+        """
+        return f"{self.kind} sweep of {self.window.isoformat()}"
+
+    class Meta:
+        verbose_name = MODEL_VERBOSE_NAMES["reminder_sweep"]
+        verbose_name_plural = MODEL_VERBOSE_NAMES["reminder_sweeps"]
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "window"], name="unique_reminder_sweep"),
+        ]
+
+
+class TaskChange(models.Model):
+    """
+    Entry of the append-only history of a task: who changed which fields, and how.
+
+    Entries are written by ``tasks.history`` and stored in ``default`` even
+    when tasks are sharded. Neither the task nor the user is a constraint, so
+    the history of a deleted task, and the author of a change once deleted,
+    are kept.
+
+    Attributes:
+        task (Task): Changed task.
+        user (User): Author of the change, None when made outside a request.
+        action (str): One of ``ACTIONS``.
+        changes (dict): Previous and new value of each changed field, as ``{field: [old, new]}``.
+        created_at (datetime): When the change was made.
+    """
+
+    CREATED: str = "created"
+    UPDATED: str = "updated"
+    COMPLETED: str = "completed"
+    DELETED: str = "deleted"
+    ACTIONS: tuple[str, ...] = (CREATED, UPDATED, COMPLETED, DELETED)
+
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        # Covered by the (task, created_at) index
+        db_index=False,
+        related_name="changes",
+        verbose_name="Task",
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="task_changes",
+        verbose_name="User",
+    )
+    action = models.CharField(max_length=10, choices=[(action, action) for action in ACTIONS], verbose_name="Action")
+    changes = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder, verbose_name="Changes")
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="Creation timestamp")
+
+    def __str__(self) -> str:
+        """
+        String representation of the TaskChange object.
+
+        Returns:
+            str: The action and task of the change.
+        """
+        return f"Task {self.task_id} {self.action}"
+
+    class Meta:
+        verbose_name = MODEL_VERBOSE_NAMES["task_change"]
+        verbose_name_plural = MODEL_VERBOSE_NAMES["task_changes"]
+        indexes = [
+            # History of a task, newest first
+            models.Index(fields=["task", "created_at"]),
+        ]
+
+
+@receiver(pre_delete, sender=User)
+def delete_sharded_rows(sender, instance: User, using: str, **kwargs) -> None:
+    """
+    Deletes the tasks, memberships and archived tasks of a deleted user from the other shards.
+
+    Deleting a user only cascades within its own database.
+
+    Args:
+        sender: The User model.
+        instance (User): User being deleted.
+        using (str): Database the user is deleted from.
+    """
+    for alias in get_shards():
+        if alias == using:
+            continue
+        Task.objects.using(alias).filter(Q(user_id=instance.pk) | Q(created_by_id=instance.pk)).delete()
+        TaskMembership.objects.using(alias).filter(user_id=instance.pk).delete()
+        ArchivedTask.objects.using(alias).filter(Q(user_id=instance.pk) | Q(created_by_id=instance.pk)).delete()
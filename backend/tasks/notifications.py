@@ -0,0 +1,128 @@
+"""
+Side effects of task writes.
+
+The API, the admin and the model methods all report their writes through
+these functions, so whoever made the write, the cached responses of the
+task members are invalidated, the members get their event and the history
+gets its entries.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any
+
+from django.contrib.auth.models import User
+from django.db.models import QuerySet
+
+from constants import EVENTS
+from events.publisher import publish
+from tasks import history
+from tasks.cache import bump_user_tasks_version
+from tasks.models import Task, TaskChange, TaskMembership
+from tasks.serializers import TaskSerializer
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+def notify_saved(
+    task: Task,
+    before: dict[str, Any],
+    user: User | None = None,
+    data: dict | None = None,
+    previous_user_id: int | None = None,
+) -> None:
+    """
+    Reports the creation or update of a task.
+
+    Args:
+        task (Task): The saved task.
+        before (dict[str, Any]): ``history.snapshot()`` of the task before the save, empty for a creation.
+        user (User | None): User who saved the task, None for the system.
+        data (dict | None): Representation of the task sent with the event, ``TaskSerializer`` by default.
+        previous_user_id (int | None): Assignee before the save, who is notified as well.
+    """
+    after: dict[str, Any] = history.snapshot(task)
+    changes: dict[str, list] = history.diff(before, after)
+    action: str = TaskChange.UPDATED if before else TaskChange.CREATED
+    if changes:
+        history.record(TaskChange(task_id=task.pk, user=user, action=action, changes=changes))
+    user_ids: set[int | None]
+    if before:
+        user_ids = {previous_user_id, *task.memberships.values_list("user_id", flat=True)}
+    else:
+        user_ids = {task.user_id, task.created_by_id}
+    bump_user_tasks_version(*user_ids)
+    event: str = EVENTS["task_updated"] if before else EVENTS["task_created"]
+    publish(event, [(user_ids, data if data is not None else TaskSerializer(task).data)])
+
+
+def notify_deleted(
+    members: dict[int, set[int]], user: User | None = None, before: dict[int, dict[str, Any]] | None = None
+) -> None:
+    """
+    Reports the deletion of tasks.
+
+    Args:
+        members (dict[int, set[int]]): Ids of the members of every deleted task, by task id.
+        user (User | None): User who deleted the tasks, None for the system.
+        before (dict[int, dict[str, Any]] | None): ``history.snapshot()`` of the deleted tasks
+            by id, recorded in the history when given.
+    """
+    before = before or {}
+    history.record(
+        *(
+            TaskChange(
+                task_id=task_id,
+                user=user,
+                action=TaskChange.DELETED,
+                changes=history.diff(before[task_id], {}) if task_id in before else {},
+            )
+            for task_id in members
+        )
+    )
+    bump_user_tasks_version(*{user_id for user_ids in members.values() for user_id in user_ids})
+    publish(EVENTS["task_deleted"], ((user_ids, {"id": task_id}) for task_id, user_ids in members.items()))
+
+
+def notify_completed(tasks: QuerySet[Task], completed_at: datetime, user: User | None = None) -> None:
+    """
+    Invalidates the cached responses of the members of completed tasks and notifies them.
+
+    Tasks of the QuerySet that were already completed are included: the
+    event only states their current state. Only the tasks completed at
+    ``completed_at``, by the caller, are added to the history.
+
+    Args:
+        tasks (QuerySet[Task]): Completed tasks.
+        completed_at (datetime): Completion time given to ``mark_as_completed()``.
+        user (User | None): User who completed the tasks, None for the system.
+    """
+    members: dict[int, tuple[int, set[int]]] = {}
+    changes: list[TaskChange] = []
+    for task_id, version, task_completed_at, user_id in (
+        TaskMembership.objects.using(tasks.db)
+        .filter(task__in=tasks)
+        .values_list("task_id", "task__version", "task__completed_at", "user_id")
+    ):
+        if task_id not in members and task_completed_at == completed_at:
+            changes.append(
+                TaskChange(
+                    task_id=task_id,
+                    user=user,
+                    action=TaskChange.COMPLETED,
+                    changes={"completed": [False, True]},
+                    created_at=completed_at,
+                )
+            )
+        members.setdefault(task_id, (version, set()))[1].add(user_id)
+    history.record(*changes)
+    bump_user_tasks_version(*{user_id for _, user_ids in members.values() for user_id in user_ids})
+    publish(
+        EVENTS["task_completed"],
+        (
+            (user_ids, {"id": task_id, "completed": True, "version": version})
+            for task_id, (version, user_ids) in members.items()
+        ),
+    )
+    logger.debug(f"{len(changes)} task completions notified")
@@ -0,0 +1,31 @@
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from typing import Any, IO
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class FastJSONParser(JSONParser):
+    """
+    Drop-in JSONParser backed by ``orjson`` when it is installed.
+
+    Falls back to DRF's JSONParser without ``orjson`` or for non UTF-8 bodies.
+    """
+
+    def parse(self, stream: IO[bytes], media_type: str | None = None, parser_context: dict | None = None) -> Any:
+        """
+        Parse the incoming JSON body.
+
+        Raises:
+            ParseError: If the body is not valid JSON.
+        """
+        encoding: str = (parser_context or {}).get("encoding", "utf-8")
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,240 @@
+import logging
+import uuid
+from datetime import date, datetime, timedelta
+
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from constants import REMINDERS
+from jobs.queue import enqueue
+from tasks.models import ReminderSweep, Task, TaskReminder
+from tasks.sharding import shard_querysets
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+def windows_to_sweep(kind: str, today: date, max_catch_up_days: int = REMINDERS["max_catch_up_days"]) -> list[date]:
+    """
+    Returns the windows of a reminder kind that still need a sweep.
+
+    The target window is the due date the kind fires for today; it stays open,
+    and is swept again by every sweep, until that day is over. Windows of the
+    previous days that were not completed (the scheduler was down, a node
+    died) are swept again, up to ``max_catch_up_days`` back. Reminders sent
+    before the due date are never caught up once that date has passed.
+
+    Args:
+        kind (str): Reminder kind.
+        today (date): Day of the sweep.
+        max_catch_up_days (int): How many missed windows to catch up on.
+
+    Returns:
+        list[date]: Windows in chronological order.
+    """
+    offset: int = REMINDERS["kinds"][kind]
+    target: date = today - timedelta(days=offset)
+    first: date = target - timedelta(days=max_catch_up_days)
+    if offset < 0:
+        first = max(first, today)
+    completed: set[date] = set(
+        ReminderSweep.objects.filter(kind=kind, window__range=(first, target), completed_at__isnull=False).values_list(
+            "window", flat=True
+        )
+    )
+    days: int = (target - first).days
+    return [
+        first + timedelta(days=index) for index in range(days + 1) if first + timedelta(days=index) not in completed
+    ]
+
+
+def sweep_window(
+    kind: str,
+    window: date,
+    worker: str,
+    batch_size: int = REMINDERS["batch_size"],
+    lock_timeout: timedelta = timedelta(seconds=REMINDERS["lock_timeout_seconds"]),
+    today: date | None = None,
+) -> int:
+    """
+    Records the reminders of one window and queues their delivery.
+
+    The window is claimed with a conditional update of its sweep row, so
+    concurrent nodes never process the same window. Pending tasks due on the
+    window are walked in id order with keyset pagination
+    (``WHERE completed = false AND due_date = d AND id > cursor ORDER BY id LIMIT n``),
+    which is served by the ``(completed, due_date, id)`` index and keeps memory
+    bounded by the batch size. Each batch inserts the reminders not recorded
+    yet, advances the cursor and queues one delivery job for them, all in one
+    transaction. When sharded, every shard is walked at once and a batch holds
+    the lowest ids above the cursor of all of them; reminders of shards other
+    than ``default`` are inserted outside of the transaction, which a retried
+    batch tolerates.
+
+    Tasks may still be created or rescheduled into the window until the day
+    its reminders fire is over, so a pass started on or before that day
+    leaves the window open and rewinds its cursor: the next sweep walks it
+    again and only records the tasks it had not reminded yet. The first pass
+    started after that day completes the window.
+
+    Args:
+        kind (str): Reminder kind.
+        window (date): Due date of the tasks to remind.
+        worker (str): Name of the sweeping node.
+        batch_size (int): Tasks per batch.
+        lock_timeout (timedelta): Age of a heartbeat after which another node may take over.
+        today (date | None): Day of the sweep, the current local date if None.
+
+    Returns:
+        int: Number of reminders recorded, 0 if the window was claimed by another node.
+    """
+    sweep, _ = ReminderSweep.objects.get_or_create(kind=kind, window=window)
+    token: str = f"{worker}:{uuid.uuid4().hex[:12]}"
+    now: datetime = timezone.now()
+    claimed: int = (
+        ReminderSweep.objects.filter(pk=sweep.pk, completed_at__isnull=True)
+        .filter(Q(locked_by="") | Q(locked_at__lt=now - lock_timeout))
+        .update(locked_by=token, locked_at=now)
+    )
+    if not claimed:
+        logger.debug(f"Reminder sweep {sweep} is done or claimed by another node")
+        return 0
+
+    # Decided before walking, so a pass that ends after the window closes still sweeps it again
+    closing: bool = (today or timezone.localdate()) > window + timedelta(days=REMINDERS["kinds"][kind])
+    cursor: int = ReminderSweep.objects.values_list("cursor", flat=True).get(pk=sweep.pk)
+    processed: int = 0
+    pending = Task.objects.filter(completed=False, due_date=window).order_by("id")
+    while True:
+        shards: dict[str, list[int]] = {
+            shard.db: list(shard.filter(id__gt=cursor).values_list("id", flat=True)[:batch_size])
+            for shard in shard_querysets(pending)
+        }
+        ids: list[int] = sorted(task_id for shard_ids in shards.values() for task_id in shard_ids)[:batch_size]
+        if not ids:
+            break
+        recorded: list[int] = []
+        with transaction.atomic():
+            # The heartbeat doubles as a check that no other node took the window over
+            if not ReminderSweep.objects.filter(pk=sweep.pk, locked_by=token).update(
+                cursor=ids[-1], locked_at=timezone.now()
+            ):
+                logger.warning(f"Reminder sweep {sweep} was taken over by another node")
+                return processed
+            for alias, shard_ids in shards.items():
+                shard_ids = [task_id for task_id in shard_ids if task_id <= ids[-1]]
+                reminded: set[int] = set(
+                    TaskReminder.objects.using(alias)
+                    .filter(task_id__in=shard_ids, kind=kind, due_date=window)
+                    .values_list("task_id", flat=True)
+                )
+                new: list[int] = [task_id for task_id in shard_ids if task_id not in reminded]
+                TaskReminder.objects.using(alias).bulk_create(
+                    (TaskReminder(task_id=task_id, kind=kind, due_date=window) for task_id in new),
+                    ignore_conflicts=True,
+                )
+                recorded.extend(new)
+            if recorded:
+                enqueue(
+                    "tasks.deliver_reminders",
+                    {"kind": kind, "due_date": window.isoformat(), "task_ids": sorted(recorded)},
+                )
+        cursor = ids[-1]
+        processed += len(recorded)
+
+    if closing:
+        ReminderSweep.objects.filter(pk=sweep.pk, locked_by=token).update(
+            completed_at=timezone.now(), locked_by="", locked_at=None
+        )
+        logger.info(f"Reminder sweep {sweep} completed: {processed} tasks")
+    else:
+        ReminderSweep.objects.filter(pk=sweep.pk, locked_by=token).update(cursor=0, locked_by="", locked_at=None)
+        logger.info(f"Reminder sweep {sweep} passed, open until its day is over: {processed} tasks")
+    return processed
+
+
+def sweep(
+    today: date,
+    worker: str,
+    kinds: list[str] | None = None,
+    batch_size: int = REMINDERS["batch_size"],
+    max_catch_up_days: int = REMINDERS["max_catch_up_days"],
+) -> dict[str, int]:
+    """
+    Sweeps every pending window of the given reminder kinds.
+
+    Args:
+        today (date): Day of the sweep.
+        worker (str): Name of the sweeping node.
+        kinds (list[str] | None): Reminder kinds, all of them if None.
+        batch_size (int): Tasks per batch.
+        max_catch_up_days (int): How many missed windows to catch up on.
+
+    Returns:
+        dict[str, int]: Number of reminders recorded per kind.
+    """
+    results: dict[str, int] = {}
+    for kind in kinds or REMINDERS["kinds"]:
+        results[kind] = sum(
+            sweep_window(kind, window, worker, batch_size, today=today)
+            for window in windows_to_sweep(kind, today, max_catch_up_days)
+        )
+    return results
+
+
+def send_reminder(reminder: TaskReminder) -> None:
+    """
+    Delivers a reminder to the owner of its task.
+
+    This is the single place to plug notification channels in; reminders are
+    currently written to the log.
+
+    Args:
+        reminder (TaskReminder): Reminder to deliver, with its task loaded.
+    """
+    logger.info(
+        f"Reminder ({reminder.kind}): task '{reminder.task.title}' of user {reminder.task.user_id} "
+        f"is due on {reminder.due_date.isoformat()}"
+    )
+
+
+def deliver_reminders(kind: str, due_date: date, task_ids: list[int]) -> int:
+    """
+    Delivers the recorded, unsent reminders of a batch exactly once.
+
+    Reminders whose task was completed or rescheduled since the sweep are
+    left unsent. On PostgreSQL the rows are locked with ``SKIP LOCKED``, so
+    two deliveries of the same batch never send a reminder twice.
+
+    Args:
+        kind (str): Reminder kind.
+        due_date (date): Window of the batch.
+        task_ids (list[int]): Tasks of the batch.
+
+    Returns:
+        int: Number of reminders sent.
+    """
+    sent: int = 0
+    for reminders in shard_querysets(
+        TaskReminder.objects.filter(
+            kind=kind,
+            due_date=due_date,
+            task_id__in=task_ids,
+            sent_at__isnull=True,
+            task__completed=False,
+            task__due_date=F("due_date"),
+        ).select_related("task")
+    ):
+        if connections[reminders.db].features.has_select_for_update_skip_locked:
+            reminders = reminders.select_for_update(skip_locked=True, of=("self",))
+
+        with transaction.atomic(using=reminders.db):
+            pending: list[TaskReminder] = list(reminders)
+            for reminder in pending:
+                send_reminder(reminder)
+            TaskReminder.objects.using(reminders.db).filter(id__in=[reminder.id for reminder in pending]).update(
+                sent_at=timezone.now()
+            )
+        sent += len(pending)
+    return sent
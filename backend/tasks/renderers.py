@@ -0,0 +1,97 @@
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def to_compact(data: Any) -> Any:
+    """
+    Convert a list of objects into column names plus rows of values.
+
+    Other payloads (single objects, errors) are returned unchanged.
+
+    Args:
+        data (Any): Serialized data.
+
+    Returns:
+        Any: ``{"columns": [...], "rows": [[...], ...]}`` for lists of objects.
+    """
+    if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+        return data
+    columns: list[str] = list(data[0].keys()) if data else []
+    return {"columns": columns, "rows": [[item.get(column) for column in columns] for item in data]}
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer backed by ``orjson`` when it is installed.
+
+    Produces the same bytes as DRF's JSONRenderer for compact output and
+    falls back to it for indented output or without ``orjson``.
+    """
+
+    def render(self, data: Any, accepted_media_type: str | None = None, renderer_context: dict | None = None) -> bytes:
+        """
+        Render the data into JSON.
+        """
+        if data is None:
+            return b""
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret: bytes = orjson.dumps(data, default=self.encoder_class().default, option=orjson.OPT_NON_STR_KEYS)
+        # Same escaping as JSONRenderer, so the output stays a strict JavaScript subset
+        return ret.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
+
+
+class CompactJSONRenderer(FastJSONRenderer):
+    """
+    JSON renderer emitting lists as arrays of arrays.
+
+    Field names are sent once instead of once per task, which shrinks large
+    lists considerably. Selected with ``?format=compact`` or the media type.
+    """
+
+    media_type = "application/vnd.taskmanager.compact+json"
+    format = "compact"
+
+    def render(self, data: Any, accepted_media_type: str | None = None, renderer_context: dict | None = None) -> bytes:
+        """
+        Render the data in compact form.
+        """
+        return super().render(to_compact(data), accepted_media_type, renderer_context)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack renderer, available when the optional ``msgpack`` package is installed.
+
+    Selected with ``?format=msgpack`` or ``Accept: application/msgpack``.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data: Any, accepted_media_type: str | None = None, renderer_context: dict | None = None) -> bytes:
+        """
+        Render the data as MessagePack.
+        """
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=str)
+
+
+# Optional renderers whose dependencies are installed
+OPTIONAL_RENDERERS: list[type[BaseRenderer]] = [MessagePackRenderer] if msgpack is not None else []
@@ -0,0 +1,86 @@
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+
+from constants import SHARDING
+from tasks.models import ArchivedTask, Task
+from tasks.sharding import get_shards, shard_for_user
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+def move_archived_tasks(ids: list[int], source: str, target: str) -> int:
+    """
+    Moves archived tasks to another shard.
+
+    Args:
+        ids (list[int]): Ids of the archived tasks.
+        source (str): Shard holding them.
+        target (str): Shard to move them to.
+
+    Returns:
+        int: Number of moved archived tasks.
+    """
+    rows: list[dict] = list(
+        ArchivedTask.objects.using(source)
+        .filter(id__in=ids)
+        .values(*(field.attname for field in ArchivedTask._meta.concrete_fields))
+    )
+    with transaction.atomic(using=target):
+        ArchivedTask.objects.using(target).bulk_create((ArchivedTask(**row) for row in rows), ignore_conflicts=True)
+        # bulk_create() stamps archived_at, so the original one is written back
+        ArchivedTask.objects.using(target).bulk_update([ArchivedTask(**row) for row in rows], ["archived_at"])
+    ArchivedTask.objects.using(source).filter(id__in=ids).delete()
+    return len(rows)
+
+
+def reshard(
+    batch_size: int = SHARDING["reshard_batch_size"], sources: list[str] | None = None, dry_run: bool = False
+) -> dict[str, int]:
+    """
+    Moves the tasks and archived tasks that are not in the shard of their assignee.
+
+    Run after adding shards, or with ``sources`` to drain databases removed
+    from ``TASK_SHARD_URLS``. Each source is walked in id order with keyset
+    pagination, and the misplaced rows of a batch are moved to their shard
+    with their memberships and reminders. Moves skip the rows already copied,
+    so an interrupted run can simply start again.
+
+    Args:
+        batch_size (int): Rows read per batch.
+        sources (list[str] | None): Databases to walk, every shard if None.
+        dry_run (bool): Only count the misplaced rows.
+
+    Returns:
+        dict[str, int]: Number of moved tasks and archived tasks.
+    """
+    moved: dict[str, int] = {"tasks": 0, "archived_tasks": 0}
+    for alias in sources or get_shards():
+        for model, key in ((Task, "tasks"), (ArchivedTask, "archived_tasks")):
+            cursor: int = 0
+            while True:
+                rows: list[tuple[int, int]] = list(
+                    model.objects.using(alias)
+                    .filter(id__gt=cursor)
+                    .order_by("id")
+                    .values_list("id", "user_id")[:batch_size]
+                )
+                if not rows:
+                    break
+                cursor = rows[-1][0]
+                targets: defaultdict[str, list[int]] = defaultdict(list)
+                for row_id, user_id in rows:
+                    target: str = shard_for_user(user_id)
+                    if target != alias:
+                        targets[target].append(row_id)
+                for target, ids in targets.items():
+                    if not dry_run:
+                        if model is Task:
+                            Task.objects.using(alias).filter(id__in=ids).move_to(target)
+                        else:
+                            move_archived_tasks(ids, alias, target)
+                    moved[key] += len(ids)
+        logger.info(f"Resharded {alias}: {moved['tasks']} tasks and {moved['archived_tasks']} archived tasks so far")
+    return moved
@@ -0,0 +1,82 @@
+"""
+OpenAPI documentation of the task endpoints, loaded with the schema (see ``task_manager.schema``).
+"""
+
+from drf_spectacular.extensions import OpenApiViewExtension
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+
+from constants import DATE_FORMAT_DISPLAY, QUERY_PARAMS
+from idempotency.schema import IDEMPOTENCY_KEY_PARAMETER
+from tasks.calendar import BUCKETS
+from tasks.serializers import TaskChangeSerializer, TaskIdsSerializer, TaskSerializer, TaskShareSerializer
+
+INCLUDE_ARCHIVED_PARAMETER: OpenApiParameter = OpenApiParameter(
+    name=QUERY_PARAMS["include_archived"],
+    description="Also return archived tasks (true/false)",
+    required=False,
+    type=OpenApiTypes.BOOL,
+)
+
+
+class TaskViewSetSchema(OpenApiViewExtension):
+    target_class = "tasks.views.TaskViewSet"
+
+    def view_replacement(self) -> type:
+        @extend_schema_view(
+            list=extend_schema(parameters=[INCLUDE_ARCHIVED_PARAMETER]),
+            create=extend_schema(parameters=[IDEMPOTENCY_KEY_PARAMETER]),
+            retrieve=extend_schema(parameters=[INCLUDE_ARCHIVED_PARAMETER]),
+            export=extend_schema(responses={200: TaskSerializer(many=True)}),
+            complete=extend_schema(request=None, responses={200: OpenApiTypes.OBJECT}),
+            bulk_complete=extend_schema(request=TaskIdsSerializer, responses={200: OpenApiTypes.OBJECT}),
+            share=extend_schema(request=TaskShareSerializer, responses={200: OpenApiTypes.OBJECT}),
+            unshare=extend_schema(request=TaskShareSerializer, responses={200: OpenApiTypes.OBJECT}),
+            history=extend_schema(responses={200: TaskChangeSerializer(many=True)}),
+            search=extend_schema(
+                parameters=[
+                    OpenApiParameter(
+                        name=QUERY_PARAMS["start_date"],
+                        description=f"Start date ({DATE_FORMAT_DISPLAY})",
+                        required=False,
+                        type=OpenApiTypes.DATE,
+                    ),
+                    OpenApiParameter(
+                        name=QUERY_PARAMS["end_date"],
+                        description=f"End date ({DATE_FORMAT_DISPLAY})",
+                        required=False,
+                        type=OpenApiTypes.DATE,
+                    ),
+                    INCLUDE_ARCHIVED_PARAMETER,
+                ],
+                responses={200: TaskSerializer(many=True)},
+            ),
+            calendar=extend_schema(
+                parameters=[
+                    OpenApiParameter(
+                        name=QUERY_PARAMS["from_date"],
+                        description=f"First day of the range ({DATE_FORMAT_DISPLAY})",
+                        required=True,
+                        type=OpenApiTypes.DATE,
+                    ),
+                    OpenApiParameter(
+                        name=QUERY_PARAMS["to_date"],
+                        description=f"Last day of the range ({DATE_FORMAT_DISPLAY})",
+                        required=True,
+                        type=OpenApiTypes.DATE,
+                    ),
+                    OpenApiParameter(
+                        name=QUERY_PARAMS["bucket"],
+                        description="Bucket size",
+                        required=False,
+                        type=OpenApiTypes.STR,
+                        enum=[*BUCKETS],
+                    ),
+                ],
+                responses={200: OpenApiTypes.OBJECT},
+            ),
+        )
+        class TaskViewSet(self.target_class):
+            pass
+
+        return TaskViewSet
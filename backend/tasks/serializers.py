@@ -1,11 +1,15 @@
 from rest_framework import serializers
-from tasks.models import Task
+from tasks.models import Task, TaskChange
+from tasks.sharding import shard_for_user
 from users.serializers import UserBasicSerializer
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db.models import Q
+from django.db.models import Q, QuerySet
+from django.utils import timezone
 import logging
-from constants import ERROR_MESSAGES, FIELD_REQUIREMENTS
-from datetime import date
+from constants import BULK_OPERATIONS, ERROR_MESSAGES, FIELD_REQUIREMENTS, QUERY_PARAMS
+from datetime import date, datetime
+from typing import Any, Callable
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -18,8 +22,16 @@ class TaskSerializer(serializers.ModelSerializer):
     Provides validation to ensure:
     - The due date is later or equal to the start date
     - There is no overlap of tasks for the same user
+
+    When the context holds a ``fields`` set, only those fields are serialized.
     """
 
+    # Nested representations that need a join and can be requested with ?expand=
+    EXPANDABLE_FIELDS: tuple[str, ...] = ("assigned_user",)
+
+    # Fields that can make a task overlap with another one
+    OVERLAP_FIELDS: tuple[str, ...] = ("start_date", "due_date", "user", "completed")
+
     assigned_user = UserBasicSerializer(source="user", read_only=True)
 
     class Meta:
@@ -36,8 +48,9 @@ class TaskSerializer(serializers.ModelSerializer):
             "updated_at",
             "assigned_user",
             "created_by",
+            "version",
         ]
-        read_only_fields = ["id", "created_at", "updated_at"]
+        read_only_fields = ["id", "created_at", "updated_at", "version"]
         extra_kwargs = {
             "title": {
                 "required": True,
@@ -52,6 +65,99 @@ class TaskSerializer(serializers.ModelSerializer):
             },
         }
 
+    def __init__(self, *args, **kwargs) -> None:
+        """
+        Initialize the serializer, dropping the fields not selected in the context.
+        """
+        super().__init__(*args, **kwargs)
+        selected: set[str] | None = self.context.get("fields")
+        if selected is not None:
+            for field_name in set(self.fields) - selected:
+                self.fields.pop(field_name)
+
+    @classmethod
+    def select_fields(cls, fields: str | None, expand: str | None) -> set[str] | None:
+        """
+        Parse the sparse fieldset requested with ``?fields=`` and ``?expand=``.
+
+        Without ``fields`` the full representation is used. With ``fields``,
+        nested representations are only included if listed in ``expand``.
+
+        Args:
+            fields (str | None): Comma separated field names.
+            expand (str | None): Comma separated nested representations.
+
+        Returns:
+            set[str] | None: Selected field names, or None for the full representation.
+
+        Raises:
+            serializers.ValidationError: If a field or expansion is unknown.
+        """
+        if not fields:
+            return None
+
+        requested: set[str] = {name.strip() for name in fields.split(",") if name.strip()}
+        expanded: set[str] = {name.strip() for name in (expand or "").split(",") if name.strip()}
+
+        unknown_fields: set[str] = requested - set(cls.Meta.fields)
+        if unknown_fields:
+            raise serializers.ValidationError(
+                {
+                    QUERY_PARAMS["fields"]: ERROR_MESSAGES["unknown_fields"].format(
+                        fields=", ".join(sorted(unknown_fields))
+                    )
+                }
+            )
+        unknown_expansions: set[str] = expanded - set(cls.EXPANDABLE_FIELDS)
+        if unknown_expansions:
+            raise serializers.ValidationError(
+                {
+                    QUERY_PARAMS["expand"]: ERROR_MESSAGES["unknown_fields"].format(
+                        fields=", ".join(sorted(unknown_expansions))
+                    )
+                }
+            )
+        return requested | expanded
+
+    @classmethod
+    def get_only_columns(cls, selected: set[str]) -> list[str]:
+        """
+        Map selected fields to the columns to load with ``QuerySet.only()``.
+
+        Args:
+            selected (set[str]): Selected field names.
+
+        Returns:
+            list[str]: Model field paths, including joined user columns if expanded.
+        """
+        columns: list[str] = ["id"]
+        for field_name in selected:
+            if field_name == "assigned_user":
+                columns += ["user", *(f"user__{name}" for name in UserBasicSerializer.Meta.fields)]
+            elif field_name != "id":
+                columns.append(field_name)
+        return columns
+
+    def update(self, instance: Task, validated_data: dict) -> Task:
+        """
+        Update a task, optionally only if it is still at the expected version.
+
+        Args:
+            instance (Task): Task to update.
+            validated_data (dict): Validated data, optionally with an ``expected_version``.
+
+        Returns:
+            Task: The updated task.
+
+        Raises:
+            TaskVersionConflict: If the task is no longer at the expected version.
+        """
+        expected_version: int | None = validated_data.pop("expected_version", None)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(expected_version=expected_version)
+        return instance
+
     def validate_title(self, value: str) -> str:
         """
         Validate that the title is not empty.
@@ -69,6 +175,25 @@ class TaskSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(ERROR_MESSAGES["empty_title"])
         return value
 
+    def overlap_fields_changed(self, data: dict) -> bool:
+        """
+        Check whether the data changes any field relevant to the overlap validation.
+
+        Args:
+            data (dict): Data to validate.
+
+        Returns:
+            bool: True for new tasks or if a date, the user or the completion state changed.
+        """
+        if self.instance is None:
+            return True
+        # Related users are compared by id, as reading instance.user would load it
+        return any(
+            field in data
+            and getattr(data[field], "pk", data[field]) != getattr(self.instance, Task._meta.get_field(field).attname)
+            for field in self.OVERLAP_FIELDS
+        )
+
     def validate(self, data: dict) -> dict:
         """
         Validate the data of the Task model.
@@ -77,6 +202,9 @@ class TaskSerializer(serializers.ModelSerializer):
         - The due date is later or equal to the start date
         - There is no overlap of tasks for the same user
 
+        The overlap query is skipped on updates that leave the dates, the
+        user and the completion state untouched.
+
         Args:
             data (dict): Data to validate.
 
@@ -98,7 +226,7 @@ class TaskSerializer(serializers.ModelSerializer):
         # Validate task overlap
         user: User | None = data.get("user")
 
-        if user and due_date:
+        if user and due_date and self.overlap_fields_changed(data):
             # Check if there are tasks that overlap
             task_id: int | None = self.instance.id if self.instance else None
 
@@ -113,11 +241,13 @@ class TaskSerializer(serializers.ModelSerializer):
                 Q(start_date__lte=start_date, due_date__gte=due_date)
             )
 
+            # Read the user's shard on the primary: a lagging replica could miss a task created just before
+            tasks: QuerySet = Task.objects.using(shard_for_user(user.id))
             # Exclude the current task if it is being updated
             if task_id:
-                overlapping_tasks = Task.objects.filter(overlapping_query).exclude(id=task_id)
+                overlapping_tasks = tasks.filter(overlapping_query).exclude(id=task_id)
             else:
-                overlapping_tasks = Task.objects.filter(overlapping_query)
+                overlapping_tasks = tasks.filter(overlapping_query)
 
             if overlapping_tasks.exists():
                 error_msg = ERROR_MESSAGES["task_overlap"]
@@ -128,3 +258,208 @@ class TaskSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({"start_date": error_msg, "overlapping_task": overlapping_task.title})
 
         return data
+
+
+class TaskChangeSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the entries of a task's history.
+    """
+
+    class Meta:
+        model = TaskChange
+        fields = ["id", "action", "user", "changes", "created_at"]
+        read_only_fields = fields
+
+
+class TaskIdsSerializer(serializers.Serializer):
+    """
+    Serializer for bulk operations on a list of task ids.
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_OPERATIONS["max_ids"],
+    )
+
+
+class TaskShareSerializer(serializers.Serializer):
+    """
+    Serializer for sharing a task with a list of users.
+    """
+
+    users = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_OPERATIONS["max_ids"],
+    )
+
+    def validate_users(self, value: list[int]) -> list[int]:
+        """
+        Validate that every user exists, with a single query.
+
+        Args:
+            value (list[int]): Ids of the users.
+
+        Returns:
+            list[int]: The ids without duplicates.
+
+        Raises:
+            serializers.ValidationError: If any user does not exist.
+        """
+        requested: set[int] = set(value)
+        unknown: set[int] = requested - set(User.objects.filter(id__in=requested).values_list("id", flat=True))
+        if unknown:
+            raise serializers.ValidationError(
+                ERROR_MESSAGES["unknown_users"].format(users=", ".join(map(str, sorted(unknown))))
+            )
+        return sorted(requested)
+
+
+class FastTaskSerializer:
+    """
+    Read-only serializer building task representations straight from ``.values()`` rows.
+
+    Produces exactly the same output as TaskSerializer (field order, date and
+    datetime formats, nested ``assigned_user``) without instantiating models
+    or DRF fields, which makes it much cheaper on large lists.
+    """
+
+    USER_FIELDS: tuple[str, ...] = tuple(UserBasicSerializer.Meta.fields)
+
+    # Model columns backing each TaskSerializer field
+    COLUMNS: dict[str, tuple[str, ...]] = {
+        "id": ("id",),
+        "title": ("title",),
+        "description": ("description",),
+        "start_date": ("start_date",),
+        "due_date": ("due_date",),
+        "completed": ("completed",),
+        "user": ("user_id",),
+        "created_at": ("created_at",),
+        "updated_at": ("updated_at",),
+        "assigned_user": tuple(f"user__{name}" for name in UserBasicSerializer.Meta.fields),
+        "created_by": ("created_by_id",),
+        "version": ("version",),
+    }
+
+    def __init__(self, fields: set[str] | None = None) -> None:
+        """
+        Initialize the serializer.
+
+        Args:
+            fields (set[str] | None): Sparse fieldset, or None for the full representation.
+        """
+        self.fields: list[str] = [name for name in TaskSerializer.Meta.fields if fields is None or name in fields]
+        self.timezone = timezone.get_current_timezone() if settings.USE_TZ else None
+        # One formatter per output field, resolved once instead of per row
+        self.formatters: list[tuple[str, Callable[[dict], Any]]] = [
+            (name, self.get_formatter(name)) for name in self.fields
+        ]
+
+    def get_formatter(self, name: str) -> Callable[[dict], Any]:
+        """
+        Return the function computing a field from a row.
+
+        Args:
+            name (str): Field name.
+
+        Returns:
+            Callable[[dict], Any]: Function receiving the row and returning the field value.
+        """
+        if name in ("start_date", "due_date"):
+            return lambda row: row[name].isoformat() if row[name] is not None else None
+        if name in ("created_at", "updated_at"):
+            return lambda row: self.format_datetime(row[name])
+        if name == "assigned_user":
+            return lambda row: {field: row[f"user__{field}"] for field in self.USER_FIELDS}
+        column: str = self.COLUMNS[name][0]
+        return lambda row: row[column]
+
+    def get_columns(self) -> list[str]:
+        """
+        Return the columns to pass to ``QuerySet.values()``.
+
+        Returns:
+            list[str]: Model columns, including joined user columns when needed.
+        """
+        return [column for name in self.fields for column in self.COLUMNS[name]]
+
+    def format_datetime(self, value: datetime | None) -> str | None:
+        """
+        Format a datetime like DRF's DateTimeField.
+
+        Args:
+            value (datetime | None): Datetime to format.
+
+        Returns:
+            str | None: ISO 8601 representation, with ``Z`` for UTC.
+        """
+        if value is None:
+            return None
+        if self.timezone is not None and timezone.is_aware(value):
+            value = value.astimezone(self.timezone)
+        formatted: str = value.isoformat()
+        return formatted[:-6] + "Z" if formatted.endswith("+00:00") else formatted
+
+    def to_representation(self, row: dict) -> dict:
+        """
+        Convert a ``.values()`` row into the TaskSerializer representation.
+
+        Args:
+            row (dict): Row with the columns returned by ``get_columns()``.
+
+        Returns:
+            dict: Task representation.
+        """
+        return {name: formatter(row) for name, formatter in self.formatters}
+
+    def serialize(self, queryset: QuerySet[Task]) -> list[dict]:
+        """
+        Serialize a task QuerySet in a single query.
+
+        Args:
+            queryset (QuerySet[Task]): Tasks to serialize.
+
+        Returns:
+            list[dict]: Task representations, in QuerySet order.
+        """
+        return [self.to_representation(row) for row in queryset.values(*self.get_columns())]
+
+    def serialize_sharded(self, querysets: list[QuerySet[Task]], order: tuple[str, ...]) -> list[dict]:
+        """
+        Serialize the tasks read from several shards as a single list.
+
+        Shards hold no users, so the assignees are read from ``default`` in one
+        query instead of being joined. A task found in two shards, while it is
+        being moved, is returned once.
+
+        Args:
+            querysets (list[QuerySet[Task]]): The query bound to each shard.
+            order (tuple[str, ...]): Columns sorting the merged list, ``None`` last.
+
+        Returns:
+            list[dict]: Task representations.
+        """
+        columns: list[str] = [column for column in self.get_columns() if not column.startswith("user__")]
+        columns += [column for column in (*order, "id", "user_id") if column not in columns]
+        rows: dict[int, dict] = {}
+        for queryset in querysets:
+            for row in queryset.values(*columns):
+                rows.setdefault(row["id"], row)
+
+        if "assigned_user" in self.fields:
+            users: dict[int, dict] = {
+                user["id"]: user
+                for user in User.objects.filter(pk__in={row["user_id"] for row in rows.values()}).values(
+                    *self.USER_FIELDS
+                )
+            }
+            for row in rows.values():
+                user: dict = users.get(row["user_id"], {})
+                row.update((f"user__{field}", user.get(field)) for field in self.USER_FIELDS)
+
+        ordered: list[dict] = sorted(
+            rows.values(), key=lambda row: tuple((row[column] is None, row[column]) for column in order)
+        )
+        return [self.to_representation(row) for row in ordered]
@@ -0,0 +1,162 @@
+"""
+Horizontal sharding of the task tables by assignee.
+
+Every task lives in one of the ``TASK_SHARDS`` databases, chosen by a jump
+consistent hash of its ``user_id``. Its memberships and reminders live next
+to it, and archived tasks follow the same rule. Users, jobs and events stay
+in ``default``, which is always the first shard: a single database is the
+unsharded case, where every helper below falls back to plain queries.
+
+Per-assignee queries, such as the overlap check, hit a single shard. The
+membership reads of a user (the tasks they created or watch belong to other
+assignees) and the lookups by id are sent to every shard and merged.
+"""
+
+from django.conf import settings
+from django.db.models import Model, QuerySet
+
+# Models stored in the task shards
+SHARDED_MODELS: frozenset[str] = frozenset(
+    {"tasks.task", "tasks.taskmembership", "tasks.taskreminder", "tasks.archivedtask"}
+)
+
+# Sharded models placed by their own user_id, the others follow their task
+USER_KEYED_MODELS: frozenset[str] = frozenset({"tasks.task", "tasks.archivedtask"})
+
+
+def get_shards() -> list[str]:
+    """
+    Returns the aliases of the databases holding tasks.
+
+    Returns:
+        list[str]: ``default`` followed by the aliases configured with ``TASK_SHARD_URLS``.
+    """
+    return settings.TASK_SHARDS
+
+
+def is_sharded() -> bool:
+    """
+    Tells whether tasks are spread over several databases.
+
+    Returns:
+        bool: True if more than one shard is configured.
+    """
+    return len(settings.TASK_SHARDS) > 1
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """
+    Maps a key to a bucket with Lamping and Veach's jump consistent hash.
+
+    Growing from n to n + 1 buckets only moves the keys landing in the new
+    bucket, about 1/(n + 1) of them, so adding a shard moves little data.
+
+    Args:
+        key (int): Key to place.
+        buckets (int): Number of buckets.
+
+    Returns:
+        int: Bucket index, between 0 and ``buckets - 1``.
+    """
+    bucket: int = -1
+    candidate: int = 0
+    while candidate < buckets:
+        bucket = candidate
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        candidate = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return bucket
+
+
+def shard_for_user(user_id: int) -> str:
+    """
+    Returns the shard holding the tasks assigned to a user.
+
+    Args:
+        user_id (int): Id of the assignee.
+
+    Returns:
+        str: Database alias.
+    """
+    shards: list[str] = get_shards()
+    return shards[jump_hash(user_id, len(shards))] if len(shards) > 1 else shards[0]
+
+
+def shard_querysets(queryset: QuerySet) -> list[QuerySet]:
+    """
+    Splits a query over the task tables into one query per shard.
+
+    Args:
+        queryset (QuerySet): Query on a sharded model.
+
+    Returns:
+        list[QuerySet]: The query bound to each shard, or the query itself when unsharded.
+    """
+    if not is_sharded():
+        return [queryset]
+    return [queryset.using(alias) for alias in get_shards()]
+
+
+def locate(model: type[Model], pk, prefer: str | None = None) -> str | None:
+    """
+    Finds the shard holding a row, probing the preferred shard first.
+
+    Args:
+        model (type[Model]): Sharded model.
+        pk: Primary key of the row.
+        prefer (str | None): Shard most likely to hold the row, e.g. the requester's.
+
+    Returns:
+        str | None: Alias of the shard, None if unsharded, not found or the key is invalid.
+    """
+    if not is_sharded():
+        return None
+    shards: list[str] = get_shards()
+    if prefer in shards:
+        shards = [prefer, *(alias for alias in shards if alias != prefer)]
+    try:
+        for alias in shards:
+            if model._default_manager.using(alias).filter(pk=pk).exists():
+                return alias
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+class ShardRouter:
+    """
+    Routes the rows of the task tables to their shard.
+
+    Instances already saved stay where they are; new tasks and archived
+    tasks go to the shard of their assignee. Queries that are not bound to
+    an instance are left to the next router, so code reading across shards
+    must bind each query with ``using()`` (see ``shard_querysets()``). Users
+    related to a task are read from ``default`` rather than from the shard.
+    """
+
+    def route(self, model: type[Model], **hints) -> str | None:
+        """
+        Picks the database of a query bound to an instance of a sharded model.
+
+        Args:
+            model (type[Model]): Model of the query.
+            **hints: Routing hints, ``instance`` being the only one used.
+
+        Returns:
+            str | None: Alias of the shard, None to defer to the next router.
+        """
+        instance: Model | None = hints.get("instance")
+        if not is_sharded() or instance is None or instance._meta.label_lower not in SHARDED_MODELS:
+            return None
+        if model._meta.label_lower not in SHARDED_MODELS:
+            return None
+        if instance._state.db:
+            return instance._state.db
+        if instance._meta.label_lower in USER_KEYED_MODELS and instance.user_id is not None:
+            return shard_for_user(instance.user_id)
+        return None
+
+    def db_for_read(self, model: type[Model], **hints) -> str | None:
+        return self.route(model, **hints)
+
+    def db_for_write(self, model: type[Model], **hints) -> str | None:
+        return self.route(model, **hints)
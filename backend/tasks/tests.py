@@ -1,13 +1,45 @@
+import importlib
+import io
 import pytest
+from django.apps import apps as django_apps
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.test import APIClient
 from datetime import date, timedelta
+from types import SimpleNamespace
 from typing import List, Tuple, Callable
-from tasks.models import Task
-from constants import ERROR_MESSAGES, QUERY_PARAMS
+from jobs.models import Job
+from jobs.queue import process
+from tasks.admin import EstimatedCountPaginator
+from tasks.cache import TASKS_VERSION_KEY, get_user_tasks_version
+from tasks.archive import archive_tasks
+from tasks import history
+from tasks.models import (
+    ArchivedTask,
+    ReminderSweep,
+    Task,
+    TaskChange,
+    TaskMembership,
+    TaskReminder,
+    TaskVersionConflict,
+)
+from tasks.reminders import deliver_reminders, sweep, sweep_window, windows_to_sweep
+from tasks.renderers import FastJSONRenderer
+from tasks.serializers import FastTaskSerializer, TaskSerializer
+from tasks.views import TaskViewSet
+from tasks.sharding import jump_hash, shard_for_user
+from users.deletion import delete_account, request_deletion
+from constants import API_RESPONSES, ERROR_MESSAGES, EVENTS, QUERY_PARAMS
+from events.models import Event
 
 
 @pytest.mark.django_db  # Necesario para acceder a la base de datos
@@ -303,3 +335,1154 @@ class TestTaskAPI:
         # The update should be successful
         assert response.status_code == status.HTTP_200_OK
         assert response.data["title"] == "Updated title"
+
+    def test_calendar_groups_tasks_by_day(self, task_factory: Callable) -> None:
+        """Test that the calendar expands multi-day tasks across their day buckets."""
+        task_factory(
+            title="Three day task",
+            start_date=date(2025, 4, 1),
+            due_date=date(2025, 4, 3),
+            user=self.user,
+        )
+        task_factory(
+            title="Single day task",
+            start_date=date(2025, 4, 4),
+            due_date=date(2025, 4, 4),
+            user=self.user,
+        )
+
+        response: Response = self.client.get(
+            f"{self.task_list_url}calendar/",
+            {QUERY_PARAMS["from_date"]: "2025-04-02", QUERY_PARAMS["to_date"]: "2025-04-05"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["bucket"] == "day"
+        buckets: dict[str, List[str]] = {
+            bucket["date"]: [task["title"] for task in bucket["tasks"]] for bucket in response.data["buckets"]
+        }
+        assert buckets == {
+            "2025-04-02": ["Three day task"],
+            "2025-04-03": ["Three day task"],
+            "2025-04-04": ["Single day task"],
+            "2025-04-05": [],
+        }
+
+    def test_calendar_groups_tasks_by_week(self, task_factory: Callable) -> None:
+        """Test that week buckets start on Monday and list spanning tasks once per week."""
+        # Wednesday to the next Tuesday
+        task_factory(
+            title="Cross week task",
+            start_date=date(2025, 4, 2),
+            due_date=date(2025, 4, 8),
+            user=self.user,
+        )
+
+        response: Response = self.client.get(
+            f"{self.task_list_url}calendar/",
+            {QUERY_PARAMS["from_date"]: "2025-04-01", QUERY_PARAMS["to_date"]: "2025-04-20", "bucket": "week"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [bucket["date"] for bucket in response.data["buckets"]] == ["2025-03-31", "2025-04-07", "2025-04-14"]
+        assert [len(bucket["tasks"]) for bucket in response.data["buckets"]] == [1, 1, 0]
+
+    def test_calendar_invalid_parameters(self) -> None:
+        """Test that the calendar rejects missing, inverted and malformed ranges."""
+        calendar_url: str = f"{self.task_list_url}calendar/"
+
+        assert self.client.get(calendar_url).status_code == status.HTTP_400_BAD_REQUEST
+        assert (
+            self.client.get(calendar_url, {"from": "2025-04-05", "to": "2025-04-01"}).status_code
+            == status.HTTP_400_BAD_REQUEST
+        )
+        assert (
+            self.client.get(calendar_url, {"from": "2025-04-01", "to": "2025-04-05", "bucket": "year"}).status_code
+            == status.HTTP_400_BAD_REQUEST
+        )
+        response: Response = self.client.get(calendar_url, {"from": "01-04-2025", "to": "2025-04-05"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert ERROR_MESSAGES["invalid_date_format"] in response.data["error"]
+
+    def test_calendar_cache_invalidated_on_write(self, django_capture_on_commit_callbacks: Callable) -> None:
+        """Test that calendar responses are revalidated with ETags and refreshed after a write."""
+        calendar_url: str = f"{self.task_list_url}calendar/"
+        params: dict = {"from": str(self.today), "to": str(self.tomorrow)}
+
+        first: Response = self.client.get(calendar_url, params)
+        assert first.status_code == status.HTTP_200_OK
+
+        not_modified: Response = self.client.get(calendar_url, params, HTTP_IF_NONE_MATCH=first["ETag"])
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.client.patch(reverse("task-detail", kwargs={"pk": self.task.id}), {"title": "Renamed"}, format="json")
+
+        refreshed: Response = self.client.get(calendar_url, params, HTTP_IF_NONE_MATCH=first["ETag"])
+        assert refreshed.status_code == status.HTTP_200_OK
+        assert refreshed.data["buckets"][0]["tasks"][0]["title"] == "Renamed"
+
+    def test_calendar_with_sparse_fieldset(self) -> None:
+        """Test that the calendar renders only the requested fields, without the assigned user."""
+        params: dict = {"from": str(self.today), "to": str(self.tomorrow), "fields": "id,title"}
+
+        response: Response = self.client.get(f"{self.task_list_url}calendar/", params)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["buckets"][0]["tasks"][0] == {"id": self.task.id, "title": self.task.title}
+
+    def test_calendar_etag_not_reused_after_eviction(self) -> None:
+        """Test that an ETag issued before the user's version key was evicted does not match again."""
+        calendar_url: str = f"{self.task_list_url}calendar/"
+        params: dict = {"from": str(self.today), "to": str(self.tomorrow)}
+        first: Response = self.client.get(calendar_url, params)
+
+        cache.delete(TASKS_VERSION_KEY.format(user_id=self.user.id))
+
+        response: Response = self.client.get(calendar_url, params, HTTP_IF_NONE_MATCH=first["ETag"])
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_complete_task(
+        self, django_assert_num_queries: Callable, django_capture_on_commit_callbacks: Callable
+    ) -> None:
+        """Test that a task is completed with a single conditional UPDATE."""
+        complete_url: str = reverse("task-complete", kwargs={"pk": self.task.id})
+
+        # One UPDATE, the owner lookup used to invalidate cached responses, the change events and history
+        with django_assert_num_queries(4), django_capture_on_commit_callbacks(execute=True):
+            response: Response = self.client.post(complete_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["completed"] is True
+        self.task.refresh_from_db()
+        assert self.task.completed is True
+
+        # Completing again is an idempotent no-op
+        response = self.client.post(complete_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["detail"] == API_RESPONSES["task_already_completed"]
+
+    def test_complete_task_of_another_user(self, user_factory: Callable, task_factory: Callable) -> None:
+        """Test that tasks not visible to the user cannot be completed."""
+        other_task: Task = task_factory(user=user_factory(username="other"), created_by=user_factory(username="x"))
+
+        response: Response = self.client.post(reverse("task-complete", kwargs={"pk": other_task.id}))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        other_task.refresh_from_db()
+        assert other_task.completed is False
+
+    def test_complete_task_with_invalid_id(self) -> None:
+        """Test that completing a task with a non-numeric id is answered with 404."""
+        response: Response = self.client.post(f"{self.task_list_url}abc/complete/")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_bulk_complete_tasks(self, user_factory: Callable, task_factory: Callable) -> None:
+        """Test that several tasks are completed at once, ignoring foreign ids."""
+        own_task: Task = task_factory(title="Own task", start_date=date(2025, 5, 1), due_date=None, user=self.user)
+        other_task: Task = task_factory(user=user_factory(username="other"), created_by=user_factory(username="x"))
+
+        response: Response = self.client.post(
+            reverse("task-bulk-complete"), {"ids": [self.task.id, own_task.id, other_task.id]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["completed"] == 2
+        assert Task.objects.filter(completed=True).count() == 2
+        other_task.refresh_from_db()
+        assert other_task.completed is False
+
+    def test_bulk_complete_requires_ids(self) -> None:
+        """Test that the bulk completion rejects an empty list."""
+        response: Response = self.client.post(reverse("task-bulk-complete"), {"ids": []}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "ids" in response.data
+
+    def test_patch_without_date_changes_skips_overlap_query(self) -> None:
+        """Test that a PATCH leaving dates and user untouched writes only the changed columns."""
+        task_detail_url: str = reverse("task-detail", kwargs={"pk": self.task.id})
+        data: dict = {
+            "title": "Only the title changes",
+            "start_date": str(self.task.start_date),
+            "due_date": str(self.task.due_date),
+            "user": self.user.id,
+        }
+
+        with CaptureQueriesContext(connection) as context:
+            response: Response = self.client.patch(task_detail_url, data, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        statements: List[str] = [query["sql"] for query in context.captured_queries]
+        # Only the detail lookup reads tasks_task: the overlap query was skipped
+        assert len([sql for sql in statements if sql.startswith("SELECT") and '"tasks_task"' in sql]) == 1
+        updates: List[str] = [sql for sql in statements if sql.startswith("UPDATE")]
+        assert len(updates) == 1
+        assert '"title"' in updates[0] and '"start_date"' not in updates[0]
+
+    def test_overlap_check_compares_user_ids(self, django_assert_num_queries: Callable) -> None:
+        """Test that comparing the assignee of an update does not load the task's user."""
+        task: Task = Task.objects.get(id=self.task.id)
+        serializer: TaskSerializer = TaskSerializer(instance=task)
+
+        with django_assert_num_queries(0):
+            assert serializer.overlap_fields_changed({"title": "Renamed", "user": self.user}) is False
+            assert serializer.overlap_fields_changed({"user": User(id=self.user.id + 1)}) is True
+
+    def test_task_save_tracks_dirty_fields(self) -> None:
+        """Test that saving a loaded task only writes changed fields and skips no-op saves."""
+        task: Task = Task.objects.get(id=self.task.id)
+        assert task.get_dirty_fields() == []
+
+        with CaptureQueriesContext(connection) as context:
+            task.save()
+        assert len(context.captured_queries) == 0
+
+        task.description = "Changed description"
+        assert task.get_dirty_fields() == ["description"]
+        with CaptureQueriesContext(connection) as context:
+            task.save()
+        assert len(context.captured_queries) == 1
+        assert '"description"' in context.captured_queries[0]["sql"]
+        assert '"title"' not in context.captured_queries[0]["sql"]
+        assert task.get_dirty_fields() == []
+
+    def test_update_with_matching_if_match(self) -> None:
+        """Test that a write with the current version as If-Match succeeds and bumps the version."""
+        task_detail_url: str = reverse("task-detail", kwargs={"pk": self.task.id})
+
+        response: Response = self.client.get(task_detail_url)
+        assert response["ETag"] == '"1"'
+
+        response = self.client.patch(task_detail_url, {"title": "Versioned"}, format="json", HTTP_IF_MATCH='"1"')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["version"] == 2
+        assert response["ETag"] == '"2"'
+
+    def test_update_with_stale_if_match(self) -> None:
+        """Test that a write with an outdated If-Match is rejected with the current task."""
+        task_detail_url: str = reverse("task-detail", kwargs={"pk": self.task.id})
+        self.client.patch(task_detail_url, {"title": "Edited elsewhere"}, format="json")
+
+        response: Response = self.client.patch(task_detail_url, {"title": "Stale"}, format="json", HTTP_IF_MATCH='"1"')
+
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert response.data["current"]["title"] == "Edited elsewhere"
+        assert response.data["current"]["version"] == 2
+        self.task.refresh_from_db()
+        assert self.task.title == "Edited elsewhere"
+
+    def test_interleaved_saves_get_distinct_versions(self) -> None:
+        """Test that a save landing after another write gets the version following it, not the same one."""
+        first: Task = Task.objects.get(id=self.task.id)
+        second: Task = Task.objects.get(id=self.task.id)
+        first.title = "First"
+        first.save()
+        Task.objects.filter(id=self.task.id).mark_as_completed()
+
+        second.description = "Second"
+        second.save()
+
+        self.task.refresh_from_db()
+        assert (first.version, second.version, self.task.version) == (2, 4, 4)
+        assert (self.task.title, self.task.description, self.task.completed) == ("First", "Second", True)
+
+    def test_delete_with_stale_if_match(self) -> None:
+        """Test that a delete with an outdated If-Match keeps the task."""
+        task_detail_url: str = reverse("task-detail", kwargs={"pk": self.task.id})
+        self.client.post(reverse("task-complete", kwargs={"pk": self.task.id}))
+
+        response: Response = self.client.delete(task_detail_url, HTTP_IF_MATCH='"1"')
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert Task.objects.filter(id=self.task.id).exists()
+
+        response = self.client.delete(task_detail_url, HTTP_IF_MATCH='"2"')
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    def test_conditional_save_detects_concurrent_write(self) -> None:
+        """Test that a conditional save fails if another write changed the row after it was read."""
+        first: Task = Task.objects.get(id=self.task.id)
+        second: Task = Task.objects.get(id=self.task.id)
+
+        first.title = "First writer"
+        first.save(expected_version=1)
+
+        second.title = "Second writer"
+        with pytest.raises(TaskVersionConflict):
+            second.save(expected_version=1)
+        assert second.version == 1
+
+        self.task.refresh_from_db()
+        assert self.task.title == "First writer"
+        assert self.task.version == 2
+
+    def test_list_sparse_fieldset(self) -> None:
+        """Test that ?fields= narrows both the representation and the loaded columns."""
+        with CaptureQueriesContext(connection) as context:
+            response: Response = self.client.get(
+                self.task_list_url, {QUERY_PARAMS["fields"]: "id,title,start_date,due_date,completed"}
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data[0]) == {"id", "title", "start_date", "due_date", "completed"}
+        assert len(context.captured_queries) == 1
+        assert '"description"' not in context.captured_queries[0]["sql"]
+
+    def test_list_sparse_fieldset_with_expand(self) -> None:
+        """Test that ?expand=assigned_user adds the nested user with a join."""
+        with CaptureQueriesContext(connection) as context:
+            response: Response = self.client.get(
+                self.task_list_url, {QUERY_PARAMS["fields"]: "id,title", QUERY_PARAMS["expand"]: "assigned_user"}
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data[0]) == {"id", "title", "assigned_user"}
+        assert response.data[0]["assigned_user"]["username"] == self.user.username
+        assert len(context.captured_queries) == 1
+
+    def test_list_unknown_sparse_field(self) -> None:
+        """Test that unknown fields are rejected."""
+        response: Response = self.client.get(self.task_list_url, {QUERY_PARAMS["fields"]: "id,secret"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert QUERY_PARAMS["fields"] in response.data
+
+    def test_list_compact_format(self) -> None:
+        """Test that the compact format sends column names once and rows as arrays."""
+        response: Response = self.client.get(
+            self.task_list_url, {QUERY_PARAMS["fields"]: "id,title", "format": "compact"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("application/vnd.taskmanager.compact+json")
+        assert response.json() == {"columns": ["id", "title"], "rows": [[self.task.id, self.task.title]]}
+
+    def test_list_msgpack_format(self) -> None:
+        """Test the optional MessagePack rendering."""
+        msgpack = pytest.importorskip("msgpack")
+
+        response: Response = self.client.get(self.task_list_url, {QUERY_PARAMS["fields"]: "id", "format": "msgpack"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert msgpack.unpackb(response.content) == [{"id": self.task.id}]
+
+
+@pytest.mark.django_db
+class TestFastTaskSerializer:
+    @pytest.fixture(autouse=True)
+    def setup(self, user_factory: Callable, task_factory: Callable) -> None:
+        """Create varied tasks: unicode, line separators, open-ended and cross-user tasks."""
+        self.user: User = user_factory(username="golden", email="golden@example.com", first_name="Gölden")
+        other_user: User = user_factory(username="other", email="", last_name="Ünïcode")
+        task_factory(title="Plain task", start_date=date(2025, 1, 1), due_date=date(2025, 1, 2), user=self.user)
+        task_factory(
+            title="Tâche «spéciale» 🚀",
+            description='Line\u2028separator and "quotes"',
+            start_date=date(2025, 2, 1),
+            due_date=None,
+            completed=True,
+            user=other_user,
+            created_by=self.user,
+        )
+        self.queryset = Task.objects.filter(Q(user=self.user) | Q(created_by=self.user)).order_by("id")
+
+    def test_output_is_byte_identical(self) -> None:
+        """Golden test: the fast path renders exactly the same bytes as TaskSerializer."""
+        expected: bytes = JSONRenderer().render(TaskSerializer(self.queryset, many=True).data)
+
+        fast_data: List[dict] = FastTaskSerializer().serialize(self.queryset)
+
+        assert JSONRenderer().render(fast_data) == expected
+        assert FastJSONRenderer().render(fast_data) == expected
+
+    def test_sparse_output_is_byte_identical(self) -> None:
+        """Golden test for a sparse fieldset."""
+        fields: set = {"id", "title", "due_date", "assigned_user", "updated_at"}
+        expected: bytes = JSONRenderer().render(
+            TaskSerializer(self.queryset, many=True, context={"fields": fields}).data
+        )
+
+        assert FastJSONRenderer().render(FastTaskSerializer(fields).serialize(self.queryset)) == expected
+
+    def test_list_endpoint_matches_task_serializer(self, api_client: APIClient) -> None:
+        """Test that the list endpoint body is unchanged by the fast path."""
+        api_client.force_authenticate(user=self.user)
+
+        response: Response = api_client.get(reverse("task-list"))
+
+        expected: bytes = JSONRenderer().render(
+            TaskSerializer(self.queryset.order_by("start_date", "due_date"), many=True).data
+        )
+        assert response.content == expected
+
+    def test_export_endpoint(self, api_client: APIClient) -> None:
+        """Test that the export endpoint serves the tasks as an attachment."""
+        api_client.force_authenticate(user=self.user)
+
+        response: Response = api_client.get(reverse("task-export"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Disposition"] == 'attachment; filename="tasks.json"'
+        assert len(response.json()) == 2
+
+
+@pytest.mark.django_db
+class TestQueryBudgets:
+    """Task endpoints must stay within the query budgets declared in conftest.py."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, authenticated_client: Tuple[APIClient, User], task_factory: Callable) -> None:
+        """Initial setup for all tests"""
+        self.client, self.user = authenticated_client
+        self.today: date = date.today()
+        self.task: Task = task_factory(user=self.user, created_by=self.user)
+        task_factory(
+            user=self.user,
+            created_by=self.user,
+            start_date=self.today + timedelta(days=5),
+            due_date=self.today + timedelta(days=6),
+        )
+        self.detail_url: str = reverse("task-detail", kwargs={"pk": self.task.id})
+
+    def request(self, endpoint: str) -> Response:
+        """Sends a typical request to an endpoint."""
+        later: date = self.today + timedelta(days=10)
+        requests: dict[str, Callable[[], Response]] = {
+            "task-list": lambda: self.client.get(reverse("task-list")),
+            "task-detail:get": lambda: self.client.get(self.detail_url),
+            "task-search": lambda: self.client.get(reverse("task-search"), {"start": self.today.isoformat()}),
+            "task-calendar": lambda: self.client.get(
+                reverse("task-calendar"),
+                {"from": self.today.isoformat(), "to": later.isoformat()},
+            ),
+            "task-create": lambda: self.client.post(
+                reverse("task-list"),
+                {
+                    "title": "Budget task",
+                    "start_date": later.isoformat(),
+                    "due_date": later.isoformat(),
+                    "user": self.user.id,
+                },
+                format="json",
+            ),
+            "task-update": lambda: self.client.patch(self.detail_url, {"title": "Renamed"}, format="json"),
+            "task-complete": lambda: self.client.post(reverse("task-complete", kwargs={"pk": self.task.id})),
+            "task-bulk-complete": lambda: self.client.post(
+                reverse("task-bulk-complete"), {"ids": [self.task.id]}, format="json"
+            ),
+            "task-delete": lambda: self.client.delete(self.detail_url),
+            "task-history": lambda: self.client.get(reverse("task-history", kwargs={"pk": self.task.id})),
+        }
+        return requests[endpoint]()
+
+    @pytest.mark.parametrize(
+        "endpoint",
+        [
+            "task-list",
+            "task-detail:get",
+            "task-search",
+            "task-calendar",
+            "task-create",
+            "task-update",
+            "task-complete",
+            "task-bulk-complete",
+            "task-delete",
+            "task-history",
+        ],
+    )
+    def test_endpoint_within_query_budget(self, endpoint: str, query_budget: Callable) -> None:
+        """Test that the endpoint does not exceed its query budget."""
+        with query_budget(endpoint):
+            response: Response = self.request(endpoint)
+
+        assert response.status_code < status.HTTP_400_BAD_REQUEST
+
+    def test_budget_overrun_fails(self, query_budget: Callable) -> None:
+        """Test that exceeding a budget fails the test with the executed queries."""
+        with pytest.raises(pytest.fail.Exception, match="task-list ran 2 queries, its budget is 1"):
+            with query_budget("task-list"):
+                list(Task.objects.all())
+                list(User.objects.all())
+
+
+@pytest.mark.django_db
+class TestSeedData:
+    """The seeded snapshot and the bulk factories declared in conftest.py."""
+
+    def test_seeded_users_have_pending_tasks(self, seeded_users: List[User]) -> None:
+        """Test that every test starts with the seeded users and their tasks."""
+        assert seeded_users
+        counts: set[int] = {Task.objects.filter(user=user, completed=False).count() for user in seeded_users}
+        assert len(counts) == 1
+        assert counts.pop() > 0
+
+    def test_bulk_tasks_pass_overlap_validation(self, bulk_user_factory: Callable, bulk_task_factory: Callable) -> None:
+        """Test that bulk-created tasks are non-overlapping, yet collide with a task on the same dates."""
+        user: User = bulk_user_factory(1, prefix="bulk")[0]
+        tasks: List[Task] = bulk_task_factory(user, 10, length=2)
+
+        assert len(tasks) == 10
+        assert all(current.due_date < following.start_date for current, following in zip(tasks, tasks[1:]))
+        serializer: TaskSerializer = TaskSerializer(
+            data={
+                "title": "Overlapping",
+                "start_date": tasks[3].start_date,
+                "due_date": tasks[3].due_date,
+                "user": user.id,
+            }
+        )
+        assert not serializer.is_valid()
+
+
+@pytest.mark.django_db
+class TestReminders:
+    """Due date reminder sweeps. The sweep day lies far beyond the seeded tasks."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user_factory: Callable, task_factory: Callable) -> None:
+        """Create tasks due on the day before and after the sweep day."""
+        self.user: User = user_factory(username="reminded")
+        self.today: date = date(2040, 1, 10)
+        self.yesterday: date = self.today - timedelta(days=1)
+        self.tomorrow: date = self.today + timedelta(days=1)
+        self.overdue: List[Task] = [
+            task_factory(user=self.user, start_date=self.yesterday, due_date=self.yesterday) for _ in range(5)
+        ]
+        self.upcoming: Task = task_factory(user=self.user, start_date=self.tomorrow, due_date=self.tomorrow)
+        task_factory(user=self.user, start_date=self.yesterday, due_date=self.yesterday, completed=True)
+
+    def test_sweep_records_and_delivers_reminders(self) -> None:
+        """Test that pending tasks crossing their due date get one reminder of each kind, delivered once."""
+        results: dict = sweep(self.today, "node", max_catch_up_days=0)
+
+        assert results == {"upcoming": 1, "overdue": 5}
+        assert TaskReminder.objects.filter(kind="overdue", due_date=self.yesterday).count() == 5
+        assert TaskReminder.objects.get(kind="upcoming").task == self.upcoming
+
+        while process("worker"):
+            pass
+
+        assert not TaskReminder.objects.filter(sent_at__isnull=True).exists()
+
+    def test_sweep_is_idempotent(self) -> None:
+        """Test that sweeping a window again records and delivers nothing new."""
+        sweep(self.today, "node", max_catch_up_days=0)
+        assert sweep(self.today, "node", max_catch_up_days=0) == {"upcoming": 0, "overdue": 0}
+
+        ReminderSweep.objects.update(completed_at=None, cursor=0)
+        sweep(self.today, "node", max_catch_up_days=0)
+
+        assert TaskReminder.objects.count() == 6
+        assert deliver_reminders("overdue", self.yesterday, [task.id for task in self.overdue]) == 5
+        assert deliver_reminders("overdue", self.yesterday, [task.id for task in self.overdue]) == 0
+
+    def test_window_is_walked_in_keyset_batches(self) -> None:
+        """Test that a window is processed in batches, each with its own delivery job."""
+        processed: int = sweep_window("overdue", self.yesterday, "node", batch_size=2, today=self.tomorrow)
+
+        assert processed == 5
+        assert Job.objects.filter(name="tasks.deliver_reminders").count() == 3
+        window: ReminderSweep = ReminderSweep.objects.get(kind="overdue", window=self.yesterday)
+        assert window.cursor == self.overdue[-1].id
+        assert window.completed_at is not None
+
+    def test_open_window_is_swept_again(self, task_factory: Callable) -> None:
+        """Test that a task created in a window already swept today is reminded by the next sweep."""
+        sweep(self.today, "node", kinds=["overdue"], max_catch_up_days=0)
+        window: ReminderSweep = ReminderSweep.objects.get(kind="overdue", window=self.yesterday)
+        assert window.completed_at is None
+        assert window.cursor == 0
+
+        late: Task = task_factory(user=self.user, start_date=self.yesterday, due_date=self.yesterday)
+
+        assert sweep(self.today, "node", kinds=["overdue"], max_catch_up_days=0) == {"overdue": 1}
+        assert TaskReminder.objects.filter(kind="overdue", due_date=self.yesterday).count() == 6
+        assert Job.objects.filter(name="tasks.deliver_reminders").last().payload["task_ids"] == [late.id]
+
+        # The first sweep of the next day completes the window
+        assert sweep_window("overdue", self.yesterday, "node", today=self.tomorrow) == 0
+        window.refresh_from_db()
+        assert window.completed_at is not None
+
+    def test_window_claimed_by_another_node_is_skipped(self) -> None:
+        """Test that concurrent nodes do not sweep the same window, unless its lock is stale."""
+        ReminderSweep.objects.create(kind="overdue", window=self.yesterday, locked_by="other", locked_at=timezone.now())
+
+        assert sweep_window("overdue", self.yesterday, "node") == 0
+
+        ReminderSweep.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+
+        assert sweep_window("overdue", self.yesterday, "node") == 5
+
+    def test_rescheduled_task_is_not_reminded(self) -> None:
+        """Test that a task whose due date moved after the sweep gets no reminder."""
+        sweep_window("overdue", self.yesterday, "node")
+        Task.objects.filter(id=self.overdue[0].id).update(due_date=self.tomorrow)
+
+        assert deliver_reminders("overdue", self.yesterday, [task.id for task in self.overdue]) == 4
+
+    def test_missed_windows_are_caught_up(self) -> None:
+        """Test that overdue windows of days the scheduler missed are swept."""
+        assert windows_to_sweep("overdue", self.tomorrow, max_catch_up_days=1) == [self.yesterday, self.today]
+        assert windows_to_sweep("upcoming", self.today, max_catch_up_days=3) == [self.today, self.tomorrow]
+
+    def test_send_reminders_command(self) -> None:
+        """Test that the scheduler command reports the processed tasks per kind."""
+        output: io.StringIO = io.StringIO()
+
+        call_command("send_reminders", "--date", self.today.isoformat(), "--max-catch-up-days", "0", stdout=output)
+
+        assert "overdue: 5 tasks" in output.getvalue()
+
+
+@pytest.mark.django_db
+class TestTaskMemberships:
+    """Materialized task visibility: assignee, creator and watcher memberships."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, authenticated_client: Tuple[APIClient, User], user_factory: Callable) -> None:
+        """Create a task created by the authenticated user for an assignee."""
+        self.client, self.creator = authenticated_client
+        self.assignee: User = user_factory(username="assignee")
+        self.watcher: User = user_factory(username="watcher")
+        self.task: Task = Task.objects.create(
+            title="Shared task", start_date=date(2041, 1, 1), user=self.assignee, created_by=self.creator
+        )
+
+    def roles(self, task: Task) -> dict[int, int]:
+        """Returns the roles of the members of a task."""
+        return dict(task.memberships.values_list("user_id", "roles"))
+
+    def client_for(self, user: User) -> APIClient:
+        """Returns a client authenticated as the given user."""
+        client: APIClient = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def test_memberships_follow_task_writes(self, bulk_task_factory: Callable) -> None:
+        """Test that saves and bulk inserts maintain the assignee and creator memberships."""
+        assert self.roles(self.task) == {
+            self.assignee.id: TaskMembership.ASSIGNEE,
+            self.creator.id: TaskMembership.CREATOR,
+        }
+
+        self.task.add_watchers([self.watcher.id])
+        self.task.user = self.creator
+        self.task.start_date = date(2041, 2, 1)
+        self.task.save()
+
+        assert self.roles(self.task) == {
+            self.creator.id: TaskMembership.ASSIGNEE | TaskMembership.CREATOR,
+            self.watcher.id: TaskMembership.WATCHER,
+        }
+        assert set(self.task.memberships.values_list("start_date", flat=True)) == {date(2041, 2, 1)}
+
+        tasks: List[Task] = bulk_task_factory(self.watcher, 3, start=date(2042, 1, 1))
+        assert TaskMembership.objects.filter(task__in=tasks, user=self.watcher).count() == 3
+
+    def test_watchers_can_read_but_not_modify(self) -> None:
+        """Test that sharing gives read access only, and unsharing removes it."""
+        response: Response = self.client.post(
+            reverse("task-share", kwargs={"pk": self.task.id}), {"users": [self.watcher.id]}, format="json"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"id": self.task.id, "watchers": [self.watcher.id]}
+
+        watcher_client: APIClient = self.client_for(self.watcher)
+        detail_url: str = reverse("task-detail", kwargs={"pk": self.task.id})
+        assert [task["id"] for task in watcher_client.get(reverse("task-list")).data] == [self.task.id]
+        assert watcher_client.patch(detail_url, {"title": "Hijacked"}).status_code == status.HTTP_404_NOT_FOUND
+        assert (
+            watcher_client.post(
+                reverse("task-share", kwargs={"pk": self.task.id}), {"users": [self.watcher.id]}, format="json"
+            ).status_code
+            == status.HTTP_404_NOT_FOUND
+        )
+
+        response = self.client.post(
+            reverse("task-unshare", kwargs={"pk": self.task.id}),
+            {"users": [self.watcher.id, self.assignee.id]},
+            format="json",
+        )
+        assert response.data["watchers"] == []
+        assert watcher_client.get(reverse("task-list")).data == []
+        assert self.roles(self.task)[self.assignee.id] == TaskMembership.ASSIGNEE
+
+    def test_share_rejects_unknown_users(self) -> None:
+        """Test that sharing with users that do not exist fails without changes."""
+        response: Response = self.client.post(
+            reverse("task-share", kwargs={"pk": self.task.id}), {"users": [self.watcher.id, 999999]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["users"] == [ERROR_MESSAGES["unknown_users"].format(users="999999")]
+        assert self.watcher.id not in self.roles(self.task)
+
+    def test_migration_backfills_memberships(self) -> None:
+        """Test that the data migration creates the memberships of existing tasks."""
+        backfill = importlib.import_module("tasks.migrations.0005_task_memberships").backfill_memberships
+        TaskMembership.objects.all().delete()
+
+        backfill(django_apps, SimpleNamespace(connection=connection))
+
+        assert self.roles(self.task) == {
+            self.assignee.id: TaskMembership.ASSIGNEE,
+            self.creator.id: TaskMembership.CREATOR,
+        }
+
+
+@pytest.mark.django_db
+class TestArchive:
+    """Archival of the tasks completed long ago. Dates lie beyond the seeded tasks."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, authenticated_client: Tuple[APIClient, User], bulk_task_factory: Callable) -> None:
+        """Create old completed tasks, a recently completed one and a pending one."""
+        self.client, self.user = authenticated_client
+        self.old: List[Task] = bulk_task_factory(self.user, 3, start=date(2045, 1, 1), completed=True)
+        self.recent: Task = bulk_task_factory(self.user, 1, start=date(2045, 2, 1), completed=True)[0]
+        self.pending: Task = bulk_task_factory(self.user, 1, start=date(2045, 3, 1))[0]
+        Task.objects.filter(id__in=[task.id for task in self.old]).update(
+            completed_at=timezone.now() - timedelta(days=400)
+        )
+
+    def test_completion_time_is_tracked(self) -> None:
+        """Test that completing a task stamps completed_at and reopening it clears it."""
+        assert self.recent.completed_at is not None
+
+        self.client.post(reverse("task-complete", kwargs={"pk": self.pending.id}))
+        self.pending.refresh_from_db()
+        assert self.pending.completed_at is not None
+
+        self.pending.completed = False
+        self.pending.save()
+        self.pending.refresh_from_db()
+        assert self.pending.completed_at is None
+
+    def test_archive_moves_old_completed_tasks_in_batches(self) -> None:
+        """Test that only tasks completed before the cutoff are moved, batch by batch."""
+        assert archive_tasks(timedelta(days=365), batch_size=2, pause=0, max_batches=1) == 2
+        assert archive_tasks(timedelta(days=365), batch_size=2, pause=0) == 1
+
+        old_ids: set[int] = {task.id for task in self.old}
+        assert set(ArchivedTask.objects.values_list("id", flat=True)) == old_ids
+        assert not Task.objects.filter(id__in=old_ids).exists()
+        assert not TaskMembership.objects.filter(task_id__in=old_ids).exists()
+        assert Task.objects.filter(id__in=[self.recent.id, self.pending.id]).count() == 2
+
+    def test_archived_tasks_are_returned_on_request(self) -> None:
+        """Test that ?include_archived= adds archived tasks to lists, searches and reads."""
+        output: io.StringIO = io.StringIO()
+        call_command("archive_tasks", "--older-than-days", "365", "--pause", "0", stdout=output)
+        assert "Archived 3 tasks" in output.getvalue()
+        archived_id: int = self.old[0].id
+        params: dict = {QUERY_PARAMS["include_archived"]: "true"}
+
+        listed: list[int] = [task["id"] for task in self.client.get(reverse("task-list")).data]
+        assert archived_id not in listed
+        listed = [task["id"] for task in self.client.get(reverse("task-list"), params).data]
+        assert listed[-3:] == [task.id for task in self.old]
+
+        searched: Response = self.client.get(
+            reverse("task-search"),
+            {**params, QUERY_PARAMS["start_date"]: "2045-01-03", QUERY_PARAMS["end_date"]: "2045-01-31"},
+        )
+        assert [task["id"] for task in searched.data] == [self.old[1].id, self.old[2].id]
+
+        detail_url: str = reverse("task-detail", kwargs={"pk": archived_id})
+        assert self.client.get(detail_url).status_code == status.HTTP_404_NOT_FOUND
+        response: Response = self.client.get(detail_url, params)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["completed"] is True
+        assert self.client.delete(f"{detail_url}?include_archived=true").status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestTaskHistory:
+    """Change history of tasks. Dates lie beyond the seeded tasks."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, authenticated_client: Tuple[APIClient, User], django_capture_on_commit_callbacks: Callable) -> None:
+        """Create a task through the API."""
+        self.client, self.user = authenticated_client
+        # The history is inserted once the request commits, which the test transaction never does
+        self.committed: Callable = lambda: django_capture_on_commit_callbacks(execute=True)
+        self.start: date = date(2050, 1, 1)
+        with self.committed():
+            response: Response = self.client.post(
+                reverse("task-list"),
+                {"title": "Tracked", "start_date": self.start.isoformat(), "user": self.user.id},
+                format="json",
+            )
+        self.task_id: int = response.data["id"]
+        self.history_url: str = reverse("task-history", kwargs={"pk": self.task_id})
+
+    def test_changes_are_recorded_field_by_field(self) -> None:
+        """Test that each write records who changed which fields, and that deletions keep the history."""
+        detail_url: str = reverse("task-detail", kwargs={"pk": self.task_id})
+        with self.committed():
+            self.client.patch(detail_url, {"title": "Renamed", "due_date": "2050-01-03"}, format="json")
+            self.client.patch(detail_url, {"title": "Renamed"}, format="json")
+            self.client.post(reverse("task-complete", kwargs={"pk": self.task_id}))
+            # Already completed: nothing to record
+            self.client.post(reverse("task-bulk-complete"), {"ids": [self.task_id]}, format="json")
+
+        response: Response = self.client.get(self.history_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        changes: list[dict] = response.data["results"]
+        assert [change["action"] for change in changes] == [
+            TaskChange.COMPLETED,
+            TaskChange.UPDATED,
+            TaskChange.CREATED,
+        ]
+        assert {change["user"] for change in changes} == {self.user.id}
+        assert changes[0]["changes"] == {"completed": [False, True]}
+        assert changes[1]["changes"] == {"title": ["Tracked", "Renamed"], "due_date": [None, "2050-01-03"]}
+        assert changes[2]["changes"]["title"] == [None, "Tracked"]
+
+        with self.committed():
+            self.client.delete(detail_url)
+        assert self.client.get(self.history_url).status_code == status.HTTP_404_NOT_FOUND
+        deleted: TaskChange = TaskChange.objects.filter(task_id=self.task_id).latest("created_at")
+        assert deleted.action == TaskChange.DELETED
+        assert deleted.changes["title"] == ["Renamed", None]
+
+    def test_model_completion_has_the_same_side_effects(self, django_capture_on_commit_callbacks: Callable) -> None:
+        """Test that Task.mark_as_completed() records history, sends the event and invalidates the cache."""
+        task: Task = Task.objects.get(id=self.task_id)
+        version: int = get_user_tasks_version(self.user.id)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            assert task.mark_as_completed(self.user) is True
+        assert task.mark_as_completed(self.user) is False
+
+        stored: Task = Task.objects.get(id=self.task_id)
+        assert (task.completed_at, task.version) == (stored.completed_at, stored.version)
+        completion: TaskChange = TaskChange.objects.get(task_id=self.task_id, action=TaskChange.COMPLETED)
+        assert (completion.user, completion.created_at) == (self.user, stored.completed_at)
+        assert Event.objects.filter(type=EVENTS["task_completed"], user=self.user).count() == 1
+        assert get_user_tasks_version(self.user.id) > version
+
+    def test_history_is_paginated_and_limited_to_members(self, user_factory: Callable) -> None:
+        """Test that pages follow the cursor links, and that only members read the history."""
+        task: Task = Task.objects.get(pk=self.task_id)
+        with self.committed():
+            for number in range(4):
+                self.client.patch(reverse("task-detail", kwargs={"pk": task.id}), {"title": f"Title {number}"})
+
+        first: Response = self.client.get(self.history_url, {QUERY_PARAMS["page_size"]: 3})
+        second: Response = self.client.get(first.data["next"])
+
+        titles: list[str] = [change["changes"]["title"][1] for change in first.data["results"] + second.data["results"]]
+        assert titles == ["Title 3", "Title 2", "Title 1", "Title 0", "Tracked"]
+        assert second.data["next"] is None
+
+        other: APIClient = APIClient()
+        watcher: User = user_factory(username="watcher")
+        other.force_authenticate(user=watcher)
+        assert other.get(self.history_url).status_code == status.HTTP_404_NOT_FOUND
+        task.add_watchers([watcher.id])
+        assert len(other.get(self.history_url).data["results"]) == 5
+
+    def test_buffered_changes_are_inserted_together(self, django_assert_num_queries: Callable) -> None:
+        """Test that the changes recorded within a buffer take one INSERT, and are written right away outside."""
+        with django_assert_num_queries(1), self.committed():
+            with history.buffered():
+                for _ in range(3):
+                    history.record(TaskChange(task_id=self.task_id, action=TaskChange.UPDATED))
+
+        with django_assert_num_queries(1):
+            history.record(TaskChange(task_id=self.task_id, action=TaskChange.UPDATED))
+        assert TaskChange.objects.filter(task_id=self.task_id).count() == 5
+
+    def test_failed_writes_record_nothing(self, monkeypatch) -> None:
+        """Test that the buffer is dropped when its block raises, its transaction rolls back or the request fails."""
+        with self.committed(), pytest.raises(ValueError):
+            with history.buffered():
+                history.record(TaskChange(task_id=self.task_id, action=TaskChange.UPDATED))
+                raise ValueError
+        with self.committed(), pytest.raises(ValueError), transaction.atomic():
+            with history.buffered():
+                history.record(TaskChange(task_id=self.task_id, action=TaskChange.UPDATED))
+            raise ValueError
+
+        # The write went through, but the response is an error
+        finalize_response = TaskViewSet.finalize_response
+        monkeypatch.setattr(
+            TaskViewSet,
+            "finalize_response",
+            lambda view, request, response, *args, **kwargs: finalize_response(
+                view, request, Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR), *args, **kwargs
+            ),
+        )
+        with self.committed():
+            self.client.patch(reverse("task-detail", kwargs={"pk": self.task_id}), {"title": "Failed"})
+
+        assert Task.objects.get(pk=self.task_id).title == "Failed"
+        assert list(TaskChange.objects.filter(task_id=self.task_id).values_list("action", flat=True)) == [
+            TaskChange.CREATED
+        ]
+
+
+SHARDS: list[str] = ["default", "shard_1", "shard_2"]
+
+
+@pytest.mark.django_db(databases=SHARDS)
+class TestSharding:
+    @pytest.fixture(autouse=True)
+    def setup(
+        self, authenticated_client: Tuple[APIClient, User], user_factory: Callable, settings, monkeypatch
+    ) -> None:
+        """Spread tasks over three shards, with another user whose tasks live in another shard."""
+        settings.TASK_SHARDS = SHARDS
+        monkeypatch.setattr("tasks.models._task_ids", [])
+        self.client, self.user = authenticated_client
+        self.shard: str = shard_for_user(self.user.id)
+        index: int = 0
+        while True:
+            index += 1
+            self.other: User = user_factory(username=f"other{index}")
+            if shard_for_user(self.other.id) != self.shard:
+                break
+        self.other_shard: str = shard_for_user(self.other.id)
+        self.today: date = date(2046, 1, 1)
+
+    def create(self, title: str, user: User, start: date, due: date | None = None) -> Response:
+        """Create a task through the API as the authenticated user."""
+        data: dict = {"title": title, "start_date": start.isoformat(), "user": user.id}
+        if due:
+            data["due_date"] = due.isoformat()
+        return self.client.post(reverse("task-list"), data)
+
+    def test_jump_hash_moves_few_keys_when_growing(self) -> None:
+        """Test that adding a bucket only moves keys into the new bucket."""
+        before: list[int] = [jump_hash(key, 3) for key in range(3000)]
+        after: list[int] = [jump_hash(key, 4) for key in range(3000)]
+
+        moved: list[int] = [key for key in range(3000) if before[key] != after[key]]
+        assert all(after[key] == 3 for key in moved)
+        assert 600 < len(moved) < 900
+        assert set(before) == {0, 1, 2}
+
+    def test_tasks_are_stored_in_the_shard_of_their_assignee(self) -> None:
+        """Test that tasks, with their memberships, go to their assignee's shard with unique ids."""
+        own: int = self.create("Own", self.user, self.today).data["id"]
+        delegated: int = self.create("Delegated", self.other, self.today).data["id"]
+
+        assert own != delegated
+        assert Task.objects.using(self.shard).filter(pk=own).exists()
+        assert Task.objects.using(self.other_shard).filter(pk=delegated).exists()
+        assert not Task.objects.using(self.shard).filter(pk=delegated).exists()
+        assert set(
+            TaskMembership.objects.using(self.other_shard).filter(task_id=delegated).values_list("user_id", flat=True)
+        ) == {self.user.id, self.other.id}
+
+    def test_reads_and_writes_cross_shards(self) -> None:
+        """Test that the tasks a user created for others are listed, searched, read and edited."""
+        own: int = self.create("Own", self.user, self.today + timedelta(days=1)).data["id"]
+        delegated: int = self.create("Delegated", self.other, self.today).data["id"]
+
+        listed: list[dict] = self.client.get(reverse("task-list")).data
+        assert [task["id"] for task in listed if task["id"] in (own, delegated)] == [delegated, own]
+        assert next(task for task in listed if task["id"] == delegated)["assigned_user"]["username"] == (
+            self.other.username
+        )
+        searched: Response = self.client.get(
+            reverse("task-search"), {QUERY_PARAMS["start_date"]: self.today.isoformat()}
+        )
+        assert [task["id"] for task in searched.data] == [delegated, own]
+
+        detail_url: str = reverse("task-detail", kwargs={"pk": delegated})
+        assert self.client.get(detail_url).data["title"] == "Delegated"
+        assert self.client.patch(detail_url, {"title": "Renamed"}).status_code == status.HTTP_200_OK
+        assert self.client.post(reverse("task-complete", kwargs={"pk": delegated})).data["completed"] is True
+        assert Task.objects.using(self.other_shard).get(pk=delegated).title == "Renamed"
+        assert self.client.delete(detail_url).status_code == status.HTTP_204_NO_CONTENT
+        assert not Task.objects.using(self.other_shard).filter(pk=delegated).exists()
+
+    def test_overlap_validation_reads_the_assignee_shard(self) -> None:
+        """Test that overlaps are detected among the tasks of another shard."""
+        self.create("First", self.other, self.today, self.today + timedelta(days=2))
+
+        response: Response = self.create("Second", self.other, self.today + timedelta(days=1))
+
+        assert response.status_code == status.HTTP_201_CREATED
+        response = self.create("Third", self.other, self.today + timedelta(days=1), self.today + timedelta(days=1))
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["overlapping_task"] == ["First"]
+
+    def test_reassigning_moves_the_task(self, user_factory: Callable) -> None:
+        """Test that a task follows its assignee to another shard, keeping its watchers."""
+        task_id: int = self.create("Moving", self.user, self.today).data["id"]
+        watcher: User = user_factory(username="watcher")
+        self.client.post(reverse("task-share", kwargs={"pk": task_id}), {"users": [watcher.id]}, format="json")
+
+        response: Response = self.client.patch(reverse("task-detail", kwargs={"pk": task_id}), {"user": self.other.id})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not Task.objects.using(self.shard).filter(pk=task_id).exists()
+        assert not TaskMembership.objects.using(self.shard).filter(task_id=task_id).exists()
+        assert dict(
+            TaskMembership.objects.using(self.other_shard).filter(task_id=task_id).values_list("user_id", "roles")
+        ) == {
+            self.user.id: TaskMembership.CREATOR,
+            self.other.id: TaskMembership.ASSIGNEE,
+            watcher.id: TaskMembership.WATCHER,
+        }
+
+    def test_reshard_command_moves_misplaced_tasks(self, settings) -> None:
+        """Test that tasks created before sharding are moved to their shard, resumably."""
+        settings.TASK_SHARDS = ["default"]
+        task_id: int = self.create("Legacy", self.other, self.today).data["id"]
+        settings.TASK_SHARDS = SHARDS
+        # The seeded tasks are in default too
+        misplaced: int = sum(
+            shard_for_user(user_id) != "default" for user_id in Task.objects.values_list("user_id", flat=True)
+        )
+        output: io.StringIO = io.StringIO()
+
+        call_command("reshard_tasks", "--dry-run", stdout=output)
+        assert Task.objects.filter(pk=task_id).exists()
+        call_command("reshard_tasks", stdout=output)
+        call_command("reshard_tasks", stdout=output)
+
+        assert output.getvalue().splitlines() == [
+            f"Would move {misplaced} tasks and 0 archived tasks",
+            f"Moved {misplaced} tasks and 0 archived tasks",
+            "Moved 0 tasks and 0 archived tasks",
+        ]
+        moved: Task = Task.objects.using(self.other_shard).get(pk=task_id)
+        assert moved.title == "Legacy" and moved.memberships.count() == 2
+        assert not Task.objects.filter(pk=task_id).exists()
+
+    def test_account_deletion_walks_every_shard(self) -> None:
+        """Test that deleting an account removes the user's tasks from their shard and from the others."""
+        own: int = self.create("Own", self.user, self.today).data["id"]
+        delegated: int = self.create("Delegated", self.other, self.today).data["id"]
+
+        assert delete_account(request_deletion(self.user, background=False), "worker", pause=0)
+
+        assert not Task.objects.using(self.shard).filter(pk=own).exists()
+        assert not Task.objects.using(self.other_shard).filter(pk=delegated).exists()
+        assert not TaskMembership.objects.using(self.other_shard).filter(task_id=delegated).exists()
+        assert not User.objects.filter(pk=self.user.pk).exists()
+
+
+@pytest.mark.django_db
+class TestTaskAdmin:
+    @pytest.fixture(autouse=True)
+    def setup(self, admin_client, user_factory: Callable, task_factory: Callable) -> None:
+        """Creates three pending tasks, on top of the seeded ones."""
+        self.client = admin_client
+        self.user: User = user_factory(username="assignee")
+        self.tasks: list[Task] = [
+            task_factory(title=f"Admin task {index}", user=self.user, created_by=self.user) for index in range(3)
+        ]
+        self.url: str = reverse("admin:tasks_task_changelist")
+
+    def test_changelist_joins_users_and_counts_once(self) -> None:
+        """Test that the list page runs a fixed number of queries without dropdowns of users."""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(context.captured_queries) <= 8
+        assert sum("COUNT(" in query["sql"] for query in context.captured_queries) == 1
+        actions: list[str] = [name for name, _ in response.context["action_form"].fields["action"].choices]
+        assert actions == ["", "complete_tasks", "delete_tasks"]
+        response = self.client.get(reverse("admin:tasks_task_change", kwargs={"object_id": self.tasks[0].pk}))
+        assert b'class="vForeignKeyRawIdAdminField"' in response.content
+
+    def test_paginator_estimates_large_unfiltered_tables(self, monkeypatch) -> None:
+        """Test that the planner estimate replaces COUNT(*) only for large unfiltered lists."""
+        monkeypatch.setattr(EstimatedCountPaginator, "estimate_count", lambda paginator: 10_000_000)
+
+        assert EstimatedCountPaginator(Task.objects.order_by("id"), 100).count == 10_000_000
+        monkeypatch.setattr(EstimatedCountPaginator, "estimate_count", lambda paginator: 10)
+        assert EstimatedCountPaginator(Task.objects.order_by("id"), 100).count == Task.objects.count()
+        monkeypatch.undo()
+        assert EstimatedCountPaginator(Task.objects.filter(user=self.user).order_by("id"), 100).estimate_count() is None
+
+    def test_complete_action_runs_one_update(self) -> None:
+        """Test that completing selected tasks updates them in one statement."""
+        data: dict = {"action": "complete_tasks", "_selected_action": [task.pk for task in self.tasks[:2]]}
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, data)
+
+        assert response.status_code == status.HTTP_302_FOUND
+        assert sum(query["sql"].startswith('UPDATE "tasks_task"') for query in context.captured_queries) == 1
+        assert list(Task.objects.filter(user=self.user).order_by("id").values_list("completed", "version")) == [
+            (True, 2),
+            (True, 2),
+            (False, 1),
+        ]
+
+    def test_delete_action_runs_one_delete_per_table(self) -> None:
+        """Test that deleting selected tasks removes them and their memberships without loading them."""
+        data: dict = {"action": "delete_tasks", "_selected_action": [task.pk for task in self.tasks[:2]]}
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, data)
+
+        assert response.status_code == status.HTTP_302_FOUND
+        statements: list[str] = [query["sql"] for query in context.captured_queries]
+        assert sum(sql.startswith('DELETE FROM "tasks_task"') for sql in statements) == 1
+        assert not any(sql.startswith('SELECT "tasks_task"."id", "tasks_task"."title"') for sql in statements)
+        assert list(Task.objects.filter(user=self.user).values_list("pk", flat=True)) == [self.tasks[2].pk]
+        assert not TaskMembership.objects.filter(task_id__in=[task.pk for task in self.tasks[:2]]).exists()
+
+    def test_change_form_has_the_same_side_effects(self, django_capture_on_commit_callbacks: Callable) -> None:
+        """Test that saving a task from its change form records history, sends the event and invalidates the cache."""
+        task: Task = self.tasks[0]
+        version: int = get_user_tasks_version(self.user.id)
+        data: dict = {
+            "title": "Renamed by admin",
+            "description": task.description,
+            "start_date": task.start_date.isoformat(),
+            "due_date": task.due_date.isoformat(),
+            "user": self.user.pk,
+            "created_by": self.user.pk,
+        }
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = self.client.post(reverse("admin:tasks_task_change", kwargs={"object_id": task.pk}), data)
+
+        assert response.status_code == status.HTTP_302_FOUND
+        change: TaskChange = TaskChange.objects.get(task_id=task.pk, action=TaskChange.UPDATED)
+        assert change.changes == {"title": [task.title, "Renamed by admin"]}
+        assert Event.objects.filter(type=EVENTS["task_updated"], user=self.user).count() == 1
+        assert get_user_tasks_version(self.user.id) > version
+
+    def test_deletes_have_the_same_side_effects(self, django_capture_on_commit_callbacks: Callable) -> None:
+        """Test that deleting tasks from the delete page or the action has the same side effects as the API."""
+        version: int = get_user_tasks_version(self.user.id)
+        delete_url: str = reverse("admin:tasks_task_delete", kwargs={"object_id": self.tasks[0].pk})
+        data: dict = {"action": "delete_tasks", "_selected_action": [task.pk for task in self.tasks[1:]]}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            assert self.client.post(delete_url, {"post": "yes"}).status_code == status.HTTP_302_FOUND
+            assert self.client.post(self.url, data).status_code == status.HTTP_302_FOUND
+
+        task_ids: list[int] = [task.pk for task in self.tasks]
+        assert not Task.objects.filter(pk__in=task_ids).exists()
+        deleted: list[int] = sorted(
+            TaskChange.objects.filter(action=TaskChange.DELETED).values_list("task_id", flat=True)
+        )
+        assert deleted == task_ids
+        assert TaskChange.objects.get(task_id=task_ids[0], action=TaskChange.DELETED).changes["title"][1] is None
+        assert Event.objects.filter(type=EVENTS["task_deleted"], user=self.user).count() == 3
+        assert get_user_tasks_version(self.user.id) > version
+
+    def test_complete_action_records_history(self, django_capture_on_commit_callbacks: Callable) -> None:
+        """Test that completing tasks from the action records who completed them."""
+        data: dict = {"action": "complete_tasks", "_selected_action": [self.tasks[0].pk]}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.client.post(self.url, data)
+
+        completion: TaskChange = TaskChange.objects.get(task_id=self.tasks[0].pk, action=TaskChange.COMPLETED)
+        assert completion.user.username == "admin"
+        assert Event.objects.filter(type=EVENTS["task_completed"], user=self.user).count() == 1
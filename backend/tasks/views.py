@@ -1,20 +1,66 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
+from rest_framework.renderers import JSONRenderer
 from rest_framework.request import Request
-from django.db.models import Q, QuerySet
+from rest_framework.settings import api_settings
+from django.core.cache import cache
+from django.db import router
+from django.db.models import F, Q, QuerySet, prefetch_related_objects
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
 from datetime import datetime, date
+from typing import Iterable
+import hashlib
 import logging
-from tasks.models import Task
-from tasks.serializers import TaskSerializer
+from tasks.sharding import is_sharded, locate, shard_for_user, shard_querysets
+from tasks.cache import bump_user_tasks_version, calendar_cache_key
+from tasks.calendar import BUCKETS, build_calendar
+from tasks.exceptions import PreconditionFailed
+from tasks import history
+from tasks.models import ArchivedTask, Task, TaskChange, TaskMembership, TaskVersionConflict
+from tasks.notifications import notify_completed, notify_deleted, notify_saved
+from tasks.renderers import OPTIONAL_RENDERERS, CompactJSONRenderer, FastJSONRenderer
+from tasks.serializers import (
+    FastTaskSerializer,
+    TaskChangeSerializer,
+    TaskIdsSerializer,
+    TaskSerializer,
+    TaskShareSerializer,
+)
 from django.contrib.auth.models import User
-from drf_spectacular.utils import extend_schema, OpenApiParameter
-from drf_spectacular.types import OpenApiTypes
-from constants import DATE_FORMAT, DATE_FORMAT_DISPLAY, ERROR_MESSAGES, QUERY_PARAMS
+from events.publisher import publish
+from idempotency.keys import idempotent
+from constants import (
+    API_RESPONSES,
+    CALENDAR,
+    DATE_FORMAT,
+    ERROR_MESSAGES,
+    EVENTS,
+    PAGINATION,
+    QUERY_PARAMS,
+)
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+
+class TaskHistoryPagination(CursorPagination):
+    """
+    Keyset pagination of a task's history, served by the ``(task, created_at)`` index.
+    """
+
+    ordering = "-created_at"
+    page_size = PAGINATION["default_page_size"]
+    page_size_query_param = QUERY_PARAMS["page_size"]
+    max_page_size = PAGINATION["max_page_size"]
+
+
 # Create your views here.
 
 
@@ -24,21 +70,277 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     Provides full CRUD functionality for the Task model,
     with filters by authenticated user and search by date range.
+
+    Read endpoints accept ``?fields=`` and ``?expand=assigned_user`` to
+    return a sparse fieldset, and ``?format=compact`` (or ``msgpack`` when
+    installed) for smaller payloads.
     """
 
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = [
+        FastJSONRenderer,
+        *(renderer for renderer in api_settings.DEFAULT_RENDERER_CLASSES if not issubclass(renderer, JSONRenderer)),
+        CompactJSONRenderer,
+        *OPTIONAL_RENDERERS,
+    ]
+
+    # Fields always loaded by the calendar to place tasks in buckets
+    CALENDAR_COLUMNS: tuple[str, ...] = ("start_date", "due_date")
+
+    # Actions whose response is a single task and carries its version as ETag
+    ETAG_ACTIONS: tuple[str, ...] = ("retrieve", "create", "update", "partial_update")
 
     def get_queryset(self) -> QuerySet[Task]:
         """
         Returns only the tasks of the authenticated user.
 
+        Tasks are read through the user's memberships: the tasks assigned to,
+        created by or shared with the user, in the order of the
+        ``(user, start_date)`` membership index. The membership's copy of the
+        start date is available as ``member_start_date`` for range filters.
+        Writes are limited to the tasks the user is assignee or creator of.
+
         Returns:
             QuerySet: Filtered list of tasks of the current user.
         """
         user: User = self.request.user
         logger.info(f"User: {user}")
-        return Task.objects.filter(Q(user=user) | Q(created_by=user))
+        tasks: QuerySet[Task] = Task.objects.all()
+        shard: str | None = self.get_shard(Task)
+        if shard is not None:
+            tasks = tasks.using(shard)
+
+        if self.request.method != "GET":
+            return tasks.filter(
+                memberships__user=user,
+                memberships__roles__in=TaskMembership.roles_including(TaskMembership.EDITORS),
+            )
+
+        queryset: QuerySet[Task] = (
+            tasks.filter(memberships__user=user)
+            .alias(member_start_date=F("memberships__start_date"))
+            .order_by("member_start_date", "due_date")
+        )
+
+        # Only load the columns of the requested fieldset
+        selected: set[str] | None = self.get_selected_fields()
+        if selected is not None:
+            columns: list[str] = TaskSerializer.get_only_columns(selected)
+            if self.action == "calendar":
+                columns += self.CALENDAR_COLUMNS
+            queryset = queryset.only(*columns)
+        # Shards hold no users to join
+        if (selected is None or "assigned_user" in selected) and not is_sharded():
+            return queryset.select_related("user")
+        return queryset
+
+    def get_shard(self, model: type[Task] | type[ArchivedTask]) -> str | None:
+        """
+        Locates the shard holding the task of a detail request.
+
+        The shard of the requester's own tasks is probed first.
+
+        Args:
+            model (type[Task] | type[ArchivedTask]): Table to look the task up in.
+
+        Returns:
+            str | None: Alias of the shard, None for list requests, when unsharded or if no shard holds the task.
+        """
+        if not self.detail or not is_sharded():
+            return None
+        if not hasattr(self, "_shards"):
+            self._shards: dict[type, str | None] = {}
+        if model not in self._shards:
+            self._shards[model] = locate(
+                model,
+                self.kwargs[self.lookup_url_kwarg or self.lookup_field],
+                prefer=shard_for_user(self.request.user.id),
+            )
+        return self._shards[model]
+
+    def get_archived_queryset(self) -> QuerySet[ArchivedTask]:
+        """
+        Returns the archived tasks of the authenticated user.
+
+        Returns:
+            QuerySet: Archived tasks assigned to or created by the current user.
+        """
+        user: User = self.request.user
+        archived: QuerySet[ArchivedTask] = ArchivedTask.objects.filter(Q(user=user) | Q(created_by=user))
+        shard: str | None = self.get_shard(ArchivedTask)
+        return archived.using(shard) if shard is not None else archived
+
+    def include_archived(self) -> bool:
+        """
+        Tells whether the request asked for archived tasks with ``?include_archived=``.
+
+        Returns:
+            bool: True for ``true``, ``1`` or ``yes``.
+        """
+        value: str = self.request.query_params.get(QUERY_PARAMS["include_archived"], "")
+        return value.lower() in ("true", "1", "yes")
+
+    def get_object(self) -> Task | ArchivedTask:
+        """
+        Returns the requested task, looking in the archive too if the request includes it.
+
+        Returns:
+            Task | ArchivedTask: The task. Archived tasks are only returned for reads.
+        """
+        try:
+            return super().get_object()
+        except Http404:
+            if self.action != "retrieve" or not self.include_archived():
+                raise
+            return get_object_or_404(self.get_archived_queryset(), pk=self.kwargs[self.lookup_field])
+
+    def get_selected_fields(self) -> set[str] | None:
+        """
+        Returns the sparse fieldset requested by a read request.
+
+        Returns:
+            set[str] | None: Selected field names, or None for the full representation.
+        """
+        if not hasattr(self, "_selected_fields"):
+            self._selected_fields: set[str] | None = (
+                TaskSerializer.select_fields(
+                    self.request.query_params.get(QUERY_PARAMS["fields"]),
+                    self.request.query_params.get(QUERY_PARAMS["expand"]),
+                )
+                if self.request.method == "GET"
+                else None
+            )
+        return self._selected_fields
+
+    def serialize_tasks(self, queryset: QuerySet[Task] | QuerySet[ArchivedTask]) -> list[dict]:
+        """
+        Serializes a list of tasks through the read-only fast path.
+
+        When sharded, the query runs on every shard and the results are merged
+        in start date order.
+
+        Args:
+            queryset (QuerySet[Task] | QuerySet[ArchivedTask]): Tasks to serialize.
+
+        Returns:
+            list[dict]: Representations identical to TaskSerializer's.
+        """
+        serializer: FastTaskSerializer = FastTaskSerializer(self.get_selected_fields())
+        if not is_sharded():
+            return serializer.serialize(queryset)
+        return serializer.serialize_sharded(shard_querysets(queryset), order=("start_date", "due_date", "id"))
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        """
+        Lists the tasks of the authenticated user.
+
+        With ``?include_archived=true`` the archived tasks follow the current
+        ones, also in start date order.
+
+        Returns:
+            Response: List of tasks.
+        """
+        data: list[dict] = self.serialize_tasks(self.filter_queryset(self.get_queryset()))
+        if self.include_archived():
+            data += self.serialize_tasks(self.get_archived_queryset())
+        return Response(data)
+
+    @idempotent
+    def create(self, request: Request, *args, **kwargs) -> Response:
+        """
+        Creates a task created by the authenticated user.
+
+        Retries sent with the same ``Idempotency-Key`` header get the created task back
+        instead of creating a duplicate.
+
+        Returns:
+            Response: The created task.
+        """
+        return super().create(request, *args, **kwargs)
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        """
+        Returns a task of the authenticated user, or an archived one with ``?include_archived=true``.
+
+        Returns:
+            Response: The task.
+        """
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(detail=False, methods=["get"])
+    def export(self, request: Request) -> Response:
+        """
+        Endpoint for downloading every task of the authenticated user.
+
+        Returns:
+            Response: List of tasks served as a file attachment.
+        """
+        response: Response = Response(self.serialize_tasks(self.get_queryset()))
+        response["Content-Disposition"] = f'attachment; filename="tasks.{request.accepted_renderer.format}"'
+        logger.info(f"Tasks exported by user {request.user.username}")
+        return response
+
+    def get_serializer_context(self) -> dict:
+        """
+        Adds the requested sparse fieldset to the serializer context.
+        """
+        context: dict = super().get_serializer_context()
+        context["fields"] = self.get_selected_fields()
+        return context
+
+    def finalize_response(self, request: Request, response: Response, *args, **kwargs) -> Response:
+        """
+        Adds the task version as ETag to single task responses.
+        """
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            getattr(self, "action", None) in self.ETAG_ACTIONS
+            and status.is_success(response.status_code)
+            and isinstance(response.data, dict)
+            and "version" in response.data
+        ):
+            response["ETag"] = quote_etag(str(response.data["version"]))
+        return response
+
+    def get_expected_version(self, instance: Task) -> int | None:
+        """
+        Reads the version required by the ``If-Match`` header of the request.
+
+        Accepts quoted, weak or bare versions (``"3"``, ``W/"3"``, ``3``).
+
+        Args:
+            instance (Task): Task targeted by the request.
+
+        Returns:
+            int | None: Version the write must apply to, or None without precondition.
+
+        Raises:
+            PreconditionFailed: If no listed version matches the task.
+        """
+        header: str = self.request.headers.get("If-Match", "").strip()
+        if not header or header == "*":
+            return None
+
+        versions: list[str] = [etag.removeprefix("W/").strip('"') for etag in parse_etags(header)] or [header]
+        if str(instance.version) not in versions:
+            logger.warning(f"Version conflict on task {instance.pk}: If-Match {header}, current {instance.version}")
+            raise PreconditionFailed(current=self.get_serializer(instance).data)
+        return instance.version
+
+    def version_conflict(self, pk: int) -> PreconditionFailed:
+        """
+        Builds the error of a write that lost a race against another one.
+
+        Args:
+            pk (int): Id of the task.
+
+        Returns:
+            PreconditionFailed: Error carrying the current task representation, if it still exists.
+        """
+        current: Task | None = self.get_queryset().filter(pk=pk).first()
+        logger.warning(f"Concurrent modification of task {pk} by user {self.request.user.username}")
+        return PreconditionFailed(current=self.get_serializer(current).data if current else None)
 
     def perform_create(self, serializer: TaskSerializer) -> None:
         """
@@ -48,46 +350,184 @@ class TaskViewSet(viewsets.ModelViewSet):
             serializer: Validated Task serializer.
         """
         serializer.save(created_by=self.request.user)
+        notify_saved(serializer.instance, {}, self.request.user, serializer.data)
         logger.info(f"Task created: {serializer.instance.title} by user {self.request.user.username}")
 
     def perform_update(self, serializer: TaskSerializer) -> None:
         """
         Updates a task and logs the action.
 
+        With an ``If-Match`` header the update is conditional on the task
+        version and fails with 412 if another write got there first.
+
         Args:
             serializer: Validated Task serializer.
         """
-        serializer.save()
+        previous_user_id: int = serializer.instance.user_id
+        before: dict = history.snapshot(serializer.instance)
+        expected_version: int | None = self.get_expected_version(serializer.instance)
+        try:
+            serializer.save(expected_version=expected_version)
+        except TaskVersionConflict:
+            raise self.version_conflict(serializer.instance.pk)
+        notify_saved(serializer.instance, before, self.request.user, serializer.data, previous_user_id)
         logger.info(f"Task updated: {serializer.instance.title} by user {self.request.user.username}")
 
     def perform_destroy(self, instance: Task) -> None:
         """
         Deletes a task and logs the action.
 
+        With an ``If-Match`` header the delete is conditional on the task version.
+
         Args:
             instance: Instance of Task to delete.
         """
         task_title: str = instance.title
-        instance.delete()
+        task_id: int = instance.pk
+        user_ids: list[int] = list(instance.memberships.values_list("user_id", flat=True))
+        expected_version: int | None = self.get_expected_version(instance)
+        if expected_version is None:
+            instance.delete()
+        else:
+            tasks: QuerySet[Task] = Task.objects.using(router.db_for_write(Task, instance=instance))
+            deleted, _ = tasks.filter(pk=instance.pk, version=expected_version).delete()
+            if not deleted:
+                raise self.version_conflict(instance.pk)
+        notify_deleted({task_id: set(user_ids)}, self.request.user, {task_id: history.snapshot(instance)})
         logger.info(f"Task deleted: {task_title} by user {self.request.user.username}")
 
-    @extend_schema(
-        parameters=[
-            OpenApiParameter(
-                name=QUERY_PARAMS["start_date"],
-                description=f"Start date ({DATE_FORMAT_DISPLAY})",
-                required=False,
-                type=OpenApiTypes.DATE,
-            ),
-            OpenApiParameter(
-                name=QUERY_PARAMS["end_date"],
-                description=f"End date ({DATE_FORMAT_DISPLAY})",
-                required=False,
-                type=OpenApiTypes.DATE,
-            ),
-        ],
-        responses={200: TaskSerializer(many=True)},
-    )
+    @action(detail=True, methods=["post"])
+    def complete(self, request: Request, pk: str | None = None) -> Response:
+        """
+        Endpoint for marking a single task as completed.
+
+        Runs one conditional UPDATE without loading the task or re-running
+        the overlap validation. Completing an already completed task is a no-op.
+
+        Returns:
+            Response: The task id, its completion state and whether this call changed it.
+        """
+        try:
+            task_id: int = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound()
+        tasks: QuerySet[Task] = self.get_queryset().filter(pk=task_id)
+        now: datetime = timezone.now()
+        completed: bool = tasks.mark_as_completed(now) > 0
+
+        if not completed:
+            if not tasks.exists():
+                raise NotFound()
+            return Response({"id": task_id, "completed": True, "detail": API_RESPONSES["task_already_completed"]})
+
+        notify_completed(tasks, now, request.user)
+        logger.info(f"Task {task_id} marked as completed by user {request.user.username}")
+        return Response({"id": task_id, "completed": True, "detail": API_RESPONSES["task_completed"]})
+
+    @action(detail=False, methods=["post"], url_path="complete")
+    def bulk_complete(self, request: Request) -> Response:
+        """
+        Endpoint for marking several tasks as completed at once.
+
+        Body:
+            ids (list[int]): Ids of the tasks to complete. Unknown or foreign ids are ignored.
+
+        Returns:
+            Response: Number of tasks completed by this call.
+        """
+        serializer: TaskIdsSerializer = TaskIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        completed: int = 0
+        now: datetime = timezone.now()
+        for tasks in shard_querysets(self.get_queryset().filter(pk__in=serializer.validated_data["ids"])):
+            shard_completed: int = tasks.mark_as_completed(now)
+            if shard_completed:
+                notify_completed(tasks, now, request.user)
+            completed += shard_completed
+        logger.info(f"{completed} tasks marked as completed by user {request.user.username}")
+        return Response({"completed": completed})
+
+    def watchers_response(self, task: Task) -> tuple[Response, set[int]]:
+        """
+        Builds the response of the share endpoints.
+
+        Args:
+            task (Task): Shared task.
+
+        Returns:
+            tuple[Response, set[int]]: The task id and its watchers, and the ids of all its members.
+        """
+        memberships: list[tuple[int, int]] = list(task.memberships.values_list("user_id", "roles"))
+        watchers: list[int] = sorted(user_id for user_id, roles in memberships if roles & TaskMembership.WATCHER)
+        return Response({"id": task.id, "watchers": watchers}), {user_id for user_id, _ in memberships}
+
+    @action(detail=True, methods=["post"])
+    def share(self, request: Request, pk: str | None = None) -> Response:
+        """
+        Endpoint for sharing a task with other users, who can then read it.
+
+        Only the assignee and the creator of a task can share it.
+
+        Body:
+            users (list[int]): Ids of the users to add as watchers.
+
+        Returns:
+            Response: The task id and the ids of its watchers.
+        """
+        task: Task = self.get_object()
+        serializer: TaskShareSerializer = TaskShareSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user_ids: list[int] = serializer.validated_data["users"]
+
+        task.add_watchers(user_ids)
+        bump_user_tasks_version(*user_ids)
+        publish(EVENTS["task_shared"], [(user_ids, self.get_serializer(task).data)])
+        logger.info(f"Task {task.pk} shared with users {user_ids} by user {request.user.username}")
+        response, _ = self.watchers_response(task)
+        return response
+
+    @action(detail=True, methods=["post"])
+    def unshare(self, request: Request, pk: str | None = None) -> Response:
+        """
+        Endpoint for removing watchers from a task.
+
+        Removing the assignee or the creator only drops their watcher role.
+
+        Body:
+            users (list[int]): Ids of the watchers to remove.
+
+        Returns:
+            Response: The task id and the ids of its remaining watchers.
+        """
+        task: Task = self.get_object()
+        serializer: TaskShareSerializer = TaskShareSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user_ids: list[int] = serializer.validated_data["users"]
+
+        task.remove_watchers(user_ids)
+        response, members = self.watchers_response(task)
+        bump_user_tasks_version(*user_ids)
+        publish(EVENTS["task_unshared"], [(set(user_ids) - members, {"id": task.id})])
+        logger.info(f"Task {task.pk} unshared from users {user_ids} by user {request.user.username}")
+        return response
+
+    @action(detail=True, methods=["get"], pagination_class=TaskHistoryPagination)
+    def history(self, request: Request, pk: str | None = None) -> Response:
+        """
+        Endpoint for the change history of a task, newest first.
+
+        Every member of the task can read it. Pages are walked with the
+        ``cursor`` links of the response, ``?page_size=`` changes their length.
+
+        Returns:
+            Response: A page of changes, with the links to the next and previous pages.
+        """
+        task: Task = self.get_object()
+        changes: QuerySet[TaskChange] = TaskChange.objects.filter(task_id=task.pk)
+        page: list[TaskChange] = self.paginate_queryset(changes)
+        return self.get_paginated_response(TaskChangeSerializer(page, many=True).data)
+
     @action(detail=False, methods=["get"])
     def search(self, request: Request) -> Response:
         """
@@ -96,6 +536,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         Query parameters:
             start (str): Start date in format YYYY-MM-DD
             end (str): End date in format YYYY-MM-DD
+            include_archived (bool): Also search the archived tasks
 
         Returns:
             Response: List of tasks that meet the search criteria.
@@ -104,12 +545,14 @@ class TaskViewSet(viewsets.ModelViewSet):
         end: str | None = request.query_params.get(QUERY_PARAMS["end_date"], None)
 
         queryset: QuerySet[Task] = self.get_queryset()
+        archived: QuerySet[ArchivedTask] = self.get_archived_queryset()
 
         if start:
             try:
                 logger.info(f"Start date: {start}")
                 start_date: date = datetime.strptime(start, DATE_FORMAT).date()
-                queryset = queryset.filter(start_date__gte=start_date)
+                queryset = queryset.filter(member_start_date__gte=start_date)
+                archived = archived.filter(start_date__gte=start_date)
             except ValueError:
                 logger.error(f"Invalid date format: {start}")
                 return Response(
@@ -122,6 +565,7 @@ class TaskViewSet(viewsets.ModelViewSet):
                 logger.info(f"End date: {end}")
                 end_date: date = datetime.strptime(end, DATE_FORMAT).date()
                 queryset = queryset.filter(Q(due_date__lte=end_date) | Q(due_date__isnull=True))
+                archived = archived.filter(Q(due_date__lte=end_date) | Q(due_date__isnull=True))
             except ValueError:
                 logger.error(f"Invalid date format: {end}")
                 return Response(
@@ -129,5 +573,107 @@ class TaskViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-        serializer: TaskSerializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        data: list[dict] = self.serialize_tasks(queryset)
+        if self.include_archived():
+            data += self.serialize_tasks(archived)
+        return Response(data)
+
+    @action(detail=False, methods=["get"])
+    def calendar(self, request: Request) -> Response:
+        """
+        Endpoint for the calendar/agenda view.
+
+        Returns the tasks of the range grouped by day or week. Tasks spanning
+        several days are repeated in every bucket they cover. Responses are
+        cached per user and range until one of the user's tasks changes.
+
+        Query parameters:
+            from (str): First day in format YYYY-MM-DD
+            to (str): Last day in format YYYY-MM-DD
+            bucket (str): ``day`` (default) or ``week``
+
+        Returns:
+            Response: The range, the bucket size and the list of buckets.
+        """
+        start: str | None = request.query_params.get(QUERY_PARAMS["from_date"])
+        end: str | None = request.query_params.get(QUERY_PARAMS["to_date"])
+        bucket: str = request.query_params.get(QUERY_PARAMS["bucket"], CALENDAR["bucket_day"])
+
+        if not start or not end:
+            return Response(
+                {"error": ERROR_MESSAGES["calendar_range_required"]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if bucket not in BUCKETS:
+            return Response(
+                {"error": ERROR_MESSAGES["invalid_bucket"].format(buckets=", ".join(BUCKETS))},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            start_date: date = datetime.strptime(start, DATE_FORMAT).date()
+            end_date: date = datetime.strptime(end, DATE_FORMAT).date()
+        except ValueError:
+            logger.error(f"Invalid date format: {start} - {end}")
+            return Response(
+                {"error": ERROR_MESSAGES["invalid_date_format"]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if end_date < start_date:
+            return Response(
+                {"error": ERROR_MESSAGES["calendar_range_inverted"]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if (end_date - start_date).days >= CALENDAR["max_range_days"]:
+            return Response(
+                {"error": ERROR_MESSAGES["calendar_range_too_large"].format(max_days=CALENDAR["max_range_days"])},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        selected: set[str] | None = self.get_selected_fields()
+        cache_key: str = calendar_cache_key(
+            request.user.id, start_date, end_date, bucket, ",".join(sorted(selected)) if selected else ""
+        )
+        etag: str = quote_etag(hashlib.md5(cache_key.encode(), usedforsecurity=False).hexdigest())
+
+        # The key changes whenever the user's tasks change, so it doubles as an ETag
+        # Weak comparison: compression turns the ETag into W/"..."
+        if etag in (tag.removeprefix("W/") for tag in parse_etags(request.headers.get("If-None-Match", ""))):
+            response: Response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            response["ETag"] = etag
+            return response
+
+        data: dict | None = cache.get(cache_key)
+
+        if data is None:
+            # Rows are read once, in start date order, using the (user, start_date) membership index
+            queryset: QuerySet[Task] = (
+                self.get_queryset()
+                .filter(member_start_date__lte=end_date)
+                .filter(Q(due_date__gte=start_date) | Q(due_date__isnull=True))
+                .order_by("member_start_date", "id")
+            )
+            tasks: Iterable[Task]
+            if is_sharded():
+                tasks = sorted(
+                    (task for shard in shard_querysets(queryset) for task in shard),
+                    key=lambda task: (task.start_date, task.pk),
+                )
+                if selected is None or "assigned_user" in selected:
+                    prefetch_related_objects(tasks, "user")
+            else:
+                # get_queryset() joins the user unless the fieldset leaves it out
+                tasks = queryset.iterator()
+            rows = ((task.start_date, task.due_date, self.get_serializer(task).data) for task in tasks)
+            data = {
+                "from": start_date.isoformat(),
+                "to": end_date.isoformat(),
+                "bucket": bucket,
+                "buckets": build_calendar(rows, start_date, end_date, bucket),
+            }
+            cache.set(cache_key, data, timeout=CALENDAR["cache_timeout"])
+
+        response = Response(data)
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ["Accept", "Authorization"])
+        return response
@@ -0,0 +1,266 @@
+"""
+Deletion of user accounts in bounded batches.
+
+Deleting a ``User`` directly makes Django collect every task assigned to
+or created by the user, and their memberships and reminders, in memory,
+then delete them in one transaction that holds its locks until the end.
+For accounts with many tasks, ``request_deletion()`` instead deactivates
+the user at once, so their tokens stop working, and ``delete_account()``
+deletes their rows afterwards, phase after phase (see ``PHASES``):
+
+- every phase walks the user's rows of one table in every database holding
+  it, with keyset pagination on an index starting with the user column
+  (``WHERE user_id = u AND (start_date, id) > cursor ORDER BY start_date, id LIMIT n``);
+- each batch is deleted in its own short transaction, together with the
+  rows cascading from it, and the position is stored after it, so an
+  interrupted deletion resumes with the next batch;
+- runs sleep between batches to throttle the load. In the background, the
+  ``users.delete_account`` job deletes one batch and queues the next one.
+
+The user is deleted last, once nothing is left to cascade to. A deletion
+is claimed with a conditional update of its ``AccountDeletion`` row, so two
+processes never run the same deletion; the claim expires when its holder
+stops sending heartbeats.
+"""
+
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.contrib.auth.models import User
+from django.db import router, transaction
+from django.db.models import Model, Q
+from django.utils import timezone
+
+from constants import ACCOUNT_DELETION, EVENTS
+from events.models import Event
+from events.publisher import publish
+from jobs.queue import enqueue
+from tasks import history
+from tasks.cache import bump_user_tasks_version
+from tasks.models import ArchivedTask, Task, TaskChange, TaskMembership
+from tasks.sharding import get_shards
+from users.models import AccountDeletion
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Phase:
+    """
+    Rows of one table referencing the deleted user.
+
+    Attributes:
+        name (str): Name of the phase, stored while it runs.
+        model (type[Model]): Table of the rows.
+        user_field (str): Foreign key to the user.
+        order (tuple[str, ...]): Sort key of the keyset pagination, ending with ``id``, served by
+            an index on the user field followed by these columns.
+        sharded (bool): Whether the table is stored in every task shard rather than in its own database.
+    """
+
+    name: str
+    model: type[Model]
+    user_field: str
+    order: tuple[str, ...]
+    sharded: bool = True
+
+    def databases(self) -> list[str]:
+        """Returns the databases walked by the phase, in order."""
+        return get_shards() if self.sharded else [router.db_for_write(self.model)]
+
+
+# Deleting a task also deletes its memberships and reminders; the memberships left are the
+# user's watcher roles on the tasks of others
+PHASES: tuple[Phase, ...] = (
+    Phase("assigned_tasks", Task, "user", ("start_date", "id")),
+    Phase("created_tasks", Task, "created_by", ("start_date", "id")),
+    Phase("archived_tasks", ArchivedTask, "user", ("start_date", "id")),
+    Phase("created_archived_tasks", ArchivedTask, "created_by", ("start_date", "id")),
+    Phase("memberships", TaskMembership, "user", ("start_date", "id")),
+    Phase("events", Event, "user", ("id",), sharded=False),
+)
+
+# Last phase: deleting the user, once nothing is left to cascade to
+USER_PHASE: str = "user"
+
+
+def after(order: tuple[str, ...], cursor: list) -> Q:
+    """
+    Builds the condition selecting the rows sorted after a cursor.
+
+    Args:
+        order (tuple[str, ...]): Sort key.
+        cursor (list): Values of the sort key of the last row, e.g. ``[start_date, id]``.
+
+    Returns:
+        Q: Row comparison ``(a, b) > (x, y)``, as ``a > x OR (a = x AND b > y)``.
+    """
+    condition: Q = Q(**{f"{order[-1]}__gt": cursor[-1]})
+    for field, value in zip(reversed(order[:-1]), reversed(cursor[:-1])):
+        condition = Q(**{f"{field}__gt": value}) | (Q(**{field: value}) & condition)
+    return condition
+
+
+def request_deletion(user: User, background: bool = True) -> AccountDeletion:
+    """
+    Deactivates a user and records the deletion of their account.
+
+    Requesting the deletion of an account again returns the recorded deletion.
+
+    Args:
+        user (User): User to delete.
+        background (bool): Queue a job running the deletion.
+
+    Returns:
+        AccountDeletion: The deletion, to be run by ``delete_account()``.
+    """
+    with transaction.atomic(using=router.db_for_write(AccountDeletion)):
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        deletion, created = AccountDeletion.objects.get_or_create(
+            user_id=user.pk, defaults={"username": user.username, "phase": PHASES[0].name}
+        )
+        if background and deletion.completed_at is None:
+            enqueue("users.delete_account", {"deletion_id": deletion.pk})
+    user.is_active = False
+    if created:
+        logger.info(f"Deletion of user {user.username} requested")
+    return deletion
+
+
+def delete_batch(deletion: AccountDeletion, token: str, batch_size: int) -> int | None:
+    """
+    Deletes the next batch of the deletion's current phase, or moves on to the next position.
+
+    Args:
+        deletion (AccountDeletion): Deletion claimed with ``token``, at its stored position.
+        token (str): Claim token.
+        batch_size (int): Maximum number of rows deleted.
+
+    Returns:
+        int | None: Number of rows deleted (0 when moving to the next database, phase or to
+            the user), None if the claim was lost.
+    """
+    deletions = AccountDeletion.objects.filter(pk=deletion.pk, locked_by=token)
+    names: list[str] = [phase.name for phase in PHASES]
+    if deletion.phase == USER_PHASE:
+        with transaction.atomic(using=router.db_for_write(AccountDeletion)):
+            if not deletions.update(phase="", locked_at=timezone.now()):
+                return None
+            User.objects.filter(pk=deletion.user_id).delete()
+        deletion.phase = ""
+        return 0
+
+    phase: Phase = PHASES[names.index(deletion.phase)]
+    databases: list[str] = phase.databases()
+    alias: str = deletion.shard if deletion.shard in databases else databases[0]
+    rows = phase.model.objects.using(alias).filter(**{phase.user_field: deletion.user_id}).order_by(*phase.order)
+    if deletion.cursor is not None:
+        rows = rows.filter(after(phase.order, deletion.cursor))
+    keys: list[tuple] = list(rows.values_list(*phase.order)[:batch_size])
+
+    if not keys:
+        # Next database of the phase, or first database of the next phase
+        position: dict = {"cursor": None, "shard": ""}
+        if alias != databases[-1]:
+            position["shard"] = databases[databases.index(alias) + 1]
+        else:
+            following: list[str] = names[names.index(phase.name) + 1 :]
+            position["phase"] = following[0] if following else USER_PHASE
+        if not deletions.update(locked_at=timezone.now(), **position):
+            return None
+        for field, value in position.items():
+            setattr(deletion, field, value)
+        return 0
+
+    ids: list[int] = [key[-1] for key in keys]
+    cursor: list = list(keys[-1])
+    deleted: dict = {**deletion.deleted, phase.name: deletion.deleted.get(phase.name, 0) + len(ids)}
+    members: dict[int, set[int]] = {}
+    # The shard commits first: a crash before the outer commit leaves deleted rows behind the
+    # stored cursor, which the next run skips over
+    with transaction.atomic(using=router.db_for_write(AccountDeletion)), transaction.atomic(using=alias):
+        if not deletions.update(shard=alias, cursor=cursor, deleted=deleted, locked_at=timezone.now()):
+            return None
+        if phase.model is Task:
+            for task_id, user_id in (
+                TaskMembership.objects.using(alias).filter(task_id__in=ids).values_list("task_id", "user_id")
+            ):
+                members.setdefault(task_id, set()).add(user_id)
+        phase.model.objects.using(alias).filter(id__in=ids).delete()
+        if phase.model is Task:
+            history.record(*(TaskChange(task_id=task_id, action=TaskChange.DELETED) for task_id in ids))
+            publish(
+                EVENTS["task_deleted"],
+                ((user_ids - {deletion.user_id}, {"id": task_id}) for task_id, user_ids in members.items()),
+            )
+    bump_user_tasks_version(*{user_id for user_ids in members.values() for user_id in user_ids})
+    deletion.shard, deletion.cursor, deletion.deleted = alias, cursor, deleted
+    return len(ids)
+
+
+def delete_account(
+    deletion: AccountDeletion,
+    worker: str,
+    batch_size: int = ACCOUNT_DELETION["batch_size"],
+    pause: float = ACCOUNT_DELETION["pause_seconds"],
+    max_batches: int | None = None,
+    progress: Callable[[AccountDeletion, int], None] | None = None,
+) -> bool:
+    """
+    Runs a requested deletion from its stored position, batch after batch.
+
+    Args:
+        deletion (AccountDeletion): Deletion to run.
+        worker (str): Name of the running process.
+        batch_size (int): Rows per batch.
+        pause (float): Seconds to sleep between two batches.
+        max_batches (int | None): Stop after this many batches, None to run the deletion to the end.
+        progress (Callable[[AccountDeletion, int], None] | None): Called after every batch with the
+            deletion and the number of rows the batch deleted.
+
+    Returns:
+        bool: Whether the deletion is completed. False if stopped by ``max_batches``, or if
+            another process holds or took over the deletion.
+    """
+    token: str = f"{worker}:{uuid.uuid4().hex[:12]}"
+    now: datetime = timezone.now()
+    lock_timeout: timedelta = timedelta(seconds=ACCOUNT_DELETION["lock_timeout_seconds"])
+    claimed: int = (
+        AccountDeletion.objects.filter(pk=deletion.pk, completed_at__isnull=True)
+        .filter(Q(locked_by="") | Q(locked_at__lt=now - lock_timeout))
+        .update(locked_by=token, locked_at=now)
+    )
+    if not claimed:
+        deletion.refresh_from_db()
+        if deletion.completed_at is None:
+            logger.debug(f"The {deletion} is run by another process")
+        return deletion.completed_at is not None
+    deletion.refresh_from_db()
+
+    batches: int = 0
+    while deletion.phase and (max_batches is None or batches < max_batches):
+        deleted: int | None = delete_batch(deletion, token, batch_size)
+        if deleted is None:
+            logger.warning(f"The {deletion} was taken over by another process")
+            return False
+        if progress is not None:
+            progress(deletion, deleted)
+        if deleted:
+            batches += 1
+            time.sleep(pause)
+
+    if deletion.phase:
+        AccountDeletion.objects.filter(pk=deletion.pk, locked_by=token).update(locked_by="", locked_at=None)
+        deletion.locked_by, deletion.locked_at = "", None
+        return False
+    deletion.completed_at = timezone.now()
+    AccountDeletion.objects.filter(pk=deletion.pk, locked_by=token).update(
+        completed_at=deletion.completed_at, locked_by="", locked_at=None
+    )
+    logger.info(f"Account of {deletion.username} deleted: {deletion.deleted}")
+    return True
@@ -0,0 +1,31 @@
+import os
+import socket
+from datetime import timedelta
+
+from constants import ACCOUNT_DELETION
+from jobs.queue import enqueue
+from jobs.registry import job
+from users.deletion import delete_account
+from users.models import AccountDeletion
+
+
+@job("users.delete_account")
+def delete_account_job(payload: dict) -> None:
+    """
+    Deletes one batch of a requested account deletion, then queues the next one.
+
+    Jobs run in a transaction, so each job deletes a single batch and the
+    pause between batches becomes the delay of the next job. A deletion run
+    by another process is checked again once its claim could have expired.
+
+    Args:
+        payload (dict): ``{"deletion_id": int}``.
+    """
+    deletion: AccountDeletion | None = AccountDeletion.objects.filter(pk=payload["deletion_id"]).first()
+    if deletion is None:
+        return
+    worker: str = f"{socket.gethostname()}:{os.getpid()}"
+    if delete_account(deletion, worker, ACCOUNT_DELETION["batch_size"], pause=0, max_batches=1):
+        return
+    delay: float = ACCOUNT_DELETION["lock_timeout_seconds"] if deletion.locked_by else ACCOUNT_DELETION["pause_seconds"]
+    enqueue("users.delete_account", payload, delay=timedelta(seconds=delay))
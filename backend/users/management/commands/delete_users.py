@@ -0,0 +1,78 @@
+import os
+import socket
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from constants import ACCOUNT_DELETION
+from users.deletion import delete_account, request_deletion
+from users.models import AccountDeletion
+
+
+class Command(BaseCommand):
+    help = (
+        "Deactivate users and delete their accounts with their tasks in batches; without usernames, "
+        "resume the deletions that did not complete"
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("usernames", nargs="*", help="users to delete")
+        parser.add_argument("--batch-size", type=int, default=ACCOUNT_DELETION["batch_size"], help="rows per batch")
+        parser.add_argument(
+            "--pause", type=float, default=ACCOUNT_DELETION["pause_seconds"], help="seconds to sleep between batches"
+        )
+        parser.add_argument("--max-batches", type=int, help="stop each deletion after this many batches")
+        parser.add_argument(
+            "--background", action="store_true", help="only deactivate the users and queue the deletions as jobs"
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["usernames"]:
+            users: dict[str, User] = {
+                user.username: user for user in User.objects.filter(username__in=options["usernames"])
+            }
+            unknown: list[str] = [username for username in options["usernames"] if username not in users]
+            if unknown:
+                raise CommandError(f"Unknown users: {', '.join(unknown)}")
+            deletions: list[AccountDeletion] = [
+                request_deletion(user, background=options["background"]) for user in users.values()
+            ]
+        else:
+            deletions = list(AccountDeletion.objects.filter(completed_at__isnull=True).order_by("requested_at"))
+        if options["background"]:
+            self.stdout.write(f"Queued the deletion of {len(deletions)} accounts")
+            return
+
+        worker: str = f"{socket.gethostname()}:{os.getpid()}"
+        for deletion in deletions:
+            completed: bool = delete_account(
+                deletion,
+                worker,
+                batch_size=options["batch_size"],
+                pause=options["pause"],
+                max_batches=options["max_batches"],
+                progress=self.report,
+            )
+            total: int = sum(deletion.deleted.values())
+            if completed:
+                self.stdout.write(f"Deleted the account of {deletion.username} and {total} rows")
+            else:
+                self.stdout.write(
+                    f"Stopped the deletion of {deletion.username} at {deletion.phase} after {total} rows; "
+                    "run the command again to resume it"
+                )
+
+    def report(self, deletion: AccountDeletion, deleted: int) -> None:
+        """
+        Prints the progress of a deletion after a batch.
+
+        Args:
+            deletion (AccountDeletion): The deletion.
+            deleted (int): Rows deleted by the batch.
+        """
+        if deleted:
+            location: str = f"{deletion.phase} in {deletion.shard}" if deletion.shard else deletion.phase
+            self.stdout.write(
+                f"{deletion.username}: {deleted} rows of {location} deleted, "
+                f"{sum(deletion.deleted.values())} in total"
+            )
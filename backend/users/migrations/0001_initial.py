@@ -0,0 +1,42 @@
+# Generated by Django 4.2.1 on 2026-10-19 05:59
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="AccountDeletion",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("user_id", models.BigIntegerField(unique=True, verbose_name="User id")),
+                ("username", models.CharField(max_length=150, verbose_name="Username")),
+                ("phase", models.CharField(blank=True, max_length=30, verbose_name="Phase")),
+                ("shard", models.CharField(blank=True, max_length=100, verbose_name="Shard")),
+                (
+                    "cursor",
+                    models.JSONField(
+                        blank=True,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        null=True,
+                        verbose_name="Cursor",
+                    ),
+                ),
+                ("deleted", models.JSONField(blank=True, default=dict, verbose_name="Deleted rows")),
+                ("locked_by", models.CharField(blank=True, max_length=100, verbose_name="Locked by")),
+                ("locked_at", models.DateTimeField(blank=True, null=True, verbose_name="Locked at")),
+                ("requested_at", models.DateTimeField(default=django.utils.timezone.now, verbose_name="Requested at")),
+                ("completed_at", models.DateTimeField(blank=True, null=True, verbose_name="Completed at")),
+            ],
+            options={
+                "verbose_name": "Account deletion",
+                "verbose_name_plural": "Account deletions",
+            },
+        ),
+    ]
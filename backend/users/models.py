@@ -0,0 +1,53 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+from constants import MODEL_VERBOSE_NAMES
+
+
+class AccountDeletion(models.Model):
+    """
+    Progress of the deletion of a user account and of the rows that belong to it.
+
+    The user is deactivated when the deletion is requested; ``users.deletion``
+    then deletes the user's rows phase after phase, in keyset batches, and
+    stores its position after every batch, so an interrupted deletion resumes
+    where it stopped. The user itself is deleted last. Rows are kept once
+    completed, as a record of the deletion.
+
+    Attributes:
+        user_id (int): Id of the deleted user.
+        username (str): Username of the deleted user.
+        phase (str): Name of the phase in progress, empty once completed.
+        shard (str): Database the phase is walking.
+        cursor (list | None): Sort key of the last deleted row of the phase in that database.
+        deleted (dict): Number of rows deleted by phase.
+        locked_by (str): Claim token of the process running the deletion, empty if free.
+        locked_at (datetime): Last heartbeat of that process.
+        requested_at (datetime): When the deletion was requested.
+        completed_at (datetime): When the user was deleted.
+    """
+
+    user_id = models.BigIntegerField(unique=True, verbose_name="User id")
+    username = models.CharField(max_length=150, verbose_name="Username")
+    phase = models.CharField(max_length=30, blank=True, verbose_name="Phase")
+    shard = models.CharField(max_length=100, blank=True, verbose_name="Shard")
+    cursor = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder, verbose_name="Cursor")
+    deleted = models.JSONField(default=dict, blank=True, verbose_name="Deleted rows")
+    locked_by = models.CharField(max_length=100, blank=True, verbose_name="Locked by")
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name="Locked at")
+    requested_at = models.DateTimeField(default=timezone.now, verbose_name="Requested at")
+    completed_at = models.DateTimeField(null=True, blank=True, verbose_name="Completed at")
+
+    def __str__(self) -> str:
+        """
+        String representation of the AccountDeletion object.
+
+        Returns:
+            str: The username and id of the deleted user.
+        """
+        return f"deletion of {self.username} (#{self.user_id})"
+
+    class Meta:
+        verbose_name = MODEL_VERBOSE_NAMES["account_deletion"]
+        verbose_name_plural = MODEL_VERBOSE_NAMES["account_deletions"]
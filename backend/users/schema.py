@@ -0,0 +1,61 @@
+"""
+OpenAPI documentation of the user endpoints, loaded with the schema (see ``task_manager.schema``).
+"""
+
+from drf_spectacular.extensions import OpenApiViewExtension
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from idempotency.schema import IDEMPOTENCY_KEY_PARAMETER
+from users.serializers import EmailLoginSerializer, UserSerializer
+
+
+class RegisterViewSchema(OpenApiViewExtension):
+    target_class = "users.views.RegisterView"
+
+    def view_replacement(self) -> type:
+        @extend_schema_view(
+            post=extend_schema(
+                description="Register a new user",
+                request=UserSerializer,
+                responses={201: UserSerializer},
+                parameters=[IDEMPOTENCY_KEY_PARAMETER],
+            )
+        )
+        class RegisterView(self.target_class):
+            pass
+
+        return RegisterView
+
+
+class EmailLoginViewSchema(OpenApiViewExtension):
+    target_class = "users.views.EmailLoginView"
+
+    def view_replacement(self) -> type:
+        @extend_schema_view(
+            post=extend_schema(
+                description="Login with email",
+                request=EmailLoginSerializer,
+                responses={200: TokenObtainPairSerializer},
+            )
+        )
+        class EmailLoginView(self.target_class):
+            pass
+
+        return EmailLoginView
+
+
+class UserViewSchema(OpenApiViewExtension):
+    target_class = "users.views.UserView"
+
+    def view_replacement(self) -> type:
+        @extend_schema_view(
+            get=extend_schema(
+                description="Get list of users",
+                responses={200: UserSerializer(many=True)},
+            )
+        )
+        class UserView(self.target_class):
+            pass
+
+        return UserView
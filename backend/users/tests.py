@@ -1,12 +1,34 @@
+import io
 import pytest
 from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models import Q
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import date
 from typing import Callable
-
-from constants import ID_STR, PASSWORD_CONFIRM_STR, PASSWORD_STR, USERNAME_STR, EMAIL_STR, FIRST_NAME_STR, LAST_NAME_STR
+from events.models import Event
+from jobs.models import Job
+from jobs.queue import process
+from tasks.models import ArchivedTask, Task, TaskChange, TaskMembership
+from users.deletion import request_deletion
+from users.models import AccountDeletion
+
+from constants import (
+    ACCOUNT_DELETION,
+    EVENTS,
+    ID_STR,
+    PASSWORD_CONFIRM_STR,
+    PASSWORD_STR,
+    USERNAME_STR,
+    EMAIL_STR,
+    FIRST_NAME_STR,
+    LAST_NAME_STR,
+)
 
 
 @pytest.mark.django_db
@@ -165,3 +187,118 @@ class TestUserAPI:
         assert "access" in response.data
         assert "refresh" in response.data
         assert "user" in response.data
+
+    def test_users_within_query_budget(self, user_factory: Callable, query_budget: Callable) -> None:
+        """Test that the users endpoint stays within its query budget."""
+        user: User = user_factory(username="budget")
+        user_factory(username="other")
+        self.client.force_authenticate(user=user)
+
+        with query_budget("users"):
+            response: Response = self.client.get(reverse("users"))
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_login_within_query_budget(self, query_budget: Callable) -> None:
+        """Test that the login endpoint stays within its query budget."""
+        self.client.post(self.register_url, self.valid_user_data, format="json")
+        login_data: dict[str, str] = {
+            EMAIL_STR: self.valid_user_data[EMAIL_STR],
+            PASSWORD_STR: self.valid_user_data[PASSWORD_STR],
+        }
+
+        with query_budget("login"):
+            response: Response = self.client.post(reverse("login"), login_data, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+class TestAccountDeletion:
+    """Deletion of accounts in batches. Dates lie beyond the seeded tasks."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user_factory: Callable, task_factory: Callable, bulk_task_factory: Callable) -> None:
+        """Create a user with tasks, a task created for someone else, a watched task, an archived task and events."""
+        self.user: User = user_factory(username="leaving")
+        self.other: User = user_factory(username="staying")
+        start: date = date(2060, 1, 1)
+        self.own: list[Task] = bulk_task_factory(self.user, 5, start=start)
+        self.delegated: Task = task_factory(user=self.other, created_by=self.user, start_date=start, due_date=start)
+        self.watched: Task = task_factory(user=self.other, created_by=self.other, start_date=start, due_date=None)
+        self.watched.add_watchers([self.user.id])
+        now = timezone.now()
+        ArchivedTask.objects.create(
+            id=10**9,
+            title="Archived",
+            start_date=start,
+            user=self.user,
+            created_by=self.user,
+            created_at=now,
+            updated_at=now,
+        )
+        Event.objects.bulk_create(Event(user=self.user, type="task.updated") for _ in range(3))
+
+    def assert_deleted(self) -> None:
+        """Check that nothing of the user is left, and that the other user only lost the delegated task."""
+        assert not User.objects.filter(pk=self.user.pk).exists()
+        assert not Task.objects.filter(Q(user_id=self.user.pk) | Q(created_by_id=self.user.pk)).exists()
+        assert not TaskMembership.objects.filter(user_id=self.user.pk).exists()
+        assert not ArchivedTask.objects.filter(user_id=self.user.pk).exists()
+        assert not Event.objects.filter(user_id=self.user.pk).exists()
+        assert list(Task.objects.filter(user=self.other)) == [self.watched]
+        assert Event.objects.filter(
+            user=self.other, type=EVENTS["task_deleted"], data={"id": self.delegated.id}
+        ).exists()
+        deletion: AccountDeletion = AccountDeletion.objects.get(user_id=self.user.pk)
+        assert deletion.completed_at is not None
+        assert deletion.deleted == {
+            "assigned_tasks": 5,
+            "created_tasks": 1,
+            "archived_tasks": 1,
+            "memberships": 1,
+            "events": 3,
+        }
+        assert TaskChange.objects.filter(task_id=self.delegated.id, action=TaskChange.DELETED).exists()
+
+    def test_requested_deletion_deactivates_the_user_at_once(self) -> None:
+        """Test that the user's tokens stop working before any task is deleted."""
+        client: APIClient = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+        assert client.get(reverse("task-list")).status_code == status.HTTP_200_OK
+
+        request_deletion(self.user, background=False)
+
+        assert client.get(reverse("task-list")).status_code == status.HTTP_401_UNAUTHORIZED
+        assert Task.objects.filter(user=self.user).count() == 5
+
+    def test_command_deletes_in_batches_and_resumes(self) -> None:
+        """Test that a deletion stopped after some batches resumes from its position when run again."""
+        output: io.StringIO = io.StringIO()
+        call_command(
+            "delete_users", "leaving", "--batch-size", "2", "--max-batches", "2", "--pause", "0", stdout=output
+        )
+
+        assert "Stopped the deletion of leaving at assigned_tasks after 4 rows" in output.getvalue()
+        assert Task.objects.filter(user=self.user).count() == 1
+        assert AccountDeletion.objects.get(user_id=self.user.pk).cursor is not None
+
+        call_command("delete_users", "--batch-size", "2", "--pause", "0", stdout=output)
+
+        assert "Deleted the account of leaving and 11 rows" in output.getvalue()
+        self.assert_deleted()
+
+    def test_background_deletion_runs_one_batch_per_job(self, monkeypatch) -> None:
+        """Test that the queued job deletes a batch and queues the next one until the user is deleted."""
+        monkeypatch.setitem(ACCOUNT_DELETION, "pause_seconds", 0)
+        monkeypatch.setitem(ACCOUNT_DELETION, "batch_size", 2)
+        call_command("delete_users", "leaving", "--background", stdout=io.StringIO())
+        assert not User.objects.get(pk=self.user.pk).is_active
+
+        jobs: int = 0
+        while process("worker"):
+            jobs += 1
+
+        assert jobs > 5
+        assert not Job.objects.filter(name="users.delete_account").exists()
+        self.assert_deleted()
@@ -1,14 +1,14 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.views import APIView
-from .serializers import EmailLoginSerializer, UserSerializer
-from drf_spectacular.utils import extend_schema
+from .serializers import UserSerializer
 import logging
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from rest_framework.exceptions import ValidationError
+from idempotency.keys import idempotent
+from task_manager.routers import mark_recent_write
 
 # Configure logger for debugging
 logger = logging.getLogger(__name__)
@@ -22,18 +22,19 @@ class RegisterView(generics.CreateAPIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = UserSerializer
 
-    @extend_schema(
-        description="Register a new user",
-        request=UserSerializer,
-        responses={201: UserSerializer},
-    )
+    @idempotent
     def post(self, request):
         """
         Register a new user.
+
+        Retries sent with the same ``Idempotency-Key`` header get the registered user back.
         """
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
             serializer.save()
+            # Anonymous writes pin no one to the primary: the new user's first requests would miss
+            # it on a lagging replica
+            mark_recent_write(serializer.instance.pk)
             logger.info(f"User registered: {serializer.data['username']}")
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         logger.error(f"User registration failed: {serializer.errors}")
@@ -47,11 +48,6 @@ class EmailLoginView(APIView):
 
     permission_classes = [permissions.AllowAny]
 
-    @extend_schema(
-        description="Login with email",
-        request=EmailLoginSerializer,
-        responses={200: TokenObtainPairSerializer},
-    )
     def post(self, request) -> Response:
         """
         Login with email and password.
@@ -80,6 +76,9 @@ class EmailLoginView(APIView):
             logger.error(f"Incorrect password for email: {email}")
             raise ValidationError({"password": "Incorrect credentials"})
 
+        # The token's first requests read the user from the primary, like after a registration
+        mark_recent_write(user.pk)
+
         # Generate tokens
         refresh: RefreshToken = RefreshToken.for_user(user)
 
@@ -103,10 +102,6 @@ class UserView(APIView):
 
     permission_classes = [permissions.IsAuthenticated]
 
-    @extend_schema(
-        description="Get list of users",
-        responses={200: UserSerializer(many=True)},
-    )
     def get(self, request) -> Response:
         """
         Retrieve list of all users.